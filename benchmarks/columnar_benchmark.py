@@ -0,0 +1,107 @@
+"""
+Benchmark: Scan einer Spalte über einen großen Spiegel.
+
+Vergleicht die Auswertung "Summe einer Zahlenspalte, gefiltert nach einer
+Dropdown-Spalte, gruppiert nach einer zweiten" über
+  - Einträge als Liste von Dicts im Speicher (bisheriger Weg),
+  - den SQLite-Spiegel (sql_query),
+  - den spaltenorientierten Spiegel (scan_columnar_mirror).
+Für den Spalten-Spiegel wird zusätzlich gezeigt, wie viele Bytes die
+Abfrage tatsächlich einblendet.
+
+    python benchmarks/columnar_benchmark.py --rows 1000000 --columns 20
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dimetrics_mcp_server.columnar import ColumnarTable, columnar_schema  # noqa: E402
+from dimetrics_mcp_server.mirror import ResourceMirror, _cell, mirror_columns  # noqa: E402
+
+
+def build(rows: int, columns: int):
+    attributes = [{"name": "training_type", "type": "DROPDOWN_FIELD"}, {"name": "surface", "type": "DROPDOWN_FIELD"}]
+    attributes += [{"name": f"metric_{index}", "type": "NUMERIC_FIELD"} for index in range(max(1, columns - 6))]
+    attributes += [{"name": "date", "type": "TIMESTAMP_FIELD"}, {"name": "note", "type": "INPUT_FIELD"}]
+    numeric = [attribute["name"] for attribute in attributes if attribute["type"] == "NUMERIC_FIELD"]
+    generator = random.Random(1)
+    entries = [
+        {
+            "object_id": f"00000000-0000-4000-8000-{index:012d}",
+            "training_type": generator.choice(("dauerlauf", "intervall", "tempo", "long")),
+            "surface": generator.choice(("asphalt", "trail", "bahn")),
+            **{name: round(generator.random() * 20, 2) for name in numeric},
+            "date": f"2025-{index % 12 + 1:02d}-{index % 28 + 1:02d}T06:00:00Z",
+            "note": f"Lauf {index}",
+            "ingest_timestamp": "2025-01-01T00:00:00Z",
+            "update_timestamp": "2025-01-01T00:00:00Z",
+        }
+        for index in range(rows)
+    ]
+    return attributes, entries
+
+
+def timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--columns", type=int, default=20)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    attributes, entries = build(args.rows, args.columns)
+    dict_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"{args.rows:,} Zeilen x {len(entries[0])} Spalten")
+
+    directory = tempfile.mkdtemp(prefix="columnar-bench-")
+
+    def with_dicts():
+        sums = {}
+        for entry in entries:
+            if entry["surface"] != "trail":
+                key = entry["training_type"]
+                sums[key] = sums.get(key, 0.0) + entry["metric_0"]
+        return sums
+
+    mirror = ResourceMirror(os.path.join(directory, "mirror.sqlite3"))
+    columns = mirror_columns(attributes)
+    names = [name for name, _ in columns]
+    _, sqlite_write = timed(lambda: mirror._replace_table(
+        "runs", "runs", columns, [tuple(_cell(entry.get(name)) for name in names) for entry in entries], 0
+    ))
+    sql = "SELECT training_type, SUM(metric_0) FROM runs WHERE surface <> 'trail' GROUP BY training_type"
+
+    table = ColumnarTable(os.path.join(directory, "runs"))
+    _, columnar_write = timed(lambda: table.write("runs", columnar_schema(attributes), entries, None))
+
+    _, dict_ms = timed(with_dicts)
+    _, sqlite_ms = timed(lambda: asyncio.run(mirror.query(sql)))
+    table.close()
+    _, columnar_ms = timed(lambda: table.aggregate({"sum": "metric_0"}, "training_type", {"surface": {"_neq": "trail"}}))
+    mapped = sum(column.bytes for column in table._columns.values())
+    on_disk = table.describe()["bytes_on_disk"]
+
+    print(f"{'Speicherung':<22} {'Schreiben ms':>13} {'Größe MB':>10} {'Scan ms':>9} {'gelesen MB':>11}")
+    print(f"{'Dicts im Speicher':<22} {'-':>13} {dict_bytes / 1e6:>10.1f} {dict_ms:>9.1f} {dict_bytes / 1e6:>11.1f}")
+    sqlite_size = os.path.getsize(mirror.path)
+    print(f"{'SQLite-Spiegel':<22} {sqlite_write:>13.0f} {sqlite_size / 1e6:>10.1f} {sqlite_ms:>9.1f} {sqlite_size / 1e6:>11.1f}")
+    print(f"{'Spalten-Spiegel':<22} {columnar_write:>13.0f} {on_disk / 1e6:>10.1f} {columnar_ms:>9.1f} {mapped / 1e6:>11.1f}")
+    mirror.close()
+
+
+if __name__ == "__main__":
+    main()
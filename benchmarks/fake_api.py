@@ -0,0 +1,45 @@
+"""
+Minimale Attrappe der Dimetrics-API für Benchmarks (liefert vorberechnete Generics-Seiten).
+
+    uvicorn benchmarks.fake_api:create_app --factory --port 8900 --workers 4
+
+BENCH_ROWS steuert die Zeilen pro Seite, BENCH_ROW_BYTES die ungefähre Größe einer Zeile.
+"""
+
+import json
+import os
+
+from starlette.applications import Starlette
+from starlette.responses import Response
+from starlette.routing import Route
+
+
+def build_page(rows: int, row_bytes: int = 200) -> bytes:
+    filler = "x" * max(0, row_bytes - 150)
+    results = [
+        {
+            "object_id": f"00000000-0000-4000-8000-{index:012d}",
+            "name": f"Eintrag {index}",
+            "amount": index * 1.5,
+            "state": "ok" if index % 3 else "pending",
+            "date_created": "2025-01-01T00:00:00Z",
+            "notes": filler,
+        }
+        for index in range(rows)
+    ]
+    return json.dumps({"count": rows, "next": None, "previous": None, "results": results}).encode()
+
+
+def create_app() -> Starlette:
+    page = build_page(int(os.getenv("BENCH_ROWS", "200")), int(os.getenv("BENCH_ROW_BYTES", "200")))
+
+    async def generics(request):
+        return Response(page, media_type="application/json")
+
+    async def attributes(request):
+        return Response(b"[]", media_type="application/json")
+
+    return Starlette(routes=[
+        Route("/api/generics/{resource}/", generics),
+        Route("/api/attributes/{resource}/", attributes),
+    ])
@@ -0,0 +1,93 @@
+"""
+Benchmark: Blockade des Event-Loops beim Dekodieren großer Generics-Seiten.
+
+Während der API Client eine mehrere MB große Seite dekodiert, misst ein
+Ticker (alle 1 ms), wie lange der Event-Loop am Stück nicht reagiert hat.
+Verglichen werden response.json() (bisher), das schnellste verfügbare
+Backend in einem Zug (orjson, falls installiert) und das kooperative
+Decoding des Clients.
+
+    python benchmarks/json_decode_benchmark.py --rows 20000 --row-bytes 250
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_api import build_page  # noqa: E402
+from dimetrics_mcp_server.api_client import DimetricsAPIClient  # noqa: E402
+from dimetrics_mcp_server.json_decoding import JSON_BACKEND  # noqa: E402
+
+
+async def measure(client: DimetricsAPIClient, mode: str, repeat: int) -> dict:
+    gaps = []
+    running = True
+
+    async def ticker():
+        last = time.perf_counter()
+        while running:
+            await asyncio.sleep(0.001)
+            now = time.perf_counter()
+            gaps.append(now - last)
+            last = now
+
+    if mode == "response.json()":
+        async def fetch():
+            response = await client.client.get("/generics/bench/")
+            return response.json()
+    else:
+        client.json_cooperative_bytes = 512 * 1024 if mode == "kooperativ" else 0
+
+        async def fetch():
+            return await client.list_generic_entries("bench")
+
+    task = asyncio.create_task(ticker())
+    await asyncio.sleep(0.01)
+    durations = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await fetch()
+        durations.append(time.perf_counter() - started)
+        assert len(result["results"]) > 0
+        await asyncio.sleep(0.01)
+    running = False
+    await task
+
+    return {
+        "mode": mode,
+        "max_block_ms": max(gaps) * 1000,
+        "blocked_over_10ms": sum(gap for gap in gaps if gap > 0.01) * 1000,
+        "decode_ms": sum(durations) / len(durations) * 1000,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--row-bytes", type=int, default=250)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = build_page(args.rows, args.row_bytes)
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=page))
+    client = DimetricsAPIClient("http://bench/api", api_key="benchmark", transport=transport)
+    print(f"Seite: {len(page) / 1e6:.1f} MB, {args.rows} Zeilen, JSON-Backend: {JSON_BACKEND}")
+
+    modes = ["response.json()", f"{JSON_BACKEND} in einem Zug", "kooperativ"]
+    results = [await measure(client, mode, args.repeat) for mode in modes]
+
+    print(f"{'Verfahren':<22} {'max. Blockade ms':>17} {'Summe >10ms':>12} {'Dauer/Seite ms':>15}")
+    for result in results:
+        print(f"{result['mode']:<22} {result['max_block_ms']:>17.1f} {result['blocked_over_10ms']:>12.1f} "
+              f"{result['decode_ms']:>15.1f}")
+    await client.client.aclose()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,165 @@
+"""
+Benchmark: Seitennummern (OFFSET) gegen Keyset-Pagination.
+
+Eine lokale Attrappe der Generics API hält N Einträge in SQLite (Index
+auf object_id und date_created) und beantwortet page/page_size wie ein
+Backend mit LIMIT/OFFSET, directus-Filter als WHERE, count wie der
+Paginator bei jeder Anfrage. Gemessen wird die Latenz einer Seite in
+verschiedenen Tiefen über den echten DimetricsAPIClient, jeweils mit und
+ohne count (das COUNT(*) über die verbleibenden Zeilen zahlt das Backend
+in beiden Verfahren), und ob ein Durchlauf bei gleichzeitigen
+Einfügungen Einträge doppelt liefert.
+
+    python benchmarks/keyset_benchmark.py --rows 1000000
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dimetrics_mcp_server.api_client import DimetricsAPIClient  # noqa: E402
+from dimetrics_mcp_server.pagination import encode_cursor  # noqa: E402
+
+_OPS = {"_eq": "=", "_gt": ">", "_gte": ">=", "_lt": "<", "_lte": "<="}
+COLUMNS = ("object_id", "date_created", "distance_km")
+
+
+class StandIn:
+    """Generics-Endpunkt über einer SQLite-Tabelle."""
+
+    def __init__(self, rows: int, with_count: bool = True):
+        self.db = sqlite3.connect(":memory:", check_same_thread=False)
+        self.db.execute("CREATE TABLE runs (object_id TEXT PRIMARY KEY, date_created TEXT, distance_km REAL)")
+        self.db.executemany(
+            "INSERT INTO runs VALUES (?, ?, ?)",
+            ((self.object_id(index), self.stamp(index), index % 42 / 2) for index in range(rows))
+        )
+        self.db.execute("CREATE INDEX runs_created ON runs (date_created, object_id)")
+        self.with_count = with_count
+        self.inserted = 0
+
+    @staticmethod
+    def object_id(index: int) -> str:
+        # Zufällig verteilte IDs wie UUIDs: Sortierung nach object_id ≠ Einfügereihenfolge
+        return f"{(index * 2654435761) % 2**32:08x}-{index:012d}"
+
+    @staticmethod
+    def stamp(index: int) -> str:
+        return f"2025-01-01T00:00:00.{index:07d}Z"
+
+    def where(self, node):
+        clauses, params = [], []
+        for key, value in node.items():
+            if key in ("_and", "_or"):
+                parts = [self.where(item) for item in value]
+                clauses.append("(" + f" {key[1:].upper()} ".join(sql for sql, _ in parts) + ")")
+                params += [param for _, part in parts for param in part]
+                continue
+            for op, argument in value.items():
+                clauses.append(f"{key} {_OPS[op]} ?")
+                params.append(argument)
+        return " AND ".join(clauses) or "1", params
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        query = request.url.params
+        where, params = self.where(json.loads(query["filter"])) if "filter" in query else ("1", [])
+        order = ", ".join(
+            f"{field.lstrip('-')} {'DESC' if field.startswith('-') else 'ASC'}"
+            for field in (query.get("ordering") or "object_id").split(",")
+        )
+        size, page = int(query.get("page_size", 20)), int(query.get("page", 1))
+        rows = self.db.execute(
+            f"SELECT object_id, date_created, distance_km FROM runs WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?",
+            (*params, size, (page - 1) * size)
+        ).fetchall()
+        count = self.db.execute(f"SELECT COUNT(*) FROM runs WHERE {where}", params).fetchone()[0] if self.with_count else None
+        more = len(rows) == size if count is None else page * size < count
+        body = {"count": count, "next": "next" if more else None, "previous": None, "results": [dict(zip(COLUMNS, row)) for row in rows]}
+        return httpx.Response(200, content=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+    def insert_front(self, count: int) -> None:
+        """Neue Einträge, die in der Sortierung vor den bisherigen liegen."""
+        for _ in range(count):
+            self.inserted += 1
+            self.db.execute("INSERT INTO runs VALUES (?, ?, ?)", (f"00000000-new-{self.inserted:08d}", "2024-12-31T00:00:00Z", 1.0))
+
+    def key_at(self, position: int, ordering: str):
+        field = ordering.lstrip("-")
+        direction = "DESC" if ordering.startswith("-") else "ASC"
+        order = f"object_id {direction}" if field == "object_id" else f"{field} {direction}, object_id {direction}"
+        return list(self.db.execute(f"SELECT {field}, object_id FROM runs ORDER BY {order} LIMIT 1 OFFSET ?", (position,)).fetchone())
+
+
+def client_for(stand_in: StandIn) -> DimetricsAPIClient:
+    return DimetricsAPIClient("http://bench/api", api_key="bench", transport=httpx.MockTransport(stand_in.handler))
+
+
+async def timed(factory, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        await factory()
+        samples.append((time.perf_counter() - started) * 1000)
+    return statistics.median(samples)
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--ordering", default="date_created")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    stand_in = StandIn(args.rows)
+    print(f"{args.rows:,} Einträge in {time.perf_counter() - started:.1f} s angelegt, Seite = {args.page_size}, ordering = {args.ordering}")
+    client = client_for(stand_in)
+
+    print(f"{'':>10} {'ohne count':>22} {'mit count':>22}")
+    print(f"{'Tiefe':>10} {'OFFSET ms':>11} {'Keyset ms':>10} {'OFFSET ms':>11} {'Keyset ms':>10}")
+    depths = sorted({0, 1_000, 10_000, 100_000, args.rows // 2, args.rows - args.page_size} & set(range(args.rows)))
+    for depth in depths:
+        page = depth // args.page_size + 1
+        cursor = encode_cursor(args.ordering, stand_in.key_at(depth - 1, args.ordering)) if depth else None
+        timings = []
+        for with_count in (False, True):
+            stand_in.with_count = with_count
+            timings.append(await timed(lambda: client.list_generic_entries(
+                "runs", page_size=args.page_size, page=page, ordering=f"{args.ordering},object_id"
+            ), args.repeat))
+            timings.append(await timed(lambda: client.list_generic_entries_keyset(
+                "runs", cursor=cursor, page_size=args.page_size, ordering=args.ordering
+            ), args.repeat))
+        print(f"{depth:>10,} {timings[0]:>11.1f} {timings[1]:>10.1f} {timings[2]:>11.1f} {timings[3]:>10.1f}")
+
+    # Durchlauf über die ersten Seiten, während vorne Einträge hinzukommen
+    pages = 50
+    seen_offset, seen_keyset = [], []
+    for page in range(1, pages + 1):
+        data = await client.list_generic_entries("runs", page_size=args.page_size, page=page, ordering="object_id")
+        seen_offset += [entry["object_id"] for entry in data["results"]]
+        stand_in.insert_front(5)
+    cursor = None
+    for _ in range(pages):
+        data = await client.list_generic_entries_keyset("runs", cursor=cursor, page_size=args.page_size, ordering="object_id")
+        seen_keyset += [entry["object_id"] for entry in data["results"]]
+        cursor = data["next_cursor"]
+        stand_in.insert_front(5)
+    print(f"\nDurchlauf über {pages} Seiten mit je 5 Einfügungen pro Seite:")
+    print(f"  page/OFFSET: {len(seen_offset) - len(set(seen_offset))} doppelt gelieferte Einträge")
+    print(f"  Keyset:      {len(seen_keyset) - len(set(seen_keyset))} doppelt gelieferte Einträge")
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
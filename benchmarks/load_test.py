@@ -0,0 +1,209 @@
+"""
+Lasttest für den Streamable-HTTP-Betrieb: Durchsatz in Abhängigkeit der Worker-Anzahl.
+
+Startet eine Attrappe der Dimetrics-API (benchmarks/fake_api.py) und für jede
+Worker-Anzahl den MCP Server (MCP_TRANSPORT=streamable-http), ruft dann aus
+mehreren Lastprozessen parallel das Tool list_generic_entries auf und
+misst Requests pro Sekunde sowie Latenzen.
+
+    python benchmarks/load_test.py --workers 1,2,4 --concurrency 32 --duration 10 --rows 500
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def tool_call(request_id: int, rows: int) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": request_id,
+        "method": "tools/call",
+        "params": {"name": "list_generic_entries", "arguments": {"resource_name": "bench", "page_size": rows}},
+    }
+
+
+def parse_response(response: httpx.Response) -> dict:
+    """Antwort als JSON oder als SSE-Stream (data:-Zeilen)."""
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        for line in response.text.splitlines():
+            if line.startswith("data:"):
+                return json.loads(line[5:])
+        raise ValueError("Keine Daten im SSE-Stream")
+    return response.json()
+
+
+async def _drive(url: str, concurrency: int, duration: float, rows: int):
+    headers = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + duration
+    limits = httpx.Limits(max_connections=concurrency)
+
+    async with httpx.AsyncClient(timeout=60, limits=limits) as client:
+        async def user(index: int):
+            nonlocal errors
+            request_id = index * 1_000_000
+            while time.perf_counter() < deadline:
+                request_id += 1
+                started = time.perf_counter()
+                try:
+                    response = await client.post(url, json=tool_call(request_id, rows), headers=headers)
+                    body = parse_response(response)
+                    if response.status_code != 200 or "error" in body or body["result"].get("isError"):
+                        errors += 1
+                        continue
+                except Exception:
+                    errors += 1
+                    continue
+                latencies.append(time.perf_counter() - started)
+
+        await asyncio.gather(*(user(index) for index in range(concurrency)))
+    return latencies, errors
+
+
+def _load_process(args):
+    url, concurrency, duration, rows = args
+    return asyncio.run(_drive(url, concurrency, duration, rows))
+
+
+def wait_ready(url: str, process: subprocess.Popen, timeout: float = 30) -> None:
+    headers = {"Accept": "application/json, text/event-stream", "Content-Type": "application/json"}
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Prozess beendet mit Code {process.returncode}")
+        try:
+            response = httpx.post(url, json={"jsonrpc": "2.0", "id": 0, "method": "tools/list"}, headers=headers)
+            if response.status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} nicht erreichbar")
+
+
+def start_fake_api(port: int, rows: int, row_bytes: int) -> subprocess.Popen:
+    env = dict(os.environ, BENCH_ROWS=str(rows), BENCH_ROW_BYTES=str(row_bytes))
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "benchmarks.fake_api:create_app", "--factory",
+         "--port", str(port), "--workers", "4", "--log-level", "warning"],
+        cwd=ROOT, env=env
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/attributes/bench/")
+            return process
+        except httpx.TransportError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Fake-API nicht erreichbar")
+
+
+def start_server(port: int, api_port: int, workers: int) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        MCP_TRANSPORT="streamable-http",
+        MCP_WORKERS=str(workers),
+        MCP_STATELESS_HTTP="true",
+        MCP_JSON_RESPONSE="true",
+        MCP_LOG_LEVEL="warning",
+        HOST="127.0.0.1",
+        PORT=str(port),
+        DIMETRICS_API_URL=f"http://127.0.0.1:{api_port}/api",
+        DIMETRICS_API_KEY="benchmark",
+        DIMETRICS_BACKENDS="",
+        DIMETRICS_BACKENDS_FILE="",
+    )
+    return subprocess.Popen([sys.executable, "-m", "dimetrics_mcp_server"], cwd=ROOT, env=env)
+
+
+def stop(process: subprocess.Popen) -> None:
+    # SIGTERM: uvicorn fährt die Worker geordnet herunter (Lifespan schließt die Clients)
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+def run_case(workers: int, api_port: int, args) -> dict:
+    port = free_port()
+    server = start_server(port, api_port, workers)
+    url = f"http://127.0.0.1:{port}/mcp"
+    try:
+        wait_ready(url, server)
+        # Aufwärmen: Verbindungen und Caches in allen Workern
+        _load_process((url, args.concurrency, 1.0, args.rows))
+
+        per_process = max(1, args.concurrency // args.load_processes)
+        with multiprocessing.Pool(args.load_processes) as pool:
+            outcomes = pool.map(
+                _load_process, [(url, per_process, args.duration, args.rows)] * args.load_processes
+            )
+    finally:
+        stop(server)
+
+    latencies = [value for outcome in outcomes for value in outcome[0]]
+    errors = sum(outcome[1] for outcome in outcomes)
+    latencies.sort()
+    return {
+        "workers": workers,
+        "requests": len(latencies),
+        "errors": errors,
+        "rps": len(latencies) / args.duration,
+        "p50_ms": statistics.median(latencies) * 1000 if latencies else None,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000 if latencies else None,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,2,4", help="Kommagetrennte Worker-Anzahlen")
+    parser.add_argument("--concurrency", type=int, default=32, help="Gleichzeitige Requests insgesamt")
+    parser.add_argument("--load-processes", type=int, default=4, help="Prozesse für die Lasterzeugung")
+    parser.add_argument("--duration", type=float, default=10.0, help="Messdauer pro Lauf in Sekunden")
+    parser.add_argument("--rows", type=int, default=500, help="Zeilen pro Generics-Seite")
+    parser.add_argument("--row-bytes", type=int, default=200, help="Ungefähre Größe einer Zeile")
+    args = parser.parse_args()
+
+    api_port = free_port()
+    fake_api = start_fake_api(api_port, args.rows, args.row_bytes)
+    results = []
+    try:
+        for workers in [int(value) for value in args.workers.split(",")]:
+            result = run_case(workers, api_port, args)
+            results.append(result)
+            print(f"workers={workers}: {result['rps']:.1f} req/s, p50 {result['p50_ms']:.1f} ms, "
+                  f"p95 {result['p95_ms']:.1f} ms, Fehler {result['errors']}", flush=True)
+    finally:
+        stop(fake_api)
+
+    base = results[0]["rps"] or 1
+    print()
+    print(f"{'Worker':>6} {'req/s':>9} {'Faktor':>7} {'p50 ms':>8} {'p95 ms':>8} {'Fehler':>7}")
+    for result in results:
+        print(f"{result['workers']:>6} {result['rps']:>9.1f} {result['rps'] / base:>7.2f} "
+              f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['errors']:>7}")
+
+
+if __name__ == "__main__":
+    main()
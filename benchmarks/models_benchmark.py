@@ -0,0 +1,89 @@
+"""
+Benchmark: Dekodierzeit und Speicherbedarf der Attribut-Projektion.
+
+Vergleicht die frühere Projektion (Dict-Comprehension mit .get() je Feld)
+mit ATTRIBUTE aus dimetrics_mcp_server.models. Gemessen werden die Zeit
+von den Antwort-Bytes bis zur Liste für die Tool-Antwort sowie der
+belegte Speicher der gehaltenen Liste (tracemalloc).
+
+    python benchmarks/models_benchmark.py --attributes 10000
+"""
+
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.serialization_benchmark import build_attributes  # noqa: E402
+from dimetrics_mcp_server.json_decoding import JSON_BACKEND, loads  # noqa: E402
+from dimetrics_mcp_server.models import ATTRIBUTE  # noqa: E402
+
+
+def project_dicts(body: bytes) -> List[dict]:
+    """Bisherige Projektion aus list_attributes."""
+    return [
+        {
+            "object_id": attr.get("object_id"),
+            "name": attr.get("name"),
+            "type": attr.get("type"),
+            "label": attr.get("label"),
+            "description": attr.get("description", ""),
+            "required": attr.get("required", False),
+            "readonly": attr.get("readonly", False),
+            "unique": attr.get("unique", False),
+            "show_in_table": attr.get("show_in_table", True),
+            "enable_sum": attr.get("enable_sum", False),
+            "field_order": attr.get("field_order"),
+            "form_layout_location": attr.get("form_layout_location", "Main"),
+            "form_layout_col": attr.get("form_layout_col", "12"),
+            "resource": attr.get("resource", {})
+        }
+        for attr in loads(body)
+    ]
+
+
+def project_summaries(body: bytes) -> List[dict]:
+    return ATTRIBUTE.page(loads(body), summary=True)
+
+
+def measure(decode: Callable[[bytes], Any], body: bytes, repeat: int) -> dict:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        decode(body)
+        timings.append(time.perf_counter() - started)
+
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    result = decode(body)
+    gc.collect()
+    # Nur was die projizierte Liste hält (die Roh-Dicts sind freigegeben)
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del result
+    return {"ms": statistics.median(timings) * 1000, "retained": retained}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--attributes", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=7)
+    args = parser.parse_args()
+
+    body = build_attributes(args.attributes)
+    print(f"{args.attributes} Attribute, {len(body):,} Bytes, Decoder: {JSON_BACKEND}")
+    print(f"{'Projektion':<28} {'ms':>8} {'gehalten (KB)':>14}")
+    for label, project in (("Dict-Comprehension (.get)", project_dicts), ("ATTRIBUTE.page", project_summaries)):
+        result = measure(project, body, args.repeat)
+        print(f"{label:<28} {result['ms']:>8.2f} {result['retained'] / 1024:>14,.0f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Benchmark: vollständiger Scan seriell gegen parallel über Teilbereiche.
+
+Nutzt die SQLite-Attrappe aus keyset_benchmark.py (zusätzlich mit
+_starts_with, _null und _or) und verzögert jede Antwort um eine feste
+Netzwerk-Latenz. Verglichen werden ein serieller Keyset-Durchlauf und
+partitioned_scan über object_id-Präfixe bzw. Wertebereiche von
+distance_km, jeweils sortiert nach date_created (K-Wege-Merge).
+
+    python benchmarks/partition_benchmark.py --rows 200000 --latency-ms 40
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from dimetrics_mcp_server.api_client import DimetricsAPIClient  # noqa: E402
+from dimetrics_mcp_server.partitioning import partitioned_scan  # noqa: E402
+from keyset_benchmark import _OPS, StandIn  # noqa: E402
+
+
+class PartitionStandIn(StandIn):
+    """StandIn mit den Operatoren, die partitioned_scan verwendet."""
+
+    def __init__(self, rows: int, latency_ms: float):
+        super().__init__(rows)
+        self.latency = latency_ms / 1000
+        self.db.execute("CREATE INDEX runs_distance ON runs (distance_km, object_id)")
+
+    def where(self, node):
+        clauses, params = [], []
+        for key, value in node.items():
+            if key in ("_and", "_or"):
+                parts = [self.where(item) for item in value]
+                clauses.append("(" + f" {key[1:].upper()} ".join(sql for sql, _ in parts) + ")")
+                params += [param for _, part in parts for param in part]
+                continue
+            for op, argument in value.items():
+                if op == "_starts_with":
+                    clauses.append(f"{key} >= ? AND {key} < ?")
+                    params += [argument, argument + "￿"]
+                elif op == "_null":
+                    clauses.append(f"{key} IS {'' if argument else 'NOT '}NULL")
+                else:
+                    clauses.append(f"{key} {_OPS[op]} ?")
+                    params.append(argument)
+        return " AND ".join(clauses) or "1", params
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        query = request.url.params
+        aggregate = {key[10:-1]: value for key, value in query.items() if key.startswith("aggregate[")}
+        if not aggregate:
+            return super().handler(request)
+        where, params = self.where(json.loads(query["filter"])) if "filter" in query else ("1", [])
+        row = {
+            function: {field: self.db.execute(f"SELECT {function}({field}) FROM runs WHERE {where}", params).fetchone()[0]}
+            for function, field in aggregate.items()
+        }
+        return httpx.Response(200, json={"count": 1, "next": None, "previous": None, "results": [row]})
+
+    async def delayed(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(self.latency)
+        return self.handler(request)
+
+
+async def serial_scan(client: DimetricsAPIClient, ordering: str, page_size: int):
+    entries, cursor, requests = [], None, 0
+    while True:
+        data = await client.list_generic_entries_keyset("runs", cursor=cursor, page_size=page_size, ordering=ordering)
+        requests += 1
+        entries.extend(data["results"])
+        cursor = data["next_cursor"]
+        if not cursor:
+            return entries, requests
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=200_000)
+    parser.add_argument("--page-size", type=int, default=500)
+    parser.add_argument("--latency-ms", type=float, default=40)
+    parser.add_argument("--partitions", type=int, default=8)
+    args = parser.parse_args()
+
+    stand_in = PartitionStandIn(args.rows, args.latency_ms)
+    client = DimetricsAPIClient("http://bench/api", api_key="bench", transport=httpx.MockTransport(stand_in.delayed))
+    print(f"{args.rows:,} Einträge, Seite = {args.page_size}, Latenz = {args.latency_ms:.0f} ms, ordering = date_created")
+
+    started = time.perf_counter()
+    reference, requests = await serial_scan(client, "date_created", args.page_size)
+    serial_ms = (time.perf_counter() - started) * 1000
+    expected = [entry["object_id"] for entry in reference]
+
+    print(f"{'Verfahren':<28} {'Dauer ms':>10} {'Requests':>9} {'Bereiche':>9} {'Größter':>9} {'Reihenfolge':>12}")
+    print(f"{'seriell (Keyset)':<28} {serial_ms:>10.0f} {requests:>9} {1:>9} {len(reference):>9} {'ok':>12}")
+    for partition_by in ("object_id", "distance_km"):
+        started = time.perf_counter()
+        entries, stats = await partitioned_scan(
+            client, "runs", partition_by=partition_by, partitions=args.partitions,
+            ordering="date_created", page_size=args.page_size, concurrency=args.partitions
+        )
+        duration_ms = (time.perf_counter() - started) * 1000
+        largest = max(partition["count"] for partition in stats["partitions"])
+        order = "ok" if [entry["object_id"] for entry in entries] == expected else "FEHLER"
+        label = f"partitioniert ({partition_by})"
+        print(f"{label:<28} {duration_ms:>10.0f} {stats['requests']:>9} {len(stats['partitions']):>9} {largest:>9} {order:>12}")
+    await client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
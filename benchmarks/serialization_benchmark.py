@@ -0,0 +1,106 @@
+"""
+Benchmark: Serialisierungszeit und Ausgabegröße von Tool-Ergebnissen.
+
+Ruft Tools über den MCP-Request-Handler auf (wie ein echter Client) und
+serialisiert die JSON-RPC-Antwort wie der Transport. Verglichen werden
+der Standardpfad von FastMCP (Text + structuredContent), derselbe ohne
+Echo-Felder (verbose=False) und der schnelle Pfad (DIMETRICS_FAST_JSON).
+
+    python benchmarks/serialization_benchmark.py --rows 5000 --attributes 500
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.fake_api import build_page  # noqa: E402
+from dimetrics_mcp_server import __main__ as server  # noqa: E402
+from dimetrics_mcp_server.api_client import DimetricsAPIClient  # noqa: E402
+from dimetrics_mcp_server.backends import BackendConfig, ClientRegistry  # noqa: E402
+from dimetrics_mcp_server.json_decoding import JSON_BACKEND  # noqa: E402
+from mcp import types  # noqa: E402
+
+
+def build_attributes(count: int) -> bytes:
+    return json.dumps([
+        {
+            "object_id": f"00000000-0000-4000-8000-{index:012d}",
+            "name": f"feld_{index}",
+            "type": "INPUT_FIELD",
+            "label": f"Feld {index}",
+            "description": "",
+            "required": False,
+            "field_order": index,
+            "resource": {"object_id": "00000000-0000-4000-8000-000000000000", "name": "bench"},
+        }
+        for index in range(count)
+    ]).encode()
+
+
+async def call(name: str, arguments: dict, repeat: int) -> dict:
+    handler = server.mcp._mcp_server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(method="tools/call", params=types.CallToolRequestParams(name=name, arguments=arguments))
+    timings, size = [], 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = await handler(request)
+        body = result.model_dump_json(by_alias=True, exclude_none=True)
+        timings.append(time.perf_counter() - started)
+        size = len(body)
+        assert not result.root.isError, body[:300]
+    return {"ms": statistics.median(timings) * 1000, "bytes": size}
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=5000)
+    parser.add_argument("--attributes", type=int, default=500)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = build_page(args.rows)
+    attributes = build_attributes(args.attributes)
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        body = attributes if request.url.path.startswith("/api/attributes/") else page
+        return httpx.Response(200, content=body)
+
+    registry = ClientRegistry({"bench": BackendConfig("bench", "http://bench/api")})
+    registry.register_client("bench", DimetricsAPIClient(
+        "http://bench/api", api_key="benchmark", transport=httpx.MockTransport(handler)
+    ))
+    server.client_registry = registry
+
+    cases = [
+        ("list_generic_entries", {"resource_name": "bench", "page_size": args.rows}),
+        ("list_attributes", {"resource_name": "bench", "page_size": args.attributes}),
+        ("get_client_metrics", {}),
+    ]
+    modes = [
+        ("Standard, verbose", False, True),
+        ("Standard", False, False),
+        (f"schnell ({JSON_BACKEND})", True, False),
+    ]
+
+    print(f"{'Tool':<22} {'Pfad':<20} {'ms/Aufruf':>10} {'Bytes':>12}")
+    for name, arguments in cases:
+        for label, fast_json, verbose in modes:
+            if verbose and name != "list_generic_entries":
+                continue
+            server.mcp.fast_json = fast_json
+            # Tool-Definitionen (mit/ohne Output-Schema) neu laden
+            server.mcp._mcp_server._tool_cache.clear()
+            result = await call(name, dict(arguments, verbose=True) if verbose else arguments, args.repeat)
+            print(f"{name:<22} {label:<20} {result['ms']:>10.2f} {result['bytes']:>12,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
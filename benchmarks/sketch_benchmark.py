@@ -0,0 +1,83 @@
+"""
+Benchmark: Genauigkeit, Speicher und Durchsatz der Sketches gegen exakte Werte.
+
+Erzeugt synthetische Läufe (Pace normalverteilt, Schuhe Zipf-verteilt,
+Strecken gleichverteilt) und vergleicht count_distinct, Median/Perzentile
+und Top-k aus SketchAggregation mit den exakt berechneten Werten.
+
+    python benchmarks/sketch_benchmark.py --rows 1000000
+"""
+
+import argparse
+import collections
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dimetrics_mcp_server.sketches import SketchAggregation  # noqa: E402
+
+
+def generate(rows: int, seed: int):
+    rng = random.Random(seed)
+    for i in range(rows):
+        yield {
+            "object_id": f"{i:032x}",
+            "pace": round(rng.gauss(5.5, 0.8), 3),
+            "shoe": f"shoe-{int(rng.paretovariate(1.1))}",
+            "route": f"route-{rng.randrange(rows // 4 or 1)}"
+        }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--page-size", type=int, default=2000)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    aggregation = SketchAggregation(
+        [("count_distinct", "route"), ("count_distinct", "shoe"), ("percentiles", "pace"), ("top_k", "shoe")],
+        percentiles=(0.01, 0.5, 0.99),
+        top_k=5
+    )
+    paces, routes, shoes = [], set(), collections.Counter()
+    page = []
+    sketch_seconds = 0.0
+    for row in generate(args.rows, args.seed):
+        paces.append(row["pace"])
+        routes.add(row["route"])
+        shoes[row["shoe"]] += 1
+        page.append(row)
+        if len(page) == args.page_size:
+            started = time.perf_counter()
+            aggregation.add_rows(page)
+            sketch_seconds += time.perf_counter() - started
+            page = []
+    started = time.perf_counter()
+    aggregation.add_rows(page)
+    result = aggregation.result()
+    sketch_seconds += time.perf_counter() - started
+    values = result["values"]
+
+    paces.sort()
+    print(f"{args.rows:,} Zeilen, {aggregation.rows / sketch_seconds:,.0f} Zeilen/s, Sketches {aggregation.memory_bytes / 1024:.0f} KB")
+    print(f"{'Kennzahl':<24} {'exakt':>14} {'Sketch':>14} {'Abweichung':>11}")
+    for label, exact, estimate in (
+        ("count_distinct(route)", len(routes), values["count_distinct_route"]),
+        ("count_distinct(shoe)", len(shoes), values["count_distinct_shoe"]),
+    ):
+        print(f"{label:<24} {exact:>14,} {estimate:>14,} {(estimate - exact) / exact:>10.2%}")
+    for q in (0.01, 0.5, 0.99):
+        exact = paces[min(len(paces) - 1, int(q * len(paces)))]
+        estimate = values["percentiles_pace"][f"p{q * 100:g}"]
+        print(f"{f'p{q * 100:g}(pace)':<24} {exact:>14.3f} {estimate:>14.3f} {(estimate - exact) / exact:>10.2%}")
+    exact_top = [value for value, _ in shoes.most_common(5)]
+    sketch_top = [item["value"] for item in values["top_k_shoe"]]
+    print(f"{'top_k(shoe)':<24} {'ok' if exact_top == sketch_top else 'abweichend':>14}")
+
+
+if __name__ == "__main__":
+    main()
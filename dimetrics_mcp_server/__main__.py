@@ -6,13 +6,31 @@ import asyncio
 import json
 import logging
 import os
-from typing import Dict, Any
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict
 from dotenv import load_dotenv
 
-# FastMCP Import
-from mcp.server.fastmcp import FastMCP
-
 from .api_client import DimetricsAPIClient
+from .app_builder import AppBuilder, AppBuildError
+from .backends import ClientRegistry, token_fingerprint
+from .bulk_import import ResourceImporter
+from .columnar import ColumnarStore
+from .federation import federated_query as run_federated_query
+from .jobs import JobManager, describe_job
+from .loop_monitor import loop_monitor
+from .mirror import ResourceMirror
+from .models import APP, ATTRIBUTE, CATEGORY, RESOURCE, SERVICE
+from .partitioning import partitioned_export
+from .prefetch import PagePrefetcher
+from .profiling import ProfileCache
+from .results import PREVIEW_ROWS, RESULT_INLINE_BYTES, ResultStore, StoredResult, encode_rows
+from .schema_export import export_app_schema, import_app_schema
+from .schema_sync import SchemaApplier, plan_schema_changes
+from .serialization import FastJSONMCP
+from .sketches import SketchAggregation, normalize_sketch_spec, sketch_aggregate
+from .upsert import upsert_entries
+from .views import MaterializedViews, normalize_spec
 
 # Lade Umgebungsvariablen
 load_dotenv()
@@ -21,23 +39,46 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Globaler API Client
-api_client: DimetricsAPIClient = None
+# Registry der API Clients (ein Client mit eigenem Pool, Cache und Rate-Limit pro Backend)
+client_registry: ClientRegistry = None
+
+# Globaler Job-Manager für lang laufende Operationen
+job_manager: JobManager = None
+
+# Lokale Spiegel von Resources (pro Backend und Mandant: SQLite-Datei bzw. Spalten-Verzeichnis)
+resource_mirrors: Dict[str, ResourceMirror] = {}
+columnar_stores: Dict[str, ColumnarStore] = {}
+materialized_views: Dict[str, MaterializedViews] = {}
+
+# Spekulatives Vorladen der Folgeseite bei list_generic_entries (DIMETRICS_PREFETCH=true)
+page_prefetcher: PagePrefetcher = None
 
-# FastMCP Server erstellen
-mcp = FastMCP("Dimetrics MCP Server")
+# Server-seitig abgelegte große Ergebnisse (Result-Handles)
+result_store: ResultStore = None
+
+# Spaltenprofile pro Resource, gültig bis sich ihr Wasserstand ändert
+profile_cache: ProfileCache = None
+
+# FastMCP Server erstellen (DIMETRICS_FAST_JSON=true: kompakte Tool-Ausgabe ohne structuredContent)
+mcp = FastJSONMCP("Dimetrics MCP Server", fast_json=os.getenv("DIMETRICS_FAST_JSON", "false").lower() == "true")
 
 @mcp.tool()
-async def health_check() -> Dict[str, Any]:
-    """Health Check für den MCP Server."""
+async def health_check(backend: str = "") -> Dict[str, Any]:
+    """
+    Health Check für den MCP Server.
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         # Einfacher API-Test
         return {
             "status": "healthy",
             "message": "MCP Server läuft und API-Verbindung ist verfügbar",
             "timestamp": str(asyncio.get_event_loop().time()),
-            "api_configured": bool(client)
+            "api_configured": bool(client),
+            "backend": client.name
         }
     except Exception as e:
         return {
@@ -46,28 +87,294 @@ async def health_check() -> Dict[str, Any]:
             "message": "MCP Server läuft, aber API-Verbindung fehlgeschlagen"
         }
 
-async def get_api_client() -> DimetricsAPIClient:
-    """Gibt den konfigurierten API Client zurück."""
-    global api_client
+@mcp.tool()
+async def list_backends() -> Dict[str, Any]:
+    """
+    Listet die konfigurierten Backends (z.B. dimetrics, werkportal, ppmc).
     
-    if api_client is None:
-        base_url = os.getenv("DIMETRICS_API_URL", "https://app.dimetrics.io/api")
-        api_key = os.getenv("DIMETRICS_API_KEY")
-        session_cookie = os.getenv("DIMETRICS_SESSION_COOKIE")
+    Returns:
+        Name, API-URL, Auth-Art und Limits pro Backend (ohne Zugangsdaten)
+        sowie das Standard-Backend
+        
+    Hinweis: Jedes Tool akzeptiert den Parameter backend; leer = Standard-Backend.
+    """
+    try:
+        registry = get_client_registry()
+        active = registry.active_clients()
+        backends = []
+        for name, config in registry.configs.items():
+            info = config.describe()
+            info["default"] = name == registry.default
+            info["connected"] = name in active
+            backends.append(info)
         
-        if not api_key and not session_cookie:
-            logger.warning("Keine Authentifizierung konfiguriert - verwende Mock-Modus")
+        return {
+            "success": True,
+            "backends": backends,
+            "default": registry.default,
+            "count": len(backends),
+            "tenant_pool": registry.tenant_pool.describe()
+        }
         
-        api_client = DimetricsAPIClient(
-            base_url=base_url,
-            api_key=api_key,
-            session_cookie=session_cookie
+    except Exception as e:
+        logger.error(f"Fehler beim Auflisten der Backends: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Auflisten der Backends"
+        }
+
+def get_client_registry() -> ClientRegistry:
+    """Gibt die Registry der Backend-Clients zurück (aus Umgebung/Konfigurationsdatei)."""
+    global client_registry
+    
+    if client_registry is None:
+        client_registry = ClientRegistry.from_env()
+        logger.info(f"Konfigurierte Backends: {', '.join(client_registry.names)} (Standard: {client_registry.default})")
+    
+    return client_registry
+
+def get_session_token() -> str | None:
+    """
+    API-Token des Mandanten der aktuellen MCP-Session.
+    
+    Bei HTTP-Transports (SSE/Streamable HTTP) kann jeder Client eigene
+    Zugangsdaten per Header "X-Dimetrics-Token: <key>" oder
+    "Authorization: Token <key>" mitsenden. Ohne Header (und bei stdio)
+    gelten die konfigurierten Zugangsdaten des Backends.
+    """
+    try:
+        request = mcp.get_context().request_context.request
+    except (LookupError, ValueError):
+        return None
+    headers = getattr(request, "headers", None)
+    if not headers:
+        return None
+    
+    token = headers.get("x-dimetrics-token")
+    if token:
+        return token.strip()
+    scheme, _, credentials = headers.get("authorization", "").partition(" ")
+    if scheme.lower() == "token" and credentials.strip():
+        return credentials.strip()
+    return None
+
+async def get_api_client(backend: str = "") -> DimetricsAPIClient:
+    """
+    Gibt den API Client eines Backends zurück (pro Mandant, falls die Session ein Token mitsendet).
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend)
+    
+    Raises:
+        ValueError: wenn das Backend nicht konfiguriert ist
+    """
+    loop_monitor.ensure_started()
+    return get_client_registry().get(backend, token=get_session_token())
+
+def get_session_key() -> str:
+    """
+    Schlüssel der aktuellen MCP-Session für session-lokale Caches.
+    
+    Bei Streamable HTTP die mcp-session-id, sonst das Mandanten-Token;
+    ohne beides (z.B. stdio mit einer Session pro Prozess) "local".
+    """
+    try:
+        request = mcp.get_context().request_context.request
+    except (LookupError, ValueError):
+        request = None
+    headers = getattr(request, "headers", None)
+    session_id = headers.get("mcp-session-id") if headers else None
+    if session_id:
+        return f"session:{session_id}"
+    token = get_session_token()
+    return f"tenant:{token_fingerprint(token)}" if token else "local"
+
+def _multi_worker() -> bool:
+    """
+    Ob Requests einer Session bei verschiedenen Worker-Prozessen landen können
+    (MCP_WORKERS > 1 oder zustandslose Sessions, siehe http_server).
+    """
+    return int(os.getenv("MCP_WORKERS", "1")) > 1 or mcp.settings.stateless_http
+
+def get_page_prefetcher() -> PagePrefetcher | None:
+    """
+    Gibt den Prefetcher für Folgeseiten zurück (None, wenn DIMETRICS_PREFETCH
+    nicht aktiv ist oder mehrere Worker die Requests bedienen).
+    
+    Vorgeladene Seiten liegen im Prozess: landet die nächste Anfrage der
+    Session bei einem anderen Worker, wäre jede Folgeseite doppelt geladen.
+    """
+    global page_prefetcher
+    
+    if page_prefetcher is None and os.getenv("DIMETRICS_PREFETCH", "false").lower() == "true":
+        if _multi_worker():
+            return None
+        page_prefetcher = PagePrefetcher()
+        get_client_registry().invalidation_listeners.append(_invalidate_prefetched)
+    return page_prefetcher
+
+def _invalidate_prefetched(backend: str, scope: str, key: str | None) -> None:
+    """Verwirft vorgeladene Seiten einer Resource, sobald Einträge darin geschrieben werden."""
+    if scope == "entry" and page_prefetcher is not None:
+        page_prefetcher.invalidate((backend, key.partition("/")[0]) if key else None)
+
+async def _fetch_page(
+    client: DimetricsAPIClient,
+    query: Dict[str, Any],
+    position: Any,
+    load: Callable[[Any], Awaitable[Dict[str, Any]]],
+    next_position: Callable[[Dict[str, Any]], Any] | None
+) -> Dict[str, Any]:
+    """
+    Lädt eine Seite für list_generic_entries.
+    
+    Mit aktivem Prefetcher kommt sie aus dem Vorladen der vorherigen
+    Anfrage derselben Session, und die Folgeseite wird im Hintergrund geladen.
+    """
+    prefetcher = get_page_prefetcher()
+    if prefetcher is None or next_position is None:
+        return await load(position)
+    stream = (client.name, json.dumps(query, sort_keys=True, default=str))
+    return await prefetcher.fetch(
+        get_session_key(), stream, position, load, next_position, resource=(client.name, query["resource_name"])
+    )
+
+def get_result_store() -> ResultStore:
+    """Gibt die Ablage für Result-Handles zurück."""
+    global result_store
+    
+    if result_store is None:
+        # Mit mehreren Workern muss jeder Worker die Handles der anderen lesen können
+        result_store = ResultStore(
+            os.getenv("DIMETRICS_RESULT_DIR", os.path.join("logs", "results")),
+            shared=_multi_worker()
         )
+    return result_store
+
+def get_profile_cache() -> ProfileCache:
+    """Gibt den Cache der Spaltenprofile zurück."""
+    global profile_cache
+    
+    if profile_cache is None:
+        profile_cache = ProfileCache()
+    return profile_cache
+
+def _session_tenant() -> str:
+    """
+    Mandant der Session (Fingerabdruck des Tokens, leer ohne Token).
     
-    return api_client
+    Result-Handles, Profile und Jobs sind nur für ihren Mandanten sichtbar.
+    """
+    token = get_session_token()
+    return token_fingerprint(token) if token else ""
+
+async def _store_result(
+    rows: list,
+    source: Dict[str, Any],
+    force: bool = False
+) -> StoredResult | None:
+    """
+    Legt Zeilen als Result-Handle ab, wenn force gesetzt ist oder sie
+    größer als DIMETRICS_RESULT_INLINE_BYTES sind; sonst None.
+    """
+    lines = await asyncio.to_thread(encode_rows, rows)
+    if not force and sum(len(line) for line in lines) <= RESULT_INLINE_BYTES:
+        return None
+    store = get_result_store()
+    return await asyncio.to_thread(store.put, rows, source, _session_tenant(), lines)
+
+def _mirror_path(backend: str) -> str:
+    """
+    Dateiname (ohne Endung) der lokalen Spiegel eines Backends.
+    
+    Sendet die Session ein Mandanten-Token, erhält der Mandant eigene
+    Dateien, damit Abfragen nur Daten sehen, die sein Token lesen darf.
+    """
+    registry = get_client_registry()
+    name = backend or registry.default
+    token = get_session_token()
+    key = f"{name}-{token_fingerprint(token)}" if token else name
+    directory = os.getenv("DIMETRICS_MIRROR_DIR", os.path.join("logs", "mirrors"))
+    return os.path.join(directory, re.sub(r"[^A-Za-z0-9_-]", "_", key))
+
+def _file_path(file_path: str, create_dirs: bool = False) -> str:
+    """
+    Pfad einer Import-/Exportdatei innerhalb von DIMETRICS_FILE_DIR.
+    
+    Relative Pfade gelten relativ zu diesem Verzeichnis. Pfade, die (auch
+    über '..' oder Symlinks) außerhalb liegen, werden abgelehnt. Sendet die
+    Session ein Mandanten-Token, erhält der Mandant ein eigenes
+    Unterverzeichnis.
+    
+    Raises:
+        ValueError: wenn der Pfad außerhalb des Dateiverzeichnisses liegt
+    """
+    directory = os.getenv("DIMETRICS_FILE_DIR", os.path.join("logs", "files"))
+    tenant = _session_tenant()
+    if tenant:
+        directory = os.path.join(directory, tenant)
+    root = os.path.realpath(directory)
+    path = os.path.realpath(os.path.join(root, file_path))
+    if not file_path.strip() or path == root or os.path.commonpath([root, path]) != root:
+        raise ValueError(f"Dateipfad '{file_path}' liegt außerhalb des Dateiverzeichnisses (DIMETRICS_FILE_DIR)")
+    if create_dirs:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+def get_resource_mirror(backend: str = "") -> ResourceMirror:
+    """Gibt den SQL-Spiegel (SQLite) eines Backends zurück."""
+    path = _mirror_path(backend) + ".sqlite3"
+    mirror = resource_mirrors.get(path)
+    if mirror is None:
+        mirror = resource_mirrors[path] = ResourceMirror(path)
+    return mirror
+
+def get_columnar_store(backend: str = "") -> ColumnarStore:
+    """Gibt den spaltenorientierten Spiegel eines Backends zurück."""
+    path = _mirror_path(backend) + ".columnar"
+    store = columnar_stores.get(path)
+    if store is None:
+        store = columnar_stores[path] = ColumnarStore(path)
+    return store
+
+def get_materialized_views(backend: str = "") -> MaterializedViews:
+    """Gibt die materialisierten Sichten eines Backends zurück."""
+    path = _mirror_path(backend) + ".views.sqlite3"
+    views = materialized_views.get(path)
+    if views is None:
+        views = materialized_views[path] = MaterializedViews(path)
+    return views
+
+def get_job_manager() -> JobManager:
+    """Gibt den Job-Manager zurück und registriert die als Job ausführbaren Tools."""
+    global job_manager
+    
+    if job_manager is None:
+        db_path = os.getenv("DIMETRICS_JOBS_DB", os.path.join("logs", "dimetrics_jobs.sqlite3"))
+        workers = int(os.getenv("DIMETRICS_JOB_WORKERS", "2"))
+        job_manager = JobManager(db_path=db_path, workers=workers)
+        
+        # import_resource setzt über seinen Checkpoint fort und darf nach einem Neustart wieder anlaufen
+        job_manager.register("import_resource", import_resource, resumable=True)
+        job_manager.register("upsert_generic_entries", upsert_generic_entries)
+        job_manager.register("list_generic_entries", list_generic_entries)
+        job_manager.register("sync_resource_mirror", sync_resource_mirror)
+        job_manager.register("sync_columnar_mirror", sync_columnar_mirror)
+        job_manager.register("export_resource", export_resource)
+        job_manager.register("approximate_aggregate", approximate_aggregate)
+        job_manager.register("profile_resource", profile_resource)
+        job_manager.register("refresh_materialized_view", refresh_materialized_view)
+        job_manager.register("create_attributes_bulk", create_attributes_bulk)
+        job_manager.register("create_complete_app", create_complete_app)
+        job_manager.register("apply_schema", apply_schema)
+        job_manager.register("import_schema", import_schema)
+        job_manager.register("clone_app_schema", clone_app_schema)
+    
+    return job_manager
 
 @mcp.tool()
-async def create_app(name: str, description: str = "", prefix: str = "") -> Dict[str, Any]:
+async def create_app(name: str, description: str = "", prefix: str = "", backend: str = "") -> Dict[str, Any]:
     """
     Erstellt eine neue App (Service) in Dimetrics.
     
@@ -75,26 +382,19 @@ async def create_app(name: str, description: str = "", prefix: str = "") -> Dict
         name: Name der App
         description: Beschreibung der App
         prefix: Prefix für die App (optional, wird automatisch generiert wenn leer)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Erstellte App-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.create_app(name=name, description=description, prefix=prefix)
         
         return {
             "success": True,
             "message": f"App '{name}' erfolgreich erstellt",
-            "app": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "prefix": result.get("prefix"),
-                "description": result.get("description"),
-                "icon": result.get("icon"),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "app": APP.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Erstellen der App: {e}")
@@ -109,7 +409,8 @@ async def list_apps(
     search: str = "", 
     page_size: int = 0, 
     page: int = 0, 
-    limit: int = 0
+    limit: int = 0,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Listet alle verfügbaren Apps auf mit erweiterten Filteroptionen.
@@ -119,12 +420,13 @@ async def list_apps(
         page_size: Anzahl der Ergebnisse pro Seite (0 = Standard)
         page: Seitennummer (0 = keine Pagination)
         limit: Maximale Anzahl der Ergebnisse (0 = kein Limit)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Liste aller Apps mit Pagination-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         
         # Parameter nur setzen wenn sie nicht 0 sind
         kwargs = {}
@@ -144,19 +446,7 @@ async def list_apps(
             "count": result.get("count", 0),
             "next": result.get("next"),
             "previous": result.get("previous"),
-            "apps": [
-                {
-                    "object_id": app.get("object_id"),
-                    "name": app.get("name"),
-                    "prefix": app.get("prefix"),
-                    "description": app.get("description", ""),
-                    "icon": app.get("icon"),
-                    "subscription": app.get("subscription", {}),
-                    "ingest_timestamp": app.get("ingest_timestamp"),
-                    "update_timestamp": app.get("update_timestamp")
-                }
-                for app in result.get("results", [])
-            ]
+            "apps": APP.page(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Auflisten der Apps: {e}")
@@ -167,32 +457,24 @@ async def list_apps(
         }
 
 @mcp.tool()
-async def get_app_details(object_id: str) -> Dict[str, Any]:
+async def get_app_details(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Holt Details einer spezifischen App.
     
     Args:
         object_id: object_id der App (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         App-Details
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         app = await client.get_service(object_id)
         
         return {
             "success": True,
-            "app": {
-                "object_id": app.get("object_id"),
-                "name": app.get("name"),
-                "prefix": app.get("prefix"),
-                "description": app.get("description", ""),
-                "icon": app.get("icon"),
-                "ingest_timestamp": app.get("ingest_timestamp"),
-                "update_timestamp": app.get("update_timestamp"),
-                "subscription": app.get("subscription", {})
-            }
+            "app": APP.project(app)
         }
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der App-Details: {e}")
@@ -203,18 +485,19 @@ async def get_app_details(object_id: str) -> Dict[str, Any]:
         }
 
 @mcp.tool()
-async def delete_app(object_id: str) -> Dict[str, Any]:
+async def delete_app(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Löscht eine App.
     
     Args:
         object_id: object_id der zu löschenden App (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Löschstatus
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         success = await client.delete_service(object_id)
         
         return {
@@ -234,7 +517,8 @@ async def update_app(
     object_id: str, 
     name: str = None, 
     description: str = None, 
-    prefix: str = None
+    prefix: str = None,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Aktualisiert eine bestehende App.
@@ -244,12 +528,13 @@ async def update_app(
         name: Neuer Name der App (optional)
         description: Neue Beschreibung der App (optional)
         prefix: Neuer Prefix der App (optional, max 5 Zeichen)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Aktualisierte App-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.update_service(
             app_id=object_id,
             name=name,
@@ -260,16 +545,7 @@ async def update_app(
         return {
             "success": True,
             "message": f"App '{object_id}' erfolgreich aktualisiert",
-            "app": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "prefix": result.get("prefix"),
-                "description": result.get("description"),
-                "icon": result.get("icon"),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp"),
-                "subscription": result.get("subscription", {})
-            }
+            "app": APP.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Aktualisieren der App: {e}")
@@ -281,7 +557,7 @@ async def update_app(
 
 # Categories Tools
 @mcp.tool()
-async def create_category(name: str, description: str = "", prefix: str = "") -> Dict[str, Any]:
+async def create_category(name: str, description: str = "", prefix: str = "", backend: str = "") -> Dict[str, Any]:
     """
     Erstellt eine neue Category in Dimetrics.
     
@@ -289,26 +565,19 @@ async def create_category(name: str, description: str = "", prefix: str = "") ->
         name: Name der Category
         description: Beschreibung der Category
         prefix: Prefix für die Category (optional, wird automatisch generiert wenn leer)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Erstellte Category-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.create_category(name=name, description=description, prefix=prefix)
         
         return {
             "success": True,
             "message": f"Category '{name}' erfolgreich erstellt",
-            "category": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "prefix": result.get("prefix"),
-                "description": result.get("description"),
-                "icon": result.get("icon"),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "category": CATEGORY.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Erstellen der Category: {e}")
@@ -323,7 +592,8 @@ async def list_categories(
     search: str = "", 
     page_size: int = 0, 
     page: int = 0, 
-    limit: int = 0
+    limit: int = 0,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Listet alle verfügbaren Categories auf mit erweiterten Filteroptionen.
@@ -333,12 +603,13 @@ async def list_categories(
         page_size: Anzahl der Ergebnisse pro Seite (0 = Standard)
         page: Seitennummer (0 = keine Pagination)
         limit: Maximale Anzahl der Ergebnisse (0 = kein Limit)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Liste aller Categories mit Pagination-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         
         # Parameter nur setzen wenn sie nicht 0 sind
         kwargs = {}
@@ -358,19 +629,7 @@ async def list_categories(
             "count": result.get("count", 0),
             "next": result.get("next"),
             "previous": result.get("previous"),
-            "categories": [
-                {
-                    "object_id": category.get("object_id"),
-                    "name": category.get("name"),
-                    "prefix": category.get("prefix"),
-                    "description": category.get("description", ""),
-                    "icon": category.get("icon"),
-                    "subscription": category.get("subscription", {}),
-                    "ingest_timestamp": category.get("ingest_timestamp"),
-                    "update_timestamp": category.get("update_timestamp")
-                }
-                for category in result.get("results", [])
-            ]
+            "categories": CATEGORY.page(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Auflisten der Categories: {e}")
@@ -381,32 +640,24 @@ async def list_categories(
         }
 
 @mcp.tool()
-async def get_category_details(object_id: str) -> Dict[str, Any]:
+async def get_category_details(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Holt Details einer spezifischen Category.
     
     Args:
         object_id: object_id der Category (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Category-Details
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         category = await client.get_category(object_id)
         
         return {
             "success": True,
-            "category": {
-                "object_id": category.get("object_id"),
-                "name": category.get("name"),
-                "prefix": category.get("prefix"),
-                "description": category.get("description", ""),
-                "icon": category.get("icon"),
-                "ingest_timestamp": category.get("ingest_timestamp"),
-                "update_timestamp": category.get("update_timestamp"),
-                "subscription": category.get("subscription", {})
-            }
+            "category": CATEGORY.project(category)
         }
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Category-Details: {e}")
@@ -421,7 +672,8 @@ async def update_category(
     object_id: str, 
     name: str = None, 
     description: str = None, 
-    prefix: str = None
+    prefix: str = None,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Aktualisiert eine bestehende Category.
@@ -431,12 +683,13 @@ async def update_category(
         name: Neuer Name der Category (optional)
         description: Neue Beschreibung der Category (optional)
         prefix: Neuer Prefix der Category (optional, max 5 Zeichen)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Aktualisierte Category-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.update_category(
             category_id=object_id,
             name=name,
@@ -447,16 +700,7 @@ async def update_category(
         return {
             "success": True,
             "message": f"Category '{object_id}' erfolgreich aktualisiert",
-            "category": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "prefix": result.get("prefix"),
-                "description": result.get("description"),
-                "icon": result.get("icon"),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp"),
-                "subscription": result.get("subscription", {})
-            }
+            "category": CATEGORY.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Aktualisieren der Category: {e}")
@@ -467,18 +711,19 @@ async def update_category(
         }
 
 @mcp.tool()
-async def delete_category(object_id: str) -> Dict[str, Any]:
+async def delete_category(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Löscht eine Category.
     
     Args:
         object_id: object_id der zu löschenden Category (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Löschstatus
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         success = await client.delete_category(object_id)
         
         return {
@@ -504,7 +749,8 @@ async def create_service(
     icon: str = "DataBarHorizontal24Regular",
     order: int = 0,
     hidden: bool = False,
-    isFavorite: bool = False
+    isFavorite: bool = False,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Erstellt einen neuen Service in Dimetrics.
@@ -519,12 +765,13 @@ async def create_service(
         order: Reihenfolge/Sortierung (default: 0)
         hidden: Ob der Service versteckt ist (default: False)
         isFavorite: Ob der Service als Favorit markiert ist (default: False)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Erstellte Service-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.create_service_endpoint(
             name=name,
             app_space=app_space,
@@ -540,21 +787,7 @@ async def create_service(
         return {
             "success": True,
             "message": f"Service '{name}' erfolgreich erstellt",
-            "service": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "title": result.get("title"),
-                "description": result.get("description"),
-                "app_space": result.get("app_space"),
-                "category": result.get("category"),
-                "icon": result.get("icon"),
-                "order": result.get("order"),
-                "hidden": result.get("hidden"),
-                "isFavorite": result.get("isFavorite"),
-                "nested_resources": result.get("nested_resources", []),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "service": SERVICE.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Erstellen des Services: {e}")
@@ -569,7 +802,8 @@ async def list_services(
     search: str = "", 
     page_size: int = 0, 
     page: int = 0, 
-    limit: int = 0
+    limit: int = 0,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Listet alle verfügbaren Services auf mit erweiterten Filteroptionen.
@@ -579,12 +813,13 @@ async def list_services(
         page_size: Anzahl der Ergebnisse pro Seite (0 = Standard)
         page: Seitennummer (0 = keine Pagination)
         limit: Maximale Anzahl der Ergebnisse (0 = kein Limit)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Liste aller Services mit Pagination-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         
         # Parameter nur setzen wenn sie nicht 0 sind
         kwargs = {}
@@ -604,25 +839,7 @@ async def list_services(
             "count": result.get("count", 0),
             "next": result.get("next"),
             "previous": result.get("previous"),
-            "services": [
-                {
-                    "object_id": service.get("object_id"),
-                    "name": service.get("name"),
-                    "title": service.get("title"),
-                    "description": service.get("description", ""),
-                    "app_space": service.get("app_space"),
-                    "category": service.get("category"),
-                    "icon": service.get("icon"),
-                    "order": service.get("order"),
-                    "hidden": service.get("hidden"),
-                    "isFavorite": service.get("isFavorite"),
-                    "nested_resources": service.get("nested_resources", []),
-                    "subscription": service.get("subscription", {}),
-                    "ingest_timestamp": service.get("ingest_timestamp"),
-                    "update_timestamp": service.get("update_timestamp")
-                }
-                for service in result.get("results", [])
-            ]
+            "services": SERVICE.page(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Auflisten der Services: {e}")
@@ -633,38 +850,24 @@ async def list_services(
         }
 
 @mcp.tool()
-async def get_service_details(object_id: str) -> Dict[str, Any]:
+async def get_service_details(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Holt Details eines spezifischen Services.
     
     Args:
         object_id: object_id des Services (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Service-Details
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         service = await client.get_service_endpoint(object_id)
         
         return {
             "success": True,
-            "service": {
-                "object_id": service.get("object_id"),
-                "name": service.get("name"),
-                "title": service.get("title"),
-                "description": service.get("description", ""),
-                "app_space": service.get("app_space"),
-                "category": service.get("category"),
-                "icon": service.get("icon"),
-                "order": service.get("order"),
-                "hidden": service.get("hidden"),
-                "isFavorite": service.get("isFavorite"),
-                "nested_resources": service.get("nested_resources", []),
-                "subscription": service.get("subscription", {}),
-                "ingest_timestamp": service.get("ingest_timestamp"),
-                "update_timestamp": service.get("update_timestamp")
-            }
+            "service": SERVICE.project(service)
         }
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Service-Details: {e}")
@@ -685,7 +888,8 @@ async def update_service(
     icon: str = None,
     order: int = None,
     hidden: bool = None,
-    isFavorite: bool = None
+    isFavorite: bool = None,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Aktualisiert einen bestehenden Service.
@@ -701,12 +905,13 @@ async def update_service(
         order: Neue Reihenfolge (optional)
         hidden: Neuer Hidden Status (optional)
         isFavorite: Neuer Favorite Status (optional)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Aktualisierte Service-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.update_service_endpoint(
             service_id=object_id,
             name=name,
@@ -723,22 +928,7 @@ async def update_service(
         return {
             "success": True,
             "message": f"Service '{object_id}' erfolgreich aktualisiert",
-            "service": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "title": result.get("title"),
-                "description": result.get("description"),
-                "app_space": result.get("app_space"),
-                "category": result.get("category"),
-                "icon": result.get("icon"),
-                "order": result.get("order"),
-                "hidden": result.get("hidden"),
-                "isFavorite": result.get("isFavorite"),
-                "nested_resources": result.get("nested_resources", []),
-                "subscription": result.get("subscription", {}),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "service": SERVICE.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Aktualisieren des Services: {e}")
@@ -749,18 +939,19 @@ async def update_service(
         }
 
 @mcp.tool()
-async def delete_service(object_id: str) -> Dict[str, Any]:
+async def delete_service(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Löscht einen Service.
     
     Args:
         object_id: object_id des zu löschenden Services (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Löschstatus
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         success = await client.delete_service_endpoint(object_id)
         
         return {
@@ -780,11 +971,17 @@ async def delete_service(object_id: str) -> Dict[str, Any]:
 async def list_resource_permission_groups(
     page_size: int = 50,
     page: int = 1,
-    filters_json: str = ""
+    filters_json: str = "",
+    backend: str = ""
 ) -> Dict[str, Any]:
-    """Listet Resource-Permission-Gruppen auf."""
+    """
+    Listet Resource-Permission-Gruppen auf.
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
 
         filters: Dict[str, Any] | None = None
         if filters_json:
@@ -818,8 +1015,13 @@ async def list_resource_permission_groups(
 
 
 @mcp.tool()
-async def get_resource_permission_group(group_id: str) -> Dict[str, Any]:
-    """Holt Details einer Resource-Permission-Gruppe."""
+async def get_resource_permission_group(group_id: str, backend: str = "") -> Dict[str, Any]:
+    """
+    Holt Details einer Resource-Permission-Gruppe.
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    """
     try:
         if not group_id:
             return {
@@ -827,7 +1029,7 @@ async def get_resource_permission_group(group_id: str) -> Dict[str, Any]:
                 "error": "group_id ist erforderlich"
             }
 
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.get_resource_permission_group(group_id)
 
         return {
@@ -857,9 +1059,15 @@ async def create_resource_permission_group(
     can_delete_resource: bool = False,
     hidden_attributes_json: str = "",
     custom_filter_json: str = "",
-    extra_fields_json: str = ""
+    extra_fields_json: str = "",
+    backend: str = ""
 ) -> Dict[str, Any]:
-    """Erstellt eine neue Resource-Permission-Gruppe."""
+    """
+    Erstellt eine neue Resource-Permission-Gruppe.
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    """
     try:
         if not all([name, resource, subscription]):
             return {
@@ -882,7 +1090,7 @@ async def create_resource_permission_group(
         custom_filter = _parse_json(custom_filter_json, dict, "custom_filter_json")
         extra_fields = _parse_json(extra_fields_json, dict, "extra_fields_json")
 
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.create_resource_permission_group(
             name=name,
             resource=resource,
@@ -921,9 +1129,15 @@ async def create_resource_permission_group(
 @mcp.tool()
 async def update_resource_permission_group(
     group_id: str,
-    fields_json: str
+    fields_json: str,
+    backend: str = ""
 ) -> Dict[str, Any]:
-    """Aktualisiert eine Resource-Permission-Gruppe (PATCH)."""
+    """
+    Aktualisiert eine Resource-Permission-Gruppe (PATCH).
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    """
     try:
         if not group_id:
             return {
@@ -951,7 +1165,7 @@ async def update_resource_permission_group(
                 "error": "fields_json muss ein nicht-leeres Objekt sein"
             }
 
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.update_resource_permission_group(group_id, **fields)
 
         return {
@@ -991,7 +1205,8 @@ async def create_resource(
     table_sort_default_direction: str = "-",
     custom_filter: str = "",
     quick_filters: str = "[]",
-    attribute_order: str = "[]"
+    attribute_order: str = "[]",
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Erstellt eine neue Resource in Dimetrics.
@@ -1019,12 +1234,13 @@ async def create_resource(
         custom_filter: Custom Filter (optional)
         quick_filters: Quick Filters JSON (default: [])
         attribute_order: Attribut-Reihenfolge JSON (default: [])
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Erstellte Resource-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.create_resource_endpoint(
             name=name,
             service=service,
@@ -1048,26 +1264,7 @@ async def create_resource(
         return {
             "success": True,
             "message": f"Resource '{name}' erfolgreich erstellt",
-            "resource": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "title": result.get("title"),
-                "title_plural": result.get("title_plural"),
-                "description": result.get("description"),
-                "service": result.get("service"),
-                "icon": result.get("icon"),
-                "form_layout_type": result.get("form_layout_type"),
-                "meta_attributes_enabled": result.get("meta_attributes_enabled"),
-                "primary_key_name": result.get("primary_key_name"),
-                "primary_key_type": result.get("primary_key_type"),
-                "table_type": result.get("table_type"),
-                "default_page_size": result.get("default_page_size"),
-                "is_table_pagination": result.get("is_table_pagination"),
-                "is_table_flex": result.get("is_table_flex"),
-                "allow_table_inline_edit": result.get("allow_table_inline_edit"),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "resource": RESOURCE.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Erstellen der Resource: {e}")
@@ -1082,7 +1279,8 @@ async def list_resources(
     search: str = "", 
     page_size: int = 0, 
     page: int = 0, 
-    limit: int = 0
+    limit: int = 0,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Listet alle verfügbaren Resources auf mit erweiterten Filteroptionen.
@@ -1092,12 +1290,13 @@ async def list_resources(
         page_size: Anzahl der Ergebnisse pro Seite (0 = Standard)
         page: Seitennummer (0 = keine Pagination)
         limit: Maximale Anzahl der Ergebnisse (0 = kein Limit)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Liste aller Resources mit Pagination-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         
         # Parameter nur setzen wenn sie nicht 0 sind
         kwargs = {}
@@ -1117,23 +1316,7 @@ async def list_resources(
             "count": result.get("count", 0),
             "next": result.get("next"),
             "previous": result.get("previous"),
-            "resources": [
-                {
-                    "object_id": resource.get("object_id"),
-                    "name": resource.get("name"),
-                    "title": resource.get("title"),
-                    "title_plural": resource.get("title_plural"),
-                    "description": resource.get("description", ""),
-                    "service": resource.get("service"),
-                    "icon": resource.get("icon"),
-                    "table_type": resource.get("table_type"),
-                    "meta_attributes_enabled": resource.get("meta_attributes_enabled"),
-                    "subscription": resource.get("subscription", {}),
-                    "ingest_timestamp": resource.get("ingest_timestamp"),
-                    "update_timestamp": resource.get("update_timestamp")
-                }
-                for resource in result.get("results", [])
-            ]
+            "resources": RESOURCE.page(result, summary=True)
         }
     except Exception as e:
         logger.error(f"Fehler beim Auflisten der Resources: {e}")
@@ -1144,46 +1327,24 @@ async def list_resources(
         }
 
 @mcp.tool()
-async def get_resource_details(object_id: str) -> Dict[str, Any]:
+async def get_resource_details(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Holt Details einer spezifischen Resource.
     
     Args:
         object_id: object_id der Resource (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Resource-Details
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         resource = await client.get_resource_endpoint(object_id)
         
         return {
             "success": True,
-            "resource": {
-                "object_id": resource.get("object_id"),
-                "name": resource.get("name"),
-                "title": resource.get("title"),
-                "title_plural": resource.get("title_plural"),
-                "description": resource.get("description", ""),
-                "service": resource.get("service"),
-                "icon": resource.get("icon"),
-                "form_layout_type": resource.get("form_layout_type"),
-                "meta_attributes_enabled": resource.get("meta_attributes_enabled"),
-                "primary_key_name": resource.get("primary_key_name"),
-                "primary_key_type": resource.get("primary_key_type"),
-                "table_type": resource.get("table_type"),
-                "table_column_width": resource.get("table_column_width"),
-                "default_page_size": resource.get("default_page_size"),
-                "is_table_pagination": resource.get("is_table_pagination"),
-                "is_table_flex": resource.get("is_table_flex"),
-                "allow_table_inline_edit": resource.get("allow_table_inline_edit"),
-                "table_sort_default_column_name": resource.get("table_sort_default_column_name"),
-                "table_sort_default_direction": resource.get("table_sort_default_direction"),
-                "subscription": resource.get("subscription", {}),
-                "ingest_timestamp": resource.get("ingest_timestamp"),
-                "update_timestamp": resource.get("update_timestamp")
-            }
+            "resource": RESOURCE.project(resource)
         }
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Resource-Details: {e}")
@@ -1216,7 +1377,8 @@ async def update_resource(
     table_sort_default_direction: str = None,
     custom_filter: str = None,
     quick_filters: str = None,
-    attribute_order: str = None
+    attribute_order: str = None,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Aktualisiert eine bestehende Resource.
@@ -1244,12 +1406,13 @@ async def update_resource(
         custom_filter: Custom Filter (optional)
         quick_filters: Quick Filters (optional)
         attribute_order: Attribut-Reihenfolge (optional)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Aktualisierte Resource-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.update_resource_endpoint(
             resource_id=object_id,
             name=name,
@@ -1273,23 +1436,7 @@ async def update_resource(
         return {
             "success": True,
             "message": f"Resource '{object_id}' erfolgreich aktualisiert",
-            "resource": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "title": result.get("title"),
-                "title_plural": result.get("title_plural"),
-                "description": result.get("description"),
-                "service": result.get("service"),
-                "icon": result.get("icon"),
-                "form_layout_type": result.get("form_layout_type"),
-                "meta_attributes_enabled": result.get("meta_attributes_enabled"),
-                "primary_key_name": result.get("primary_key_name"),
-                "primary_key_type": result.get("primary_key_type"),
-                "table_type": result.get("table_type"),
-                "subscription": result.get("subscription", {}),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "resource": RESOURCE.project(result)
         }
     except Exception as e:
         logger.error(f"Fehler beim Aktualisieren der Resource: {e}")
@@ -1300,18 +1447,19 @@ async def update_resource(
         }
 
 @mcp.tool()
-async def delete_resource(object_id: str) -> Dict[str, Any]:
+async def delete_resource(object_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Löscht eine Resource.
     
     Args:
         object_id: object_id der zu löschenden Resource (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Löschstatus
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         success = await client.delete_resource_endpoint(object_id)
         
         return {
@@ -1371,11 +1519,55 @@ def list_resources_resource() -> str:
     # Diese Ressource wird asynchron von list_resources() Tool verwendet
     return "Verwenden Sie das 'list_resources' Tool um aktuelle Resource-Informationen abzurufen."
 
+@mcp.resource("dimetrics://results/{handle}", mime_type="application/json")
+async def result_resource(handle: str) -> str:
+    """
+    Server-seitig abgelegtes Ergebnis (siehe list_generic_entries).
+    
+    Returns:
+        JSON-String mit Zusammenfassung und den ersten 100 Zeilen
+    """
+    store = get_result_store()
+    stored = await asyncio.to_thread(store.get, handle, _session_tenant())
+    data = await asyncio.to_thread(store.read, handle, 0, 100, _session_tenant())
+    return json.dumps(dict(data, result=stored.describe(store.ttl)), ensure_ascii=False, default=str)
+
+@mcp.resource("dimetrics://results/{handle}/{offset}/{limit}", mime_type="application/json")
+async def result_slice_resource(handle: str, offset: str, limit: str) -> str:
+    """
+    Bereich [offset, offset + limit) eines abgelegten Ergebnisses.
+    
+    Returns:
+        JSON-String wie read_result_slice (rows, total, next_offset)
+    """
+    store = get_result_store()
+    data = await asyncio.to_thread(store.read, handle, int(offset), int(limit), _session_tenant())
+    return json.dumps(data, ensure_ascii=False, default=str)
+
+async def serve(transport: str = "stdio") -> None:
+    """
+    Betreibt den Server mit stdio- oder SSE-Transport.
+
+    Der Job-Manager startet vor dem ersten Request, damit wartende und
+    unterbrochene Jobs nach einem Neustart sofort weiterlaufen.
+    """
+    manager = get_job_manager()
+    manager.start()
+    try:
+        if transport == "sse":
+            await mcp.run_sse_async()
+        else:
+            await mcp.run_stdio_async()
+    finally:
+        await manager.shutdown()
+
 # Hauptfunktion zum Starten des Servers
 def main():
     """Startet den FastMCP Server."""
     logger.info("🚀 Starte Dimetrics MCP Server (Minimal-Version)...")
-    logger.info("📋 Verfügbare Tools:")
+    logger.info("📋 Verfügbare Tools (alle mit Parameter backend):")
+    logger.info("  Backends:")
+    logger.info("    • list_backends - Listet die konfigurierten Backends")
     logger.info("  Apps:")
     logger.info("    • create_app - Erstellt eine neue App")
     logger.info("    • list_apps - Listet alle Apps auf")
@@ -1405,6 +1597,12 @@ def main():
     logger.info("    • get_resource_details - Holt Resource-Details")
     logger.info("    • update_resource - Aktualisiert eine Resource")
     logger.info("    • delete_resource - Löscht eine Resource")
+    logger.info("    • create_complete_app - Erstellt App, Service, Resources und Attribute in einem Zug (mit Rollback)")
+    logger.info("    • plan_schema - Vergleicht ein Soll-Schema mit dem Live-Zustand (nur lesend)")
+    logger.info("    • apply_schema - Wendet ein Soll-Schema mit minimalen API-Operationen an")
+    logger.info("    • export_schema - Exportiert den Schema-Baum einer App als portables Dokument")
+    logger.info("    • import_schema - Importiert ein exportiertes Schema (IDs und linked_resource werden neu zugeordnet)")
+    logger.info("    • clone_app_schema - Kopiert das Schema einer App in ein anderes Backend")
     
     logger.info("🏷️  Attribute Management:")
     logger.info("    • list_attributes - Listet Attribute einer Resource")
@@ -1416,19 +1614,44 @@ def main():
     
     logger.info("📊 Generics API (Resource Data):")
     logger.info("    • list_generic_entries - Listet Einträge einer Resource auf (echte Daten) mit Aggregationen und Search")
+    logger.info("    • read_result_slice - Liest einen Bereich eines abgelegten Ergebnisses (Result-Handle)")
+    logger.info("    • federated_query - Führt dieselbe Abfrage parallel auf mehreren Backends aus")
+    logger.info("    • sync_resource_mirror - Spiegelt eine Resource in die lokale SQL-Datenbank")
+    logger.info("    • sql_query - Führt lesendes SQL über die lokal gespiegelten Resources aus")
+    logger.info("    • list_resource_mirrors - Listet die gespiegelten Tabellen mit Spalten und Alter")
+    logger.info("    • sync_columnar_mirror - Spiegelt eine Resource spaltenorientiert (inkrementell nach update_timestamp)")
+    logger.info("    • scan_columnar_mirror - Liest oder aggregiert einen Spalten-Spiegel (nur benötigte Spalten)")
+    logger.info("    • create_materialized_view - Legt eine inkrementell gepflegte Aggregat-Sicht an")
+    logger.info("    • refresh_materialized_view - Wendet Änderungen seit dem Wasserstand auf eine Sicht an")
+    logger.info("    • query_materialized_view - Liest die Gruppen einer Sicht")
+    logger.info("    • list_materialized_views - Listet die Sichten mit Wasserstand und Alter")
+    logger.info("    • drop_materialized_view - Löscht eine Sicht")
     logger.info("    • create_generic_entry - Erstellt einen neuen Eintrag in einer Resource")
     logger.info("    • get_generic_entry - Holt einen spezifischen Eintrag aus einer Resource")
     logger.info("    • update_generic_entry - Aktualisiert einen Eintrag in einer Resource (PATCH)")
     logger.info("    • delete_generic_entry - Löscht einen Eintrag aus einer Resource")
+    logger.info("    • import_resource - Importiert CSV/NDJSON-Dateien in eine Resource (Streaming, Resume)")
+    logger.info("    • export_resource - Exportiert eine Resource als NDJSON (parallele Bereiche, K-Wege-Merge)")
+    logger.info("    • approximate_aggregate - Distinct-Zählung, Median/Perzentile und Top-k in einem Durchlauf (Sketches)")
+    logger.info("    • profile_resource - Spaltenprofil (Null-Anteil, Distinct, Min/Max, Histogramm, Top-Werte), gecacht bis zur nächsten Änderung")
+    logger.info("    • upsert_generic_entries - Legt Einträge an oder aktualisiert sie anhand von Schlüssel-Attributen")
+    logger.info("    • get_client_metrics - Zeigt Cache-, Decoding- und Event-Loop-Kennzahlen")
+    
+    logger.info("⏳ Jobs (lang laufende Operationen):")
+    logger.info("    • submit_job - Startet ein Tool als Hintergrund-Job und gibt sofort die Job-ID zurück")
+    logger.info("    • get_job_status - Zeigt Status und Laufzeit eines Jobs")
+    logger.info("    • get_job_result - Holt das Ergebnis eines abgeschlossenen Jobs")
+    logger.info("    • cancel_job - Bricht einen wartenden oder laufenden Job ab")
+    logger.info("    • list_jobs - Listet die letzten Jobs")
     
     # Server starten
-    mcp.run()
+    asyncio.run(serve())
 
 
 # ===== ATTRIBUTE MANAGEMENT TOOLS =====
 
 @mcp.tool()
-async def list_attributes(resource_name: str, search: str = "", page_size: int = 50, page: int = 1) -> Dict[str, Any]:
+async def list_attributes(resource_name: str, search: str = "", page_size: int = 50, page: int = 1, backend: str = "") -> Dict[str, Any]:
     """
     Listet alle Attribute einer Resource auf.
     
@@ -1437,12 +1660,13 @@ async def list_attributes(resource_name: str, search: str = "", page_size: int =
         search: Optionaler Suchbegriff für Attribut-Namen oder -Beschreibungen
         page_size: Anzahl der Ergebnisse pro Seite (Standard: 50)
         page: Seitennummer für Pagination (Standard: 1)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Liste der gefundenen Attribute mit Pagination-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.list_attributes(
             resource_name=resource_name,
             search=search if search else None,
@@ -1450,45 +1674,8 @@ async def list_attributes(resource_name: str, search: str = "", page_size: int =
             page=page
         )
         
-        attributes = []
-        # Attribute API gibt direkt eine Liste zurück, nicht ein Dict mit results
-        if isinstance(result, list):
-            for attr in result:
-                attributes.append({
-                    "object_id": attr.get("object_id"),
-                    "name": attr.get("name"),
-                    "type": attr.get("type"),
-                    "label": attr.get("label"),
-                    "description": attr.get("description", ""),
-                    "required": attr.get("required", False),
-                    "readonly": attr.get("readonly", False),
-                    "unique": attr.get("unique", False),
-                    "show_in_table": attr.get("show_in_table", True),
-                    "enable_sum": attr.get("enable_sum", False),
-                    "field_order": attr.get("field_order"),
-                    "form_layout_location": attr.get("form_layout_location", "Main"),
-                    "form_layout_col": attr.get("form_layout_col", "12"),
-                    "resource": attr.get("resource", {})
-                })
-        elif isinstance(result, dict) and "results" in result:
-            # Fallback für Standard-Pagination-Format
-            for attr in result["results"]:
-                attributes.append({
-                    "object_id": attr.get("object_id"),
-                    "name": attr.get("name"),
-                    "type": attr.get("type"),
-                    "label": attr.get("label"),
-                    "description": attr.get("description", ""),
-                    "required": attr.get("required", False),
-                    "readonly": attr.get("readonly", False),
-                    "unique": attr.get("unique", False),
-                    "show_in_table": attr.get("show_in_table", True),
-                    "enable_sum": attr.get("enable_sum", False),
-                    "field_order": attr.get("field_order"),
-                    "form_layout_location": attr.get("form_layout_location", "Main"),
-                    "form_layout_col": attr.get("form_layout_col", "12"),
-                    "resource": attr.get("resource", {})
-                })
+        # Attribute API gibt direkt eine Liste zurück (Fallback: Dict mit results)
+        attributes = ATTRIBUTE.page(result, summary=True)
         
         return {
             "success": True,
@@ -1508,41 +1695,25 @@ async def list_attributes(resource_name: str, search: str = "", page_size: int =
         }
 
 @mcp.tool()
-async def get_attribute_details(resource_name: str, attribute_id: str) -> Dict[str, Any]:
+async def get_attribute_details(resource_name: str, attribute_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Holt detaillierte Informationen zu einem Attribut.
     
     Args:
         resource_name: Name der Resource
         attribute_id: UUID des Attributs
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Detaillierte Attribut-Informationen
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.get_attribute_details(resource_name, attribute_id)
         
         return {
             "success": True,
-            "attribute": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "type": result.get("type"),
-                "label": result.get("label"),
-                "description": result.get("description", ""),
-                "required": result.get("required", False),
-                "readonly": result.get("readonly", False),
-                "unique": result.get("unique", False),
-                "show_in_table": result.get("show_in_table", True),
-                "enable_sum": result.get("enable_sum", False),
-                "field_order": result.get("field_order"),
-                "form_layout_location": result.get("form_layout_location", "Main"),
-                "form_layout_col": result.get("form_layout_col", "12"),
-                "resource": result.get("resource", {}),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            },
+            "attribute": ATTRIBUTE.project(result),
             "message": f"Details für Attribut '{result.get('name')}' erfolgreich abgerufen"
         }
         
@@ -1590,7 +1761,8 @@ async def create_attribute(
     alt_display_field: str = None,
     hide_child_resource: bool = False,
     date_format: str = "YYYY-MM-DD",
-    datetime_input_type: str = "date"
+    datetime_input_type: str = "date",
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Erstellt ein neues Attribut für eine Resource.
@@ -1612,6 +1784,7 @@ async def create_attribute(
         field_order: Reihenfolge der Felder
         form_layout_location: Layout-Bereich im Formular (Main, Meta, Advanced)
         form_layout_col: Spaltenbreite im Formular (1, 2, 3, 4, 6, 12)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
         
         # Text-Feld Parameter
         placeholder: Platzhalter-Text für Eingabefelder
@@ -1650,7 +1823,7 @@ async def create_attribute(
         Erstelltes Attribut mit Details
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         
         # Basis-Parameter zusammenstellen
         kwargs = {}
@@ -1754,24 +1927,7 @@ async def create_attribute(
         return {
             "success": True,
             "message": f"Attribut '{name}' für Resource '{resource_name}' erfolgreich erstellt",
-            "attribute": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "type": result.get("type"),
-                "label": result.get("label"),
-                "description": result.get("description"),
-                "required": result.get("required"),
-                "readonly": result.get("readonly"),
-                "unique": result.get("unique"),
-                "show_in_table": result.get("show_in_table"),
-                "enable_sum": result.get("enable_sum"),
-                "field_order": result.get("field_order"),
-                "form_layout_location": result.get("form_layout_location"),
-                "form_layout_col": result.get("form_layout_col"),
-                "resource": result.get("resource", {}),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "attribute": ATTRIBUTE.project(result)
         }
         
     except Exception as e:
@@ -1796,7 +1952,8 @@ async def update_attribute(
     enable_sum: bool = None,
     field_order: int = None,
     form_layout_location: str = None,
-    form_layout_col: str = None
+    form_layout_col: str = None,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Aktualisiert ein bestehendes Attribut.
@@ -1815,12 +1972,13 @@ async def update_attribute(
         field_order: Neue Reihenfolge (optional)
         form_layout_location: Neuer Layout-Bereich (optional)
         form_layout_col: Neue Spaltenbreite (optional)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Aktualisiertes Attribut mit Details
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.update_attribute(
             resource_name=resource_name,
             attribute_id=attribute_id,
@@ -1840,24 +1998,7 @@ async def update_attribute(
         return {
             "success": True,
             "message": f"Attribut '{result.get('name')}' erfolgreich aktualisiert",
-            "attribute": {
-                "object_id": result.get("object_id"),
-                "name": result.get("name"),
-                "type": result.get("type"),
-                "label": result.get("label"),
-                "description": result.get("description"),
-                "required": result.get("required"),
-                "readonly": result.get("readonly"),
-                "unique": result.get("unique"),
-                "show_in_table": result.get("show_in_table"),
-                "enable_sum": result.get("enable_sum"),
-                "field_order": result.get("field_order"),
-                "form_layout_location": result.get("form_layout_location"),
-                "form_layout_col": result.get("form_layout_col"),
-                "resource": result.get("resource", {}),
-                "ingest_timestamp": result.get("ingest_timestamp"),
-                "update_timestamp": result.get("update_timestamp")
-            }
+            "attribute": ATTRIBUTE.project(result)
         }
         
     except Exception as e:
@@ -1869,19 +2010,20 @@ async def update_attribute(
         }
 
 @mcp.tool()
-async def delete_attribute(resource_name: str, attribute_id: str) -> Dict[str, Any]:
+async def delete_attribute(resource_name: str, attribute_id: str, backend: str = "") -> Dict[str, Any]:
     """
     Löscht ein Attribut aus einer Resource.
     
     Args:
         resource_name: Name der Resource
         attribute_id: UUID des zu löschenden Attributs
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Bestätigung der Löschung
     """
     try:
-        client = await get_api_client()
+        client = await get_api_client(backend)
         success = await client.delete_attribute(resource_name, attribute_id)
         
         if success:
@@ -1904,7 +2046,7 @@ async def delete_attribute(resource_name: str, attribute_id: str) -> Dict[str, A
         }
 
 @mcp.tool()
-async def create_attributes_bulk(resource_name: str, attributes_json: str) -> Dict[str, Any]:
+async def create_attributes_bulk(resource_name: str, attributes_json: str, backend: str = "") -> Dict[str, Any]:
     """
     Erstellt mehrere Attribute gleichzeitig für eine Resource.
     
@@ -1912,6 +2054,7 @@ async def create_attributes_bulk(resource_name: str, attributes_json: str) -> Di
         resource_name: Name der Resource
         attributes_json: JSON-String mit Liste von Attribut-Definitionen
                         Format: [{"name": "...", "type": "...", "label": "...", ...}, ...]
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
         Liste der erstellten Attribute
@@ -1936,7 +2079,7 @@ async def create_attributes_bulk(resource_name: str, attributes_json: str) -> Di
                 "message": "Ungültiges Format für Attribut-Definitionen"
             }
         
-        client = await get_api_client()
+        client = await get_api_client(backend)
         result = await client.create_attributes_bulk(resource_name, attributes)
         
         return {
@@ -1966,24 +2109,50 @@ async def list_generic_entries(
     ordering: str = "",
     filters_json: str = "{}",
     directus_filter_json: str = "",
-    aggregate_json: str = ""
+    aggregate_json: str = "",
+    verbose: bool = False,
+    keyset: bool = False,
+    cursor: str = "",
+    result_handle: bool = False,
+    all_pages: bool = False,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
     Listet Einträge einer Resource auf (echte Daten aus den Tabellen) mit Aggregationen.
     
+    Für große Tabellen keyset=True verwenden: statt Seitennummern (OFFSET,
+    späte Seiten werden immer langsamer) wird nach einem Feld sortiert und
+    die nächste Seite über next_cursor geladen; die Latenz bleibt gleich,
+    und Änderungen während des Durchlaufs doppeln oder überspringen keine
+    Einträge.
+    
+    Große Ergebnisse (über DIMETRICS_RESULT_INLINE_BYTES) werden server-seitig
+    abgelegt: results enthält dann nur eine Vorschau, data.result das Handle.
+    Weitere Zeilen liest read_result_slice bzw. die Resource
+    dimetrics://results/{handle}, ohne die Abfrage zu wiederholen.
+    
     Args:
         resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
         search: Suchbegriff für Textfelder (Volltext-Suche in allen Feldern)
-        page_size: Anzahl Einträge pro Seite (Standard: 20)
+        page_size: Anzahl Einträge pro Seite (Standard: 20; mit keyset: 0 = adaptiv nach Zeilengröße und Latenz)
         page: Seitennummer, 1-basiert (Standard: 1)
         ordering: Sortierung (z.B. "name", "-date_created" für absteigende Sortierung)
         filters_json: JSON-String mit einfachen Filtern (Legacy, für Rückwärtskompatibilität)
         directus_filter_json: JSON-String mit Directus-ähnlichen Filtern (empfohlen)
         aggregate_json: JSON-String mit Aggregation-Parametern
+        verbose: Zusätzlich next/previous-URLs und die Abfrage-Parameter zurückgeben (Standard: False)
+        keyset: Keyset-Pagination statt page; ordering = genau ein Feld ohne leere Werte (Standard: object_id, z.B. "-date_created")
+        cursor: next_cursor der vorherigen Antwort (setzt keyset voraus, page wird ignoriert)
+        result_handle: Ergebnis immer als Handle ablegen, auch wenn es klein ist (Standard: False)
+        all_pages: Alle Seiten laden und als Handle ablegen (page/keyset werden ignoriert, keine Aggregationen;
+            höchstens DIMETRICS_RESULT_MAX_ROWS Einträge, Standard 1000000)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
-        Strukturierte Antwort mit count, next, previous, results und aggregations
+        Strukturierte Antwort mit count, Pagination, results und aggregations
         Bei Aggregationen: results enthält aggregierte Werte statt Rohdaten
+        Mit keyset: count = verbleibende Einträge ab dieser Seite, next_cursor für die nächste Seite
+        Mit Handle: results = Vorschau, result = Handle, Zeilenzahl, Spalten und Ablaufzeit
         
     Beispiele für einfache Filter (filters_json):
         '{"training_type": "dauerlauf"}'
@@ -2069,41 +2238,145 @@ async def list_generic_entries(
                     "message": "Fehler beim Parsen der Aggregations-Parameter"
                 }
         
-        client = await get_api_client()
-        result = await client.list_generic_entries(
-            resource_name=resource_name,
-            search=search if search else None,
-            page_size=page_size if page_size > 0 else None,
-            page=page if page > 0 else None,
-            ordering=ordering if ordering else None,
-            filters=filters if filters else None,
-            directus_filter=directus_filter if directus_filter else None,
-            aggregate=aggregate if aggregate else None
-        )
+        client = await get_api_client(backend)
+        if all_pages:
+            if aggregate:
+                raise ValueError("Aggregationen sind mit all_pages nicht möglich")
+            if filters:
+                raise ValueError("all_pages unterstützt nur directus_filter_json, nicht filters_json")
+            source = {
+                "backend": client.name,
+                "resource_name": resource_name,
+                "search": search or None,
+                "ordering": ordering or None,
+                "directus_filter": directus_filter or None
+            }
+            # Seite für Seite direkt in die Datei des Ergebnisses, höchstens DIMETRICS_RESULT_MAX_ROWS Zeilen
+            store = get_result_store()
+            writer = await asyncio.to_thread(store.writer, source, _session_tenant())
+            try:
+                async for entries in client.iter_generic_pages(
+                    resource_name,
+                    directus_filter=directus_filter or None,
+                    ordering=ordering or None,
+                    search=search or None
+                ):
+                    await asyncio.to_thread(writer.add, entries)
+                stored = await asyncio.to_thread(writer.commit)
+            except BaseException:
+                writer.discard()
+                raise
+            return {
+                "success": True,
+                "message": f"{stored.count} Einträge für Resource '{resource_name}' abgelegt (Handle {stored.handle})",
+                "data": {
+                    "count": stored.count,
+                    "results": writer.preview,
+                    "result": stored.describe(store.ttl)
+                },
+                "resource_name": resource_name
+            }
         
-        return {
-            "success": True,
-            "message": f"Einträge für Resource '{resource_name}' erfolgreich abgerufen",
-            "data": {
+        if keyset or cursor:
+            if aggregate:
+                raise ValueError("Aggregationen sind mit keyset-Pagination nicht möglich")
+            if filters:
+                raise ValueError("keyset-Pagination unterstützt nur directus_filter_json, nicht filters_json")
+            query = {
+                "resource_name": resource_name,
+                "page_size": page_size if page_size > 0 else None,
+                "ordering": ordering or None,
+                "directus_filter": directus_filter or None,
+                "search": search or None
+            }
+            result = await _fetch_page(
+                client,
+                query,
+                cursor or None,
+                lambda position: client.list_generic_entries_keyset(cursor=position, **query),
+                lambda data: data["next_cursor"]
+            )
+            data = {
                 "count": result.get("count", 0),
-                "total_pages": (result.get("count", 0) + page_size - 1) // page_size if page_size > 0 else 1,
-                "current_page": page,
-                "page_size": page_size,
-                "has_next": result.get("next") is not None,
-                "has_previous": result.get("previous") is not None,
-                "next_url": result.get("next"),
-                "previous_url": result.get("previous"),
-                "aggregations": result.get("aggregations", []),
+                "page_size": result["page_size"],
+                "has_next": result["next_cursor"] is not None,
+                "next_cursor": result["next_cursor"],
                 "results": result.get("results", [])
-            },
+            }
+            source = dict(query, backend=client.name, cursor=cursor or None)
+            stored = await _store_result(data["results"], source, force=result_handle)
+            if stored is not None:
+                data["results"] = data["results"][:PREVIEW_ROWS]
+                data["result"] = stored.describe(get_result_store().ttl)
+            response = {
+                "success": True,
+                "message": f"Einträge für Resource '{resource_name}' erfolgreich abgerufen (Keyset)",
+                "data": data,
+                "resource_name": resource_name
+            }
+            if verbose:
+                response.update(search_term=search, ordering=ordering, directus_filters=directus_filter, cursor=cursor)
+            return response
+        
+        query = {
             "resource_name": resource_name,
-            "search_term": search,
-            "ordering": ordering,
-            "simple_filters": filters,
-            "directus_filters": directus_filter,
-            "aggregations": aggregate
+            "search": search if search else None,
+            "page_size": page_size if page_size > 0 else None,
+            "ordering": ordering if ordering else None,
+            "filters": filters if filters else None,
+            "directus_filter": directus_filter if directus_filter else None,
+            "aggregate": aggregate if aggregate else None
+        }
+        current = page if page > 0 else 1
+        result = await _fetch_page(
+            client,
+            query,
+            current,
+            lambda position: client.list_generic_entries(page=position, **query),
+            # Aggregationen haben keine Folgeseite
+            None if aggregate else lambda data: current + 1 if data.get("next") else None
+        )
+        
+        data = {
+            "count": result.get("count", 0),
+            "total_pages": (result.get("count", 0) + page_size - 1) // page_size if page_size > 0 else 1,
+            "current_page": page,
+            "page_size": page_size,
+            "has_next": result.get("next") is not None,
+            "has_previous": result.get("previous") is not None,
+            "aggregations": result.get("aggregations", []),
+            "results": result.get("results", [])
+        }
+        if not aggregate:
+            source = dict(query, backend=client.name, page=current)
+            stored = await _store_result(data["results"], source, force=result_handle)
+            if stored is not None:
+                data["results"] = data["results"][:PREVIEW_ROWS]
+                data["result"] = stored.describe(get_result_store().ttl)
+        response = {
+            "success": True,
+            "message": f"Einträge für Resource '{resource_name}' erfolgreich abgerufen",
+            "data": data,
+            "resource_name": resource_name
         }
+        if verbose:
+            # Echo der Abfrage; bei großen Seiten nur unnötiger Ballast
+            data["next_url"] = result.get("next")
+            data["previous_url"] = result.get("previous")
+            response.update(
+                search_term=search,
+                ordering=ordering,
+                simple_filters=filters,
+                directus_filters=directus_filter,
+                aggregations=aggregate
+            )
+        return response
         
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
     except Exception as e:
         logger.error(f"Fehler beim Abrufen der Generic Entries für '{resource_name}': {e}")
         return {
@@ -2118,256 +2391,2033 @@ async def list_generic_entries(
         }
 
 @mcp.tool()
-async def create_generic_entry(
-    resource_name: str,
-    entry_data_json: str
+async def read_result_slice(
+    handle: str,
+    offset: int = 0,
+    limit: int = 100,
+    fields: str = ""
 ) -> Dict[str, Any]:
     """
-    Erstellt einen neuen Eintrag in einer Resource (echte Daten in Tabellen).
+    Liest einen Bereich eines server-seitig abgelegten Ergebnisses.
+    
+    Handles liefert list_generic_entries für große Ergebnisse (data.result);
+    gelesen wird ohne erneute Abfrage beim Backend. Ein Handle verfällt nach
+    DIMETRICS_RESULT_TTL Sekunden ohne Zugriff.
     
     Args:
-        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
-        entry_data_json: JSON-String mit den Daten für den neuen Eintrag
+        handle: Handle aus data.result.handle
+        offset: Erste Zeile, 0-basiert (Standard: 0)
+        limit: Anzahl Zeilen (Standard: 100, höchstens 1000)
+        fields: Kommagetrennte Feldnamen, leer = alle Felder
     
     Returns:
-        Strukturierte Antwort mit dem erstellten Eintrag
-        
-    Beispiele für entry_data_json:
-        '{"name": "Morgenlauf", "distance_km": 5.2, "training_type": "dauerlauf"}'
-        '{"name": "Canva Pro", "amount": 27.50, "state": "ok", "from": "canva.com"}'
-        '{"product_name": "Laptop", "is_available": true, "priority": "high"}'
-        
-    Automatische Felder (werden vom System gesetzt):
-        - object_id: Eindeutige UUID für den Eintrag
-        - date_created: Zeitstempel der Erstellung
-        - date_updated: Zeitstempel der letzten Änderung
-        - subscription: Verknüpfung zum Dimetrics-Account
-        
-    Pflichtfelder (je nach Resource):
-        - name: Name/Titel des Eintrags (meist erforderlich)
-        - state: Status des Eintrags (falls vorhanden, z.B. "active", "ok", "pending")
+        rows des Bereichs, total und next_offset (None am Ende)
     """
     try:
-        import json
-        
-        # Entry-Daten JSON parsen
-        try:
-            entry_data = json.loads(entry_data_json)
-        except json.JSONDecodeError as e:
-            return {
-                "success": False,
-                "error": f"Ungültiges JSON-Format für Entry-Daten: {e}",
-                "message": "Fehler beim Parsen der Entry-Daten-Parameter"
-            }
-        
-        client = await get_api_client()
-        result = await client.create_generic_entry(
-            resource_name=resource_name,
-            data=entry_data
-        )
-        
+        names = [name.strip() for name in fields.split(",") if name.strip()]
+        store = get_result_store()
+        data = await asyncio.to_thread(store.read, handle, offset, limit, _session_tenant(), names or None)
         return {
             "success": True,
-            "message": f"Eintrag in Resource '{resource_name}' erfolgreich erstellt",
-            "entry": result,
-            "resource_name": resource_name,
-            "created_id": result.get("object_id"),
-            "entry_data": entry_data
+            "message": f"Zeilen {offset} bis {offset + data['count']} von {data['total']} gelesen",
+            "data": data
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
         }
-        
     except Exception as e:
-        logger.error(f"Fehler beim Erstellen des Generic Entry für '{resource_name}': {e}")
+        logger.error(f"Fehler beim Lesen des Ergebnisses '{handle}': {e}")
         return {
             "success": False,
             "error": str(e),
-            "message": f"Fehler beim Erstellen des Eintrags für Resource '{resource_name}'"
+            "message": f"Fehler beim Lesen des Ergebnisses '{handle}'"
         }
 
 @mcp.tool()
-async def get_generic_entry(
+async def federated_query(
     resource_name: str,
-    entry_id: str
+    backends: str = "",
+    resource_names_json: str = "",
+    search: str = "",
+    directus_filter_json: str = "",
+    aggregate_json: str = "",
+    ordering: str = "",
+    page_size: int = 20
 ) -> Dict[str, Any]:
     """
-    Holt einen spezifischen Eintrag aus einer Resource (echte Daten).
+    Führt dieselbe Abfrage wie list_generic_entries parallel auf mehreren Backends aus.
     
     Args:
-        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
-        entry_id: object_id des Eintrags (UUID)
+        resource_name: Name der Resource (in allen Backends gleich)
+        backends: Kommagetrennte Backend-Namen (leer = alle konfigurierten, siehe list_backends)
+        resource_names_json: Abweichende Resource-Namen pro Backend, z.B. '{"werkportal": "wp1_kunden"}'
+        search: Suchbegriff für Textfelder
+        directus_filter_json: JSON-String mit Directus-ähnlichen Filtern
+        aggregate_json: JSON-String mit Aggregation, z.B. '{"count": "name", "avg": "amount"}'
+        ordering: Sortierung der vereinigten Zeilen (z.B. "-date_created")
+        page_size: Zeilen pro Backend (nur ohne Aggregation, Standard: 20)
     
     Returns:
-        Strukturierte Antwort mit den detaillierten Eintragsdaten
-        
-    Beispiele:
-        resource_name="lau6_RunEntries", entry_id="a1b2c3d4-e5f6-7890-abcd-ef1234567890"
-        resource_name="n8n_collection", entry_id="c89515a4-13f3-4d7e-b4a5-249b5b4e8368"
-        
-    Rückgabedaten enthalten:
-        - Alle Attribute-Werte des Eintrags
-        - Metadaten: object_id, date_created, date_updated, subscription
-        - Relation-Fields: Verknüpfte Objekte (vendor, etc.)
+        Ohne Aggregation: vereinigte Zeilen mit Spalte "_backend"
+        Mit Aggregation: kombinierte Aggregate (sum/count addiert, min/max
+        über alle Backends, avg aus Gesamtsumme / Gesamtanzahl)
+        Pro Backend: Latenz, Anzahl bzw. Teil-Aggregate und ggf. Fehler
     """
     try:
-        client = await get_api_client()
-        result = await client.get_generic_entry(
-            resource_name=resource_name,
-            entry_id=entry_id
+        directus_filter = json.loads(directus_filter_json) if directus_filter_json else None
+        aggregate = json.loads(aggregate_json) if aggregate_json else None
+        resource_names = json.loads(resource_names_json) if resource_names_json else None
+        
+        registry = get_client_registry()
+        names = [name.strip() for name in backends.split(",") if name.strip()] or registry.names
+        token = get_session_token()
+        clients = {name: registry.get(name, token=token) for name in names}
+        
+        result = await run_federated_query(
+            clients,
+            resource_name,
+            resource_names=resource_names,
+            search=search or None,
+            directus_filter=directus_filter,
+            aggregate=aggregate,
+            ordering=ordering or None,
+            page_size=page_size
         )
         
+        failed = [entry["backend"] for entry in result["backends"] if not entry["success"]]
+        if len(failed) == len(names):
+            return {
+                "success": False,
+                "error": "; ".join(f"{entry['backend']}: {entry['error']}" for entry in result["backends"]),
+                "message": f"Föderierte Abfrage für '{resource_name}' auf allen Backends fehlgeschlagen",
+                "data": result
+            }
+        
+        message = f"Föderierte Abfrage für '{resource_name}' auf {len(names) - len(failed)}/{len(names)} Backends"
+        if failed:
+            message += f" (fehlgeschlagen: {', '.join(failed)})"
         return {
             "success": True,
-            "message": f"Eintrag '{entry_id}' aus Resource '{resource_name}' erfolgreich abgerufen",
-            "entry": result,
-            "resource_name": resource_name,
-            "entry_id": entry_id
+            "message": message,
+            "data": result
         }
         
-    except Exception as e:
-        logger.error(f"Fehler beim Abrufen des Generic Entry '{entry_id}' für '{resource_name}': {e}")
+    except json.JSONDecodeError as e:
         return {
             "success": False,
-            "error": str(e),
-            "message": f"Fehler beim Abrufen des Eintrags '{entry_id}' für Resource '{resource_name}'"
+            "error": f"Ungültiges JSON-Format: {e}",
+            "message": "Fehler beim Parsen der Abfrage-Parameter"
         }
-
-@mcp.tool()
-async def update_generic_entry(
-    resource_name: str,
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler bei der föderierten Abfrage für '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler bei der föderierten Abfrage für Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def sync_resource_mirror(
+    resource_name: str,
+    page_size: int = 0,
+    concurrency: int = 4,
+    partition_by: str = "",
+    partitions: int = 8,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Lädt alle Einträge einer Resource in ihre Tabelle der lokalen SQL-Datenbank (siehe sql_query).
+    
+    Args:
+        resource_name: Name der Resource (wird zum Tabellennamen)
+        page_size: Einträge pro API-Request (0 = adaptiv nach Zeilengröße und Latenz, Standard)
+        concurrency: Parallel geladene Seiten (Standard: 4)
+        partition_by: Parallel über Bereiche laden: 'object_id' oder ein Zahlen-/Zeitstempel-Feld (leer = nach Seitennummer)
+        partitions: Angestrebte Anzahl Bereiche bei partition_by (Standard: 8)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Tabellenname, Spalten mit SQL-Typen, Zeilenzahl und Dauer
+    """
+    try:
+        client = await get_api_client(backend)
+        result = await get_resource_mirror(backend).sync(
+            client, resource_name, page_size=page_size, concurrency=concurrency,
+            partition_by=partition_by, partitions=partitions
+        )
+        return {
+            "success": True,
+            "message": f"Resource '{resource_name}' als Tabelle '{result['table']}' gespiegelt ({result['rows']} Zeilen)",
+            "mirror": result
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Spiegeln der Resource '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Spiegeln der Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def sql_query(
+    sql: str,
+    resources: str = "",
+    max_age_seconds: int = 300,
+    params_json: str = "",
+    max_rows: int = 1000,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Führt lesendes SQL (SQLite-Dialekt) über lokal gespiegelte Resources aus.
+    
+    Für Joins, GROUP BY, Window Functions und CTEs, die sich mit
+    directus_filter_json und aggregate_json nicht ausdrücken lassen. Jede
+    Resource ist eine Tabelle (Name = Resource-Name, Spalten = Attribute
+    plus object_id, ingest_timestamp, update_timestamp). Relationen stehen
+    als object_id in der Spalte, Mehrfach-Relationen und Listen als
+    JSON-Array (z.B. über json_each auswerten).
+    
+    Args:
+        sql: SELECT- oder WITH-Abfrage, z.B. "SELECT k.name, SUM(a.betrag) FROM auftraege a JOIN kunden k ON a.kunde = k.object_id GROUP BY k.name"
+        resources: Kommagetrennte Resources, die vor der Abfrage gespiegelt werden, falls noch nicht vorhanden oder älter als max_age_seconds
+        max_age_seconds: Maximales Alter eines Spiegels in Sekunden (Standard: 300)
+        params_json: JSON-Array mit Parametern für ?-Platzhalter
+        max_rows: Maximale Anzahl gelieferter Zeilen (Standard: 1000)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Spalten, Zeilen, ob abgeschnitten wurde, Laufzeit und ggf. aktualisierte Spiegel
+    """
+    try:
+        params = json.loads(params_json) if params_json else []
+        if not isinstance(params, list):
+            raise ValueError("params_json muss ein JSON-Array sein")
+        
+        client = await get_api_client(backend)
+        mirror = get_resource_mirror(backend)
+        stale = []
+        for resource_name in [name.strip() for name in resources.split(",") if name.strip()]:
+            age = mirror.age(resource_name)
+            if age is None or age > max_age_seconds:
+                stale.append(resource_name)
+        synced = await asyncio.gather(*(mirror.sync(client, resource_name) for resource_name in stale))
+        
+        result = await mirror.query(sql, params, max_rows=max_rows)
+        response = {
+            "success": True,
+            "message": f"{result['row_count']} Zeilen in {result['elapsed_ms']} ms",
+            "data": result
+        }
+        if synced:
+            response["synced"] = list(synced)
+        return response
+        
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"Ungültiges JSON-Format: {e}",
+            "message": "Fehler beim Parsen von params_json"
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler bei der SQL-Abfrage: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler bei der SQL-Abfrage"
+        }
+
+@mcp.tool()
+async def list_resource_mirrors(backend: str = "") -> Dict[str, Any]:
+    """
+    Listet die lokal gespiegelten Tabellen für sql_query und scan_columnar_mirror.
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        SQL-Tabellen mit Resource, Spalten und SQL-Typen, Zeilenzahl und Alter;
+        unter "columnar" die Spalten-Spiegel mit Segmenten und Wasserstand
+    """
+    try:
+        await get_api_client(backend)
+        tables = get_resource_mirror(backend).tables()
+        return {
+            "success": True,
+            "count": len(tables),
+            "tables": tables,
+            "columnar": get_columnar_store(backend).tables()
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Auflisten der Spiegel: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Auflisten der gespiegelten Resources"
+        }
+
+@mcp.tool()
+async def sync_columnar_mirror(
+    resource_name: str,
+    full: bool = False,
+    page_size: int = 0,
+    concurrency: int = 4,
+    partition_by: str = "",
+    partitions: int = 8,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Spiegelt eine Resource in den spaltenorientierten lokalen Speicher (siehe scan_columnar_mirror).
+    
+    Nach dem ersten Sync werden nur Einträge mit neuerem update_timestamp
+    geladen und angehängt; ab 8 Segmenten wird im Hintergrund verdichtet.
+    
+    Args:
+        resource_name: Name der Resource
+        full: Alles neu laden (erfasst auch gelöschte Einträge)
+        page_size: Einträge pro API-Request (0 = adaptiv nach Zeilengröße und Latenz, Standard)
+        concurrency: Parallel geladene Seiten (Standard: 4)
+        partition_by: Parallel über Bereiche laden: 'object_id' oder ein Zahlen-/Zeitstempel-Feld (leer = nach Seitennummer)
+        partitions: Angestrebte Anzahl Bereiche bei partition_by (Standard: 8)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Modus (full/incremental), geladene Einträge, Wasserstand, Segmente und Dauer
+    """
+    try:
+        client = await get_api_client(backend)
+        result = await get_columnar_store(backend).sync(
+            client, resource_name, full=full, page_size=page_size, concurrency=concurrency,
+            partition_by=partition_by, partitions=partitions
+        )
+        return {
+            "success": True,
+            "message": f"Resource '{resource_name}' gespiegelt ({result['mode']}, {result['fetched']} Einträge geladen)",
+            "mirror": result
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Spiegeln der Resource '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Spiegeln der Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def scan_columnar_mirror(
+    resource_name: str,
+    columns: str = "",
+    directus_filter_json: str = "",
+    aggregate_json: str = "",
+    group_by: str = "",
+    limit: int = 100,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Liest oder aggregiert einen Spalten-Spiegel; gelesen werden nur die benötigten Spalten.
+    
+    Args:
+        resource_name: Name der gespiegelten Resource (siehe sync_columnar_mirror)
+        columns: Kommagetrennte Spalten für Zeilen-Ausgabe (leer = alle)
+        directus_filter_json: Bedingungen pro Spalte (UND), z.B. '{"distance_km": {"_gte": 10}, "training_type": {"_in": ["dauerlauf"]}}'
+            Operatoren: _eq, _neq, _gt, _gte, _lt, _lte, _in, _nin, _null, _nnull
+        aggregate_json: Aggregation statt Zeilen, z.B. '{"sum": "distance_km", "count": "object_id"}'
+        group_by: Spalte für die Gruppierung der Aggregation
+        limit: Maximale Anzahl Zeilen ohne Aggregation (Standard: 100)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Zeilen bzw. Gruppen mit Aggregaten sowie Laufzeit
+    """
+    try:
+        where = json.loads(directus_filter_json) if directus_filter_json else None
+        aggregate = json.loads(aggregate_json) if aggregate_json else None
+        if where is not None and not (isinstance(where, dict) and all(isinstance(value, dict) for value in where.values())):
+            raise ValueError("directus_filter_json muss ein Objekt {spalte: {operator: wert}} sein")
+        
+        await get_api_client(backend)
+        table = get_columnar_store(backend).table(resource_name)
+        if not table.manifest.get("segments"):
+            raise ValueError(f"Resource '{resource_name}' ist nicht gespiegelt (siehe sync_columnar_mirror)")
+        
+        started = time.perf_counter()
+        if aggregate:
+            data = await asyncio.to_thread(table.aggregate, aggregate, group_by or None, where)
+        else:
+            names = [name.strip() for name in columns.split(",") if name.strip()] or list(table.manifest["schema"])
+            data = {"rows": await asyncio.to_thread(table.read, names, where, limit)}
+        data["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 2)
+        data["watermark"] = table.manifest.get("watermark")
+        return {
+            "success": True,
+            "message": f"Spalten-Spiegel '{resource_name}' ausgewertet",
+            "data": data
+        }
+        
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"Ungültiges JSON-Format: {e}",
+            "message": "Fehler beim Parsen der Abfrage-Parameter"
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Auswerten des Spalten-Spiegels '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Auswerten des Spalten-Spiegels '{resource_name}'"
+        }
+
+@mcp.tool()
+async def create_materialized_view(
+    name: str,
+    resource_name: str,
+    aggregate_json: str,
+    group_by: str = "",
+    directus_filter_json: str = "",
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Legt eine materialisierte Aggregat-Sicht an (oder ersetzt sie) und baut sie auf.
+    
+    Die Sicht wird lokal gespeichert; refresh_materialized_view und
+    query_materialized_view wenden danach nur Einträge an, die sich seit
+    dem letzten update_timestamp geändert haben.
+    
+    Args:
+        name: Name der Sicht, z.B. "wochen_km"
+        resource_name: Name der Resource
+        aggregate_json: Funktion -> Spalte(n), z.B. '{"sum": ["distance_km", "duration_min"], "count": "object_id"}'
+            Funktionen: count, sum, avg, min, max
+        group_by: Kommagetrennte Spalten, Zeitstempel optional mit Bucket (day, week, month, year), z.B. "date:week,training_type"
+        directus_filter_json: Bedingungen pro Spalte (UND), z.B. '{"surface": {"_neq": "trail"}}'
+            Operatoren: _eq, _neq, _gt, _gte, _lt, _lte, _in, _nin, _null, _nnull
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Definition der Sicht und Ergebnis des ersten Aufbaus
+    """
+    try:
+        spec = normalize_spec(
+            resource_name,
+            json.loads(aggregate_json),
+            [item.strip() for item in group_by.split(",") if item.strip()],
+            json.loads(directus_filter_json) if directus_filter_json else None
+        )
+        client = await get_api_client(backend)
+        views = get_materialized_views(backend)
+        views.define(name, spec)
+        refresh = await views.refresh(client, name)
+        return {
+            "success": True,
+            "message": f"Sicht '{name}' angelegt ({refresh['fetched']} Einträge verarbeitet)",
+            "view": views.describe(name)
+        }
+        
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"Ungültiges JSON-Format: {e}",
+            "message": "Fehler beim Parsen der Sicht-Definition"
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Anlegen der Sicht '{name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Anlegen der Sicht '{name}'"
+        }
+
+@mcp.tool()
+async def refresh_materialized_view(name: str, full: bool = False, backend: str = "") -> Dict[str, Any]:
+    """
+    Bringt eine materialisierte Sicht auf den aktuellen Stand.
+    
+    Inkrementell werden nur Einträge mit update_timestamp ab dem
+    Wasserstand geladen; full=True baut neu auf und erfasst auch gelöschte
+    Einträge.
+    
+    Args:
+        name: Name der Sicht
+        full: Vollständig neu aufbauen
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Modus, geladene und geänderte Einträge, neuer Wasserstand und Dauer
+    """
+    try:
+        client = await get_api_client(backend)
+        result = await get_materialized_views(backend).refresh(client, name, full=full)
+        return {
+            "success": True,
+            "message": f"Sicht '{name}' aktualisiert ({result['mode']}, {result['changed']} Änderungen)",
+            "refresh": result
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Aktualisieren der Sicht '{name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Aktualisieren der Sicht '{name}'"
+        }
+
+@mcp.tool()
+async def query_materialized_view(name: str, max_age_seconds: int = 300, backend: str = "") -> Dict[str, Any]:
+    """
+    Liest die Gruppen einer materialisierten Sicht.
+    
+    Gelesen werden nur die gespeicherten Gruppen, unabhängig von der
+    Anzahl der Einträge. Ist die Sicht älter als max_age_seconds, werden
+    vorher die Änderungen seit dem Wasserstand angewendet.
+    
+    Args:
+        name: Name der Sicht
+        max_age_seconds: Maximales Alter in Sekunden (Standard: 300, -1 = nie aktualisieren)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Gruppen mit Aggregaten, Wasserstand und ggf. das Ergebnis der Aktualisierung
+    """
+    try:
+        client = await get_api_client(backend)
+        views = get_materialized_views(backend)
+        refreshed = None
+        age = views.age(name)
+        if max_age_seconds >= 0 and (age is None or age > max_age_seconds):
+            refreshed = await views.refresh(client, name)
+        data = views.read(name)
+        response = {
+            "success": True,
+            "message": f"Sicht '{name}': {len(data['groups'])} Gruppen",
+            "data": data
+        }
+        if refreshed:
+            response["refreshed"] = refreshed
+        return response
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Lesen der Sicht '{name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Lesen der Sicht '{name}'"
+        }
+
+@mcp.tool()
+async def list_materialized_views(check_upstream: bool = False, backend: str = "") -> Dict[str, Any]:
+    """
+    Listet die materialisierten Sichten mit Definition, Wasserstand und Alter.
+    
+    Args:
+        check_upstream: Pro Sicht bei der API zählen, wie viele Einträge seit dem Wasserstand geändert wurden
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Sichten mit age_seconds und (bei check_upstream) pending_changes und stale
+    """
+    try:
+        client = await get_api_client(backend)
+        views = get_materialized_views(backend)
+        described = [views.describe(name) for name in views.names()]
+        if check_upstream:
+            pending = await asyncio.gather(*(views.pending_changes(client, view["name"]) for view in described))
+            for view, count in zip(described, pending):
+                view["pending_changes"] = count
+                view["stale"] = count is None or count > 0
+        return {
+            "success": True,
+            "count": len(described),
+            "views": described
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Auflisten der Sichten: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Auflisten der materialisierten Sichten"
+        }
+
+@mcp.tool()
+async def drop_materialized_view(name: str, backend: str = "") -> Dict[str, Any]:
+    """
+    Löscht eine materialisierte Sicht.
+    
+    Args:
+        name: Name der Sicht
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Bestätigung der Löschung
+    """
+    try:
+        await get_api_client(backend)
+        if not get_materialized_views(backend).drop(name):
+            raise ValueError(f"Materialisierte Sicht '{name}' existiert nicht (siehe list_materialized_views)")
+        return {
+            "success": True,
+            "message": f"Sicht '{name}' gelöscht"
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Löschen der Sicht '{name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Löschen der Sicht '{name}'"
+        }
+
+async def _validate_entry_data(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    data: Any,
+    partial: bool
+) -> Dict[str, Any] | None:
+    """
+    Validiert Entry-Daten lokal gegen das Attribut-Schema der Resource.
+    
+    Returns:
+        Fehler-Antwort für das Tool oder None wenn die Daten gültig sind
+        (oder das Schema nicht geladen werden konnte)
+    """
+    if not isinstance(data, dict):
+        return {
+            "success": False,
+            "error": "Entry-Daten müssen ein JSON-Objekt sein",
+            "message": f"Ungültige Daten für Resource '{resource_name}'"
+        }
+    
+    try:
+        validator = await client.get_entry_validator(resource_name)
+    except Exception as e:
+        # Ohne Schema entscheidet der Server
+        logger.warning(f"Attribut-Schema für '{resource_name}' nicht verfügbar, überspringe Validierung: {e}")
+        return None
+    
+    errors = validator.validate(data, partial=partial)
+    if not errors:
+        return None
+    
+    return {
+        "success": False,
+        "error": "; ".join(error["message"] for error in errors),
+        "message": f"Validierung für Resource '{resource_name}' fehlgeschlagen (nichts gesendet)",
+        "validation_errors": errors,
+        "unknown_fields": validator.unknown_fields(data)
+    }
+
+@mcp.tool()
+async def create_generic_entry(
+    resource_name: str,
+    entry_data_json: str,
+    validate: bool = True,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Erstellt einen neuen Eintrag in einer Resource (echte Daten in Tabellen).
+    
+    Args:
+        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
+        entry_data_json: JSON-String mit den Daten für den neuen Eintrag
+        validate: Daten vorab lokal gegen die Attribut-Definitionen prüfen (Standard: True)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Strukturierte Antwort mit dem erstellten Eintrag
+        
+    Beispiele für entry_data_json:
+        '{"name": "Morgenlauf", "distance_km": 5.2, "training_type": "dauerlauf"}'
+        '{"name": "Canva Pro", "amount": 27.50, "state": "ok", "from": "canva.com"}'
+        '{"product_name": "Laptop", "is_available": true, "priority": "high"}'
+        
+    Automatische Felder (werden vom System gesetzt):
+        - object_id: Eindeutige UUID für den Eintrag
+        - date_created: Zeitstempel der Erstellung
+        - date_updated: Zeitstempel der letzten Änderung
+        - subscription: Verknüpfung zum Dimetrics-Account
+        
+    Pflichtfelder (je nach Resource):
+        - name: Name/Titel des Eintrags (meist erforderlich)
+        - state: Status des Eintrags (falls vorhanden, z.B. "active", "ok", "pending")
+    """
+    try:
+        import json
+        
+        # Entry-Daten JSON parsen
+        try:
+            entry_data = json.loads(entry_data_json)
+        except json.JSONDecodeError as e:
+            return {
+                "success": False,
+                "error": f"Ungültiges JSON-Format für Entry-Daten: {e}",
+                "message": "Fehler beim Parsen der Entry-Daten-Parameter"
+            }
+        
+        client = await get_api_client(backend)
+        
+        # Lokale Validierung spart bei ungültigen Daten den Roundtrip und die 400-Antwort
+        if validate:
+            validation_error = await _validate_entry_data(client, resource_name, entry_data, partial=False)
+            if validation_error:
+                return validation_error
+        
+        result = await client.create_generic_entry(
+            resource_name=resource_name,
+            data=entry_data
+        )
+        
+        return {
+            "success": True,
+            "message": f"Eintrag in Resource '{resource_name}' erfolgreich erstellt",
+            "entry": result,
+            "resource_name": resource_name,
+            "created_id": result.get("object_id"),
+            "entry_data": entry_data
+        }
+        
+    except Exception as e:
+        logger.error(f"Fehler beim Erstellen des Generic Entry für '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Erstellen des Eintrags für Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def get_generic_entry(
+    resource_name: str,
+    entry_id: str,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Holt einen spezifischen Eintrag aus einer Resource (echte Daten).
+    
+    Args:
+        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
+        entry_id: object_id des Eintrags (UUID)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Strukturierte Antwort mit den detaillierten Eintragsdaten
+        
+    Beispiele:
+        resource_name="lau6_RunEntries", entry_id="a1b2c3d4-e5f6-7890-abcd-ef1234567890"
+        resource_name="n8n_collection", entry_id="c89515a4-13f3-4d7e-b4a5-249b5b4e8368"
+        
+    Rückgabedaten enthalten:
+        - Alle Attribute-Werte des Eintrags
+        - Metadaten: object_id, date_created, date_updated, subscription
+        - Relation-Fields: Verknüpfte Objekte (vendor, etc.)
+    """
+    try:
+        client = await get_api_client(backend)
+        result = await client.get_generic_entry(
+            resource_name=resource_name,
+            entry_id=entry_id
+        )
+        
+        return {
+            "success": True,
+            "message": f"Eintrag '{entry_id}' aus Resource '{resource_name}' erfolgreich abgerufen",
+            "entry": result,
+            "resource_name": resource_name,
+            "entry_id": entry_id
+        }
+        
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen des Generic Entry '{entry_id}' für '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Abrufen des Eintrags '{entry_id}' für Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def update_generic_entry(
+    resource_name: str,
+    entry_id: str,
+    update_data_json: str,
+    validate: bool = True,
+    only_changed: bool = False,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Aktualisiert einen Eintrag in einer Resource (PATCH - nur veränderte Felder).
+    
+    Args:
+        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
+        entry_id: object_id des zu aktualisierenden Eintrags (UUID)
+        update_data_json: JSON-String mit den zu ändernden Daten
+        validate: Daten vorab lokal gegen die Attribut-Definitionen prüfen (Standard: True)
+        only_changed: Nur tatsächlich geänderte Felder senden (Standard: False). Vergleicht
+                      gegen eine gecachte (max. 60s alte) oder frisch geladene Kopie und
+                      überspringt den PATCH komplett, wenn sich nichts ändert.
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Strukturierte Antwort mit dem aktualisierten Eintrag
+        
+    Beispiele für update_data_json:
+        '{"distance_km": 6.8, "notes": "Sehr guter Lauf!"}'
+        '{"state": "completed", "amount": 29.99}'
+        '{"priority": "urgent", "is_available": false}'
+        
+    PATCH-Verhalten:
+        - Nur angegebene Felder werden geändert
+        - Andere Felder bleiben unverändert
+        - date_updated wird automatisch aktualisiert
+        - object_id und date_created bleiben unverändert
+        
+    Häufige Update-Szenarien:
+        - Status ändern: '{"state": "completed"}'
+        - Werte korrigieren: '{"distance_km": 5.5, "pace_min_per_km": 5.2}'
+        - Notizen hinzufügen: '{"notes": "Toller Lauf bei perfektem Wetter"}'
+        - Verfügbarkeit ändern: '{"is_available": true}'
+    """
+    try:
+        import json
+        
+        # Update-Daten JSON parsen
+        try:
+            update_data = json.loads(update_data_json)
+        except json.JSONDecodeError as e:
+            return {
+                "success": False,
+                "error": f"Ungültiges JSON-Format für Update-Daten: {e}",
+                "message": "Fehler beim Parsen der Update-Daten-Parameter"
+            }
+        
+        client = await get_api_client(backend)
+        
+        if validate:
+            validation_error = await _validate_entry_data(client, resource_name, update_data, partial=True)
+            if validation_error:
+                return validation_error
+        
+        if only_changed:
+            diff_result = await client.update_generic_entry_if_changed(
+                resource_name=resource_name,
+                entry_id=entry_id,
+                data=update_data
+            )
+            skipped = diff_result["skipped"]
+            return {
+                "success": True,
+                "message": (
+                    f"Eintrag '{entry_id}' in Resource '{resource_name}' unverändert, kein Request gesendet"
+                    if skipped else
+                    f"Eintrag '{entry_id}' in Resource '{resource_name}' erfolgreich aktualisiert"
+                ),
+                "entry": diff_result["entry"],
+                "resource_name": resource_name,
+                "entry_id": entry_id,
+                "skipped": skipped,
+                "updated_fields": diff_result["changed_fields"],
+                "unchanged_fields": [field for field in update_data if field not in diff_result["changed_fields"]],
+                "compared_against": diff_result["source"],
+                "bytes_saved": diff_result["bytes_saved"]
+            }
+        
+        result = await client.update_generic_entry(
+            resource_name=resource_name,
+            entry_id=entry_id,
+            data=update_data
+        )
+        
+        return {
+            "success": True,
+            "message": f"Eintrag '{entry_id}' in Resource '{resource_name}' erfolgreich aktualisiert",
+            "entry": result,
+            "resource_name": resource_name,
+            "entry_id": entry_id,
+            "updated_fields": list(update_data.keys()),
+            "update_data": update_data
+        }
+        
+    except Exception as e:
+        logger.error(f"Fehler beim Aktualisieren des Generic Entry '{entry_id}' für '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Aktualisieren des Eintrags '{entry_id}' für Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def delete_generic_entry(
+    resource_name: str,
     entry_id: str,
-    update_data_json: str
+    confirm_deletion: bool = False,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Löscht einen Eintrag aus einer Resource (VORSICHT: Unwiderruflich!).
+    
+    Args:
+        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
+        entry_id: object_id des zu löschenden Eintrags (UUID)
+        confirm_deletion: Bestätigung für die Löschung (MUSS True sein)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Strukturierte Antwort mit Lösch-Bestätigung
+        
+    ⚠️  WARNUNG: Diese Aktion ist UNWIDERRUFLICH!
+        - Der Eintrag wird permanent aus der Datenbank entfernt
+        - Alle Daten des Eintrags gehen verloren
+        - Verknüpfungen zu anderen Objekten werden gelöscht
+        
+    Sicherheits-Check:
+        - confirm_deletion MUSS auf True gesetzt werden
+        - Ohne Bestätigung wird die Löschung abgebrochen
+        
+    Beispiele:
+        resource_name="lau6_RunEntries", entry_id="...", confirm_deletion=True
+        resource_name="n8n_collection", entry_id="...", confirm_deletion=True
+        
+    Empfehlung:
+        - Vorher mit get_generic_entry() die Daten überprüfen
+        - Bei wichtigen Daten: Backup/Export vor Löschung
+        - Für Tests: Nur Test-Einträge löschen, niemals produktive Daten
+    """
+    try:
+        # Sicherheits-Check
+        if not confirm_deletion:
+            return {
+                "success": False,
+                "error": "Löschung nicht bestätigt",
+                "message": "Setzen Sie confirm_deletion=True zur Bestätigung der Löschung",
+                "warning": "Diese Aktion ist unwiderruflich! Überprüfen Sie die Daten vorher."
+            }
+        
+        client = await get_api_client(backend)
+        result = await client.delete_generic_entry(
+            resource_name=resource_name,
+            entry_id=entry_id
+        )
+        
+        return {
+            "success": True,
+            "message": f"Eintrag '{entry_id}' aus Resource '{resource_name}' erfolgreich gelöscht",
+            "deletion_result": result,
+            "resource_name": resource_name,
+            "deleted_entry_id": entry_id,
+            "warning": "Löschung war erfolgreich und unwiderruflich."
+        }
+        
+    except Exception as e:
+        logger.error(f"Fehler beim Löschen des Generic Entry '{entry_id}' für '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Löschen des Eintrags '{entry_id}' für Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def get_client_metrics(backend: str = "") -> Dict[str, Any]:
+    """
+    Liefert Laufzeit-Kennzahlen des API Clients.
+    
+    Args:
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Cache-Größen und Zähler, u.a. für diff-basierte Updates
+        (patches_sent, patches_skipped, fields_dropped, bytes_saved),
+        JSON-Decoding, adaptive Seitengrößen pro Resource, Trefferquote
+        des Vorladens von Folgeseiten (prefetch, falls aktiv), abgelegte
+        Ergebnisse (results) und Event-Loop-Verzögerung des Prozesses
+    """
+    try:
+        client = await get_api_client(backend)
+        return {
+            "success": True,
+            "metrics": client.get_metrics(),
+            "prefetch": page_prefetcher.describe() if page_prefetcher is not None else None,
+            "results": result_store.describe() if result_store is not None else None,
+            "event_loop": loop_monitor.snapshot()
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen der Client-Metriken: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Abrufen der Client-Metriken"
+        }
+
+@mcp.tool()
+async def upsert_generic_entries(
+    resource_name: str,
+    rows_json: str,
+    key_fields: str = "",
+    concurrency: int = 8,
+    validate: bool = True,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Legt Einträge an oder aktualisiert bestehende (Upsert) anhand von Schlüssel-Attributen.
+    
+    Args:
+        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
+        rows_json: JSON-Liste der Zeilen, z.B. '[{"external_id": "A-1", "name": "..."}, ...]'
+        key_fields: Komma-getrennte Schlüssel-Attribute (leer = unique-Attribute der Resource)
+        concurrency: Anzahl paralleler Schreib-Requests (Standard: 8)
+        validate: Zeilen vorab lokal gegen die Attribut-Definitionen prüfen (Standard: True)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Zähler (created, updated, unchanged, failed) und Ergebnis pro Zeile
+        
+    Ablauf (ca. zwei Roundtrips pro Batch):
+        1. Bestehende object_ids werden mit gechunkten _in-Abfragen auf die
+           Schlüssel-Attribute aufgelöst
+        2. Creates (neue Schlüssel) und PATCHes (bestehende Schlüssel) werden
+           parallel gesendet
+        
+    Hinweise:
+        - Bestehende Einträge erhalten nur die geänderten Felder; unveränderte
+          Zeilen werden ohne Request als 'unchanged' gemeldet
+        - Zeilen ohne Schlüsselwert oder mit doppeltem Schlüssel im Batch schlagen fehl
+        - Trifft ein Schlüssel mehrere bestehende Einträge, wird die Zeile nicht geschrieben
+    """
+    try:
+        import json
+        
+        try:
+            rows = json.loads(rows_json)
+        except json.JSONDecodeError as e:
+            return {
+                "success": False,
+                "error": f"Ungültiges JSON-Format für rows_json: {e}",
+                "message": "Fehler beim Parsen der Zeilen"
+            }
+        
+        if not isinstance(rows, list):
+            return {
+                "success": False,
+                "error": "rows_json muss eine JSON-Liste sein",
+                "message": "Ungültiges Format für Upsert-Zeilen"
+            }
+        
+        client = await get_api_client(backend)
+        
+        fields = [field.strip() for field in key_fields.split(",") if field.strip()]
+        if not fields:
+            validator = await client.get_entry_validator(resource_name)
+            fields = list(validator.unique_fields)
+        if not fields:
+            return {
+                "success": False,
+                "error": "Keine key_fields angegeben und Resource hat keine unique-Attribute",
+                "message": f"Upsert für Resource '{resource_name}' nicht möglich"
+            }
+        
+        summary = await upsert_entries(
+            client=client,
+            resource_name=resource_name,
+            rows=rows,
+            key_fields=fields,
+            concurrency=concurrency,
+            validate=validate
+        )
+        
+        return {
+            "success": summary["failed"] == 0,
+            "message": (
+                f"Upsert für Resource '{resource_name}': {summary['created']} erstellt, "
+                f"{summary['updated']} aktualisiert, {summary['unchanged']} unverändert, "
+                f"{summary['failed']} fehlgeschlagen"
+            ),
+            "upsert": summary
+        }
+        
+    except Exception as e:
+        logger.error(f"Fehler beim Upsert für Resource '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Upsert der Einträge für Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def import_resource(
+    resource_name: str,
+    file_path: str,
+    file_format: str = "",
+    concurrency: int = 8,
+    resume: bool = True,
+    validate_only: bool = False,
+    max_rows: int = 0,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Importiert eine CSV/NDJSON-Datei in eine Resource (Streaming, ohne LLM pro Zeile).
+    
+    Args:
+        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
+        file_path: Pfad zur Datei, relativ zum Dateiverzeichnis DIMETRICS_FILE_DIR
+        file_format: csv, tsv oder ndjson (leer = aus Dateiendung ermitteln)
+        concurrency: Anzahl paralleler create-Requests (Standard: 8)
+        resume: Fortsetzen ab dem letzten Checkpoint (Standard: True)
+        validate_only: Nur validieren, nichts senden (Standard: False)
+        max_rows: Maximale Anzahl zu verarbeitender Zeilen (0 = alle)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Zusammenfassung mit created/rejected-Zählern, Durchsatz und Pfaden
+        
+    Ablauf:
+        - Die Datei wird zeilenweise gelesen, CSV-Werte werden anhand der
+          Attribut-Typen konvertiert (Zahlen, Booleans)
+        - Jede Zeile wird gegen das gecachte Attribut-Schema geprüft
+          (Typ, required, maxLength/minLength, minNumeric/maxNumeric,
+          Dropdown-Optionen, Duplikate bei unique-Feldern innerhalb der Datei,
+          auch über einen Resume hinweg)
+        - Gültige Zeilen werden mit begrenzter Parallelität erstellt
+        - Ungültige oder vom Server abgelehnte Zeilen landen in
+          '<file_path>.rejected.ndjson' (bei validate_only: '.invalid.ndjson')
+        - Der Fortschritt wird in '<file_path>.checkpoint.json' gespeichert;
+          ein erneuter Aufruf mit resume=True setzt dort fort
+    """
+    try:
+        source = _file_path(file_path)
+        if not os.path.isfile(source):
+            return {
+                "success": False,
+                "error": f"Datei '{file_path}' nicht gefunden",
+                "message": f"Fehler beim Import in Resource '{resource_name}'"
+            }
+        
+        client = await get_api_client(backend)
+        importer = ResourceImporter(
+            client=client,
+            resource_name=resource_name,
+            file_path=source,
+            file_format=file_format,
+            concurrency=concurrency,
+            resume=resume,
+            validate_only=validate_only,
+            max_rows=max_rows
+        )
+        summary = await importer.run()
+        
+        action = "validiert" if validate_only else "importiert"
+        return {
+            "success": True,
+            "message": (
+                f"{summary['processed']} Zeilen für Resource '{resource_name}' {action}: "
+                f"{summary['valid']} gültig, {summary['rejected']} abgelehnt"
+            ),
+            "import": summary
+        }
+        
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Import in Resource '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Import der Datei '{file_path}' in Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def export_resource(
+    resource_name: str,
+    file_path: str,
+    partition_by: str = "object_id",
+    partitions: int = 8,
+    ordering: str = "",
+    directus_filter_json: str = "",
+    page_size: int = 0,
+    concurrency: int = 8,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Exportiert alle (gefilterten) Einträge einer Resource als NDJSON-Datei (Gegenstück zu import_resource).
+    
+    Die Resource wird in disjunkte Bereiche zerlegt, die parallel per
+    Keyset-Pagination gelesen werden: object_id-Präfixe oder Wertebereiche
+    eines Zahlen-/Zeitstempel-Felds. Die Grenzen richten sich nach der
+    Anzahl pro Bereich (zu große werden geteilt, kleine zusammengelegt).
+    Mit ordering werden die sortierten Bereiche per K-Wege-Merge vereinigt.
+    Jeder Bereich wird beim Lesen seitenweise auf die Platte geschrieben,
+    die Resource liegt also nie vollständig im Speicher.
+    
+    Args:
+        resource_name: Name der Resource
+        file_path: Zieldatei (.ndjson), relativ zum Dateiverzeichnis DIMETRICS_FILE_DIR
+        partition_by: 'object_id' (Standard) oder ein Zahlen-/Zeitstempel-Feld, z.B. 'date_created'
+        partitions: Angestrebte Anzahl Bereiche (Standard: 8)
+        ordering: Ein Sortierfeld, optional absteigend (z.B. '-date_created'); leer = Reihenfolge der Bereiche
+        directus_filter_json: Optionaler Directus-Filter als JSON
+        page_size: Einträge pro API-Request (0 = adaptiv nach Zeilengröße und Latenz, Standard)
+        concurrency: Parallel laufende Requests (Standard: 8)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Anzahl exportierter Einträge, Pfad und Statistik pro Bereich
+    """
+    try:
+        directus_filter = json.loads(directus_filter_json) if directus_filter_json else None
+        target = _file_path(file_path, create_dirs=True)
+        client = await get_api_client(backend)
+        entries, stats = await partitioned_export(
+            client,
+            resource_name,
+            target,
+            partition_by=partition_by,
+            partitions=partitions,
+            directus_filter=directus_filter,
+            ordering=ordering or None,
+            page_size=page_size,
+            concurrency=concurrency
+        )
+        return {
+            "success": True,
+            "message": f"{entries} Einträge aus Resource '{resource_name}' nach '{file_path}' exportiert",
+            "export": {"file_path": file_path, "entries": entries, **stats}
+        }
+        
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"Ungültiges JSON-Format für Directus-Filter: {e}",
+            "message": "Fehler beim Parsen der Export-Parameter"
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Export der Resource '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Export der Resource '{resource_name}' nach '{file_path}'"
+        }
+
+@mcp.tool()
+async def approximate_aggregate(
+    resource_name: str,
+    aggregate_json: str,
+    directus_filter_json: str = "",
+    search: str = "",
+    percentiles: str = "0.5,0.9,0.99",
+    top_k: int = 10,
+    precision: int = 14,
+    page_size: int = 0,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Näherungsweise Aggregate, die die API nicht anbietet: Anzahl verschiedener
+    Werte, Median/Perzentile und häufigste Werte.
+    
+    Liest alle passenden Einträge seitenweise (Keyset) und rechnet sie in
+    Sketches mit festem Speicher ein (HyperLogLog, t-digest, Space-Saving);
+    die Zeilen selbst werden nicht gehalten, auch nicht bei Millionen Einträgen.
+    
+    Args:
+        resource_name: Name der Resource
+        aggregate_json: Funktion -> Spalte(n), z.B. '{"median": "pace", "count_distinct": "shoe", "top_k": ["shoe", "route"]}'
+        directus_filter_json: Optionaler Directus-Filter als JSON
+        search: Suchbegriff für Textfelder
+        percentiles: Kommagetrennte Quantile für "percentiles" (Standard: 0.5,0.9,0.99)
+        top_k: Anzahl häufigster Werte für "top_k" (Standard: 10)
+        precision: HyperLogLog-Präzision 4-16; Standardfehler 1.04/sqrt(2^precision), 14 = ca. 0.8 % (Standard)
+        page_size: Einträge pro API-Request (0 = adaptiv nach Zeilengröße und Latenz, Standard)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Funktionen:
+        count_distinct: Anzahl verschiedener Werte (bis 1024 exakt)
+        median: Median (Zahlen oder Zeitstempel)
+        percentiles: Quantile aus percentiles, z.B. p90
+        top_k: Häufigste Werte mit count (obere Schranke) und error (count - error = untere Schranke)
+    
+    Returns:
+        values pro "funktion_spalte", Anzahl gefüllter Werte pro Spalte,
+        Genauigkeit pro Sketch und gelesene Einträge/Seiten
+    """
+    try:
+        aggregates = json.loads(aggregate_json)
+        directus_filter = json.loads(directus_filter_json) if directus_filter_json else None
+    except json.JSONDecodeError as e:
+        return {
+            "success": False,
+            "error": f"Ungültiges JSON-Format für Aggregations-Parameter: {e}",
+            "message": "Fehler beim Parsen der Aggregations-Parameter"
+        }
+    try:
+        try:
+            quantiles = [float(item) for item in percentiles.split(",") if item.strip()]
+        except ValueError:
+            raise ValueError(f"Ungültige percentiles '{percentiles}' (kommagetrennte Zahlen, z.B. 0.5,0.9,0.99)")
+        aggregation = SketchAggregation(
+            normalize_sketch_spec(aggregates),
+            percentiles=quantiles,
+            top_k=top_k,
+            precision=precision
+        )
+        client = await get_api_client(backend)
+        result = await sketch_aggregate(
+            client,
+            resource_name,
+            aggregation,
+            directus_filter=directus_filter,
+            search=search or None,
+            page_size=page_size if page_size > 0 else None
+        )
+        return {
+            "success": True,
+            "message": f"{result['rows']} Einträge aus Resource '{resource_name}' ausgewertet",
+            "resource_name": resource_name,
+            "aggregate": result
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler bei der näherungsweisen Aggregation über '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler bei der näherungsweisen Aggregation über Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def profile_resource(
+    resource_name: str,
+    refresh: bool = False,
+    bins: int = 10,
+    top_values: int = 10,
+    page_size: int = 0,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Profil aller Spalten einer Resource in einem Durchlauf, z.B. bevor Filter gebaut werden.
+    
+    Ersetzt list_attributes plus Stichproben über mehrere list_generic_entries-
+    Aufrufe. Pro Spalte: Typ, Null-Anteil, geschätzte Anzahl verschiedener
+    Werte, Minimum/Maximum; für Zahlen und Zeitstempel Median und Histogramm,
+    für Dropdown-, Status- und Boolean-Felder die häufigsten Werte. Das Profil
+    bleibt im Cache, bis sich der Wasserstand der Resource (Anzahl Einträge,
+    neuester update_timestamp) ändert; die Prüfung kostet einen Request.
+    
+    Args:
+        resource_name: Name der Resource
+        refresh: Profil neu berechnen, auch wenn der Wasserstand unverändert ist (Standard: False)
+        bins: Klassen pro Histogramm (Standard: 10)
+        top_values: Anzahl häufigster Werte pro Dropdown-/Status-Feld (Standard: 10)
+        page_size: Einträge pro API-Request (0 = adaptiv nach Zeilengröße und Latenz, Standard)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        columns mit dem Profil pro Spalte, rows, watermark und ob das Profil
+        aus dem Cache kam (cached, age_seconds)
+    """
+    try:
+        client = await get_api_client(backend)
+        profile = await get_profile_cache().profile(
+            client,
+            (client.name, _session_tenant(), resource_name),
+            resource_name,
+            refresh=refresh,
+            page_size=page_size if page_size > 0 else None,
+            bins=bins,
+            top=top_values
+        )
+        source = "aus dem Cache" if profile["cached"] else "berechnet"
+        return {
+            "success": True,
+            "message": f"Profil für Resource '{resource_name}' ({profile['rows']} Einträge, {len(profile['columns'])} Spalten) {source}",
+            "profile": profile
+        }
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Profilieren der Resource '{resource_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Profilieren der Resource '{resource_name}'"
+        }
+
+@mcp.tool()
+async def create_complete_app(
+    app_name: str,
+    tables_json: str,
+    app_description: str = "",
+    prefix: str = "",
+    service_name: str = "",
+    concurrency: int = 4,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Erstellt eine komplette App mit Service, Resources (Tabellen) und Attributen.
+    
+    Args:
+        app_name: Name der App (kurz halten, max. 12-15 Zeichen)
+        tables_json: JSON-Liste der Tabellen-Definitionen, z.B.
+                     '[{"name": "kunden", "title": "Kunden", "attributes": [
+                         {"name": "vorname", "type": "INPUT_FIELD", "label": "Vorname", "required": true}]},
+                       {"name": "vertraege", "attributes": [
+                         {"name": "kunde", "type": "RELATION_FIELD", "label": "Kunde", "linked_resource": "kunden"}]}]'
+        app_description: Beschreibung der App
+        prefix: Prefix der App (optional, max. 5 Zeichen, wird sonst generiert)
+        service_name: Name des Services (Standard: app_name)
+        concurrency: Anzahl paralleler Requests (Standard: 4)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        IDs von App, Service und Resources sowie Anzahl der Roundtrips
+        
+    Ablauf:
+        1. App und Service anlegen
+        2. Alle Resources parallel anlegen
+        3. Pro Resource die einfachen Attribute mit einem create_attributes_bulk
+        4. Relations-Attribute (linked_resource = Tabellenname aus tables_json
+           oder UUID einer bestehenden Resource) per Bulk, sobald die
+           Ziel-Resources existieren
+        
+    Hinweise:
+        - Die Definitionen werden vorab geprüft; bei Fehlern wird nichts angelegt
+        - Schlägt ein Schritt fehl, werden alle erstellten Resources, der Service
+          und die App wieder gelöscht (rolled_back=True)
+        - Für große Apps über submit_job('create_complete_app', ...) starten
+    """
+    try:
+        import json
+        
+        try:
+            tables = json.loads(tables_json)
+        except json.JSONDecodeError as e:
+            return {
+                "success": False,
+                "error": f"Ungültiges JSON-Format für tables_json: {e}",
+                "message": "Fehler beim Parsen der Tabellen-Definitionen"
+            }
+        
+        if not isinstance(tables, list):
+            return {
+                "success": False,
+                "error": "tables_json muss eine JSON-Liste sein",
+                "message": "Ungültiges Format für Tabellen-Definitionen"
+            }
+        
+        client = await get_api_client(backend)
+        builder = AppBuilder(
+            client=client,
+            app_name=app_name,
+            tables=tables,
+            app_description=app_description,
+            prefix=prefix,
+            service_name=service_name,
+            concurrency=concurrency
+        )
+        result = await builder.run()
+        
+        return {
+            "success": True,
+            "message": (
+                f"App '{app_name}' mit {len(result['resources'])} Resources "
+                f"in {result['requests']} Requests erstellt"
+            ),
+            "result": result
+        }
+        
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err),
+            "message": "Ungültige Tabellen-Definitionen, es wurde nichts angelegt"
+        }
+    except AppBuildError as build_err:
+        return {
+            "success": False,
+            "error": str(build_err),
+            "message": f"Fehler beim Erstellen der App '{app_name}', erstellte Objekte wurden zurückgerollt",
+            "result": build_err.result
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Erstellen der kompletten App '{app_name}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Erstellen der kompletten App '{app_name}'"
+        }
+
+def _parse_schema_json(schema_json: str) -> Dict[str, Any]:
+    """Parst ein Soll-Schema für plan_schema/apply_schema."""
+    try:
+        schema = json.loads(schema_json)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Ungültiges JSON-Format für schema_json: {e}")
+    if not isinstance(schema, dict):
+        raise ValueError("schema_json muss ein JSON-Objekt mit 'apps' sein")
+    return schema
+
+@mcp.tool()
+async def plan_schema(schema_json: str, prune: bool = False, backend: str = "") -> Dict[str, Any]:
+    """
+    Vergleicht ein Soll-Schema mit dem Live-Zustand und zeigt die nötigen Operationen (ohne zu schreiben).
+    
+    Args:
+        schema_json: Soll-Zustand als JSON, z.B.
+                     '{"apps": [{"name": "Shop", "services": [{"name": "shop", "resources": [
+                        {"name": "kunden", "title": "Kunden",
+                         "attributes": [{"name": "email", "type": "INPUT_FIELD", "label": "E-Mail"}],
+                         "permission_groups": [{"name": "Leser", "subscription": "<uuid>", "show_resource": true}]}]}]}]}'
+        prune: Live-Attribute löschen, die im Schema fehlen (Standard: False)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Operationen (create/update/delete) mit Abhängigkeiten, Stufen parallel
+        ausführbarer Operationen, Anzahl Schreib-Requests und Warnungen
+        
+    Hinweise:
+        - Objekte werden per Name innerhalb ihres Elternobjekts zugeordnet
+          (Service- und Resource-Namen auch mit App-Präfix)
+        - Verglichen werden nur die im Schema angegebenen Felder
+        - linked_resource darf den Namen einer Resource aus dem Schema enthalten
+        - Ein unverändertes Schema ergibt einen leeren Plan (writes = 0)
+    """
+    try:
+        schema = _parse_schema_json(schema_json)
+        client = await get_api_client(backend)
+        _, plan = await plan_schema_changes(client, schema, prune=prune)
+        
+        summary = plan["summary"]
+        return {
+            "success": True,
+            "message": (
+                f"Plan: {summary['create']} create, {summary['update']} update, {summary['delete']} delete "
+                f"in {len(plan['stages'])} Stufen"
+            ),
+            "plan": plan
+        }
+        
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Planen des Schemas: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Abgleich des Schemas mit dem Live-Zustand"
+        }
+
+@mcp.tool()
+async def apply_schema(schema_json: str, prune: bool = False, concurrency: int = 4, backend: str = "") -> Dict[str, Any]:
+    """
+    Wendet ein Soll-Schema an: plant die minimalen Operationen und führt sie stufenweise aus.
+    
+    Args:
+        schema_json: Soll-Zustand als JSON (Format siehe plan_schema)
+        prune: Live-Attribute löschen, die im Schema fehlen (Standard: False)
+        concurrency: Anzahl paralleler Requests innerhalb einer Stufe (Standard: 4)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Plan, Ergebnis pro Operation und Anzahl der Schreib-Requests
+        
+    Hinweise:
+        - Unabhängige Operationen (z.B. Resources eines Services, Attribute
+          verschiedener Resources) laufen parallel
+        - Neue Attribute einer Resource werden mit einem create_attributes_bulk angelegt
+        - Nach einer Stufe mit Fehlern wird abgebrochen; ein erneutes
+          apply_schema setzt am aktuellen Live-Zustand fort
+        - Ein unverändertes Schema löst keine Schreib-Requests aus
+    """
+    try:
+        schema = _parse_schema_json(schema_json)
+        client = await get_api_client(backend)
+        planner, plan = await plan_schema_changes(client, schema, prune=prune, concurrency=concurrency)
+        
+        if not plan["operations"]:
+            return {
+                "success": True,
+                "message": "Schema ist aktuell, keine Änderungen nötig",
+                "plan": plan,
+                "apply": {"results": [], "summary": {"done": 0, "failed": 0, "skipped": 0, "writes": 0}}
+            }
+        
+        applied = await SchemaApplier(client, planner, concurrency=concurrency).apply(plan)
+        summary = applied["summary"]
+        
+        return {
+            "success": summary["failed"] == 0,
+            "message": (
+                f"Schema angewendet: {summary['done']} Operationen ausgeführt, "
+                f"{summary['failed']} fehlgeschlagen, {summary['skipped']} übersprungen"
+            ),
+            "plan": plan,
+            "apply": applied
+        }
+        
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Anwenden des Schemas: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Anwenden des Schemas"
+        }
+
+def _import_summary(result: Dict[str, Any]) -> str:
+    summary = result["apply"]["summary"]
+    return (
+        f"{summary['done']} Operationen ausgeführt, {summary['failed']} fehlgeschlagen, "
+        f"{len(result['id_map'])} IDs zugeordnet"
+    )
+
+@mcp.tool()
+async def export_schema(app: str, include_permission_groups: bool = False, backend: str = "") -> Dict[str, Any]:
+    """
+    Exportiert den Schema-Baum einer App (Services, Resources, Attribute) als portables Dokument.
+    
+    Args:
+        app: object_id oder Name der App
+        include_permission_groups: Permission-Gruppen mit exportieren (Standard: False,
+                                   subscription-IDs sind backend-spezifisch)
+        backend: Name des Backends (leer = Standard-Backend, siehe list_backends)
+    
+    Returns:
+        Schema-Dokument im Format von apply_schema/import_schema
+        
+    Hinweise:
+        - object_ids werden entfernt, Namen ohne App-Präfix gespeichert
+        - linked_resource verweist auf Resource-Namen statt UUIDs
+        - Die Quell-IDs stehen unter schema.source.ids für die Zuordnung beim Import
+    """
+    try:
+        client = await get_api_client(backend)
+        document = await export_app_schema(client, app, include_permission_groups=include_permission_groups)
+        stats = document["stats"]
+        
+        return {
+            "success": True,
+            "message": (
+                f"Schema der App '{app}' exportiert: {stats['services']} Services, "
+                f"{stats['resources']} Resources, {stats['attributes']} Attribute"
+            ),
+            "schema": document
+        }
+        
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Export des Schemas der App '{app}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Export des Schemas der App '{app}'"
+        }
+
+@mcp.tool()
+async def import_schema(
+    schema_json: str,
+    app_name: str = "",
+    prefix: str = "",
+    concurrency: int = 4,
+    backend: str = ""
 ) -> Dict[str, Any]:
     """
-    Aktualisiert einen Eintrag in einer Resource (PATCH - nur veränderte Felder).
+    Importiert ein mit export_schema erzeugtes Schema in ein konfiguriertes Backend.
     
     Args:
-        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
-        entry_id: object_id des zu aktualisierenden Eintrags (UUID)
-        update_data_json: JSON-String mit den zu ändernden Daten
+        schema_json: Exportiertes Schema-Dokument als JSON
+        app_name: Neuer App-Name im Ziel (leer = Name aus dem Export)
+        prefix: App-Präfix im Ziel (leer = aus dem Export, 'auto' = neu generieren)
+        concurrency: Anzahl paralleler Requests (Standard: 4)
+        backend: Name des Ziel-Backends (leer = Standard-Backend, siehe list_backends)
     
     Returns:
-        Strukturierte Antwort mit dem aktualisierten Eintrag
+        Plan, Ausführungsergebnis und id_map (Quell-ID -> Ziel-ID)
         
-    Beispiele für update_data_json:
-        '{"distance_km": 6.8, "notes": "Sehr guter Lauf!"}'
-        '{"state": "completed", "amount": 29.99}'
-        '{"priority": "urgent", "is_available": false}'
+    Hinweise:
+        - Resources werden parallel angelegt, Attribute per create_attributes_bulk
+        - linked_resource-Namen werden auf die neuen object_ids im Ziel aufgelöst
+        - Bestehende Objekte gleichen Namens werden abgeglichen statt dupliziert;
+          ein erneuter Import ist daher idempotent
+    """
+    try:
+        document = _parse_schema_json(schema_json)
+        client = await get_api_client(backend)
         
-    PATCH-Verhalten:
-        - Nur angegebene Felder werden geändert
-        - Andere Felder bleiben unverändert
-        - date_updated wird automatisch aktualisiert
-        - object_id und date_created bleiben unverändert
+        result = await import_app_schema(
+            client,
+            document,
+            app_name=app_name,
+            prefix=None if not prefix else ("" if prefix == "auto" else prefix),
+            concurrency=concurrency
+        )
         
-    Häufige Update-Szenarien:
-        - Status ändern: '{"state": "completed"}'
-        - Werte korrigieren: '{"distance_km": 5.5, "pace_min_per_km": 5.2}'
-        - Notizen hinzufügen: '{"notes": "Toller Lauf bei perfektem Wetter"}'
-        - Verfügbarkeit ändern: '{"is_available": true}'
+        return {
+            "success": result["apply"]["summary"]["failed"] == 0,
+            "message": f"Schema importiert: {_import_summary(result)}",
+            "import": result
+        }
+        
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Import des Schemas: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Import des Schemas"
+        }
+
+@mcp.tool()
+async def clone_app_schema(
+    app: str,
+    target_backend: str = "",
+    app_name: str = "",
+    prefix: str = "",
+    include_permission_groups: bool = False,
+    concurrency: int = 4,
+    backend: str = ""
+) -> Dict[str, Any]:
+    """
+    Kopiert das Schema einer App aus diesem Backend in ein anderes (Export + Import in einem Schritt).
+    
+    Args:
+        app: object_id oder Name der App im Quell-Backend
+        target_backend: Name des Ziel-Backends (siehe list_backends)
+        app_name: Neuer App-Name im Ziel (leer = gleicher Name)
+        prefix: App-Präfix im Ziel (leer = gleiches Präfix, 'auto' = neu generieren)
+        include_permission_groups: Permission-Gruppen mitkopieren (Standard: False)
+        concurrency: Anzahl paralleler Requests (Standard: 4)
+        backend: Name des Quell-Backends (leer = Standard-Backend)
+    
+    Returns:
+        Export-Statistik, Import-Ergebnis und id_map (Quell-ID -> Ziel-ID)
+    """
+    try:
+        if not target_backend:
+            raise ValueError("target_backend muss angegeben werden (siehe list_backends)")
+        client = await get_api_client(backend)
+        target_client = await get_api_client(target_backend)
+        if target_client is client:
+            raise ValueError("Quell- und Ziel-Backend sind identisch")
+        document = await export_app_schema(
+            client, app, include_permission_groups=include_permission_groups, concurrency=concurrency
+        )
+        
+        result = await import_app_schema(
+            target_client,
+            document,
+            app_name=app_name,
+            prefix=None if not prefix else ("" if prefix == "auto" else prefix),
+            concurrency=concurrency
+        )
+        
+        return {
+            "success": result["apply"]["summary"]["failed"] == 0,
+            "message": f"Schema der App '{app}' nach {target_backend} kopiert: {_import_summary(result)}",
+            "export": {"stats": document["stats"], "warnings": document["warnings"]},
+            "import": result
+        }
+        
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
+    except Exception as e:
+        logger.error(f"Fehler beim Kopieren des Schemas der App '{app}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Kopieren des Schemas der App '{app}'"
+        }
+
+@mcp.tool()
+async def submit_job(kind: str, params_json: str = "{}") -> Dict[str, Any]:
+    """
+    Startet ein lang laufendes Tool als Hintergrund-Job und gibt sofort die Job-ID zurück.
+    
+    Args:
+        kind: Name des Tools, z.B. 'import_resource', 'upsert_generic_entries',
+              'list_generic_entries' (Aggregationen), 'create_attributes_bulk'
+        params_json: Parameter des Tools als JSON-Objekt,
+                     z.B. '{"resource_name": "lau6_RunEntries", "file_path": "/data/runs.csv"}'
+    
+    Returns:
+        job_id und Status 'queued'
+        
+    Hinweise:
+        - Den Fortschritt mit get_job_status abfragen, das Ergebnis mit get_job_result
+        - Job-Metadaten liegen in SQLite (DIMETRICS_JOBS_DB) und überstehen Neustarts;
+          wartende Jobs laufen danach weiter, unterbrochene import_resource-Jobs
+          setzen am Checkpoint fort
+        - Parallelität über DIMETRICS_JOB_WORKERS (Standard: 2)
+        - Der Job läuft mit den Zugangsdaten dieser Session und ist nur für
+          denselben Mandanten sichtbar; Jobs von Mandanten (eigenes Token)
+          laufen nach einem Neustart nicht weiter, da das Token nicht
+          gespeichert wird
     """
     try:
         import json
         
-        # Update-Daten JSON parsen
         try:
-            update_data = json.loads(update_data_json)
+            params = json.loads(params_json) if params_json else {}
         except json.JSONDecodeError as e:
             return {
                 "success": False,
-                "error": f"Ungültiges JSON-Format für Update-Daten: {e}",
-                "message": "Fehler beim Parsen der Update-Daten-Parameter"
+                "error": f"Ungültiges JSON-Format für params_json: {e}",
+                "message": "Fehler beim Parsen der Job-Parameter"
             }
         
-        client = await get_api_client()
-        result = await client.update_generic_entry(
-            resource_name=resource_name,
-            entry_id=entry_id,
-            data=update_data
-        )
+        if not isinstance(params, dict):
+            return {
+                "success": False,
+                "error": "params_json muss ein JSON-Objekt sein",
+                "message": "Ungültiges Format für Job-Parameter"
+            }
+        
+        manager = get_job_manager()
+        job_id = manager.submit(kind, params, tenant=_session_tenant())
         
         return {
             "success": True,
-            "message": f"Eintrag '{entry_id}' in Resource '{resource_name}' erfolgreich aktualisiert",
-            "entry": result,
-            "resource_name": resource_name,
-            "entry_id": entry_id,
-            "updated_fields": list(update_data.keys()),
-            "update_data": update_data
+            "job_id": job_id,
+            "status": "queued",
+            "message": f"Job '{kind}' eingereiht (ID: {job_id})"
         }
         
+    except ValueError as val_err:
+        return {
+            "success": False,
+            "error": str(val_err)
+        }
     except Exception as e:
-        logger.error(f"Fehler beim Aktualisieren des Generic Entry '{entry_id}' für '{resource_name}': {e}")
+        logger.error(f"Fehler beim Einreihen des Jobs '{kind}': {e}")
         return {
             "success": False,
             "error": str(e),
-            "message": f"Fehler beim Aktualisieren des Eintrags '{entry_id}' für Resource '{resource_name}'"
+            "message": f"Fehler beim Einreihen des Jobs '{kind}'"
         }
 
 @mcp.tool()
-async def delete_generic_entry(
-    resource_name: str,
-    entry_id: str,
-    confirm_deletion: bool = False
-) -> Dict[str, Any]:
+async def get_job_status(job_id: str) -> Dict[str, Any]:
     """
-    Löscht einen Eintrag aus einer Resource (VORSICHT: Unwiderruflich!).
+    Zeigt den Status eines Jobs (queued, running, succeeded, failed, cancelled, interrupted).
     
     Args:
-        resource_name: Name der Resource (Tabellenname, z.B. 'lau6_RunEntries')
-        entry_id: object_id des zu löschenden Eintrags (UUID)
-        confirm_deletion: Bestätigung für die Löschung (MUSS True sein)
+        job_id: ID aus submit_job
     
     Returns:
-        Strukturierte Antwort mit Lösch-Bestätigung
+        Status, Zeitstempel, Laufzeit und ggf. Fehlermeldung (ohne Ergebnis)
+    """
+    try:
+        job = get_job_manager().get(job_id, tenant=_session_tenant())
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job '{job_id}' nicht gefunden"
+            }
         
-    ⚠️  WARNUNG: Diese Aktion ist UNWIDERRUFLICH!
-        - Der Eintrag wird permanent aus der Datenbank entfernt
-        - Alle Daten des Eintrags gehen verloren
-        - Verknüpfungen zu anderen Objekten werden gelöscht
+        return {
+            "success": True,
+            "job": describe_job(job)
+        }
         
-    Sicherheits-Check:
-        - confirm_deletion MUSS auf True gesetzt werden
-        - Ohne Bestätigung wird die Löschung abgebrochen
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen des Job-Status '{job_id}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Abrufen des Status von Job '{job_id}'"
+        }
+
+@mcp.tool()
+async def get_job_result(job_id: str) -> Dict[str, Any]:
+    """
+    Holt das Ergebnis eines abgeschlossenen Jobs.
+    
+    Args:
+        job_id: ID aus submit_job
+    
+    Returns:
+        Job-Status und das Ergebnis des ausgeführten Tools
+        (solange der Job noch läuft, nur den Status)
+    """
+    try:
+        job = get_job_manager().get(job_id, tenant=_session_tenant())
+        if job is None:
+            return {
+                "success": False,
+                "error": f"Job '{job_id}' nicht gefunden"
+            }
         
-    Beispiele:
-        resource_name="lau6_RunEntries", entry_id="...", confirm_deletion=True
-        resource_name="n8n_collection", entry_id="...", confirm_deletion=True
+        if job["status"] in ("queued", "running"):
+            return {
+                "success": False,
+                "job": describe_job(job),
+                "error": f"Job '{job_id}' ist noch nicht abgeschlossen (Status: {job['status']})"
+            }
         
-    Empfehlung:
-        - Vorher mit get_generic_entry() die Daten überprüfen
-        - Bei wichtigen Daten: Backup/Export vor Löschung
-        - Für Tests: Nur Test-Einträge löschen, niemals produktive Daten
+        return {
+            "success": job["status"] == "succeeded",
+            "job": describe_job(job, include_result=True)
+        }
+        
+    except Exception as e:
+        logger.error(f"Fehler beim Abrufen des Job-Ergebnisses '{job_id}': {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": f"Fehler beim Abrufen des Ergebnisses von Job '{job_id}'"
+        }
+
+@mcp.tool()
+async def cancel_job(job_id: str) -> Dict[str, Any]:
+    """
+    Bricht einen wartenden oder laufenden Job ab.
+    
+    Args:
+        job_id: ID aus submit_job
+    
+    Returns:
+        Neuer Status des Jobs
+        
+    Hinweis: Bereits gesendete Requests werden nicht zurückgerollt; ein
+    abgebrochener import_resource-Job kann über seinen Checkpoint erneut
+    gestartet werden.
     """
     try:
-        # Sicherheits-Check
-        if not confirm_deletion:
+        status = get_job_manager().cancel(job_id, tenant=_session_tenant())
+        if status is None:
             return {
                 "success": False,
-                "error": "Löschung nicht bestätigt",
-                "message": "Setzen Sie confirm_deletion=True zur Bestätigung der Löschung",
-                "warning": "Diese Aktion ist unwiderruflich! Überprüfen Sie die Daten vorher."
+                "error": f"Job '{job_id}' nicht gefunden"
             }
         
-        client = await get_api_client()
-        result = await client.delete_generic_entry(
-            resource_name=resource_name,
-            entry_id=entry_id
-        )
+        if status != "cancelled":
+            return {
+                "success": False,
+                "status": status,
+                "error": f"Job '{job_id}' ist bereits abgeschlossen (Status: {status})"
+            }
         
         return {
             "success": True,
-            "message": f"Eintrag '{entry_id}' aus Resource '{resource_name}' erfolgreich gelöscht",
-            "deletion_result": result,
-            "resource_name": resource_name,
-            "deleted_entry_id": entry_id,
-            "warning": "Löschung war erfolgreich und unwiderruflich."
+            "status": status,
+            "message": f"Job '{job_id}' abgebrochen"
         }
         
     except Exception as e:
-        logger.error(f"Fehler beim Löschen des Generic Entry '{entry_id}' für '{resource_name}': {e}")
+        logger.error(f"Fehler beim Abbrechen des Jobs '{job_id}': {e}")
         return {
             "success": False,
             "error": str(e),
-            "message": f"Fehler beim Löschen des Eintrags '{entry_id}' für Resource '{resource_name}'"
+            "message": f"Fehler beim Abbrechen von Job '{job_id}'"
+        }
+
+@mcp.tool()
+async def list_jobs(status: str = "", limit: int = 50) -> Dict[str, Any]:
+    """
+    Listet die zuletzt eingereihten Jobs.
+    
+    Args:
+        status: Optionaler Status-Filter (queued, running, succeeded, failed, cancelled, interrupted)
+        limit: Maximale Anzahl Jobs (Standard: 50)
+    
+    Returns:
+        Jobs (neueste zuerst) und die verfügbaren Job-Arten
+    """
+    try:
+        manager = get_job_manager()
+        jobs = [describe_job(job) for job in manager.list(status=status, limit=limit, tenant=_session_tenant())]
+        
+        return {
+            "success": True,
+            "jobs": jobs,
+            "count": len(jobs),
+            "kinds": manager.kinds
+        }
+        
+    except Exception as e:
+        logger.error(f"Fehler beim Auflisten der Jobs: {e}")
+        return {
+            "success": False,
+            "error": str(e),
+            "message": "Fehler beim Auflisten der Jobs"
         }
 
 if __name__ == "__main__":
@@ -2375,18 +4425,22 @@ if __name__ == "__main__":
     
     def main():
         """Hauptfunktion zum Starten des MCP Servers."""
+        if os.getenv("MCP_TRANSPORT") == "streamable-http":
+            # Produktionsbetrieb: uvicorn mit MCP_WORKERS Worker-Prozessen
+            from .http_server import run
+            run()
         # Überprüfe, ob HTTP-Transport gewünscht ist (für Container)
-        if os.getenv("MCP_TRANSPORT") == "http" or os.getenv("PORT"):
+        elif os.getenv("MCP_TRANSPORT") == "http" or os.getenv("PORT"):
             # SSE-Transport für Container (nicht Streamable HTTP)
             logger.info(f"Starte MCP Server im SSE-Modus für Container")
             # Konfiguriere Host für Container-Nutzung
             if hasattr(mcp, 'settings'):
                 mcp.settings.host = "0.0.0.0"
                 mcp.settings.port = int(os.getenv("PORT", 8000))
-            mcp.run(transport="sse")
+            asyncio.run(serve("sse"))
         else:
             # Standard stdio-Transport für lokale Entwicklung
             logger.info("Starte MCP Server im stdio-Modus")
-            mcp.run()
+            asyncio.run(serve())
     
     main()
@@ -2,13 +2,52 @@
 API Client für die Dimetrics Web-API.
 """
 
+import asyncio
 import httpx
 import json
 import logging
-from typing import Dict, Any, List, Optional
+import time
+from collections import OrderedDict
+from typing import AsyncIterator, Callable, Dict, Any, List, Optional, Tuple
+
+from .diffing import diff_entry, payload_size
+from .json_decoding import COOPERATIVE_BYTES, JSON_BACKEND, loads, loads_cooperative
+from .page_sizing import PageSizer
+from .pagination import decode_cursor, encode_cursor, keyset_filter, keyset_order_param, last_key
+from .validation import EntryValidator
 
 logger = logging.getLogger(__name__)
 
+# Maximale Anzahl gecachter Generic Entries (für diff-basierte Updates)
+ENTRY_CACHE_SIZE = 5000
+
+
+class RateLimiter:
+    """Token-Bucket-Limiter für ausgehende Requests (Requests pro Sekunde)."""
+    
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        self.rate = rate
+        self.capacity = float(burst or max(1, int(rate)))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self.waited_seconds = 0.0
+    
+    async def acquire(self) -> None:
+        """Wartet, bis ein Token verfügbar ist."""
+        async with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens < 1:
+                wait = (1 - self._tokens) / self.rate
+                self.waited_seconds += wait
+                await asyncio.sleep(wait)
+                self._updated = time.monotonic()
+                self._tokens = 0.0
+            else:
+                self._tokens -= 1
+
 
 class DimetricsAPIClient:
     """Client für die Dimetrics REST API."""
@@ -19,7 +58,12 @@ class DimetricsAPIClient:
         api_key: Optional[str] = None,
         session_cookie: Optional[str] = None,
         timeout: int = 30,
-        debug: bool = False
+        debug: bool = False,
+        name: str = "default",
+        max_connections: int = 100,
+        rate_limit: float = 0.0,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        rate_limiter: Optional[RateLimiter] = None
     ):
         """
         Initialisiert den API Client.
@@ -30,10 +74,18 @@ class DimetricsAPIClient:
             session_cookie: Session Cookie für Authentifizierung
             timeout: Timeout für HTTP-Requests
             debug: Debug-Modus aktivieren
+            name: Name des Backends (für Logs und Metriken)
+            max_connections: Größe des Connection-Pools
+            rate_limit: Maximale Requests pro Sekunde (0 = unbegrenzt)
+            transport: Gemeinsamer httpx-Transport (Connection-Pool) mehrerer Clients;
+                wird von close() nicht geschlossen
+            rate_limiter: Gemeinsamer Limiter mehrerer Clients (ersetzt rate_limit)
         """
         self.base_url = base_url.rstrip('/')
         self.timeout = timeout
         self.debug = debug
+        self.name = name
+        self.rate_limiter = rate_limiter or (RateLimiter(rate_limit) if rate_limit > 0 else None)
         
         # HTTP Client konfigurieren
         headers = {
@@ -47,11 +99,66 @@ class DimetricsAPIClient:
         elif session_cookie:
             headers["Cookie"] = session_cookie
         
+        event_hooks = {"request": [self._throttle]} if self.rate_limiter else {}
         self.client = httpx.AsyncClient(
             headers=headers,
             timeout=timeout,
-            base_url=self.base_url
+            base_url=self.base_url,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            transport=transport,
+            event_hooks=event_hooks
         )
+        self._owns_transport = transport is None
+        
+        # Attribut-Schema-Cache: resource_name -> (Zeitstempel, Attribut-Liste)
+        self._attribute_schema_cache: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        # Kompilierte Validatoren pro Resource (an die gecachte Attribut-Liste gebunden)
+        self._entry_validators: Dict[str, EntryValidator] = {}
+        # LRU-Cache zuletzt gesehener Einträge: (resource_name, object_id) -> (Zeitstempel, Eintrag)
+        self._entry_cache: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Zähler für diff-basierte Updates
+        self.diff_stats: Dict[str, int] = {
+            "patches_sent": 0,
+            "patches_skipped": 0,
+            "fields_dropped": 0,
+            "bytes_saved": 0,
+        }
+        # Rückruf bei lokalen Invalidierungen (backend, scope, key), z.B. zur
+        # Weitergabe an andere Worker-Prozesse; siehe apply_invalidation()
+        self.invalidation_hook: Optional[Callable[[str, str, Optional[str]], None]] = None
+        # Bodies ab dieser Größe werden kooperativ dekodiert (0 = nie)
+        self.json_cooperative_bytes = COOPERATIVE_BYTES
+        self.decode_stats: Dict[str, float] = {
+            "responses": 0,
+            "cooperative": 0,
+            "bytes": 0,
+            "seconds": 0.0,
+        }
+        # Adaptive Seitengrößen pro Resource (siehe list_generic_page)
+        self._page_sizers: Dict[str, PageSizer] = {}
+    
+    async def _json(self, response: httpx.Response) -> Any:
+        """
+        Dekodiert einen JSON-Body.
+        
+        Große Bodies (z.B. Generics-Seiten mit mehreren MB) werden kooperativ
+        dekodiert, damit der Event-Loop andere Sessions weiter bedienen kann.
+        """
+        content = response.content
+        started = time.perf_counter()
+        if self.json_cooperative_bytes and len(content) >= self.json_cooperative_bytes:
+            data = await loads_cooperative(content)
+            self.decode_stats["cooperative"] += 1
+        else:
+            data = loads(content)
+        self.decode_stats["responses"] += 1
+        self.decode_stats["bytes"] += len(content)
+        self.decode_stats["seconds"] += time.perf_counter() - started
+        return data
+    
+    async def _throttle(self, request: httpx.Request) -> None:
+        """httpx-Hook: hält das Rate-Limit des Backends ein."""
+        await self.rate_limiter.acquire()
     
     # Apps API Methods
     async def create_app(self, name: str, description: str = "", prefix: str = "") -> Dict[str, Any]:
@@ -96,7 +203,7 @@ class DimetricsAPIClient:
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def create_service_deprecated(self, name: str, description: str = "", prefix: str = "") -> Dict[str, Any]:
         """
@@ -141,7 +248,7 @@ class DimetricsAPIClient:
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def list_services(self, search: str = None, page_size: int = None, page: int = None, limit: int = None) -> Dict[str, Any]:
         """
@@ -169,7 +276,7 @@ class DimetricsAPIClient:
         
         response = await self.client.get("/apps/", params=params)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def get_service(self, app_id: str) -> Dict[str, Any]:
         """
@@ -184,7 +291,7 @@ class DimetricsAPIClient:
         # Dimetrics erwartet trailing slash für GET detail
         response = await self.client.get(f"/apps/{app_id}/")
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def delete_service(self, app_id: str) -> bool:
         """
@@ -231,7 +338,7 @@ class DimetricsAPIClient:
         response = await self.client.patch(f"/apps/{app_id}/", json=data)
         response.raise_for_status()
         
-        return response.json()
+        return await self._json(response)
     
     # Categories API Methods
     async def list_categories(self, search: str = None, page_size: int = None, page: int = None, limit: int = None) -> Dict[str, Any]:
@@ -260,7 +367,7 @@ class DimetricsAPIClient:
         
         response = await self.client.get("/categories/", params=params)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def get_category(self, category_id: str) -> Dict[str, Any]:
         """
@@ -275,7 +382,7 @@ class DimetricsAPIClient:
         # Dimetrics erwartet trailing slash für GET detail
         response = await self.client.get(f"/categories/{category_id}/")
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def create_category(self, name: str, description: str = "", prefix: str = "") -> Dict[str, Any]:
         """
@@ -319,7 +426,7 @@ class DimetricsAPIClient:
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def update_category(self, category_id: str, name: str = None, description: str = None, prefix: str = None) -> Dict[str, Any]:
         """
@@ -350,7 +457,7 @@ class DimetricsAPIClient:
         response = await self.client.patch(f"/categories/{category_id}/", json=data)
         response.raise_for_status()
         
-        return response.json()
+        return await self._json(response)
     
     async def delete_category(self, category_id: str) -> bool:
         """
@@ -394,7 +501,7 @@ class DimetricsAPIClient:
         
         response = await self.client.get("/services/", params=params)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def get_service_endpoint(self, service_id: str) -> Dict[str, Any]:
         """
@@ -409,7 +516,7 @@ class DimetricsAPIClient:
         # Dimetrics erwartet trailing slash für GET detail
         response = await self.client.get(f"/services/{service_id}/")
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def create_service_endpoint(
         self, 
@@ -465,7 +572,7 @@ class DimetricsAPIClient:
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def update_service_endpoint(
         self, 
@@ -526,7 +633,7 @@ class DimetricsAPIClient:
         response = await self.client.patch(f"/services/{service_id}/", json=data)
         response.raise_for_status()
         
-        return response.json()
+        return await self._json(response)
     
     async def delete_service_endpoint(self, service_id: str) -> bool:
         """
@@ -558,13 +665,13 @@ class DimetricsAPIClient:
         
         response = await self.client.get("/resources/", params=params)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def get_resource_endpoint(self, resource_id: str) -> Dict[str, Any]:
         """Holt Details eines spezifischen Resources."""
         response = await self.client.get(f"/resources/{resource_id}/")
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def create_resource_endpoint(
         self,
@@ -621,7 +728,7 @@ class DimetricsAPIClient:
             logger.info(f"Response body: {response.text}")
             
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def update_resource_endpoint(
         self,
@@ -692,7 +799,7 @@ class DimetricsAPIClient:
         
         response = await self.client.patch(f"/resources/{resource_id}/", json=data)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def delete_resource_endpoint(self, resource_id: str) -> bool:
         """Löscht eine Resource."""
@@ -729,7 +836,88 @@ class DimetricsAPIClient:
         
         response = await self.client.get(f"/attributes/{resource_name}/", params=params)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
+
+    async def get_attribute_schema(self, resource_name: str, max_age: float = 300.0) -> List[Dict[str, Any]]:
+        """
+        Liefert die Attribut-Definitionen einer Resource aus dem Cache.
+        
+        Die Definitionen werden beim ersten Zugriff (oder nach Ablauf von
+        max_age Sekunden) über list_attributes geladen.
+        
+        Args:
+            resource_name: Name der Resource
+            max_age: Maximales Alter des Cache-Eintrags in Sekunden
+        
+        Returns:
+            Liste der Attribut-Definitionen
+        """
+        cached = self._attribute_schema_cache.get(resource_name)
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        
+        result = await self.list_attributes(resource_name, page_size=1000)
+        # Attribute API gibt direkt eine Liste zurück, Fallback für Pagination-Format
+        attributes = result if isinstance(result, list) else result.get("results", [])
+        self._attribute_schema_cache[resource_name] = (time.monotonic(), attributes)
+        return attributes
+
+    async def get_entry_validator(self, resource_name: str, max_age: float = 300.0) -> EntryValidator:
+        """
+        Liefert den kompilierten Validator für die Einträge einer Resource.
+        
+        Der Validator wird nur neu kompiliert, wenn das Attribut-Schema neu
+        geladen wurde.
+        
+        Args:
+            resource_name: Name der Resource
+            max_age: Maximales Alter des Schema-Caches in Sekunden
+        
+        Returns:
+            EntryValidator der Resource
+        """
+        attributes = await self.get_attribute_schema(resource_name, max_age=max_age)
+        validator = self._entry_validators.get(resource_name)
+        if validator is None or validator.attributes is not attributes:
+            validator = EntryValidator(attributes, resource_name=resource_name)
+            self._entry_validators[resource_name] = validator
+        return validator
+
+    def invalidate_attribute_schema(self, resource_name: Optional[str] = None) -> None:
+        """
+        Verwirft gecachte Attribut-Definitionen.
+        
+        Args:
+            resource_name: Name der Resource (None = gesamten Cache leeren)
+        """
+        self.apply_invalidation("attributes", resource_name)
+        self._notify_invalidation("attributes", resource_name)
+
+    def apply_invalidation(self, scope: str, key: Optional[str] = None) -> None:
+        """
+        Verwirft Cache-Einträge, ohne die Invalidierung weiterzumelden.
+        
+        Args:
+            scope: "attributes" (key = Resource-Name) oder "entry" (key = "resource/object_id")
+            key: Betroffener Eintrag (None = gesamten Cache des Bereichs leeren)
+        """
+        if scope == "attributes":
+            if key is None:
+                self._attribute_schema_cache.clear()
+                self._entry_validators.clear()
+            else:
+                self._attribute_schema_cache.pop(key, None)
+                self._entry_validators.pop(key, None)
+        elif scope == "entry":
+            if key is None:
+                self._entry_cache.clear()
+            else:
+                resource_name, _, entry_id = key.partition("/")
+                self._entry_cache.pop((resource_name, entry_id), None)
+
+    def _notify_invalidation(self, scope: str, key: Optional[str]) -> None:
+        if self.invalidation_hook is not None:
+            self.invalidation_hook(self.name, scope, key)
 
     async def get_attribute_details(self, resource_name: str, attribute_id: str) -> Dict[str, Any]:
         """
@@ -744,7 +932,7 @@ class DimetricsAPIClient:
         """
         response = await self.client.get(f"/attributes/{resource_name}/{attribute_id}/")
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def create_attribute(
         self,
@@ -810,13 +998,14 @@ class DimetricsAPIClient:
             logger.info(f"Creating attribute with data: {json.dumps(data, indent=2, ensure_ascii=False)}")
         
         response = await self.client.post(f"/attributes/{resource_name}/", json=data)
+        self.invalidate_attribute_schema(resource_name)
         
         if self.debug:
             logger.info(f"Response status: {response.status_code}")
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def update_attribute(
         self,
@@ -890,13 +1079,14 @@ class DimetricsAPIClient:
         
         # Dimetrics erwartet PATCH für Attribut-Updates mit trailing slash
         response = await self.client.patch(f"/attributes/{resource_name}/{attribute_id}/", json=data)
+        self.invalidate_attribute_schema(resource_name)
         
         if self.debug:
             logger.info(f"Response status: {response.status_code}")
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def delete_attribute(self, resource_name: str, attribute_id: str) -> bool:
         """
@@ -911,6 +1101,7 @@ class DimetricsAPIClient:
         """
         # Dimetrics erwartet trailing slash für DELETE
         response = await self.client.delete(f"/attributes/{resource_name}/{attribute_id}/")
+        self.invalidate_attribute_schema(resource_name)
         response.raise_for_status()
         return True
 
@@ -929,13 +1120,14 @@ class DimetricsAPIClient:
             logger.info(f"Creating bulk attributes: {json.dumps(attributes, indent=2, ensure_ascii=False)}")
         
         response = await self.client.post(f"/attributes/{resource_name}/bulk/", json=attributes)
+        self.invalidate_attribute_schema(resource_name)
         
         if self.debug:
             logger.info(f"Response status: {response.status_code}")
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     # Generics API Methods (Resource Data)
     async def list_generic_entries(
@@ -981,9 +1173,21 @@ class DimetricsAPIClient:
             {"min": "amount"}                           # Minimum der amount-Werte
             {"max": "amount"}                           # Maximum der amount-Werte
         """
-        import json
-        import urllib.parse
-        
+        params = self._generics_params(search, page_size, page, ordering, filters, directus_filter, aggregate)
+        data, _, _ = await self._get_generics(resource_name, params)
+        return data
+    
+    def _generics_params(
+        self,
+        search: Optional[str] = None,
+        page_size: Optional[int] = None,
+        page: Optional[int] = None,
+        ordering: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        directus_filter: Optional[Dict[str, Any]] = None,
+        aggregate: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Query-Parameter für /generics/<resource>/ (siehe list_generic_entries)."""
         params = {}
         
         if search:
@@ -1016,30 +1220,177 @@ class DimetricsAPIClient:
         elif filters:
             params.update(filters)
         
+        return params
+    
+    async def _get_generics(self, resource_name: str, params: Dict[str, Any]) -> Tuple[Any, int, float]:
+        """GET /generics/<resource>/; liefert dekodierte Antwort, Größe in Bytes und Latenz in Sekunden."""
         if self.debug:
             logger.info(f"Listing generic entries for resource '{resource_name}' with params: {params}")
         
+        started = time.perf_counter()
         response = await self.client.get(f"/generics/{resource_name}/", params=params)
+        try:
+            # Ohne Wartezeit im Rate-Limiter
+            seconds = response.elapsed.total_seconds()
+        except RuntimeError:
+            # Transports ohne Stream (z.B. httpx.MockTransport) setzen elapsed nicht
+            seconds = time.perf_counter() - started
         
         if self.debug:
             logger.info(f"Response status: {response.status_code}")
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        return await self._json(response), len(response.content), seconds
+    
+    def page_sizer(self, resource_name: str) -> PageSizer:
+        """Adaptive Seitengröße einer Resource (siehe page_sizing.py)."""
+        sizer = self._page_sizers.get(resource_name)
+        if sizer is None:
+            sizer = self._page_sizers[resource_name] = PageSizer()
+        return sizer
+    
+    async def list_generic_page(
+        self,
+        resource_name: str,
+        page_size: Optional[int] = None,
+        page: int = 1,
+        ordering: Optional[str] = None,
+        directus_filter: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Lädt eine Seite eines Durchlaufs und misst Größe und Latenz für die adaptive Seitengröße.
         
-        if self.debug:
-            logger.info(f"Listing generic entries for resource '{resource_name}' with params: {params}")
+        Args:
+            resource_name: Name der Resource (Tabellenname)
+            page_size: Feste Seitengröße (None = adaptiv; nach einem Timeout
+                wird mit halbierter Seitengröße wiederholt)
+            page: Seitennummer (1-basiert)
+            ordering: Sortierung
+            directus_filter: Directus-ähnliche Filter
+            search: Suchbegriff für Textfelder
         
-        response = await self.client.get(f"/generics/{resource_name}/", params=params)
+        Returns:
+            Response der API; page_size = tatsächlich angefragte Seitengröße
+        """
+        sizer = self.page_sizer(resource_name)
+        while True:
+            size = page_size or sizer.size
+            params = self._generics_params(search, size, page, ordering, directus_filter=directus_filter)
+            try:
+                data, response_bytes, seconds = await self._get_generics(resource_name, params)
+            except httpx.TimeoutException:
+                if page_size or not sizer.timed_out():
+                    raise
+                logger.warning(f"Timeout bei Seite mit {size} Einträgen von '{resource_name}', neuer Versuch mit {sizer.size}")
+                continue
+            sizer.observe(len(data.get("results", [])), response_bytes, seconds, size, bool(data.get("next")))
+            data["page_size"] = size
+            return data
+    
+    async def list_generic_entries_keyset(
+        self,
+        resource_name: str,
+        cursor: Optional[str] = None,
+        page_size: Optional[int] = None,
+        ordering: Optional[str] = None,
+        directus_filter: Optional[Dict[str, Any]] = None,
+        search: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Lädt eine Seite per Keyset-Pagination (immer page=1, kein OFFSET).
         
-        if self.debug:
-            logger.info(f"Response status: {response.status_code}")
-            logger.info(f"Response body: {response.text}")
+        Args:
+            resource_name: Name der Resource (Tabellenname)
+            cursor: next_cursor der vorherigen Seite (None = erste Seite)
+            page_size: Anzahl Einträge pro Seite (None = adaptiv, siehe list_generic_page)
+            ordering: Genau ein Sortierfeld, z.B. "date_created" oder "-object_id" (Standard: object_id)
+            directus_filter: Directus-ähnliche Filter
+            search: Suchbegriff für Textfelder
         
-        response.raise_for_status()
-        return response.json()
+        Returns:
+            Response der API (count = verbleibende Einträge ab dieser Seite) mit next_cursor
+        
+        Raises:
+            ValueError: bei ungültigem Cursor oder Sortierfeld
+        """
+        last = decode_cursor(cursor, ordering) if cursor else None
+        data = await self.list_generic_page(
+            resource_name,
+            page_size=page_size,
+            ordering=keyset_order_param(ordering),
+            directus_filter=keyset_filter(directus_filter, ordering, last),
+            search=search
+        )
+        results = data.get("results", [])
+        more = bool(data.get("next")) and bool(results)
+        data["next_cursor"] = encode_cursor(ordering, last_key(results[-1], ordering)) if more else None
+        return data
+    
+    async def list_all_generic_entries(
+        self,
+        resource_name: str,
+        directus_filter: Optional[Dict[str, Any]] = None,
+        ordering: Optional[str] = None,
+        page_size: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Holt alle Einträge einer Resource, die dem Filter entsprechen.
+        
+        Folgt per Keyset-Pagination (siehe list_generic_entries_keyset), damit
+        späte Seiten nicht langsamer werden und parallele Änderungen keine
+        Einträge doppeln oder überspringen.
+        
+        Args:
+            resource_name: Name der Resource (Tabellenname)
+            directus_filter: Directus-ähnliche Filter
+            ordering: Sortierung über ein Feld (z.B. "-date_created", Standard: object_id)
+            page_size: Anzahl Einträge pro Request (None = adaptiv)
+            search: Suchbegriff für Textfelder
+        
+        Returns:
+            Liste aller gefundenen Einträge
+        """
+        results: List[Dict[str, Any]] = []
+        async for page in self.iter_generic_pages(
+            resource_name, directus_filter=directus_filter, ordering=ordering, page_size=page_size, search=search
+        ):
+            results.extend(page)
+        return results
     
+    async def iter_generic_pages(
+        self,
+        resource_name: str,
+        directus_filter: Optional[Dict[str, Any]] = None,
+        ordering: Optional[str] = None,
+        page_size: Optional[int] = None,
+        search: Optional[str] = None
+    ) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Liefert die Einträge einer Resource seitenweise (Keyset-Pagination).
+        
+        Für Auswertungen in einem Durchlauf: im Speicher liegt immer nur
+        die aktuelle Seite. Parameter wie bei list_all_generic_entries.
+        """
+        cursor = None
+        while True:
+            data = await self.list_generic_entries_keyset(
+                resource_name,
+                cursor=cursor,
+                page_size=page_size,
+                ordering=ordering,
+                directus_filter=directus_filter,
+                search=search
+            )
+            results = data.get("results", [])
+            if results:
+                yield results
+            cursor = data["next_cursor"]
+            if not cursor:
+                return
+
     async def create_generic_entry(
         self,
         resource_name: str,
@@ -1068,7 +1419,12 @@ class DimetricsAPIClient:
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        entry = await self._json(response)
+        self._cache_entry(resource_name, entry)
+        # Neue Einträge verschieben Seiten, z.B. vorgeladene Folgeseiten
+        entry_id = entry.get("object_id", "") if isinstance(entry, dict) else ""
+        self._notify_invalidation("entry", f"{resource_name}/{entry_id}")
+        return entry
     
     async def get_generic_entry(
         self,
@@ -1095,7 +1451,9 @@ class DimetricsAPIClient:
             logger.info(f"Response body: {response.text}")
         
         response.raise_for_status()
-        return response.json()
+        entry = await self._json(response)
+        self._cache_entry(resource_name, entry)
+        return entry
     
     async def update_generic_entry(
         self,
@@ -1126,9 +1484,127 @@ class DimetricsAPIClient:
             logger.info(f"Response status: {response.status_code}")
             logger.info(f"Response body: {response.text}")
         
+        if response.status_code >= 400:
+            # Stand unklar, gecachte Kopie nicht mehr für Diffs verwenden
+            self._entry_cache.pop((resource_name, entry_id), None)
+        # Kopien in anderen Worker-Prozessen sind jetzt veraltet
+        self._notify_invalidation("entry", f"{resource_name}/{entry_id}")
         response.raise_for_status()
-        return response.json()
+        entry = await self._json(response)
+        self._cache_entry(resource_name, entry)
+        return entry
     
+    def _cache_entry(self, resource_name: str, entry: Any) -> None:
+        """Legt einen Eintrag im LRU-Cache ab (nur vollständige Einträge mit object_id)."""
+        if not isinstance(entry, dict) or not entry.get("object_id"):
+            return
+        key = (resource_name, entry["object_id"])
+        self._entry_cache[key] = (time.monotonic(), entry)
+        self._entry_cache.move_to_end(key)
+        while len(self._entry_cache) > ENTRY_CACHE_SIZE:
+            self._entry_cache.popitem(last=False)
+
+    def get_cached_entry(self, resource_name: str, entry_id: str, max_age: float = 60.0) -> Optional[Dict[str, Any]]:
+        """
+        Liefert einen gecachten Eintrag, falls er jünger als max_age Sekunden ist.
+        
+        Args:
+            resource_name: Name der Resource (Tabellenname)
+            entry_id: object_id des Eintrags
+            max_age: Maximales Alter in Sekunden
+        
+        Returns:
+            Eintrag oder None
+        """
+        cached = self._entry_cache.get((resource_name, entry_id))
+        if cached and time.monotonic() - cached[0] < max_age:
+            return cached[1]
+        return None
+
+    async def update_generic_entry_if_changed(
+        self,
+        resource_name: str,
+        entry_id: str,
+        data: Dict[str, Any],
+        current: Optional[Dict[str, Any]] = None,
+        max_cache_age: float = 60.0
+    ) -> Dict[str, Any]:
+        """
+        Sendet nur die geänderten Felder per PATCH (oder gar nichts).
+        
+        Der Vergleich erfolgt gegen current, sonst gegen eine gecachte Kopie
+        (jünger als max_cache_age) oder einen frisch geladenen Eintrag.
+        
+        Args:
+            resource_name: Name der Resource (Tabellenname)
+            entry_id: object_id des Eintrags
+            data: Gewünschte Feldwerte
+            current: Bekannter aktueller Stand (optional)
+            max_cache_age: Maximales Alter der gecachten Kopie in Sekunden
+        
+        Returns:
+            Dict mit skipped, changed_fields, bytes_saved, source und entry
+        """
+        source = "provided"
+        if current is None:
+            current = self.get_cached_entry(resource_name, entry_id, max_age=max_cache_age)
+            source = "cache"
+        if current is None:
+            current = await self.get_generic_entry(resource_name, entry_id)
+            source = "fetched"
+        
+        changes = diff_entry(current, data)
+        full_size = payload_size(data)
+        
+        if not changes:
+            self.diff_stats["patches_skipped"] += 1
+            self.diff_stats["fields_dropped"] += len(data)
+            self.diff_stats["bytes_saved"] += full_size
+            return {
+                "skipped": True,
+                "changed_fields": [],
+                "bytes_saved": full_size,
+                "source": source,
+                "entry": current
+            }
+        
+        entry = await self.update_generic_entry(resource_name, entry_id, changes)
+        saved = full_size - payload_size(changes)
+        self.diff_stats["patches_sent"] += 1
+        self.diff_stats["fields_dropped"] += len(data) - len(changes)
+        self.diff_stats["bytes_saved"] += saved
+        return {
+            "skipped": False,
+            "changed_fields": list(changes.keys()),
+            "bytes_saved": saved,
+            "source": source,
+            "entry": entry
+        }
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Liefert Laufzeit-Kennzahlen des Clients (Caches und Zähler)."""
+        return {
+            "backend": self.name,
+            "base_url": self.base_url,
+            "rate_limit": {
+                "requests_per_second": self.rate_limiter.rate,
+                "waited_seconds": round(self.rate_limiter.waited_seconds, 3)
+            } if self.rate_limiter else None,
+            "diff_updates": dict(self.diff_stats),
+            "json_decoding": dict(
+                self.decode_stats,
+                backend=JSON_BACKEND,
+                seconds=round(self.decode_stats["seconds"], 3),
+                cooperative_threshold_bytes=self.json_cooperative_bytes
+            ),
+            "caches": {
+                "attribute_schemas": len(self._attribute_schema_cache),
+                "entry_validators": len(self._entry_validators),
+                "entries": len(self._entry_cache),
+            },
+            "page_sizes": {resource: sizer.describe() for resource, sizer in self._page_sizers.items()},
+        }
+
     async def delete_generic_entry(
         self,
         resource_name: str,
@@ -1148,6 +1624,8 @@ class DimetricsAPIClient:
             logger.info(f"Deleting generic entry '{entry_id}' from resource '{resource_name}'")
         
         response = await self.client.delete(f"/generics/{resource_name}/{entry_id}/")
+        self._entry_cache.pop((resource_name, entry_id), None)
+        self._notify_invalidation("entry", f"{resource_name}/{entry_id}")
         
         if self.debug:
             logger.info(f"Response status: {response.status_code}")
@@ -1159,7 +1637,7 @@ class DimetricsAPIClient:
         if response.status_code == 204:
             return {"message": "Entry deleted successfully", "status": "deleted"}
         elif response.content:
-            return response.json()
+            return await self._json(response)
         else:
             return {"message": "Entry deleted successfully", "status": "deleted"}
 
@@ -1181,13 +1659,13 @@ class DimetricsAPIClient:
 
         response = await self.client.get("/resource_permission_groups/", params=params)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def get_resource_permission_group(self, group_id: str) -> Dict[str, Any]:
         """Holt Details einer spezifischen Resource-Permission-Gruppe."""
         response = await self.client.get(f"/resource_permission_groups/{group_id}/")
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def create_resource_permission_group(
         self,
@@ -1229,7 +1707,7 @@ class DimetricsAPIClient:
 
         response = await self.client.post("/resource_permission_groups/", json=data)
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
 
     async def update_resource_permission_group(
         self,
@@ -1246,8 +1724,9 @@ class DimetricsAPIClient:
             json=payload,
         )
         response.raise_for_status()
-        return response.json()
+        return await self._json(response)
     
     async def close(self):
-        """Schließt den HTTP Client."""
-        await self.client.aclose()
+        """Schließt den HTTP Client (ein gemeinsamer Transport bleibt offen)."""
+        if self._owns_transport:
+            await self.client.aclose()
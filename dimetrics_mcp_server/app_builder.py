@@ -0,0 +1,299 @@
+"""
+Erstellung kompletter Apps (App, Service, Resources, Attribute) mit Rollback.
+"""
+
+import asyncio
+import logging
+import re
+import time
+from typing import Dict, Any, List, Optional, Set
+
+import httpx
+
+from .api_client import DimetricsAPIClient
+
+logger = logging.getLogger(__name__)
+
+RELATION_TYPES = {"RELATION_FIELD", "RELATION_FIELD_MULTI"}
+
+_UUID_PATTERN = re.compile(r"^[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}$")
+
+
+class AppBuildError(Exception):
+    """Fehler beim Aufbau einer App; die bereits erstellten Objekte wurden zurückgerollt."""
+
+    def __init__(self, message: str, result: Dict[str, Any]):
+        super().__init__(message)
+        self.result = result
+
+
+def is_uuid(value: Any) -> bool:
+    """Prüft, ob ein Wert eine object_id (UUID) ist."""
+    return bool(_UUID_PATTERN.match(str(value)))
+
+
+def _error_text(e: BaseException) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"HTTP {e.response.status_code}: {e.response.text[:500]}"
+    return str(e)
+
+
+def attribute_payload(attribute: Dict[str, Any]) -> Dict[str, Any]:
+    """Normalisiert eine Attribut-Definition für create_attributes_bulk."""
+    payload = {key: value for key, value in attribute.items() if key != "options"}
+    # Legacy-Format: typ-spezifische Parameter unter "options"
+    if isinstance(attribute.get("options"), dict):
+        payload.update(attribute["options"])
+    payload["type"] = str(payload.get("type", "")).upper()
+    payload.setdefault("label", attribute.get("name"))
+    return payload
+
+
+def relation_dependencies(tables: List[Dict[str, Any]]) -> Dict[str, Set[str]]:
+    """
+    Ermittelt den Abhängigkeitsgraphen der Relationen.
+
+    Returns:
+        Mapping Tabellenname -> Namen der Tabellen aus der Definition, auf die
+        seine Relations-Attribute verweisen (externe UUIDs zählen nicht)
+    """
+    names = {table["name"] for table in tables}
+    graph: Dict[str, Set[str]] = {}
+    for table in tables:
+        targets = set()
+        for attribute in table.get("attributes", []):
+            target = attribute.get("linked_resource")
+            if str(attribute.get("type", "")).upper() in RELATION_TYPES and target in names:
+                targets.add(target)
+        graph[table["name"]] = targets
+    return graph
+
+
+def validate_app_spec(tables: List[Dict[str, Any]]) -> List[str]:
+    """Prüft die Tabellen-Definitionen, bevor etwas angelegt wird."""
+    errors: List[str] = []
+    seen: Set[str] = set()
+    names = {table.get("name") for table in tables if isinstance(table, dict)}
+
+    for position, table in enumerate(tables):
+        if not isinstance(table, dict) or not table.get("name"):
+            errors.append(f"Tabelle #{position + 1}: 'name' fehlt")
+            continue
+        name = table["name"]
+        if name in seen:
+            errors.append(f"Tabelle '{name}' ist mehrfach definiert")
+        seen.add(name)
+
+        attribute_names: Set[str] = set()
+        for attribute in table.get("attributes", []):
+            if not attribute.get("name") or not attribute.get("type"):
+                errors.append(f"Tabelle '{name}': Attribute brauchen 'name' und 'type'")
+                continue
+            if attribute["name"] in attribute_names:
+                errors.append(f"Tabelle '{name}': Attribut '{attribute['name']}' ist mehrfach definiert")
+            attribute_names.add(attribute["name"])
+
+            if str(attribute["type"]).upper() in RELATION_TYPES:
+                target = attribute.get("linked_resource")
+                if not target:
+                    errors.append(f"Tabelle '{name}': Relation '{attribute['name']}' braucht 'linked_resource'")
+                elif target not in names and not is_uuid(target):
+                    errors.append(
+                        f"Tabelle '{name}': Relation '{attribute['name']}' verweist auf unbekannte Tabelle '{target}'"
+                    )
+    return errors
+
+
+class AppBuilder:
+    """
+    Legt App, Service, Resources und Attribute mit minimaler Anzahl Roundtrips an.
+
+    Alle Resources werden parallel erstellt; pro Resource folgen ein
+    create_attributes_bulk für die einfachen Attribute und - sobald alle
+    Ziel-Resources existieren - ein zweites für die Relations-Attribute.
+    Schlägt ein Schritt fehl, werden alle erstellten Objekte in umgekehrter
+    Reihenfolge gelöscht.
+    """
+
+    def __init__(
+        self,
+        client: DimetricsAPIClient,
+        app_name: str,
+        tables: List[Dict[str, Any]],
+        app_description: str = "",
+        prefix: str = "",
+        service_name: str = "",
+        concurrency: int = 4
+    ):
+        self.client = client
+        self.app_name = app_name
+        self.tables = tables
+        self.app_description = app_description
+        self.prefix = prefix
+        self.service_name = service_name or app_name
+        self.concurrency = max(1, concurrency)
+
+        self.app: Optional[Dict[str, Any]] = None
+        self.service: Optional[Dict[str, Any]] = None
+        self.resources: Dict[str, Dict[str, Any]] = {}
+        self.attributes: Dict[str, List[Dict[str, Any]]] = {}
+        self.requests = 0
+
+    async def _call(self, coroutine):
+        """Führt einen API-Aufruf aus und zählt die Roundtrips."""
+        self.requests += 1
+        return await coroutine
+
+    async def _build_table(
+        self,
+        table: Dict[str, Any],
+        semaphore: asyncio.Semaphore,
+        ready: Dict[str, asyncio.Event],
+        failed: Set[str]
+    ) -> None:
+        name = table["name"]
+        try:
+            async with semaphore:
+                resource = await self._call(self.client.create_resource_endpoint(
+                    name=name,
+                    service=self.service["object_id"],
+                    title=table.get("title", ""),
+                    title_plural=table.get("title_plural", ""),
+                    description=table.get("description", "")
+                ))
+            self.resources[name] = resource
+        except BaseException:
+            failed.add(name)
+            raise
+        finally:
+            ready[name].set()
+
+        resource_name = resource.get("name", name)
+        plain, relations = [], []
+        for attribute in table.get("attributes", []):
+            payload = attribute_payload(attribute)
+            (relations if payload["type"] in RELATION_TYPES else plain).append(payload)
+
+        self.attributes[name] = []
+        if plain:
+            async with semaphore:
+                created = await self._call(self.client.create_attributes_bulk(resource_name, plain))
+            self.attributes[name].extend(created if isinstance(created, list) else [created])
+
+        if relations:
+            targets = {payload["linked_resource"] for payload in relations if payload["linked_resource"] in ready}
+            for target in targets:
+                await ready[target].wait()
+                if target in failed:
+                    raise RuntimeError(f"Ziel-Resource '{target}' für Relationen von '{name}' wurde nicht erstellt")
+            for payload in relations:
+                if payload["linked_resource"] in self.resources:
+                    payload["linked_resource"] = self.resources[payload["linked_resource"]]["object_id"]
+            async with semaphore:
+                created = await self._call(self.client.create_attributes_bulk(resource_name, relations))
+            self.attributes[name].extend(created if isinstance(created, list) else [created])
+
+    async def _rollback(self) -> List[str]:
+        """Löscht alle erstellten Objekte (Resources, dann Service, dann App)."""
+        errors: List[str] = []
+
+        async def delete(label: str, coroutine) -> None:
+            try:
+                await self._call(coroutine)
+            except Exception as e:
+                errors.append(f"{label}: {_error_text(e)}")
+
+        await asyncio.gather(*(
+            delete(f"Resource '{name}'", self.client.delete_resource_endpoint(resource["object_id"]))
+            for name, resource in self.resources.items()
+        ))
+        if self.service:
+            await delete(
+                f"Service '{self.service_name}'",
+                self.client.delete_service_endpoint(self.service["object_id"])
+            )
+        if self.app:
+            await delete(f"App '{self.app_name}'", self.client.delete_service(self.app["object_id"]))
+        return errors
+
+    def _summary(self) -> Dict[str, Any]:
+        return {
+            "app": {
+                "object_id": self.app.get("object_id") if self.app else None,
+                "name": self.app_name,
+                "prefix": self.app.get("prefix") if self.app else None
+            },
+            "service": {
+                "object_id": self.service.get("object_id") if self.service else None,
+                "name": self.service.get("name") if self.service else self.service_name
+            },
+            "resources": [
+                {
+                    "name": table["name"],
+                    "resource_name": self.resources[table["name"]].get("name"),
+                    "object_id": self.resources[table["name"]].get("object_id"),
+                    "attributes_created": len(self.attributes.get(table["name"], []))
+                }
+                for table in self.tables if table["name"] in self.resources
+            ],
+            "requests": self.requests
+        }
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Baut die App auf.
+
+        Returns:
+            Zusammenfassung mit IDs und Anzahl der Roundtrips
+
+        Raises:
+            ValueError: bei ungültigen Tabellen-Definitionen (es wird nichts angelegt)
+            AppBuildError: wenn ein Schritt fehlschlägt (nach Rollback)
+        """
+        errors = validate_app_spec(self.tables)
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        started = time.perf_counter()
+        try:
+            self.app = await self._call(self.client.create_app(
+                name=self.app_name, description=self.app_description, prefix=self.prefix
+            ))
+            self.service = await self._call(self.client.create_service_endpoint(
+                name=self.service_name, app_space=self.app["object_id"], description=self.app_description
+            ))
+
+            semaphore = asyncio.Semaphore(self.concurrency)
+            ready = {table["name"]: asyncio.Event() for table in self.tables}
+            failed: Set[str] = set()
+            # Alle Tasks laufen zu Ende, damit jedes erstellte Objekt für den Rollback bekannt ist
+            outcomes = await asyncio.gather(
+                *(self._build_table(table, semaphore, ready, failed) for table in self.tables),
+                return_exceptions=True
+            )
+            failures = [
+                f"Tabelle '{table['name']}': {_error_text(outcome)}"
+                for table, outcome in zip(self.tables, outcomes)
+                if isinstance(outcome, BaseException)
+            ]
+            if failures:
+                raise RuntimeError("; ".join(failures))
+        except Exception as e:
+            message = _error_text(e)
+            logger.error(f"Aufbau der App '{self.app_name}' fehlgeschlagen, starte Rollback: {message}")
+            rollback_errors = await self._rollback()
+            result = self._summary()
+            result.update(
+                rolled_back=True,
+                rollback_errors=rollback_errors,
+                elapsed_seconds=round(time.perf_counter() - started, 3)
+            )
+            raise AppBuildError(message, result) from e
+
+        result = self._summary()
+        result.update(
+            rolled_back=False,
+            dependencies={name: sorted(targets) for name, targets in relation_dependencies(self.tables).items()},
+            elapsed_seconds=round(time.perf_counter() - started, 3)
+        )
+        return result
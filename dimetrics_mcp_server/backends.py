@@ -0,0 +1,352 @@
+"""
+Registry benannter API Clients für mehrere Backends (z.B. dimetrics, werkportal, ppmc).
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from .api_client import DimetricsAPIClient, RateLimiter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BACKEND = "default"
+
+TENANT_POOL_SIZE = 256
+TENANT_IDLE_SECONDS = 900
+
+
+class BackendConfig:
+    """Verbindungsdaten und Limits eines Backends."""
+
+    __slots__ = ("name", "api_url", "api_key", "session_cookie", "timeout", "max_connections", "rate_limit")
+
+    def __init__(
+        self,
+        name: str,
+        api_url: str,
+        api_key: Optional[str] = None,
+        session_cookie: Optional[str] = None,
+        timeout: int = 30,
+        max_connections: int = 100,
+        rate_limit: float = 0.0
+    ):
+        self.name = name
+        self.api_url = api_url
+        self.api_key = api_key
+        self.session_cookie = session_cookie
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.rate_limit = rate_limit
+
+    def describe(self) -> Dict[str, Any]:
+        """Konfiguration ohne Zugangsdaten."""
+        return {
+            "name": self.name,
+            "api_url": self.api_url,
+            "auth": "token" if self.api_key else ("cookie" if self.session_cookie else None),
+            "max_connections": self.max_connections,
+            "rate_limit": self.rate_limit or None,
+        }
+
+
+def _env_backend(name: str) -> BackendConfig:
+    """Liest DIMETRICS_BACKEND_<NAME>_* Variablen."""
+    key = f"DIMETRICS_BACKEND_{name.upper()}_"
+    api_url = os.getenv(f"{key}API_URL")
+    if not api_url:
+        raise ValueError(f"{key}API_URL fehlt für Backend '{name}'")
+    return BackendConfig(
+        name=name,
+        api_url=api_url,
+        api_key=os.getenv(f"{key}API_KEY"),
+        session_cookie=os.getenv(f"{key}SESSION_COOKIE"),
+        timeout=int(os.getenv(f"{key}TIMEOUT", "30")),
+        max_connections=int(os.getenv(f"{key}MAX_CONNECTIONS", "100")),
+        rate_limit=float(os.getenv(f"{key}RATE_LIMIT", "0"))
+    )
+
+
+def _file_backends(path: str) -> Dict[str, BackendConfig]:
+    """
+    Liest Backends aus einer JSON-Datei:
+
+        {"backends": {"werkportal": {"api_url": "...", "api_key_env": "WERKPORTAL_API_KEY",
+                                     "max_connections": 20, "rate_limit": 10}}}
+
+    api_key_env/session_cookie_env verweisen auf Umgebungsvariablen, damit
+    keine Zugangsdaten in der Datei stehen müssen.
+    """
+    with open(path, encoding="utf-8") as handle:
+        data = json.load(handle)
+
+    configs: Dict[str, BackendConfig] = {}
+    for name, entry in data.get("backends", {}).items():
+        if not entry.get("api_url"):
+            raise ValueError(f"Backend '{name}' in '{path}' braucht 'api_url'")
+        configs[name] = BackendConfig(
+            name=name,
+            api_url=entry["api_url"],
+            api_key=entry.get("api_key") or (os.getenv(entry["api_key_env"]) if entry.get("api_key_env") else None),
+            session_cookie=entry.get("session_cookie") or (
+                os.getenv(entry["session_cookie_env"]) if entry.get("session_cookie_env") else None
+            ),
+            timeout=int(entry.get("timeout", 30)),
+            max_connections=int(entry.get("max_connections", 100)),
+            rate_limit=float(entry.get("rate_limit", 0))
+        )
+    return configs
+
+
+def load_backend_configs() -> Dict[str, BackendConfig]:
+    """
+    Lädt die Backend-Konfiguration.
+
+    Reihenfolge:
+        1. DIMETRICS_BACKENDS_FILE (JSON-Datei)
+        2. DIMETRICS_BACKENDS=dimetrics,werkportal,ppmc mit DIMETRICS_BACKEND_<NAME>_API_URL usw.
+        3. Einzelnes Backend 'default' aus DIMETRICS_API_URL / DIMETRICS_API_KEY
+    """
+    file_path = os.getenv("DIMETRICS_BACKENDS_FILE")
+    if file_path:
+        return _file_backends(file_path)
+
+    names = [name.strip() for name in os.getenv("DIMETRICS_BACKENDS", "").split(",") if name.strip()]
+    if names:
+        return {name: _env_backend(name) for name in names}
+
+    return {
+        DEFAULT_BACKEND: BackendConfig(
+            name=DEFAULT_BACKEND,
+            api_url=os.getenv("DIMETRICS_API_URL", "https://app.dimetrics.io/api"),
+            api_key=os.getenv("DIMETRICS_API_KEY"),
+            session_cookie=os.getenv("DIMETRICS_SESSION_COOKIE")
+        )
+    }
+
+
+def token_fingerprint(token: str) -> str:
+    """Kurzer Hash eines API-Tokens (Schlüssel im Pool, unbedenklich für Logs)."""
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16]
+
+
+class TenantClientPool:
+    """
+    LRU-Pool mandantenspezifischer Clients, Schlüssel (Backend, Token-Hash).
+
+    Jeder Mandant erhält einen eigenen DimetricsAPIClient mit eigenem
+    Auth-Header und eigenen Caches; alle Clients eines Backends teilen sich
+    denselben Transport und damit denselben Connection-Pool. Über
+    max_size hinaus oder nach idle_seconds ohne Zugriff werden Mandanten
+    verdrängt - die Verbindungen bleiben dabei offen.
+    """
+
+    def __init__(self, max_size: int = TENANT_POOL_SIZE, idle_seconds: float = TENANT_IDLE_SECONDS):
+        self.max_size = max(1, max_size)
+        self.idle_seconds = idle_seconds
+        self._clients: "OrderedDict[Tuple[str, str], Tuple[float, DimetricsAPIClient]]" = OrderedDict()
+        self.stats: Dict[str, int] = {"hits": 0, "misses": 0, "evicted_lru": 0, "evicted_idle": 0}
+
+    def _evict_idle(self, now: float) -> None:
+        if self.idle_seconds <= 0:
+            return
+        # Älteste Einträge stehen vorne
+        while self._clients:
+            key, (last_used, _) = next(iter(self._clients.items()))
+            if now - last_used < self.idle_seconds:
+                break
+            del self._clients[key]
+            self.stats["evicted_idle"] += 1
+
+    def get(self, backend: str, token: str, factory) -> DimetricsAPIClient:
+        """Liefert den Client eines Mandanten; factory() erstellt ihn bei Bedarf."""
+        now = time.monotonic()
+        self._evict_idle(now)
+        key = (backend, token_fingerprint(token))
+        entry = self._clients.get(key)
+        if entry is not None:
+            self.stats["hits"] += 1
+            client = entry[1]
+        else:
+            self.stats["misses"] += 1
+            client = factory()
+            while len(self._clients) >= self.max_size:
+                self._clients.popitem(last=False)
+                self.stats["evicted_lru"] += 1
+        self._clients[key] = (now, client)
+        self._clients.move_to_end(key)
+        return client
+
+    def clients_for(self, backend: str) -> List[DimetricsAPIClient]:
+        return [client for (name, _), (_, client) in self._clients.items() if name == backend]
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "tenants": len(self._clients),
+            "max_size": self.max_size,
+            "idle_seconds": self.idle_seconds,
+            **self.stats
+        }
+
+    def clear(self) -> None:
+        self._clients.clear()
+
+
+class ClientRegistry:
+    """
+    Hält pro Backend einen eigenen DimetricsAPIClient.
+
+    Jeder Client hat seinen eigenen Connection-Pool, eigene Caches und ein
+    eigenes Rate-Limit. Clients werden beim ersten Zugriff erstellt. Mit einem
+    Mandanten-Token liefert get() einen eigenen Client aus dem
+    TenantClientPool, der Connection-Pool und Rate-Limit des Backends
+    mitbenutzt.
+    """
+
+    def __init__(
+        self,
+        configs: Dict[str, BackendConfig],
+        default: Optional[str] = None,
+        tenant_pool: Optional[TenantClientPool] = None
+    ):
+        if not configs:
+            raise ValueError("Mindestens ein Backend muss konfiguriert sein")
+        self.configs = configs
+        self.default = default or next(iter(configs))
+        if self.default not in configs:
+            raise ValueError(f"Standard-Backend '{self.default}' ist nicht konfiguriert")
+        self._clients: Dict[str, DimetricsAPIClient] = {}
+        self._transports: Dict[str, httpx.AsyncHTTPTransport] = {}
+        self._rate_limiters: Dict[str, RateLimiter] = {}
+        self.tenant_pool = tenant_pool or TenantClientPool()
+        # Weitergabe lokaler Cache-Invalidierungen (z.B. CacheInvalidationBus.publish)
+        self.invalidation_hook = None
+        # Empfänger im eigenen Prozess (backend, scope, key), z.B. der PagePrefetcher
+        self.invalidation_listeners: List[Callable[[str, str, Optional[str]], None]] = []
+
+    @classmethod
+    def from_env(cls) -> "ClientRegistry":
+        return cls(
+            load_backend_configs(),
+            default=os.getenv("DIMETRICS_DEFAULT_BACKEND") or None,
+            tenant_pool=TenantClientPool(
+                max_size=int(os.getenv("DIMETRICS_TENANT_POOL_SIZE", str(TENANT_POOL_SIZE))),
+                idle_seconds=float(os.getenv("DIMETRICS_TENANT_IDLE_SECONDS", str(TENANT_IDLE_SECONDS)))
+            )
+        )
+
+    @property
+    def names(self) -> List[str]:
+        return list(self.configs)
+
+    def _config(self, name: str) -> BackendConfig:
+        config = self.configs.get(name)
+        if config is None:
+            raise ValueError(f"Unbekanntes Backend '{name}' (konfiguriert: {', '.join(self.names)})")
+        return config
+
+    def _transport(self, config: BackendConfig) -> httpx.AsyncHTTPTransport:
+        """Connection-Pool eines Backends, gemeinsam für Standard- und Mandanten-Clients."""
+        transport = self._transports.get(config.name)
+        if transport is None:
+            transport = httpx.AsyncHTTPTransport(limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_connections
+            ))
+            self._transports[config.name] = transport
+        return transport
+
+    def _rate_limiter(self, config: BackendConfig) -> Optional[RateLimiter]:
+        """Rate-Limit eines Backends, gemeinsam für Standard- und Mandanten-Clients."""
+        if config.rate_limit <= 0:
+            return None
+        limiter = self._rate_limiters.get(config.name)
+        if limiter is None:
+            limiter = self._rate_limiters[config.name] = RateLimiter(config.rate_limit)
+        return limiter
+
+    def _create_client(self, config: BackendConfig, api_key: Optional[str], session_cookie: Optional[str]):
+        client = DimetricsAPIClient(
+            base_url=config.api_url,
+            api_key=api_key,
+            session_cookie=session_cookie,
+            timeout=config.timeout,
+            name=config.name,
+            max_connections=config.max_connections,
+            transport=self._transport(config),
+            rate_limiter=self._rate_limiter(config)
+        )
+        client.invalidation_hook = self._publish_invalidation
+        return client
+
+    def _publish_invalidation(self, backend: str, scope: str, key: Optional[str]) -> None:
+        self._notify_listeners(backend, scope, key)
+        if self.invalidation_hook is not None:
+            self.invalidation_hook(backend, scope, key)
+
+    def _notify_listeners(self, backend: str, scope: str, key: Optional[str]) -> None:
+        for listener in self.invalidation_listeners:
+            listener(backend, scope, key)
+
+    def apply_invalidation(self, backend: str, scope: str, key: Optional[str]) -> None:
+        """Wendet eine Invalidierung eines anderen Prozesses auf alle Clients des Backends an."""
+        clients = self.tenant_pool.clients_for(backend)
+        if backend in self._clients:
+            clients.append(self._clients[backend])
+        for client in clients:
+            client.apply_invalidation(scope, key)
+        self._notify_listeners(backend, scope, key)
+
+    def get(self, backend: str = "", token: Optional[str] = None) -> DimetricsAPIClient:
+        """
+        Liefert den Client eines Backends (leer = Standard-Backend).
+
+        Args:
+            backend: Name des Backends
+            token: API-Token eines Mandanten; None = konfigurierte Zugangsdaten
+
+        Raises:
+            ValueError: wenn das Backend nicht konfiguriert ist
+        """
+        name = backend or self.default
+        if token:
+            config = self._config(name)
+            return self.tenant_pool.get(name, token, lambda: self._create_client(config, token, None))
+
+        client = self._clients.get(name)
+        if client is not None:
+            return client
+
+        config = self._config(name)
+        if not config.api_key and not config.session_cookie:
+            logger.warning(f"Keine Authentifizierung für Backend '{name}' konfiguriert - verwende Mock-Modus")
+
+        client = self._create_client(config, config.api_key, config.session_cookie)
+        self._clients[name] = client
+        return client
+
+    def register_client(self, name: str, client: DimetricsAPIClient) -> None:
+        """Registriert einen bereits erstellten Client (z.B. mit eigenem Transport)."""
+        if name not in self.configs:
+            self.configs[name] = BackendConfig(name=name, api_url=client.base_url)
+        client.invalidation_hook = self._publish_invalidation
+        self._clients[name] = client
+
+    def active_clients(self) -> Dict[str, DimetricsAPIClient]:
+        return dict(self._clients)
+
+    async def close(self) -> None:
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+        self.tenant_pool.clear()
+        for transport in self._transports.values():
+            await transport.aclose()
+        self._transports.clear()
+        self._rate_limiters.clear()
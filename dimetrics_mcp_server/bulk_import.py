@@ -0,0 +1,340 @@
+"""
+Streaming-Import von CSV/NDJSON-Dateien in eine Resource über die Generics API.
+"""
+
+import asyncio
+import csv
+import json
+import logging
+import os
+import time
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
+
+import httpx
+
+from .api_client import DimetricsAPIClient
+from .validation import coerce_row
+
+logger = logging.getLogger(__name__)
+
+# Anzahl der Versuche bei Verbindungsfehlern (nicht bei HTTP-Fehlerstatus)
+TRANSPORT_RETRIES = 2
+
+
+def detect_format(file_path: str, file_format: str = "") -> str:
+    """Ermittelt das Dateiformat (csv oder ndjson) aus Parameter oder Dateiendung."""
+    if file_format:
+        fmt = file_format.lower()
+    else:
+        fmt = os.path.splitext(file_path)[1].lower().lstrip(".")
+    if fmt in ("jsonl", "ndjson", "json"):
+        return "ndjson"
+    if fmt in ("csv", "tsv"):
+        return fmt
+    raise ValueError(f"Nicht unterstütztes Dateiformat '{fmt}' (erlaubt: csv, tsv, ndjson)")
+
+
+def iter_rows(file_path: str, file_format: str) -> Iterator[Tuple[int, Optional[Dict[str, Any]], Optional[str]]]:
+    """
+    Liest eine Datei zeilenweise (lazy).
+
+    Yields:
+        Tupel (Zeilennummer, Daten, Parse-Fehler). Zeilennummern beginnen bei 1
+        und zählen nur Datenzeilen (ohne CSV-Header).
+    """
+    if file_format in ("csv", "tsv"):
+        with open(file_path, newline="", encoding="utf-8-sig") as handle:
+            reader = csv.DictReader(handle, delimiter="\t" if file_format == "tsv" else ",")
+            for row_number, row in enumerate(reader, start=1):
+                yield row_number, row, None
+        return
+
+    with open(file_path, encoding="utf-8") as handle:
+        row_number = 0
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            row_number += 1
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield row_number, None, f"Ungültiges JSON: {e}"
+                continue
+            if not isinstance(data, dict):
+                yield row_number, None, "Zeile muss ein JSON-Objekt sein"
+                continue
+            yield row_number, data, None
+
+
+def _check_unique(seen_unique: Dict[str, Set[Any]], data: Dict[str, Any], errors: List[Dict[str, Any]]) -> None:
+    """
+    Ergänzt errors um Duplikate der unique-Felder innerhalb der Datei und merkt
+    sich die Werte gültiger Zeilen.
+    """
+    for name, seen in seen_unique.items():
+        value = data.get(name)
+        if value is None or isinstance(value, (dict, list)):
+            continue
+        if value in seen:
+            errors.append({
+                "field": name,
+                "code": "unique",
+                "message": f"{name}: Wert {value!r} kommt in der Datei mehrfach vor"
+            })
+        elif not errors:
+            seen.add(value)
+
+
+class ImportCheckpoint:
+    """
+    Fortschritt eines Imports für die Wiederaufnahme.
+
+    rows_done ist das Wasserzeichen: alle Zeilen bis einschließlich dieser
+    Nummer sind abgeschlossen (erstellt oder abgelehnt). Zeilen dahinter, die
+    vor einem Abbruch bereits gesendet wurden, werden beim Resume erneut
+    gesendet (at-least-once).
+    """
+
+    def __init__(self, path: str, resource_name: str, file_path: str):
+        self.path = path
+        self.resource_name = resource_name
+        self.file_path = file_path
+        self.rows_done = 0
+        self.created = 0
+        self.rejected = 0
+        self.completed = False
+
+    @classmethod
+    def load(cls, path: str, resource_name: str, file_path: str) -> "ImportCheckpoint":
+        """Lädt einen Checkpoint; verwirft ihn, wenn er zu einem anderen Import gehört."""
+        checkpoint = cls(path, resource_name, file_path)
+        if not os.path.exists(path):
+            return checkpoint
+        try:
+            with open(path, encoding="utf-8") as handle:
+                data = json.load(handle)
+        except (OSError, json.JSONDecodeError) as e:
+            logger.warning(f"Checkpoint '{path}' nicht lesbar, starte neu: {e}")
+            return checkpoint
+        if data.get("resource_name") != resource_name:
+            logger.warning(f"Checkpoint '{path}' gehört zu Resource '{data.get('resource_name')}', starte neu")
+            return checkpoint
+        checkpoint.rows_done = int(data.get("rows_done", 0))
+        checkpoint.created = int(data.get("created", 0))
+        checkpoint.rejected = int(data.get("rejected", 0))
+        checkpoint.completed = bool(data.get("completed", False))
+        return checkpoint
+
+    def save(self) -> None:
+        """Schreibt den Checkpoint atomar (temp-Datei + rename)."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as handle:
+            json.dump({
+                "resource_name": self.resource_name,
+                "file_path": self.file_path,
+                "rows_done": self.rows_done,
+                "created": self.created,
+                "rejected": self.rejected,
+                "completed": self.completed,
+                "updated_at": time.time()
+            }, handle)
+        os.replace(tmp_path, self.path)
+
+
+class ResourceImporter:
+    """Importiert eine Datei mit begrenzter Parallelität in eine Resource."""
+
+    def __init__(
+        self,
+        client: DimetricsAPIClient,
+        resource_name: str,
+        file_path: str,
+        file_format: str = "",
+        concurrency: int = 8,
+        resume: bool = True,
+        validate_only: bool = False,
+        max_rows: int = 0,
+        checkpoint_every: int = 200
+    ):
+        self.client = client
+        self.resource_name = resource_name
+        self.file_path = file_path
+        self.file_format = detect_format(file_path, file_format)
+        self.concurrency = max(1, concurrency)
+        self.resume = resume
+        self.validate_only = validate_only
+        self.max_rows = max_rows
+        self.checkpoint_every = max(1, checkpoint_every)
+
+        self.checkpoint_path = f"{file_path}.checkpoint.json"
+        # Reine Validierung schreibt in eine eigene Datei, damit echte Ablehnungen erhalten bleiben
+        suffix = "invalid" if validate_only else "rejected"
+        self.rejected_path = f"{file_path}.{suffix}.ndjson"
+
+        self._done_ahead: Set[int] = set()
+        self._since_save = 0
+        self._rejected_handle = None
+        self.checkpoint: Optional[ImportCheckpoint] = None
+        self.skipped = 0
+        self.processed = 0
+        self.created = 0
+        self.rejected = 0
+
+    def _mark_done(self, row_number: int) -> None:
+        """Markiert eine Zeile als abgeschlossen und schiebt das Wasserzeichen vor."""
+        checkpoint = self.checkpoint
+        self._done_ahead.add(row_number)
+        while checkpoint.rows_done + 1 in self._done_ahead:
+            checkpoint.rows_done += 1
+            self._done_ahead.remove(checkpoint.rows_done)
+
+        self._since_save += 1
+        if not self.validate_only and self._since_save >= self.checkpoint_every:
+            # Ablehnungen vor dem Checkpoint persistieren, damit keine Zeile verloren geht
+            if self._rejected_handle is not None:
+                self._rejected_handle.flush()
+            checkpoint.save()
+            self._since_save = 0
+
+    def _reject(self, row_number: int, data: Any, errors: List[Dict[str, Any]]) -> None:
+        """Schreibt eine abgelehnte Zeile in die Seitendatei."""
+        self.rejected += 1
+        self.checkpoint.rejected += 1
+        if self._rejected_handle is None:
+            self._rejected_handle = open(self.rejected_path, "a", encoding="utf-8")
+        self._rejected_handle.write(json.dumps({
+            "row": row_number,
+            "errors": errors,
+            "data": data
+        }, ensure_ascii=False, default=str) + "\n")
+
+    async def _post(self, row_number: int, data: Dict[str, Any]) -> None:
+        """Sendet eine Zeile an create_generic_entry (mit Retry bei Verbindungsfehlern)."""
+        for attempt in range(TRANSPORT_RETRIES + 1):
+            try:
+                await self.client.create_generic_entry(resource_name=self.resource_name, data=data)
+                self.created += 1
+                self.checkpoint.created += 1
+                return
+            except httpx.HTTPStatusError as e:
+                self._reject(row_number, data, [{"code": "http", "message": f"HTTP {e.response.status_code}: {e.response.text[:500]}"}])
+                return
+            except httpx.TransportError as e:
+                if attempt == TRANSPORT_RETRIES:
+                    self._reject(row_number, data, [{"code": "transport", "message": f"Verbindungsfehler: {e}"}])
+                    return
+                await asyncio.sleep(0.2 * (attempt + 1))
+
+    async def _worker(self, queue: "asyncio.Queue[Optional[Tuple[int, Dict[str, Any]]]]") -> None:
+        while True:
+            item = await queue.get()
+            if item is None:
+                return
+            row_number, data = item
+            try:
+                await self._post(row_number, data)
+            except Exception as e:
+                logger.error(f"Unerwarteter Fehler bei Zeile {row_number}: {e}")
+                self._reject(row_number, data, [{"code": "error", "message": str(e)}])
+            finally:
+                self._mark_done(row_number)
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        Führt den Import aus.
+
+        Returns:
+            Zusammenfassung mit Zählern, Durchsatz und Pfaden der Seitendateien
+        """
+        if self.resume and not self.validate_only:
+            self.checkpoint = ImportCheckpoint.load(self.checkpoint_path, self.resource_name, self.file_path)
+        else:
+            self.checkpoint = ImportCheckpoint(self.checkpoint_path, self.resource_name, self.file_path)
+            if os.path.exists(self.rejected_path):
+                # Frischer Lauf: alte Ablehnungen verwerfen
+                os.remove(self.rejected_path)
+
+        validator = await self.client.get_entry_validator(self.resource_name)
+        attributes = validator.attributes
+        # Bereits gesehene Werte der unique-Felder, um Duplikate innerhalb der Datei abzulehnen
+        seen_unique: Dict[str, Set[Any]] = {name: set() for name in validator.unique_fields}
+        resume_from = self.checkpoint.rows_done
+
+        queue: "asyncio.Queue[Optional[Tuple[int, Dict[str, Any]]]]" = asyncio.Queue(maxsize=self.concurrency * 4)
+        workers = []
+        if not self.validate_only:
+            workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+
+        started = time.perf_counter()
+        # Vollständig erst, wenn die Datei zu Ende gelesen ist (nicht schon, wenn max_rows erreicht ist)
+        exhausted = False
+        try:
+            for row_number, raw, parse_error in iter_rows(self.file_path, self.file_format):
+                if row_number <= resume_from:
+                    self.skipped += 1
+                    if seen_unique and not parse_error:
+                        # Werte des bereits importierten Teils nachtragen, damit Duplikate
+                        # auch über einen Resume hinweg abgelehnt werden
+                        data = coerce_row(attributes, raw)
+                        _check_unique(seen_unique, data, validator.validate(data))
+                    continue
+                if self.max_rows and self.processed >= self.max_rows:
+                    break
+                self.processed += 1
+
+                if parse_error:
+                    self._reject(row_number, raw, [{"code": "parse", "message": parse_error}])
+                    self._mark_done(row_number)
+                    continue
+
+                data = coerce_row(attributes, raw)
+                errors = validator.validate(data)
+                _check_unique(seen_unique, data, errors)
+                if errors:
+                    self._reject(row_number, raw, errors)
+                    self._mark_done(row_number)
+                    continue
+
+                if self.validate_only:
+                    self._mark_done(row_number)
+                else:
+                    await queue.put((row_number, data))
+            else:
+                exhausted = True
+
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+            if not self.validate_only:
+                self.checkpoint.completed = exhausted
+        finally:
+            for worker in workers:
+                worker.cancel()
+            if self._rejected_handle is not None:
+                self._rejected_handle.close()
+            if not self.validate_only:
+                self.checkpoint.save()
+
+        elapsed = time.perf_counter() - started
+        return {
+            "resource_name": self.resource_name,
+            "file_path": self.file_path,
+            "file_format": self.file_format,
+            "validate_only": self.validate_only,
+            "processed": self.processed,
+            "created": self.created,
+            "rejected": self.rejected,
+            "valid": self.processed - self.rejected if self.validate_only else self.created,
+            "skipped_resumed": self.skipped,
+            "completed": self.checkpoint.completed,
+            "elapsed_seconds": round(elapsed, 3),
+            "rows_per_second": round(self.processed / elapsed, 1) if elapsed > 0 else None,
+            "checkpoint_file": None if self.validate_only else self.checkpoint_path,
+            "rejected_file": self.rejected_path if self.rejected else None,
+            "totals": {
+                "created": self.checkpoint.created,
+                "rejected": self.checkpoint.rejected,
+                "rows_done": self.checkpoint.rows_done
+            }
+        }
@@ -0,0 +1,108 @@
+"""
+Weitergabe von Cache-Invalidierungen zwischen Worker-Prozessen über SQLite.
+"""
+
+import asyncio
+import logging
+import os
+import sqlite3
+import time
+from typing import Callable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Ereignisse älter als diese Zeit werden beim Aufräumen gelöscht
+RETENTION_SECONDS = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS invalidations (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    origin INTEGER NOT NULL,
+    backend TEXT NOT NULL,
+    scope TEXT NOT NULL,
+    key TEXT,
+    created_at REAL NOT NULL
+)
+"""
+
+Invalidation = Tuple[str, str, Optional[str]]
+
+
+class CacheInvalidationBus:
+    """
+    Verteilt Invalidierungen der worker-lokalen Caches an alle Prozesse.
+
+    Jeder Worker schreibt lokale Invalidierungen (geänderte Attribut-Schemas,
+    aktualisierte oder gelöschte Einträge) in eine gemeinsame SQLite-Datei und
+    liest in festen Abständen die Ereignisse der anderen Worker. Die Caches
+    bleiben damit lokal; veraltete Einträge leben höchstens poll_interval
+    Sekunden.
+    """
+
+    def __init__(self, path: str, poll_interval: float = 1.0):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.origin = os.getpid()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None, timeout=5)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        # Nur Ereignisse ab dem Start dieses Workers sind relevant
+        row = self._conn.execute("SELECT COALESCE(MAX(id), 0) FROM invalidations").fetchone()
+        self._last_id = row[0]
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"published": 0, "received": 0}
+
+    def publish(self, backend: str, scope: str, key: Optional[str]) -> None:
+        """Meldet eine lokale Invalidierung an die anderen Worker."""
+        try:
+            self._conn.execute(
+                "INSERT INTO invalidations (origin, backend, scope, key, created_at) VALUES (?, ?, ?, ?, ?)",
+                (self.origin, backend, scope, key, time.time())
+            )
+            self.stats["published"] += 1
+        except sqlite3.Error as e:
+            # Ohne Weitergabe verfallen die Caches der anderen Worker erst über ihr max_age
+            logger.warning(f"Cache-Invalidierung konnte nicht weitergegeben werden: {e}")
+
+    def poll(self) -> List[Invalidation]:
+        """Liest neue Invalidierungen anderer Worker."""
+        rows = self._conn.execute(
+            "SELECT id, origin, backend, scope, key FROM invalidations WHERE id > ? ORDER BY id",
+            (self._last_id,)
+        ).fetchall()
+        if rows:
+            self._last_id = rows[-1][0]
+        events = [(backend, scope, key) for _, origin, backend, scope, key in rows if origin != self.origin]
+        self.stats["received"] += len(events)
+        return events
+
+    def prune(self) -> None:
+        self._conn.execute("DELETE FROM invalidations WHERE created_at < ?", (time.time() - RETENTION_SECONDS,))
+
+    async def _run(self, apply: Callable[[str, str, Optional[str]], None]) -> None:
+        polls = 0
+        while True:
+            await asyncio.sleep(self.poll_interval)
+            try:
+                for backend, scope, key in self.poll():
+                    apply(backend, scope, key)
+                polls += 1
+                if polls % 600 == 0:
+                    self.prune()
+            except sqlite3.Error as e:
+                logger.warning(f"Cache-Invalidierungen konnten nicht gelesen werden: {e}")
+
+    def start(self, apply: Callable[[str, str, Optional[str]], None]) -> None:
+        """Startet das Polling im laufenden Event-Loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(apply))
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        self._conn.close()
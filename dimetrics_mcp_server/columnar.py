@@ -0,0 +1,799 @@
+"""
+Spaltenorientierter, memory-mapped Speicher für gespiegelte Resources.
+"""
+
+import asyncio
+import json
+import logging
+import math
+import mmap
+import operator
+import os
+import shutil
+import sys
+import threading
+import time
+from array import array
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from itertools import compress
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .api_client import DimetricsAPIClient
+from .mirror import _cell, fetch_entries, table_name_for
+from .validation import BOOLEAN_TYPES, DROPDOWN_TYPES, INTEGER_DATATYPES, META_FIELDS, NUMERIC_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Ab so vielen Segmenten wird im Hintergrund zu einem Segment verdichtet
+COMPACT_SEGMENTS = 8
+
+# Spaltentyp -> array-Typcode der Werte (None = Strings mit Offsets)
+TYPECODES = {
+    "int64": "q",
+    "float64": "d",
+    "bool": "b",
+    "timestamp": "q",
+    "dictionary": "i",
+    "string": None,
+}
+
+# Gruppen mit bis zu so vielen Schlüsseln werden über Masken statt Indexlisten gebildet
+MASK_GROUPS = 256
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = datetime.resolution
+_INVERT = bytes.maketrans(b"\0\1", b"\1\0")
+
+
+def column_kind(attribute: Dict[str, Any]) -> str:
+    """Spaltentyp eines Attributs."""
+    attr_type = str(attribute.get("type", "")).upper()
+    if attr_type in NUMERIC_TYPES:
+        datatype = str(attribute.get("numeric_datatype") or attribute.get("numericDatatype") or "").lower()
+        return "int64" if datatype in INTEGER_DATATYPES else "float64"
+    if attr_type in BOOLEAN_TYPES:
+        return "bool"
+    if attr_type == "TIMESTAMP_FIELD":
+        return "timestamp"
+    if attr_type in DROPDOWN_TYPES:
+        return "dictionary"
+    return "string"
+
+
+def columnar_schema(attributes: Sequence[Dict[str, Any]]) -> Dict[str, str]:
+    """Spalten (Name -> Typ): object_id, alle Attribute, Zeitstempel."""
+    schema = {"object_id": "string"}
+    for attribute in attributes:
+        name = attribute.get("name")
+        if name and name not in META_FIELDS and name not in schema:
+            schema[name] = column_kind(attribute)
+    schema["ingest_timestamp"] = "timestamp"
+    schema["update_timestamp"] = "timestamp"
+    return schema
+
+
+def _to_micros(value: Any) -> Optional[int]:
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return (parsed - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value: int) -> str:
+    return (_EPOCH + value * _MICROSECOND).isoformat().replace("+00:00", "Z")
+
+
+def _to_number(value: Any, kind: str) -> Optional[float]:
+    if value is None or value == "" or isinstance(value, (dict, list)):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(number):
+        return None
+    return int(number) if kind == "int64" else number
+
+
+def _to_bool(value: Any) -> Optional[int]:
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        return 1 if value.strip().lower() in ("true", "1", "yes", "ja") else 0
+    return 1 if value else 0
+
+
+def _padded(size: int) -> int:
+    return (size + 7) // 8 * 8
+
+
+def _lookup(keys: Any) -> bytes:
+    """Übersetzungstabelle für bytes.translate: 1 für die Bytes in keys."""
+    table = bytearray(256)
+    for key in keys:
+        table[key] = 1
+    return bytes(table)
+
+
+def _and(left: bytes, right: bytes) -> bytes:
+    """UND zweier Zeilenmasken (ein Byte 0/1 pro Zeile) in einem Schritt."""
+    return (int.from_bytes(left, "little") & int.from_bytes(right, "little")).to_bytes(len(left), "little")
+
+
+class _Column:
+    """Memory-mapped Spalte eines Segments (Werte ohne Kopie als memoryview)."""
+
+    def __init__(self, path: str, rows: int, kind: str):
+        self.kind = kind
+        self.rows = rows
+        with open(path, "rb") as handle:
+            self._mmap = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+        self.bytes = len(self._mmap)
+        view = memoryview(self._mmap)
+        self.validity = view[:rows]
+        start = _padded(rows)
+        typecode = TYPECODES[kind]
+        if typecode is None:
+            self.offsets = view[start:start + (rows + 1) * 8].cast("q")
+            self.values = None
+            self.data = view[start + (rows + 1) * 8:]
+        else:
+            self.values = view[start:start + rows * array(typecode).itemsize].cast(typecode)
+
+    def small_values(self) -> bytes:
+        """
+        Werte einer Spalte mit Werten 0..255 (Dictionary-Codes, bool) als
+        ein Byte pro Zeile: Masken entstehen dann per bytes.translate.
+        """
+        itemsize = self.values.itemsize
+        raw = self.values.cast("B").tobytes()
+        if itemsize == 1:
+            return raw
+        return raw[0 if sys.byteorder == "little" else itemsize - 1::itemsize]
+
+    def strings(self, missing: Any = None) -> List[Any]:
+        offsets, data, validity = self.offsets, self.data, self.validity
+        return [
+            bytes(data[offsets[index]:offsets[index + 1]]).decode("utf-8") if validity[index] else missing
+            for index in range(self.rows)
+        ]
+
+    def close(self) -> None:
+        for view in ("validity", "values", "offsets", "data"):
+            item = getattr(self, view, None)
+            if item is not None:
+                item.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            # Ein laufender Scan hält noch Views; die Abbildung endet mit dessen Ende
+            pass
+
+
+def _write_column(path: str, kind: str, values: List[Any]) -> None:
+    validity = bytes(value is not None for value in values)
+    with open(path, "wb") as handle:
+        handle.write(validity)
+        handle.write(b"\0" * (_padded(len(values)) - len(values)))
+        typecode = TYPECODES[kind]
+        if typecode is None:
+            encoded = [value.encode("utf-8") if value is not None else b"" for value in values]
+            offsets = array("q", [0])
+            total = 0
+            for item in encoded:
+                total += len(item)
+                offsets.append(total)
+            handle.write(offsets.tobytes())
+            handle.write(b"".join(encoded))
+        else:
+            handle.write(array(typecode, [0 if value is None else value for value in values]).tobytes())
+
+
+class ColumnarTable:
+    """
+    Eine gespiegelte Resource als Folge unveränderlicher Segmente.
+
+    Jede Spalte eines Segments ist eine eigene Datei (Gültigkeits-Bytes,
+    Werte im nativen Binärformat bzw. Offsets + UTF-8 für Strings) und wird
+    beim Lesen per mmap eingeblendet: Scans lesen nur die Dateien der
+    angefragten Spalten. Inkrementelle Syncs hängen ein Segment an; eine
+    Zeile in einem neueren Segment ersetzt ältere Versionen derselben
+    object_id. compact() fasst alle Segmente zu einem zusammen.
+
+    Lesende arbeiten auf dem Manifest, das bei ihrem Start galt; ersetzte
+    Segmente werden erst gelöscht, wenn kein Lesender sie mehr hält.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._columns: Dict[Tuple[str, str], _Column] = {}
+        self._live: Optional[Tuple[int, Dict[str, bytes]]] = None
+        # Segment -> Anzahl laufender Lesender; ersetzte, noch gelesene Segmente
+        self._readers: Dict[str, int] = {}
+        self._retired: set = set()
+        self.manifest = self._load_manifest()
+
+    def _load_manifest(self) -> Dict[str, Any]:
+        try:
+            with open(os.path.join(self.path, "manifest.json"), encoding="utf-8") as handle:
+                return json.load(handle)
+        except FileNotFoundError:
+            return {"version": 0, "schema": {}, "dictionaries": {}, "segments": [], "watermark": None, "resource": None}
+
+    def _save_manifest(self, manifest: Dict[str, Any]) -> None:
+        manifest["version"] = self.manifest.get("version", 0) + 1
+        temp = os.path.join(self.path, "manifest.json.tmp")
+        with open(temp, "w", encoding="utf-8") as handle:
+            json.dump(manifest, handle)
+        os.replace(temp, os.path.join(self.path, "manifest.json"))
+        self.manifest = manifest
+
+    @property
+    def rows(self) -> int:
+        """Anzahl der aktuellen Zeilen (ohne ersetzte Versionen)."""
+        with self._reading() as (_, live):
+            return sum(mask.count(1) for mask in live.values())
+
+    def describe(self) -> Dict[str, Any]:
+        with self._reading() as (manifest, live):
+            return {
+                "resource": manifest.get("resource"),
+                "columns": manifest.get("schema", {}),
+                "rows": sum(mask.count(1) for mask in live.values()),
+                "segments": len(manifest.get("segments", [])),
+                "stored_rows": sum(segment["rows"] for segment in manifest.get("segments", [])),
+                "watermark": manifest.get("watermark"),
+                "synced_at": manifest.get("synced_at"),
+                "bytes_on_disk": sum(
+                    entry.stat().st_size
+                    for segment in manifest.get("segments", [])
+                    for entry in os.scandir(os.path.join(self.path, segment["name"]))
+                )
+            }
+
+    @contextmanager
+    def _reading(self) -> Iterator[Tuple[Dict[str, Any], Dict[str, bytes]]]:
+        """
+        Hält Manifest und Zeilenmasken für die Dauer eines Lesevorgangs fest.
+
+        Solange der Block läuft, löscht _swap die Segmente des Manifests nicht.
+        """
+        with self._lock:
+            manifest = self.manifest
+            live = self._live_masks()
+            names = [segment["name"] for segment in manifest.get("segments", [])]
+            for name in names:
+                self._readers[name] = self._readers.get(name, 0) + 1
+        try:
+            yield manifest, live
+        finally:
+            with self._lock:
+                for name in names:
+                    count = self._readers.pop(name, 0) - 1
+                    if count > 0:
+                        self._readers[name] = count
+                self._remove_retired()
+
+    # ----- Schreiben -----
+
+    def _encode(self, kind: str, name: str, raw: List[Any], dictionaries: Dict[str, List[str]]) -> List[Any]:
+        if kind in ("int64", "float64"):
+            return [_to_number(value, kind) for value in raw]
+        if kind == "bool":
+            return [_to_bool(value) for value in raw]
+        if kind == "timestamp":
+            return [_to_micros(value) for value in raw]
+        cells = [None if value is None else str(_cell(value)) for value in raw]
+        if kind == "dictionary":
+            entries = dictionaries.setdefault(name, [])
+            codes = {value: code for code, value in enumerate(entries)}
+            encoded = []
+            for value in cells:
+                if value is None:
+                    encoded.append(None)
+                    continue
+                code = codes.get(value)
+                if code is None:
+                    code = codes[value] = len(entries)
+                    entries.append(value)
+                encoded.append(code)
+            return encoded
+        return cells
+
+    def write(
+        self,
+        resource_name: str,
+        schema: Dict[str, str],
+        entries: List[Dict[str, Any]],
+        watermark: Optional[str],
+        replace: bool = False
+    ) -> int:
+        """
+        Schreibt Einträge als neues Segment (replace=True: ersetzt alle Segmente).
+
+        Returns:
+            Anzahl geschriebener Zeilen
+        """
+        with self._lock:
+            os.makedirs(self.path, exist_ok=True)
+            manifest = json.loads(json.dumps(self.manifest))
+            if replace or manifest.get("schema") != schema:
+                manifest.update(schema=schema, dictionaries={}, segments=[])
+            manifest["resource"] = resource_name
+            sequence = manifest.get("sequence", 0) + 1
+            manifest["sequence"] = sequence
+            if entries:
+                name = f"seg-{sequence:06d}"
+                directory = os.path.join(self.path, name)
+                os.makedirs(directory, exist_ok=True)
+                for column, kind in schema.items():
+                    values = self._encode(kind, column, [entry.get(column) for entry in entries], manifest["dictionaries"])
+                    _write_column(os.path.join(directory, f"{column}.col"), kind, values)
+                manifest["segments"].append({"name": name, "rows": len(entries)})
+            if watermark:
+                manifest["watermark"] = watermark
+            manifest["synced_at"] = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+            self._swap(manifest)
+        return len(entries)
+
+    def compact(self) -> Dict[str, Any]:
+        """Fasst alle Segmente zu einem zusammen (nur aktuelle Zeilen)."""
+        started = time.perf_counter()
+        with self._lock:
+            manifest = self.manifest
+            segments = manifest.get("segments", [])
+            if len(segments) <= 1:
+                return {"segments": len(segments), "compacted": False}
+            schema = manifest["schema"]
+            live = self._live_masks()
+            sequence = manifest.get("sequence", 0) + 1
+            name = f"seg-{sequence:06d}"
+            directory = os.path.join(self.path, name)
+            os.makedirs(directory, exist_ok=True)
+            rows = 0
+            for column, kind in schema.items():
+                values: List[Any] = []
+                for segment in segments:
+                    mask = live[segment["name"]]
+                    values.extend(compress(self._raw(segment, column, kind), mask))
+                rows = len(values)
+                _write_column(os.path.join(directory, f"{column}.col"), kind, values)
+            updated = dict(manifest, sequence=sequence, segments=[{"name": name, "rows": rows}])
+            self._swap(updated)
+        logger.info(f"Spalten-Spiegel '{os.path.basename(self.path)}' verdichtet: {len(segments)} Segmente -> 1 ({rows} Zeilen)")
+        return {"segments": 1, "compacted": True, "rows": rows, "duration_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+    def _swap(self, manifest: Dict[str, Any]) -> None:
+        previous = {segment["name"] for segment in self.manifest.get("segments", [])}
+        self._save_manifest(manifest)
+        self._live = None
+        current = {segment["name"] for segment in manifest["segments"]}
+        self._retired.update(previous - current)
+        self._remove_retired()
+
+    def _remove_retired(self) -> None:
+        """Löscht ersetzte Segmente, die kein Lesender mehr hält (mit self._lock)."""
+        for name in [name for name in self._retired if name not in self._readers]:
+            # Nicht explizit schließen: zurückgegebene Views können die Abbildung noch halten
+            for key in [key for key in self._columns if key[0] == name]:
+                del self._columns[key]
+            shutil.rmtree(os.path.join(self.path, name), ignore_errors=True)
+            self._retired.discard(name)
+
+    # ----- Lesen -----
+
+    def _column(self, segment: Dict[str, Any], name: str, kind: str) -> _Column:
+        key = (segment["name"], name)
+        column = self._columns.get(key)
+        if column is None:
+            column = _Column(os.path.join(self.path, segment["name"], f"{name}.col"), segment["rows"], kind)
+            self._columns[key] = column
+        return column
+
+    def _raw(self, segment: Dict[str, Any], name: str, kind: str) -> Sequence[Any]:
+        """Gespeicherte Werte einer Spalte (None für fehlende Werte, Codes bei Dictionaries)."""
+        column = self._column(segment, name, kind)
+        if column.values is None:
+            return column.strings()
+        return [value if valid else None for value, valid in zip(column.values, column.validity)]
+
+    def _live_masks(self) -> Dict[str, bytes]:
+        """Pro Segment: welche Zeilen aktuell sind (neuere Segmente ersetzen ältere; mit self._lock)."""
+        version = self.manifest.get("version", 0)
+        if self._live is not None and self._live[0] == version:
+            return self._live[1]
+        segments = self.manifest.get("segments", [])
+        masks: Dict[str, bytes] = {}
+        if len(segments) == 1:
+            masks[segments[0]["name"]] = b"\1" * segments[0]["rows"]
+        else:
+            seen = set()
+            for segment in reversed(segments):
+                ids = self._column(segment, "object_id", "string").strings()
+                mask = bytearray(len(ids))
+                for index, object_id in enumerate(ids):
+                    if object_id not in seen:
+                        seen.add(object_id)
+                        mask[index] = 1
+                masks[segment["name"]] = bytes(mask)
+        self._live = (version, masks)
+        return masks
+
+    def _decoder(self, manifest: Dict[str, Any], name: str, kind: str) -> Callable[[Any], Any]:
+        if kind == "timestamp":
+            return _from_micros
+        if kind == "bool":
+            return bool
+        if kind == "dictionary":
+            return manifest["dictionaries"].get(name, []).__getitem__
+        return lambda value: value
+
+    def _mask(
+        self,
+        manifest: Dict[str, Any],
+        live: Dict[str, bytes],
+        segment: Dict[str, Any],
+        where: Dict[str, Dict[str, Any]]
+    ) -> bytes:
+        """Zeilen eines Segments, die alle Bedingungen erfüllen (UND)."""
+        mask = live[segment["name"]]
+        schema = manifest["schema"]
+        for name, conditions in where.items():
+            kind = schema.get(name)
+            if kind is None:
+                raise ValueError(f"Unbekannte Spalte '{name}'")
+            column = self._column(segment, name, kind)
+            # Ungültige Zeilen fallen über die Gültigkeitsmaske heraus
+            values = column.strings("") if column.values is None else column.values
+            for op, argument in conditions.items():
+                mask = _and(mask, _condition(op, argument, kind, column, values, manifest["dictionaries"].get(name, [])))
+        return mask
+
+    def _check_columns(self, manifest: Dict[str, Any], columns: Sequence[str]) -> None:
+        schema = manifest.get("schema", {})
+        unknown = [name for name in columns if name not in schema]
+        if unknown:
+            raise ValueError(f"Unbekannte Spalten: {', '.join(unknown)} (vorhanden: {', '.join(schema)})")
+
+    def scan(
+        self,
+        columns: Sequence[str],
+        where: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Iterator[Tuple[int, Dict[str, Sequence[Any]], bytes]]:
+        """
+        Liefert pro Segment die gespeicherten Werte der angefragten Spalten.
+
+        Yields:
+            (Zeilen im Segment, Spalte -> Werte/memoryview, Zeilenmaske)
+        """
+        with self._reading() as (manifest, live):
+            yield from self._scan(manifest, live, columns, where)
+
+    def _scan(
+        self,
+        manifest: Dict[str, Any],
+        live: Dict[str, bytes],
+        columns: Sequence[str],
+        where: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Iterator[Tuple[int, Dict[str, Sequence[Any]], bytes]]:
+        self._check_columns(manifest, columns)
+        for segment in manifest.get("segments", []):
+            mask = self._mask(manifest, live, segment, where or {})
+            yield segment["rows"], {name: self._values(manifest, segment, name) for name in columns}, mask
+
+    def _values(self, manifest: Dict[str, Any], segment: Dict[str, Any], name: str) -> Sequence[Any]:
+        kind = manifest["schema"][name]
+        column = self._column(segment, name, kind)
+        if column.values is None:
+            return column.strings()
+        if kind in ("int64", "float64") and all(column.validity):
+            return column.values
+        return [value if valid else None for value, valid in zip(column.values, column.validity)]
+
+    def read(self, columns: Sequence[str], where: Optional[Dict[str, Dict[str, Any]]] = None, limit: int = 100) -> List[Dict[str, Any]]:
+        """Zeilen mit den angefragten Spalten (dekodiert)."""
+        rows: List[Dict[str, Any]] = []
+        with self._reading() as (manifest, live):
+            self._check_columns(manifest, columns)
+            decoders = {name: self._decoder(manifest, name, manifest["schema"][name]) for name in columns}
+            for _, values, mask in self._scan(manifest, live, columns, where):
+                for index in compress(range(len(mask)), mask):
+                    rows.append({
+                        name: None if values[name][index] is None else decoders[name](values[name][index])
+                        for name in columns
+                    })
+                    if len(rows) >= limit:
+                        return rows
+        return rows
+
+    def _groups(
+        self,
+        manifest: Dict[str, Any],
+        segment: Dict[str, Any],
+        group_by: Optional[str],
+        mask: bytes
+    ) -> Iterator[Tuple[Any, Any]]:
+        """
+        Teilt die ausgewählten Zeilen eines Segments nach einer Spalte auf.
+
+        Yields:
+            (gespeicherter Schlüssel oder None, Zeilenmaske bzw. Indexliste)
+        """
+        if not group_by:
+            yield None, mask
+            return
+        kind = manifest["schema"][group_by]
+        column = self._column(segment, group_by, kind)
+        validity = bytes(column.validity)
+        selected = _and(mask, validity)
+        if kind == "bool" or (kind == "dictionary" and len(manifest["dictionaries"].get(group_by, [])) <= 256):
+            small = column.small_values()
+            for key in set(compress(small, selected)):
+                yield key, _and(selected, small.translate(_lookup((key,))))
+            keys = None
+        else:
+            keys = column.strings("") if column.values is None else column.values
+            distinct = set(compress(keys, selected))
+        if keys is None:
+            pass
+        elif len(distinct) <= MASK_GROUPS:
+            for key in distinct:
+                yield key, _and(selected, bytes(map(key.__eq__, keys)))
+        else:
+            indices: Dict[Any, List[int]] = {}
+            for index in compress(range(len(selected)), selected):
+                indices.setdefault(keys[index], []).append(index)
+            yield from indices.items()
+        missing = _and(mask, validity.translate(_INVERT))
+        if 1 in missing:
+            yield None, missing
+
+    def aggregate(
+        self,
+        aggregates: Dict[str, str],
+        group_by: Optional[str] = None,
+        where: Optional[Dict[str, Dict[str, Any]]] = None
+    ) -> Dict[str, Any]:
+        """
+        Aggregiert Spalten (count/sum/avg/min/max), optional gruppiert.
+
+        Args:
+            aggregates: Funktion -> Spalte, z.B. {"sum": "distance_km", "count": "object_id"}
+            group_by: Spalte für die Gruppierung
+            where: Bedingungen pro Spalte (_eq, _neq, _gt, _gte, _lt, _lte, _in, _nin, _null, _nnull)
+        """
+        with self._reading() as (manifest, live):
+            return self._aggregate(manifest, live, aggregates, group_by, where)
+
+    def _aggregate(
+        self,
+        manifest: Dict[str, Any],
+        live: Dict[str, bytes],
+        aggregates: Dict[str, str],
+        group_by: Optional[str],
+        where: Optional[Dict[str, Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        for function in aggregates:
+            if function not in ("count", "sum", "avg", "min", "max"):
+                raise ValueError(f"Unbekannte Aggregation '{function}' (erlaubt: count, sum, avg, min, max)")
+        columns = list(dict.fromkeys(list(aggregates.values()) + ([group_by] if group_by else [])))
+        self._check_columns(manifest, columns)
+        kinds = manifest.get("schema", {})
+        for function, name in aggregates.items():
+            if function in ("sum", "avg") and kinds[name] not in ("int64", "float64", "bool"):
+                raise ValueError(f"{function} ist nur für Zahlen- und Ja/Nein-Spalten möglich ('{name}' ist {kinds[name]})")
+        measures = list(dict.fromkeys(aggregates.values()))
+        # Pro Gruppe und Spalte: [count, sum, min, max]
+        states: Dict[Any, Dict[str, List[Any]]] = {}
+        for segment in manifest.get("segments", []):
+            mask = self._mask(manifest, live, segment, where or {})
+            if 1 not in mask:
+                continue
+            groups = list(self._groups(manifest, segment, group_by, mask))
+            for name in measures:
+                kind = kinds[name]
+                column = self._column(segment, name, kind)
+                # Werte einmal pro Segment auspacken (tolist: ohne Python-Schleife)
+                values = column.strings() if column.values is None else column.values.tolist()
+                if kind == "dictionary":
+                    # min/max nach Wert, nicht nach Code
+                    values = list(map(manifest["dictionaries"][name].__getitem__, values))
+                valid = _and(mask, bytes(column.validity))
+                for key, selector in groups:
+                    if isinstance(selector, list):
+                        present = [values[index] for index in selector if valid[index]]
+                    else:
+                        present = list(compress(values, _and(selector, valid)))
+                    _accumulate(states.setdefault(key, {}), name, kind, present)
+
+        decode = self._decoder(manifest, group_by, kinds[group_by]) if group_by else None
+        groups = []
+        for key, state in states.items():
+            row: Dict[str, Any] = {}
+            if group_by:
+                row[group_by] = None if key is None else decode(key)
+            for function, name in aggregates.items():
+                count, total, low, high = state.get(name, [0, 0, None, None])
+                if function == "count":
+                    value = count
+                elif function == "sum":
+                    value = total if count else None
+                elif function == "avg":
+                    value = total / count if count else None
+                else:
+                    value = low if function == "min" else high
+                    if value is not None and kinds[name] in ("timestamp", "bool"):
+                        value = self._decoder(manifest, name, kinds[name])(value)
+                row[f"{function}_{name}"] = value
+            groups.append(row)
+        return {"groups": groups if group_by else groups[:1] or [{f"{f}_{n}": 0 if f == "count" else None for f, n in aggregates.items()}]}
+
+    def close(self) -> None:
+        with self._lock:
+            self._readers.clear()
+            self._remove_retired()
+        for column in self._columns.values():
+            column.close()
+        self._columns.clear()
+
+
+def _accumulate(state: Dict[str, List[Any]], name: str, kind: str, present: List[Any]) -> None:
+    """Addiert vorhandene Werte (ohne None) zum Zustand [count, sum, min, max]."""
+    entry = state.setdefault(name, [0, 0, None, None])
+    if not present:
+        return
+    entry[0] += len(present)
+    if kind == "float64":
+        entry[1] += math.fsum(present)
+    elif kind in ("int64", "bool"):
+        entry[1] += sum(present)
+    low, high = min(present), max(present)
+    entry[2] = low if entry[2] is None else min(entry[2], low)
+    entry[3] = high if entry[3] is None else max(entry[3], high)
+
+
+# Vergleich "Wert <op> Ziel" als Methode des Ziels (gespiegelt)
+_REFLECTED = {
+    "_eq": "__eq__", "_neq": "__ne__", "_gt": "__lt__",
+    "_gte": "__le__", "_lt": "__gt__", "_lte": "__ge__",
+}
+_COMPARE = {
+    "_eq": operator.eq, "_neq": operator.ne, "_gt": operator.gt,
+    "_gte": operator.ge, "_lt": operator.lt, "_lte": operator.le,
+}
+
+
+def _condition(op: str, argument: Any, kind: str, column: _Column, values: Sequence[Any], dictionary: List[str]) -> bytes:
+    """Maske einer Bedingung; Argumente werden in die Speicherdarstellung umgerechnet."""
+    validity = column.validity
+    if op == "_null":
+        return bytes(validity).translate(_INVERT) if argument else bytes(validity)
+    if op == "_nnull":
+        return bytes(validity) if argument else bytes(validity).translate(_INVERT)
+    if op not in _COMPARE and op not in ("_in", "_nin"):
+        raise ValueError(f"Nicht unterstützter Operator '{op}' (erlaubt: _eq, _neq, _gt, _gte, _lt, _lte, _in, _nin, _null, _nnull)")
+    if op in ("_in", "_nin") and not isinstance(argument, list):
+        raise ValueError(f"{op} erwartet eine Liste")
+
+    if kind == "dictionary":
+        # Bedingung auf den (wenigen) Werten auswerten, dann über die Codes filtern
+        if op in ("_in", "_nin"):
+            wanted = {str(item) for item in argument}
+            codes = {code for code, value in enumerate(dictionary) if (value in wanted) == (op == "_in")}
+        else:
+            target = str(argument)
+            codes = {code for code, value in enumerate(dictionary) if _COMPARE[op](value, target)}
+        if len(dictionary) <= 256:
+            return _and(column.small_values().translate(_lookup(codes)), bytes(validity))
+        return _and(bytes(map(codes.__contains__, values)), bytes(validity))
+
+    def convert(value: Any) -> Any:
+        if kind == "timestamp":
+            return _to_micros(value)
+        if kind == "bool":
+            return _to_bool(value)
+        if kind in ("int64", "float64"):
+            return _to_number(value, "float64")
+        return None if value is None else str(value)
+
+    if op in ("_in", "_nin"):
+        wanted = {convert(item) for item in argument}
+        hits = bytes(map(wanted.__contains__, values))
+        return _and(hits if op == "_in" else hits.translate(_INVERT), bytes(validity))
+
+    target = convert(argument)
+    if target is None:
+        raise ValueError(f"Ungültiger Vergleichswert für {op}: {argument!r}")
+    return _and(bytes(map(getattr(target, _REFLECTED[op]), values)), bytes(validity))
+
+
+class ColumnarStore:
+    """Verzeichnis mit einer ColumnarTable pro Resource."""
+
+    def __init__(self, path: str, compact_segments: int = COMPACT_SEGMENTS):
+        self.path = path
+        self.compact_segments = compact_segments
+        os.makedirs(path, exist_ok=True)
+        self._tables: Dict[str, ColumnarTable] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._compactions: Dict[str, asyncio.Task] = {}
+
+    def table(self, resource_name: str) -> ColumnarTable:
+        name = table_name_for(resource_name)
+        table = self._tables.get(name)
+        if table is None:
+            table = self._tables[name] = ColumnarTable(os.path.join(self.path, name))
+        return table
+
+    def tables(self) -> List[Dict[str, Any]]:
+        result = []
+        for entry in sorted(os.scandir(self.path), key=lambda item: item.name):
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, "manifest.json")):
+                result.append({"table": entry.name, **self.table(entry.name).describe()})
+        return result
+
+    async def sync(
+        self,
+        client: DimetricsAPIClient,
+        resource_name: str,
+        full: bool = False,
+        page_size: int = 0,
+        concurrency: int = 4,
+        partition_by: str = "",
+        partitions: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Synchronisiert eine Resource in ihre Spalten-Tabelle.
+
+        Inkrementell (Standard, sobald ein Wasserstand existiert) werden nur
+        Einträge mit update_timestamp nach dem letzten Sync geladen und als
+        Segment angehängt. full=True lädt alles neu (erfasst auch Löschungen).
+        """
+        started = time.perf_counter()
+        lock = self._locks.setdefault(resource_name, asyncio.Lock())
+        async with lock:
+            table = self.table(resource_name)
+            schema = columnar_schema(await client.get_attribute_schema(resource_name))
+            watermark = table.manifest.get("watermark")
+            incremental = not full and watermark and table.manifest.get("schema") == schema
+            directus_filter = {"update_timestamp": {"_gt": watermark}} if incremental else None
+
+            batches, pages = await fetch_entries(
+                client, resource_name, page_size=page_size, concurrency=concurrency, directus_filter=directus_filter,
+                partition_by=partition_by, partitions=partitions
+            )
+            entries = [entry for batch in batches for entry in batch]
+            stamps = [entry.get("update_timestamp") for entry in entries if entry.get("update_timestamp")]
+            new_watermark = max(stamps, key=lambda stamp: _to_micros(stamp) or 0) if stamps else watermark
+            written = await asyncio.to_thread(
+                table.write, resource_name, schema, entries, new_watermark, not incremental
+            )
+
+        if len(table.manifest["segments"]) >= self.compact_segments and resource_name not in self._compactions:
+            task = asyncio.create_task(asyncio.to_thread(table.compact))
+            self._compactions[resource_name] = task
+            task.add_done_callback(lambda _: self._compactions.pop(resource_name, None))
+
+        return {
+            "table": table_name_for(resource_name),
+            "mode": "incremental" if incremental else "full",
+            "fetched": written,
+            "pages": pages,
+            "watermark": table.manifest.get("watermark"),
+            "segments": len(table.manifest["segments"]),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    async def close(self) -> None:
+        if self._compactions:
+            await asyncio.gather(*self._compactions.values(), return_exceptions=True)
+        for table in self._tables.values():
+            table.close()
+        self._tables.clear()
@@ -0,0 +1,63 @@
+"""
+Vergleich von Generic Entries für diff-basierte PATCH-Requests.
+"""
+
+import json
+from typing import Dict, Any
+
+
+def values_equal(current: Any, desired: Any) -> bool:
+    """
+    Vergleicht einen gespeicherten mit einem gewünschten Feldwert.
+
+    Berücksichtigt die Darstellung der API: Relationen kommen als Objekt
+    zurück, werden aber als object_id gesendet; Dezimalzahlen kommen
+    teilweise als String zurück.
+    """
+    if current == desired:
+        return True
+
+    if isinstance(current, dict) and not isinstance(desired, dict):
+        return current.get("object_id") == desired
+
+    if isinstance(current, list) and isinstance(desired, list):
+        return len(current) == len(desired) and all(
+            values_equal(c, d) for c, d in zip(current, desired)
+        )
+
+    numeric = (int, float)
+    if isinstance(current, str) and isinstance(desired, numeric) and not isinstance(desired, bool):
+        try:
+            return float(current) == float(desired)
+        except ValueError:
+            return False
+    if isinstance(desired, str) and isinstance(current, numeric) and not isinstance(current, bool):
+        try:
+            return float(desired) == float(current)
+        except ValueError:
+            return False
+
+    return False
+
+
+def diff_entry(current: Dict[str, Any], desired: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Liefert nur die Felder aus desired, die sich vom aktuellen Stand unterscheiden.
+
+    Args:
+        current: Aktueller Eintrag (gecacht oder frisch geladen)
+        desired: Gewünschte Feldwerte
+
+    Returns:
+        Geänderte Felder (leer wenn nichts zu tun ist)
+    """
+    return {
+        field: value
+        for field, value in desired.items()
+        if field not in current or not values_equal(current[field], value)
+    }
+
+
+def payload_size(data: Dict[str, Any]) -> int:
+    """Größe eines JSON-Payloads in Bytes (wie von httpx gesendet)."""
+    return len(json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
@@ -0,0 +1,267 @@
+"""
+Föderierte Abfragen: dieselbe list_generic_entries-Abfrage auf mehreren Backends.
+"""
+
+import asyncio
+import logging
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from .api_client import DimetricsAPIClient
+
+logger = logging.getLogger(__name__)
+
+# Spalte, die bei der Vereinigung die Herkunft einer Zeile angibt
+SOURCE_COLUMN = "_backend"
+
+AGGREGATE_FUNCTIONS = {"sum", "count", "avg", "min", "max"}
+
+
+def _error_text(e: BaseException) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"HTTP {e.response.status_code}: {e.response.text[:500]}"
+    return str(e)
+
+
+def _number(value: Any) -> Optional[Decimal]:
+    """Aggregat-Werte kommen als Strings ("54.00"); None bei leeren Mengen."""
+    if value is None or value == "":
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def _plain(value: Optional[Decimal]) -> Any:
+    if value is None:
+        return None
+    return int(value) if value == value.to_integral_value() else float(value)
+
+
+def _aggregate_row(response: Dict[str, Any]) -> Dict[str, Any]:
+    """Aggregat-Ergebnis einer Antwort ({"sum": {"amount": "54.00"}, ...})."""
+    rows = response.get("results") or []
+    if rows and isinstance(rows[0], dict):
+        return rows[0]
+    aggregations = response.get("aggregations")
+    if isinstance(aggregations, dict):
+        return aggregations
+    return {}
+
+
+def _value(row: Dict[str, Any], function: str, field: str) -> Any:
+    values = row.get(function)
+    return values.get(field) if isinstance(values, dict) else None
+
+
+def aggregate_requests(aggregate: Dict[str, str]) -> List[Dict[str, str]]:
+    """
+    Zerlegt eine Aggregation in die Abfragen, die pro Backend nötig sind.
+
+    avg lässt sich nicht aus Teil-Durchschnitten berechnen: dafür werden
+    sum und count desselben Feldes benötigt. Belegt die Aggregation sum oder
+    count bereits mit einem anderen Feld, folgt eine zweite Abfrage.
+
+    Raises:
+        ValueError: bei unbekannten Aggregations-Funktionen
+    """
+    unknown = set(aggregate) - AGGREGATE_FUNCTIONS
+    if unknown:
+        raise ValueError(
+            f"Unbekannte Aggregations-Funktion(en): {', '.join(sorted(unknown))} "
+            f"(verfügbar: {', '.join(sorted(AGGREGATE_FUNCTIONS))})"
+        )
+
+    primary = {function: field for function, field in aggregate.items() if function != "avg"}
+    field = aggregate.get("avg")
+    if not field:
+        return [primary]
+
+    helper = {"sum": field, "count": field}
+    if all(primary.get(function, field) == field for function in helper):
+        primary.update(helper)
+        return [primary]
+    return [primary, helper] if primary else [helper]
+
+
+def merge_aggregates(aggregate: Dict[str, str], rows: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Kombiniert die Aggregate mehrerer Backends.
+
+    sum und count werden addiert, min/max über alle Backends gebildet und
+    avg als Gesamtsumme / Gesamtanzahl berechnet.
+    """
+    merged: Dict[str, Any] = {}
+    for function, field in aggregate.items():
+        if function == "avg":
+            total = Decimal(0)
+            count = Decimal(0)
+            for row in rows:
+                row_count = _number(_value(row, "count", field))
+                row_sum = _number(_value(row, "sum", field))
+                if row_count and row_sum is not None:
+                    total += row_sum
+                    count += row_count
+            merged["avg"] = {field: float(total / count) if count else None}
+        elif function in ("sum", "count"):
+            values = [_number(_value(row, function, field)) for row in rows]
+            values = [value for value in values if value is not None]
+            merged[function] = {field: _plain(sum(values, Decimal(0))) if values or function == "count" else None}
+        else:
+            raw = [_value(row, function, field) for row in rows]
+            raw = [value for value in raw if value is not None]
+            numbers = [_number(value) for value in raw]
+            if raw and all(number is not None for number in numbers):
+                pick = min(numbers) if function == "min" else max(numbers)
+                merged[function] = {field: _plain(pick)}
+            else:
+                # Datums- oder Textwerte: ISO-Strings lassen sich direkt vergleichen
+                merged[function] = {field: (min(raw) if function == "min" else max(raw)) if raw else None}
+    return merged
+
+
+def _avg(row: Dict[str, Any], field: str) -> Any:
+    """Durchschnitt eines Backends aus seinem sum/count."""
+    total = _number(_value(row, "sum", field))
+    count = _number(_value(row, "count", field))
+    return float(total / count) if total is not None and count else None
+
+
+def _order_value(value: Any) -> Tuple[int, Any]:
+    # Relationen nach ihrer object_id (wie pagination.last_key)
+    if isinstance(value, dict):
+        value = value.get("object_id")
+    # Zahlen vor Text, None zuletzt, damit gemischte Typen vergleichbar bleiben
+    if value is None:
+        return (2, "")
+    if isinstance(value, (int, float, Decimal)):
+        return (0, value)
+    # Text und alles Übrige (z.B. Listen von Relationen) als Text
+    return (1, value if isinstance(value, str) else str(value))
+
+
+def _sort_rows(rows: List[Dict[str, Any]], ordering: str) -> List[Dict[str, Any]]:
+    """Sortiert die vereinigten Zeilen wie der Server (absteigend per '-feld')."""
+    fields = [name.strip() for name in ordering.split(",") if name.strip()]
+    # Stabile Sortierung von hinten nach vorne, pro Feld mit eigener Richtung
+    for name in reversed(fields):
+        field = name.lstrip("-")
+        rows.sort(key=lambda row: _order_value(row.get(field)), reverse=name.startswith("-"))
+    return rows
+
+
+async def federated_query(
+    clients: Dict[str, DimetricsAPIClient],
+    resource_name: str,
+    resource_names: Optional[Dict[str, str]] = None,
+    search: Optional[str] = None,
+    directus_filter: Optional[Dict[str, Any]] = None,
+    aggregate: Optional[Dict[str, str]] = None,
+    ordering: Optional[str] = None,
+    page_size: int = 20
+) -> Dict[str, Any]:
+    """
+    Führt dieselbe Abfrage parallel auf mehreren Backends aus.
+
+    Ohne Aggregation werden die Zeilen vereinigt und mit der Spalte
+    "_backend" markiert; mit Aggregation werden die Teilergebnisse korrekt
+    kombiniert (avg aus sum/count). Fehler einzelner Backends brechen die
+    Abfrage nicht ab, sondern erscheinen im Ergebnis des Backends.
+
+    Args:
+        clients: Backend-Name -> API Client
+        resource_name: Name der Resource (in allen Backends gleich)
+        resource_names: Abweichende Resource-Namen pro Backend (z.B. wegen App-Präfix)
+        search: Volltext-Suche
+        directus_filter: Directus-ähnliche Filter
+        aggregate: Aggregation (sum, count, avg, min, max)
+        ordering: Sortierung der vereinigten Zeilen
+        page_size: Zeilen pro Backend (nur ohne Aggregation)
+
+    Returns:
+        Vereinigte Zeilen bzw. kombinierte Aggregate und pro Backend Latenz,
+        Anzahl und Fehler
+    """
+    resource_names = resource_names or {}
+    requests = aggregate_requests(aggregate) if aggregate else [None]
+
+    async def query(name: str, client: DimetricsAPIClient) -> Dict[str, Any]:
+        target = resource_names.get(name, resource_name)
+        started = time.perf_counter()
+        info: Dict[str, Any] = {"backend": name, "resource_name": target}
+        try:
+            responses = await asyncio.gather(*(
+                client.list_generic_entries(
+                    resource_name=target,
+                    search=search,
+                    page_size=None if request else page_size,
+                    ordering=ordering,
+                    directus_filter=directus_filter,
+                    aggregate=request
+                )
+                for request in requests
+            ))
+            info.update(success=True, responses=responses)
+        except Exception as e:
+            logger.warning(f"Föderierte Abfrage auf Backend '{name}' fehlgeschlagen: {_error_text(e)}")
+            info.update(success=False, error=_error_text(e))
+        info["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        return info
+
+    started = time.perf_counter()
+    outcomes = await asyncio.gather(*(query(name, client) for name, client in clients.items()))
+    elapsed = round((time.perf_counter() - started) * 1000, 1)
+
+    succeeded = [outcome for outcome in outcomes if outcome["success"]]
+    result: Dict[str, Any] = {
+        "resource_name": resource_name,
+        "backends": [],
+        "elapsed_ms": elapsed,
+        "partial": len(succeeded) < len(outcomes)
+    }
+
+    if aggregate:
+        rows_per_backend = []
+        for outcome in outcomes:
+            entry = {key: outcome[key] for key in ("backend", "resource_name", "success", "latency_ms")}
+            if outcome["success"]:
+                row: Dict[str, Any] = {}
+                for response in outcome.pop("responses"):
+                    for function, values in _aggregate_row(response).items():
+                        if isinstance(values, dict):
+                            row.setdefault(function, {}).update(values)
+                rows_per_backend.append(row)
+                entry["aggregations"] = {
+                    function: {field: _avg(row, field) if function == "avg" else _value(row, function, field)}
+                    for function, field in aggregate.items()
+                }
+            else:
+                entry["error"] = outcome["error"]
+            result["backends"].append(entry)
+        result["aggregations"] = merge_aggregates(aggregate, rows_per_backend)
+        return result
+
+    rows: List[Dict[str, Any]] = []
+    total = 0
+    for outcome in outcomes:
+        entry = {key: outcome[key] for key in ("backend", "resource_name", "success", "latency_ms")}
+        if outcome["success"]:
+            response = outcome.pop("responses")[0]
+            backend_rows = response.get("results", [])
+            entry["count"] = response.get("count", len(backend_rows))
+            entry["returned"] = len(backend_rows)
+            entry["has_more"] = response.get("next") is not None
+            total += entry["count"]
+            rows.extend(dict(row, **{SOURCE_COLUMN: outcome["backend"]}) for row in backend_rows)
+        else:
+            entry["error"] = outcome["error"]
+        result["backends"].append(entry)
+
+    result["count"] = total
+    result["results"] = _sort_rows(rows, ordering) if ordering else rows
+    return result
+
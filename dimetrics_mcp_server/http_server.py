@@ -0,0 +1,121 @@
+"""
+Produktionsbetrieb: Streamable-HTTP-Transport hinter uvicorn mit mehreren Worker-Prozessen.
+"""
+
+import contextlib
+import logging
+import os
+from typing import Optional
+
+from .cache_bus import CacheInvalidationBus
+from .loop_monitor import loop_monitor
+
+logger = logging.getLogger(__name__)
+
+
+def _configure(workers: int) -> None:
+    """Passt die FastMCP-Einstellungen an den Betrieb mit mehreren Workern an."""
+    from . import __main__ as server
+
+    settings = server.mcp.settings
+    settings.host = os.getenv("HOST", "0.0.0.0")
+    settings.port = int(os.getenv("PORT", "8000"))
+
+    # Ohne Sticky Sessions landet jeder Request bei einem beliebigen Worker:
+    # Sessions dürfen dann keinen Zustand im Prozess halten
+    stateless = os.getenv("MCP_STATELESS_HTTP")
+    settings.stateless_http = stateless.lower() == "true" if stateless else workers > 1
+    if os.getenv("DIMETRICS_PREFETCH", "false").lower() == "true" and (workers > 1 or settings.stateless_http):
+        # Vorgeladene Seiten liegen im Prozess, die nächste Anfrage landet meist bei einem anderen Worker
+        logger.warning("DIMETRICS_PREFETCH ist nur mit einem Worker und zustandsbehafteten Sessions aktiv")
+    settings.json_response = os.getenv("MCP_JSON_RESPONSE", "false").lower() == "true"
+
+    allowed_hosts = [host.strip() for host in os.getenv("MCP_ALLOWED_HOSTS", "").split(",") if host.strip()]
+    if allowed_hosts:
+        from mcp.server.transport_security import TransportSecuritySettings
+
+        settings.transport_security = TransportSecuritySettings(
+            enable_dns_rebinding_protection=True,
+            allowed_hosts=allowed_hosts,
+            allowed_origins=[f"{scheme}://{host}" for host in allowed_hosts for scheme in ("http", "https")]
+        )
+    elif settings.host not in ("127.0.0.1", "localhost", "::1"):
+        # Hinter Container-Netz/Reverse-Proxy kommen beliebige Host-Header an
+        settings.transport_security = None
+
+
+def create_app():
+    """
+    ASGI-App-Factory für uvicorn (ein Aufruf pro Worker-Prozess).
+
+    Beim Start übernimmt der Job-Manager offene Jobs; beim Herunterfahren
+    werden die Hintergrund-Jobs angehalten (laufende Jobs bleiben für die
+    Recovery stehen) und alle API Clients samt Connection-Pools geschlossen. Mit DIMETRICS_CACHE_BUS_DB geben die
+    Worker Invalidierungen ihrer lokalen Caches aneinander weiter.
+    """
+    from . import __main__ as server
+
+    workers = int(os.getenv("MCP_WORKERS", "1"))
+    _configure(workers)
+    app = server.mcp.streamable_http_app()
+    session_lifespan = app.router.lifespan_context
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app):
+        registry = server.get_client_registry()
+        bus: Optional[CacheInvalidationBus] = None
+        bus_path = os.getenv("DIMETRICS_CACHE_BUS_DB")
+        if bus_path:
+            bus = CacheInvalidationBus(bus_path, poll_interval=float(os.getenv("DIMETRICS_CACHE_BUS_INTERVAL", "1.0")))
+            registry.invalidation_hook = bus.publish
+            bus.start(registry.apply_invalidation)
+
+        loop_monitor.ensure_started()
+        # Wartende Jobs und die Recovery nach einem Neustart nicht erst beim nächsten Job-Tool
+        server.get_job_manager().start()
+        logger.info(f"Worker {os.getpid()} bereit (stateless={server.mcp.settings.stateless_http})")
+        try:
+            async with session_lifespan(app):
+                yield
+        finally:
+            logger.info(f"Worker {os.getpid()} fährt herunter")
+            if bus is not None:
+                registry.invalidation_hook = None
+                await bus.stop()
+            if server.job_manager is not None:
+                await server.job_manager.shutdown()
+            for store in list(server.columnar_stores.values()):
+                await store.close()
+            server.columnar_stores.clear()
+            for views in list(server.materialized_views.values()):
+                views.close()
+            server.materialized_views.clear()
+            if server.page_prefetcher is not None:
+                server.page_prefetcher.close()
+            if server.result_store is not None:
+                server.result_store.close()
+            await registry.close()
+            await loop_monitor.stop()
+
+    app.router.lifespan_context = lifespan
+    return app
+
+
+def run(workers: Optional[int] = None) -> None:
+    """Startet uvicorn mit MCP_WORKERS Worker-Prozessen (Streamable HTTP unter /mcp)."""
+    import uvicorn
+
+    workers = workers or int(os.getenv("MCP_WORKERS", "1"))
+    os.environ["MCP_WORKERS"] = str(workers)
+    host = os.getenv("HOST", "0.0.0.0")
+    port = int(os.getenv("PORT", "8000"))
+    logger.info(f"Starte MCP Server (Streamable HTTP) auf {host}:{port} mit {workers} Worker(n)")
+    uvicorn.run(
+        "dimetrics_mcp_server.http_server:create_app",
+        factory=True,
+        host=host,
+        port=port,
+        workers=workers,
+        timeout_graceful_shutdown=int(os.getenv("MCP_SHUTDOWN_TIMEOUT", "30")),
+        log_level=os.getenv("MCP_LOG_LEVEL", "info")
+    )
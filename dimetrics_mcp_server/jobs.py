@@ -0,0 +1,362 @@
+"""
+In-Process Job-Queue für lang laufende Operationen mit SQLite-Persistenz.
+"""
+
+import asyncio
+import contextvars
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[..., Awaitable[Any]]
+
+# Status-Werte eines Jobs
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+CANCELLED = "cancelled"
+INTERRUPTED = "interrupted"
+
+FINAL_STATES = {SUCCEEDED, FAILED, CANCELLED, INTERRUPTED}
+
+# Intervall, in dem ein laufender Job auf Abbruch-Anfragen anderer Worker-Prozesse prüft
+CANCEL_POLL_SECONDS = 1.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_id TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,
+    params TEXT NOT NULL,
+    status TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    owner INTEGER,
+    tenant TEXT NOT NULL DEFAULT '',
+    cancel_requested INTEGER NOT NULL DEFAULT 0
+)
+"""
+
+
+def _process_alive(pid: Optional[int]) -> bool:
+    """Prüft, ob ein (anderer) Worker-Prozess auf diesem Host noch läuft."""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """Persistiert Job-Metadaten und -Ergebnisse in SQLite."""
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_SCHEMA)
+        columns = {row["name"] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        # Datenbanken älterer Versionen
+        if "owner" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN owner INTEGER")
+        if "tenant" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN tenant TEXT NOT NULL DEFAULT ''")
+        if "cancel_requested" not in columns:
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN cancel_requested INTEGER NOT NULL DEFAULT 0")
+
+    def insert(self, job_id: str, kind: str, params: Dict[str, Any], tenant: str = "") -> None:
+        self._conn.execute(
+            "INSERT INTO jobs (job_id, kind, params, status, created_at, owner, tenant) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (job_id, kind, json.dumps(params, ensure_ascii=False), QUEUED, time.time(), os.getpid(), tenant)
+        )
+
+    def update(self, job_id: str, only_if: Optional[str] = None, **fields: Any) -> bool:
+        """
+        Ändert Felder eines Jobs.
+
+        Args:
+            only_if: Nur ändern, wenn der Job (noch) diesen Status hat
+
+        Returns:
+            Ob der Job geändert wurde
+        """
+        if "result" in fields:
+            fields["result"] = json.dumps(fields["result"], ensure_ascii=False, default=str)
+        assignments = ", ".join(f"{name} = ?" for name in fields)
+        query = f"UPDATE jobs SET {assignments} WHERE job_id = ?"
+        args: List[Any] = [*fields.values(), job_id]
+        if only_if is not None:
+            query += " AND status = ?"
+            args.append(only_if)
+        return self._conn.execute(query, args).rowcount > 0
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        row = self._conn.execute("SELECT * FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return dict(row) if row else None
+
+    def cancel_requested(self, job_id: str) -> bool:
+        row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE job_id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def list(self, status: str = "", limit: int = 50, tenant: str = "") -> List[Dict[str, Any]]:
+        query = "SELECT job_id, kind, status, error, created_at, started_at, finished_at, attempts FROM jobs WHERE tenant = ?"
+        args: List[Any] = [tenant]
+        if status:
+            query += " AND status = ?"
+            args.append(status)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        args.append(limit)
+        return [dict(row) for row in self._conn.execute(query, args).fetchall()]
+
+    def unfinished(self) -> List[Dict[str, Any]]:
+        rows = self._conn.execute(
+            "SELECT * FROM jobs WHERE status IN (?, ?) ORDER BY created_at", (QUEUED, RUNNING)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+def describe_job(job: Dict[str, Any], include_result: bool = False) -> Dict[str, Any]:
+    """Bereitet einen Job-Datensatz für die Tool-Antwort auf."""
+    info = {
+        "job_id": job["job_id"],
+        "kind": job["kind"],
+        "status": job["status"],
+        "error": job.get("error"),
+        "attempts": job.get("attempts", 0),
+        "created_at": job.get("created_at"),
+        "started_at": job.get("started_at"),
+        "finished_at": job.get("finished_at"),
+    }
+    if job.get("started_at"):
+        end = job.get("finished_at") or time.time()
+        info["runtime_seconds"] = round(end - job["started_at"], 3)
+    if include_result:
+        info["result"] = json.loads(job["result"]) if job.get("result") else None
+    return info
+
+
+class JobManager:
+    """
+    Worker-Pool für Jobs, die als registrierte async-Handler ausgeführt werden.
+
+    Handler erhalten die Job-Parameter als Keyword-Argumente. Ein Ergebnis-Dict
+    mit "success": False markiert den Job als fehlgeschlagen. Nach einem
+    Neustart werden wartende Jobs erneut eingereiht; unterbrochene laufende
+    Jobs nur, wenn ihr Handler als resumable registriert ist, sonst werden sie
+    als 'interrupted' markiert. Teilen sich mehrere Worker-Prozesse die
+    Datenbank, übernimmt ein Worker nur Jobs, deren Prozess nicht mehr läuft.
+
+    Jobs gehören einem Mandanten (tenant) und sind nur für ihn sichtbar.
+    Der Handler läuft im Kontext des einreichenden Requests, sieht also
+    dessen Zugangsdaten und nicht die des Requests, der die Worker
+    gestartet hat. Nach einem Neustart ist dieser Kontext verloren:
+    Jobs von Mandanten werden dann als 'interrupted' markiert.
+    """
+
+    def __init__(self, db_path: str, workers: int = 2):
+        self.store = JobStore(db_path)
+        self.workers = max(1, workers)
+        self._handlers: Dict[str, JobHandler] = {}
+        self._resumable: Dict[str, bool] = {}
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._running: Dict[str, asyncio.Task] = {}
+        self._cancel_requested: set = set()
+        # Kontext (u.a. Request mit Mandanten-Token) der eingereichten Jobs
+        self._contexts: Dict[str, contextvars.Context] = {}
+
+    def register(self, kind: str, handler: JobHandler, resumable: bool = False) -> None:
+        """Registriert einen Handler für eine Job-Art."""
+        self._handlers[kind] = handler
+        self._resumable[kind] = resumable
+
+    @property
+    def kinds(self) -> List[str]:
+        return sorted(self._handlers)
+
+    def start(self) -> None:
+        """
+        Startet die Worker im laufenden Event-Loop und übernimmt offene Jobs.
+
+        Wird beim Serverstart aufgerufen, damit wartende Jobs nach einem
+        Neustart weiterlaufen; weitere Aufrufe ändern nichts.
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue()
+
+        for job in self.store.unfinished():
+            if job.get("owner") != os.getpid() and _process_alive(job.get("owner")):
+                # Gehört einem laufenden Worker-Prozess
+                continue
+            if job.get("cancel_requested"):
+                self.store.update(job["job_id"], status=CANCELLED, finished_at=time.time())
+                continue
+            if job.get("tenant"):
+                # Das Token des Mandanten wird nicht gespeichert
+                self.store.update(
+                    job["job_id"], status=INTERRUPTED, finished_at=time.time(),
+                    error="Zugangsdaten des Mandanten nach Neustart nicht verfügbar, Job erneut einreichen"
+                )
+                continue
+            if job["status"] == RUNNING and not self._resumable.get(job["kind"], False):
+                self.store.update(
+                    job["job_id"], status=INTERRUPTED, finished_at=time.time(),
+                    error="Server-Neustart während der Ausführung"
+                )
+                continue
+            if job["kind"] not in self._handlers:
+                self.store.update(job["job_id"], status=FAILED, error=f"Unbekannte Job-Art '{job['kind']}'")
+                continue
+            self.store.update(job["job_id"], status=QUEUED, owner=os.getpid())
+            self._queue.put_nowait(job["job_id"])
+            logger.info(f"Job {job['job_id']} ({job['kind']}) nach Neustart erneut eingereiht")
+
+        # Worker in leerem Kontext starten: sie sollen nichts vom aufrufenden Request erben
+        self._worker_tasks = [
+            asyncio.create_task(self._worker(), context=contextvars.Context()) for _ in range(self.workers)
+        ]
+
+    def submit(self, kind: str, params: Dict[str, Any], tenant: str = "") -> str:
+        """
+        Reiht einen Job ein und gibt sofort die Job-ID zurück.
+
+        Der Handler läuft später im aktuellen Kontext (Request des Mandanten).
+
+        Raises:
+            ValueError: wenn die Job-Art nicht registriert ist
+        """
+        if kind not in self._handlers:
+            raise ValueError(f"Unbekannte Job-Art '{kind}' (verfügbar: {', '.join(self.kinds)})")
+        self.start()
+        job_id = uuid.uuid4().hex
+        self.store.insert(job_id, kind, params, tenant=tenant)
+        self._contexts[job_id] = contextvars.copy_context()
+        self._queue.put_nowait(job_id)
+        return job_id
+
+    def get(self, job_id: str, tenant: str = "") -> Optional[Dict[str, Any]]:
+        """Job des Mandanten (None, wenn er nicht existiert oder einem anderen gehört)."""
+        self.start()
+        job = self.store.get(job_id)
+        if job is None or job.get("tenant", "") != tenant:
+            return None
+        return job
+
+    def list(self, status: str = "", limit: int = 50, tenant: str = "") -> List[Dict[str, Any]]:
+        self.start()
+        return self.store.list(status=status, limit=limit, tenant=tenant)
+
+    def cancel(self, job_id: str, tenant: str = "") -> Optional[str]:
+        """
+        Bricht einen Job ab.
+
+        Läuft der Job in einem anderen Worker-Prozess, wird der Abbruch in
+        der Datenbank vermerkt; der ausführende Worker prüft das regelmäßig.
+
+        Returns:
+            Neuer Status oder None wenn der Job nicht existiert
+        """
+        job = self.get(job_id, tenant=tenant)
+        if job is None:
+            return None
+        if job["status"] in FINAL_STATES:
+            return job["status"]
+
+        self._cancel_requested.add(job_id)
+        task = self._running.get(job_id)
+        if task is not None:
+            task.cancel()
+        elif not self.store.update(job_id, only_if=QUEUED, status=CANCELLED, finished_at=time.time()):
+            # Läuft bereits (in einem anderen Worker-Prozess)
+            self.store.update(job_id, cancel_requested=1)
+        return CANCELLED
+
+    async def _worker(self) -> None:
+        while True:
+            job_id = await self._queue.get()
+            job = self.store.get(job_id)
+            if job is None or job["status"] != QUEUED or job_id in self._cancel_requested:
+                self._cancel_requested.discard(job_id)
+                self._contexts.pop(job_id, None)
+                continue
+            await self._run(job)
+
+    async def _watch_cancel(self, job_id: str, task: asyncio.Task) -> None:
+        """Bricht den Job ab, sobald ein anderer Worker-Prozess den Abbruch vermerkt hat."""
+        while not task.done():
+            await asyncio.sleep(CANCEL_POLL_SECONDS)
+            if self.store.cancel_requested(job_id):
+                self._cancel_requested.add(job_id)
+                task.cancel()
+                return
+
+    async def _run(self, job: Dict[str, Any]) -> None:
+        job_id = job["job_id"]
+        handler = self._handlers[job["kind"]]
+        params = json.loads(job["params"])
+        # Ohne Kontext des Einreichenden (Recovery) in leerem Kontext: Zugangsdaten des Backends
+        context = self._contexts.pop(job_id, None) or contextvars.Context()
+        if not self.store.update(
+            job_id, only_if=QUEUED, status=RUNNING, started_at=time.time(), attempts=job["attempts"] + 1
+        ):
+            # Zwischenzeitlich abgebrochen
+            return
+
+        task = asyncio.create_task(handler(**params), context=context)
+        self._running[job_id] = task
+        watcher = asyncio.create_task(self._watch_cancel(job_id, task))
+        try:
+            result = await task
+        except asyncio.CancelledError:
+            if job_id not in self._cancel_requested:
+                # Worker selbst wird beendet (Shutdown): Job bleibt 'running' für Recovery
+                raise
+            self.store.update(job_id, only_if=RUNNING, status=CANCELLED, finished_at=time.time())
+            logger.info(f"Job {job_id} abgebrochen")
+            return
+        except Exception as e:
+            logger.error(f"Job {job_id} ({job['kind']}) fehlgeschlagen: {e}")
+            self.store.update(job_id, only_if=RUNNING, status=FAILED, error=str(e), finished_at=time.time())
+            return
+        finally:
+            watcher.cancel()
+            self._running.pop(job_id, None)
+            self._cancel_requested.discard(job_id)
+
+        failed = isinstance(result, dict) and result.get("success") is False
+        # Nur wenn der Job nicht zwischenzeitlich (von einem anderen Worker) abgebrochen wurde
+        self.store.update(
+            job_id,
+            only_if=RUNNING,
+            status=FAILED if failed else SUCCEEDED,
+            result=result,
+            error=result.get("error") if failed else None,
+            finished_at=time.time()
+        )
+
+    async def shutdown(self) -> None:
+        """Beendet die Worker; laufende Jobs bleiben für die Recovery als 'running' stehen."""
+        for task in self._worker_tasks:
+            task.cancel()
+        await asyncio.gather(*self._worker_tasks, return_exceptions=True)
+        self._worker_tasks = []
+        self._queue = None
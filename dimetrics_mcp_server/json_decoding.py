@@ -0,0 +1,126 @@
+"""
+JSON-Decoding von API-Antworten, ohne den Event-Loop bei großen Bodies zu blockieren.
+"""
+
+import asyncio
+import json
+import os
+import re
+import time
+from typing import Any, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional: schnelleres Decoding, falls installiert
+    orjson = None
+
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# Ab dieser Body-Größe wird kooperativ dekodiert
+COOPERATIVE_BYTES = int(os.getenv("DIMETRICS_JSON_COOPERATIVE_BYTES", str(512 * 1024)))
+
+# Maximale Zeit am Stück, bevor der Decoder an den Event-Loop abgibt
+SLICE_SECONDS = 0.002
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_DECODER = json.JSONDecoder()
+
+
+def loads(data: Any) -> Any:
+    """Dekodiert JSON in einem Zug (orjson, falls installiert)."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # NaN/Infinity u.ä. akzeptiert nur der Standard-Decoder
+            pass
+    return json.loads(data)
+
+
+class _Slicer:
+    """Gibt nach SLICE_SECONDS Rechenzeit an den Event-Loop ab."""
+
+    def __init__(self, slice_seconds: float):
+        self.slice_seconds = slice_seconds
+        self.started = time.perf_counter()
+        self.yields = 0
+
+    async def tick(self) -> None:
+        if time.perf_counter() - self.started >= self.slice_seconds:
+            await asyncio.sleep(0)
+            self.yields += 1
+            self.started = time.perf_counter()
+
+
+def _skip(text: str, index: int) -> int:
+    return _WHITESPACE.match(text, index).end()
+
+
+async def _array(text: str, index: int, slicer: _Slicer) -> Tuple[list, int]:
+    """Dekodiert ein Array Element für Element; index zeigt auf '['."""
+    items = []
+    index = _skip(text, index + 1)
+    if text.startswith("]", index):
+        return items, index + 1
+    while True:
+        value, index = _DECODER.raw_decode(text, index)
+        items.append(value)
+        index = _skip(text, index)
+        if text.startswith(",", index):
+            index = _skip(text, index + 1)
+        elif text.startswith("]", index):
+            return items, index + 1
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+        await slicer.tick()
+
+
+async def _object(text: str, index: int, slicer: _Slicer) -> Tuple[dict, int]:
+    """Dekodiert ein Objekt; Arrays auf oberster Ebene (z.B. "results") kooperativ."""
+    result = {}
+    index = _skip(text, index + 1)
+    if text.startswith("}", index):
+        return result, index + 1
+    while True:
+        if not text.startswith('"', index):
+            raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, index)
+        key, index = _DECODER.raw_decode(text, index)
+        index = _skip(text, index)
+        if not text.startswith(":", index):
+            raise json.JSONDecodeError("Expecting ':' delimiter", text, index)
+        index = _skip(text, index + 1)
+        if text.startswith("[", index):
+            result[key], index = await _array(text, index, slicer)
+        else:
+            result[key], index = _DECODER.raw_decode(text, index)
+        index = _skip(text, index)
+        if text.startswith(",", index):
+            index = _skip(text, index + 1)
+        elif text.startswith("}", index):
+            return result, index + 1
+        else:
+            raise json.JSONDecodeError("Expecting ',' delimiter", text, index)
+        await slicer.tick()
+
+
+async def loads_cooperative(data: Any, slice_seconds: float = SLICE_SECONDS) -> Any:
+    """
+    Dekodiert JSON und gibt regelmäßig an den Event-Loop ab.
+
+    json und orjson halten während des gesamten Aufrufs den GIL, ein
+    Thread-Pool verkürzt die Blockade des Event-Loops daher nicht. Stattdessen
+    werden Arrays (die Ergebnis-Listen von List-Endpunkten) Element für
+    Element dekodiert; nach jeweils slice_seconds kommen andere Sessions zum Zug.
+    """
+    text = data.decode("utf-8") if isinstance(data, (bytes, bytearray)) else data
+    slicer = _Slicer(slice_seconds)
+    index = _skip(text, 0)
+    if text.startswith("{", index):
+        value, index = await _object(text, index, slicer)
+    elif text.startswith("[", index):
+        value, index = await _array(text, index, slicer)
+    else:
+        value, index = _DECODER.raw_decode(text, index)
+    if _skip(text, index) != len(text):
+        raise json.JSONDecodeError("Extra data", text, index)
+    return value
@@ -0,0 +1,76 @@
+"""
+Messung der Event-Loop-Verzögerung (wie lange der Loop durch synchrone Arbeit blockiert ist).
+"""
+
+import asyncio
+import logging
+from collections import deque
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Ab dieser Verzögerung gilt ein Tick als Blockade
+STALL_SECONDS = 0.1
+
+
+class LoopLagMonitor:
+    """
+    Misst, wie viel später als geplant ein periodischer Timer feuert.
+
+    Die Verspätung entspricht der Zeit, in der der Event-Loop durch
+    synchrone Arbeit (z.B. JSON-Decoding) blockiert war und keine andere
+    Session bedienen konnte.
+    """
+
+    def __init__(self, interval: float = 0.05, window: int = 1200):
+        self.interval = interval
+        self._recent: deque = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self.samples = 0
+        self.max_lag = 0.0
+        self.total_lag = 0.0
+        self.stalls = 0
+
+    def ensure_started(self) -> None:
+        """Startet die Messung im laufenden Event-Loop (idempotent)."""
+        loop = asyncio.get_running_loop()
+        if self._task is not None and not self._task.done() and self._task.get_loop() is loop:
+            return
+        self._task = loop.create_task(self._run())
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            planned = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            self.record(max(0.0, loop.time() - planned))
+
+    def record(self, lag: float) -> None:
+        self.samples += 1
+        self.total_lag += lag
+        self.max_lag = max(self.max_lag, lag)
+        self._recent.append(lag)
+        if lag >= STALL_SECONDS:
+            self.stalls += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        recent = sorted(self._recent)
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "mean_ms": round(self.total_lag / self.samples * 1000, 2) if self.samples else None,
+            "p99_ms": round(recent[int(len(recent) * 0.99) - 1] * 1000, 2) if len(recent) >= 100 else None,
+            "max_ms": round(self.max_lag * 1000, 2),
+            "stalls_over_100ms": self.stalls,
+        }
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+# Prozessweiter Monitor (ein Event-Loop pro Worker)
+loop_monitor = LoopLagMonitor()
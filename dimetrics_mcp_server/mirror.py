@@ -0,0 +1,332 @@
+"""
+Lokale SQLite-Spiegel von Resources für SQL-Abfragen (Joins, GROUP BY, Window Functions).
+"""
+
+import asyncio
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .api_client import DimetricsAPIClient
+from .partitioning import PartitionedScan
+from .validation import BOOLEAN_TYPES, INTEGER_DATATYPES, META_FIELDS, NUMERIC_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Systemfelder, die zusätzlich zu den Attributen gespiegelt werden
+META_COLUMNS = ("ingest_timestamp", "update_timestamp")
+
+# Maximale Laufzeit einer SQL-Abfrage
+QUERY_TIMEOUT_SECONDS = 10.0
+
+_META_SCHEMA = """
+CREATE TABLE IF NOT EXISTS _mirror_tables (
+    table_name TEXT PRIMARY KEY,
+    resource TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    row_count INTEGER NOT NULL,
+    synced_at REAL NOT NULL,
+    duration_ms REAL NOT NULL
+)
+"""
+
+# Aktionen, die eine Abfrage ausführen darf (alles andere, z.B. ATTACH oder PRAGMA, wird abgelehnt)
+_READ_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION, sqlite3.SQLITE_RECURSIVE}
+
+
+def table_name_for(resource_name: str) -> str:
+    """SQL-Tabellenname einer Resource (nur Buchstaben, Ziffern und _)."""
+    name = re.sub(r"\W", "_", resource_name)
+    return f"r_{name}" if not name or name[0].isdigit() else name
+
+
+def _quote(identifier: str) -> str:
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def column_type(attribute: Dict[str, Any]) -> str:
+    """SQLite-Spaltentyp eines Attributs (Relationen und Listen als TEXT)."""
+    attr_type = str(attribute.get("type", "")).upper()
+    if attr_type in BOOLEAN_TYPES:
+        return "INTEGER"
+    if attr_type in NUMERIC_TYPES:
+        datatype = str(attribute.get("numeric_datatype") or attribute.get("numericDatatype") or "").lower()
+        return "INTEGER" if datatype in INTEGER_DATATYPES else "REAL"
+    return "TEXT"
+
+
+def mirror_columns(attributes: Sequence[Dict[str, Any]]) -> List[Tuple[str, str]]:
+    """Spalten des Spiegels: object_id, alle Attribute, Zeitstempel."""
+    columns = [("object_id", "TEXT")]
+    seen = {"object_id"}
+    for attribute in attributes:
+        name = attribute.get("name")
+        if not name or name in META_FIELDS or name in seen:
+            continue
+        seen.add(name)
+        columns.append((name, column_type(attribute)))
+    columns.extend((name, "TEXT") for name in META_COLUMNS)
+    return columns
+
+
+def _id_of(value: Any) -> Any:
+    return value.get("object_id", value) if isinstance(value, dict) else value
+
+
+def _cell(value: Any) -> Any:
+    """
+    Wert einer Zelle: Relationen als object_id (für Joins), Listen als
+    JSON-Array (auswertbar mit json_each), sonstige Objekte als JSON.
+    """
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, dict):
+        if "object_id" in value:
+            return value["object_id"]
+        return json.dumps(value, ensure_ascii=False)
+    if isinstance(value, list):
+        return json.dumps([_id_of(item) for item in value], ensure_ascii=False)
+    return value
+
+
+async def fetch_entries(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    page_size: int = 0,
+    concurrency: int = 4,
+    directus_filter: Optional[Dict[str, Any]] = None,
+    partition_by: str = "",
+    partitions: int = 8
+) -> Tuple[List[List[Dict[str, Any]]], int]:
+    """
+    Lädt alle (gefilterten) Einträge einer Resource, Seiten parallel.
+
+    Mit partition_by (object_id oder Zahlen-/Zeitstempel-Feld) wird die
+    Resource in disjunkte Bereiche zerlegt, die parallel per Keyset
+    gelesen werden (siehe partitioning.py); sonst parallel nach Seitennummer.
+    page_size=0 wählt die Seitengröße adaptiv (siehe page_sizing.py).
+
+    Returns:
+        Einträge pro Seite (bzw. pro Bereich) und Anzahl der Seiten
+    """
+    if partition_by:
+        scan = PartitionedScan(client, resource_name, partition_by, partitions, directus_filter, concurrency)
+        batches, stats = await scan.run(page_size=page_size)
+        return batches, sum(partition["pages"] for partition in stats["partitions"])
+
+    # Feste Sortierung, damit parallel geladene Seiten sich nicht überschneiden
+    first = await client.list_generic_page(
+        resource_name, page_size=page_size or None, ordering="object_id", directus_filter=directus_filter
+    )
+    first_results = first.get("results", [])
+    if not (first.get("next") and first_results):
+        return [first_results], 1
+    step = first["page_size"]
+    count = first.get("count", 0)
+    if len(first_results) < step:
+        # Die API begrenzt page_size: maßgeblich ist die tatsächliche Seitengröße
+        requests = [(step, page) for page in range(2, math.ceil(count / len(first_results)) + 1)]
+    else:
+        # Adaptiv: die übrigen Seiten in einem Vielfachen der ersten Seitengröße,
+        # soweit die Messung es erlaubt; die Lücke davor füllen Seiten der ersten Größe
+        factor = 1 if page_size else max(1, client.page_sizer(resource_name).size // step)
+        size = step * factor
+        requests = [(step, page) for page in range(2, min(factor, math.ceil(count / step)) + 1)]
+        requests += [(size, page) for page in range(2, math.ceil(count / size) + 1)]
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch(size: int, page: int) -> List[Dict[str, Any]]:
+        async with semaphore:
+            data = await client.list_generic_page(
+                resource_name, page_size=size, page=page, ordering="object_id", directus_filter=directus_filter
+            )
+            return data.get("results", [])
+
+    return [first_results] + await asyncio.gather(*(fetch(size, page) for size, page in requests)), len(requests) + 1
+
+
+def _read_only(action: int, table: Optional[str], *_: Any) -> int:
+    if action in _READ_ACTIONS:
+        return sqlite3.SQLITE_OK
+    # Table-valued Functions (z.B. json_each) registrieren sich intern in sqlite_master;
+    # die Verbindung ist read-only, echte Schreibzugriffe scheitern ohnehin
+    if action == sqlite3.SQLITE_UPDATE and table == "sqlite_master":
+        return sqlite3.SQLITE_OK
+    return sqlite3.SQLITE_DENY
+
+
+class ResourceMirror:
+    """
+    SQLite-Datei mit einer Tabelle pro gespiegelter Resource.
+
+    sync() lädt alle Einträge über die paginierte Generics API (Seiten
+    parallel) und ersetzt die Tabelle atomar; Tabellen- und Spaltennamen
+    kommen aus Resource- und Attribut-Definitionen. query() führt
+    ausschließlich lesendes SQL über eine eigene read-only Verbindung aus.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(_META_SCHEMA)
+        # Schreibzugriffe laufen in Worker-Threads, jeweils einer zur Zeit
+        self._write_lock = threading.Lock()
+
+    def _reader(self) -> sqlite3.Connection:
+        """Eigene read-only Verbindung (sieht nur abgeschlossene Syncs)."""
+        return sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+
+    def _meta(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        conn = self._reader()
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def tables(self) -> List[Dict[str, Any]]:
+        """Gespiegelte Tabellen mit Spalten, Zeilenzahl und Alter."""
+        now = time.time()
+        rows = self._meta(
+            "SELECT table_name, resource, columns, row_count, synced_at, duration_ms FROM _mirror_tables ORDER BY table_name"
+        )
+        return [
+            {
+                "table": table,
+                "resource": resource,
+                "columns": dict(json.loads(columns)),
+                "rows": row_count,
+                "synced_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(synced_at)),
+                "age_seconds": round(now - synced_at, 1),
+                "sync_ms": duration_ms
+            }
+            for table, resource, columns, row_count, synced_at, duration_ms in rows
+        ]
+
+    def age(self, resource_name: str) -> Optional[float]:
+        """Sekunden seit dem letzten Sync einer Resource (None = nicht gespiegelt)."""
+        rows = self._meta("SELECT synced_at FROM _mirror_tables WHERE table_name = ?", (table_name_for(resource_name),))
+        return time.time() - rows[0][0] if rows else None
+
+    async def sync(
+        self,
+        client: DimetricsAPIClient,
+        resource_name: str,
+        page_size: int = 0,
+        concurrency: int = 4,
+        partition_by: str = "",
+        partitions: int = 8
+    ) -> Dict[str, Any]:
+        """
+        Lädt alle Einträge einer Resource und ersetzt ihre Tabelle.
+
+        Returns:
+            Tabellenname, Spalten, Zeilen, Seiten und Dauer
+        """
+        started = time.perf_counter()
+        attributes = await client.get_attribute_schema(resource_name)
+        columns = mirror_columns(attributes)
+
+        batches, pages = await fetch_entries(
+            client, resource_name, page_size=page_size, concurrency=concurrency,
+            partition_by=partition_by, partitions=partitions
+        )
+        names = [name for name, _ in columns]
+        rows = [tuple(_cell(entry.get(name)) for name in names) for batch in batches for entry in batch]
+
+        table = table_name_for(resource_name)
+        duration_ms = (time.perf_counter() - started) * 1000
+        count = await asyncio.to_thread(self._replace_table, table, resource_name, columns, rows, duration_ms)
+        logger.info(f"Spiegel '{table}' aktualisiert: {count} Zeilen aus {pages} Seiten in {duration_ms:.0f} ms")
+        return {
+            "table": table,
+            "resource": resource_name,
+            "columns": dict(columns),
+            "rows": count,
+            "pages": pages,
+            "duration_ms": round(duration_ms, 1)
+        }
+
+    def _replace_table(
+        self,
+        table: str,
+        resource_name: str,
+        columns: List[Tuple[str, str]],
+        rows: List[tuple],
+        duration_ms: float
+    ) -> int:
+        staging = f"_sync_{table}"
+        definition = ", ".join(
+            f"{_quote(name)} {sql_type}" + (" PRIMARY KEY" if name == "object_id" else "") for name, sql_type in columns
+        )
+        placeholders = ", ".join("?" for _ in columns)
+        with self._write_lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(staging)}")
+                conn.execute(f"CREATE TABLE {_quote(staging)} ({definition})")
+                conn.executemany(f"INSERT OR REPLACE INTO {_quote(staging)} VALUES ({placeholders})", rows)
+                count = conn.execute(f"SELECT COUNT(*) FROM {_quote(staging)}").fetchone()[0]
+                conn.execute(f"DROP TABLE IF EXISTS {_quote(table)}")
+                conn.execute(f"ALTER TABLE {_quote(staging)} RENAME TO {_quote(table)}")
+                conn.execute(
+                    "INSERT OR REPLACE INTO _mirror_tables VALUES (?, ?, ?, ?, ?, ?)",
+                    (table, resource_name, json.dumps(columns), count, time.time(), round(duration_ms, 1))
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return count
+
+    def _query(self, sql: str, params: Sequence[Any], max_rows: int, timeout: float) -> Dict[str, Any]:
+        started = time.perf_counter()
+        conn = self._reader()
+        try:
+            conn.set_authorizer(_read_only)
+            deadline = time.monotonic() + timeout
+            conn.set_progress_handler(lambda: 1 if time.monotonic() > deadline else 0, 10000)
+            cursor = conn.execute(sql, params)
+            columns = [description[0] for description in cursor.description or []]
+            rows = cursor.fetchmany(max_rows + 1)
+        finally:
+            conn.close()
+        return {
+            "columns": columns,
+            "rows": [dict(zip(columns, row)) for row in rows[:max_rows]],
+            "row_count": min(len(rows), max_rows),
+            "truncated": len(rows) > max_rows,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 2)
+        }
+
+    async def query(
+        self,
+        sql: str,
+        params: Sequence[Any] = (),
+        max_rows: int = 1000,
+        timeout: float = QUERY_TIMEOUT_SECONDS
+    ) -> Dict[str, Any]:
+        """
+        Führt eine lesende SQL-Abfrage aus (SELECT/WITH).
+
+        Raises:
+            ValueError: bei Syntaxfehlern, schreibenden Anweisungen oder Zeitüberschreitung
+        """
+        try:
+            return await asyncio.to_thread(self._query, sql, params, max(1, max_rows), timeout)
+        except sqlite3.Error as e:
+            message = "Zeitüberschreitung" if "interrupted" in str(e) else str(e)
+            raise ValueError(f"SQL-Fehler: {message}") from e
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,151 @@
+"""
+Projektionen der Strukturobjekte der Dimetrics API auf ihre bekannten Felder.
+"""
+
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+class Projection:
+    """
+    Projektion einer API-Antwort auf die bekannten Felder eines Objekttyps.
+
+    Fehlende Felder erhalten die Standardwerte (wie bisher die .get()-Aufrufe
+    in den Tools). Die Standardwerte dict und list stehen für ein neues,
+    leeres Objekt je Antwort, damit Antworten keine Instanz teilen.
+
+    Args:
+        fields: Feldname -> Standardwert, in der Reihenfolge der Antwort
+        summary: Felder in Listen-Antworten (leer = alle)
+    """
+
+    __slots__ = ("names", "summary", "project", "summarize")
+
+    def __init__(self, fields: Dict[str, Any], summary: Sequence[str] = ()):
+        self.names = tuple(fields)
+        self.summary = tuple(summary) or self.names
+        # Dict für die Tool-Antwort mit allen Feldern bzw. den Feldern für Listen-Antworten
+        self.project = _compile(fields, self.names)
+        self.summarize = _compile(fields, self.summary)
+
+    def page(self, payload: Any, summary: bool = False) -> List[Dict[str, Any]]:
+        """Projektionen einer Antwort, die eine Liste oder ein Dict mit "results" ist."""
+        return list(map(self.summarize if summary else self.project, _results(payload)))
+
+
+def _compile(fields: Dict[str, Any], names: Tuple[str, ...]) -> Callable[[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Erzeugt die Projektion als Funktion mit einem Dict-Literal (wie
+    dataclasses per exec): so schnell wie die früheren .get()-Literale.
+    """
+    namespace: Dict[str, Any] = {}
+    items = []
+    for index, name in enumerate(names):
+        default = fields[name]
+        if default in (dict, list):
+            namespace[f"factory_{index}"] = default
+            items.append(f"{name!r}: get({name!r}) if {name!r} in data else factory_{index}()")
+        else:
+            namespace[f"default_{index}"] = default
+            items.append(f"{name!r}: get({name!r}, default_{index})")
+    source = "def project(data):\n    get = data.get\n    return {" + ", ".join(items) + "}\n"
+    exec(source, namespace)
+    return namespace["project"]
+
+
+def _results(payload: Any) -> List[Dict[str, Any]]:
+    if isinstance(payload, dict):
+        return payload.get("results") or []
+    return payload if isinstance(payload, list) else []
+
+
+_TIMESTAMPS: Dict[str, Optional[str]] = {"ingest_timestamp": None, "update_timestamp": None}
+
+APP = Projection({
+    "object_id": None,
+    "name": None,
+    "prefix": None,
+    "description": "",
+    "icon": None,
+    "subscription": dict,
+    **_TIMESTAMPS
+})
+
+CATEGORY = Projection({
+    "object_id": None,
+    "name": None,
+    "prefix": None,
+    "description": "",
+    "icon": None,
+    "subscription": dict,
+    **_TIMESTAMPS
+})
+
+SERVICE = Projection({
+    "object_id": None,
+    "name": None,
+    "title": None,
+    "description": "",
+    "app_space": None,
+    "category": None,
+    "icon": None,
+    "order": None,
+    "hidden": None,
+    "isFavorite": None,
+    "nested_resources": list,
+    "subscription": dict,
+    **_TIMESTAMPS
+})
+
+RESOURCE = Projection(
+    {
+        "object_id": None,
+        "name": None,
+        "title": None,
+        "title_plural": None,
+        "description": "",
+        "service": None,
+        "icon": None,
+        "form_layout_type": None,
+        "meta_attributes_enabled": None,
+        "primary_key_name": None,
+        "primary_key_type": None,
+        "table_type": None,
+        "table_column_width": None,
+        "default_page_size": None,
+        "is_table_pagination": None,
+        "is_table_flex": None,
+        "allow_table_inline_edit": None,
+        "table_sort_default_column_name": None,
+        "table_sort_default_direction": None,
+        "subscription": dict,
+        **_TIMESTAMPS
+    },
+    summary=(
+        "object_id", "name", "title", "title_plural", "description", "service", "icon",
+        "table_type", "meta_attributes_enabled", "subscription", "ingest_timestamp", "update_timestamp"
+    )
+)
+
+ATTRIBUTE = Projection(
+    {
+        "object_id": None,
+        "name": None,
+        "type": None,
+        "label": None,
+        "description": "",
+        "required": False,
+        "readonly": False,
+        "unique": False,
+        "show_in_table": True,
+        "enable_sum": False,
+        "field_order": None,
+        "form_layout_location": "Main",
+        "form_layout_col": "12",
+        "resource": dict,
+        **_TIMESTAMPS
+    },
+    summary=(
+        "object_id", "name", "type", "label", "description", "required", "readonly", "unique",
+        "show_in_table", "enable_sum", "field_order", "form_layout_location", "form_layout_col", "resource"
+    )
+)
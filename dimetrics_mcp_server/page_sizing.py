@@ -0,0 +1,146 @@
+"""
+Adaptive Seitengröße für Durchläufe über viele Seiten.
+
+Pro Resource wird gemessen, wie viele Bytes eine Zeile hat und wie lange
+ein Request braucht (fester Anteil plus Anteil pro Zeile). Daraus ergibt
+sich die Seitengröße, die eine Ziel-Antwortgröße und eine Ziel-Latenz
+einhält: schmale Tabellen brauchen weniger Requests, breite laufen nicht
+in Timeouts.
+"""
+
+import os
+from typing import Any, Dict, Optional
+
+# Zielgröße einer Antwort und Ziel-Latenz eines Requests
+TARGET_BYTES = int(os.getenv("DIMETRICS_PAGE_TARGET_BYTES", str(1024 * 1024)))
+TARGET_SECONDS = float(os.getenv("DIMETRICS_PAGE_TARGET_SECONDS", "2.0"))
+
+# Grenzen der Seitengröße
+MIN_PAGE_SIZE = int(os.getenv("DIMETRICS_PAGE_SIZE_MIN", "20"))
+MAX_PAGE_SIZE = int(os.getenv("DIMETRICS_PAGE_SIZE_MAX", "5000"))
+
+# Startwert, solange noch nichts gemessen wurde
+INITIAL_PAGE_SIZE = 200
+
+# Maximaler Wachstumsfaktor pro Seite (Verkleinern sofort)
+GROWTH = 2.0
+
+# Gewicht einer neuen Messung im gleitenden Mittel; ältere Seiten
+# verlieren in der Latenz-Schätzung entsprechend an Gewicht
+SMOOTHING = 0.3
+
+
+def _smooth(current: Optional[float], sample: float) -> float:
+    return sample if current is None else current + SMOOTHING * (sample - current)
+
+
+class PageSizer:
+    """
+    Seitengröße einer Resource, nachgeführt aus gemessenen Seiten.
+
+    Args:
+        initial: Startwert
+        minimum: Untergrenze
+        maximum: Obergrenze (sinkt, wenn die API page_size begrenzt)
+        target_bytes: Angestrebte Antwortgröße in Bytes
+        target_seconds: Angestrebte Latenz pro Request
+    """
+
+    def __init__(
+        self,
+        initial: int = INITIAL_PAGE_SIZE,
+        minimum: int = MIN_PAGE_SIZE,
+        maximum: int = MAX_PAGE_SIZE,
+        target_bytes: int = TARGET_BYTES,
+        target_seconds: float = TARGET_SECONDS
+    ):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.target_bytes = target_bytes
+        self.target_seconds = target_seconds
+        self.size = min(max(initial, self.minimum), self.maximum)
+        self.bytes_per_row: Optional[float] = None
+        # Latenz = overhead_seconds + Zeilen * seconds_per_row, geschätzt per
+        # Regression über die gewichteten Summen der Messungen
+        self.seconds_per_row: Optional[float] = None
+        self.overhead_seconds: Optional[float] = None
+        self._sums = [0.0, 0.0, 0.0, 0.0, 0.0]  # Gewicht, x, y, x², xy
+        self.pages = 0
+        self.timeouts = 0
+
+    def observe(self, rows: int, response_bytes: int, seconds: float, requested: int, more: bool) -> int:
+        """
+        Nimmt eine Seite auf und passt die Seitengröße an.
+
+        Args:
+            rows: Gelieferte Zeilen
+            response_bytes: Größe der Antwort
+            seconds: Latenz des Requests
+            requested: Angefragte page_size
+            more: Ob weitere Seiten folgen
+
+        Returns:
+            Neue Seitengröße
+        """
+        if rows <= 0:
+            return self.size
+        self.pages += 1
+        if more and rows < requested:
+            # Die API begrenzt page_size: größer anzufragen bringt nichts
+            self.maximum = max(self.minimum, rows)
+
+        self.bytes_per_row = _smooth(self.bytes_per_row, response_bytes / rows)
+        self._fit_latency(rows, seconds)
+
+        by_bytes = self.target_bytes / max(self.bytes_per_row, 1.0)
+        budget = self.target_seconds - self.overhead_seconds
+        if budget <= 0:
+            by_latency = float(self.minimum)
+        elif self.seconds_per_row > 0:
+            by_latency = budget / self.seconds_per_row
+        else:
+            by_latency = float(self.maximum)
+
+        target = min(by_bytes, by_latency, self.size * GROWTH)
+        self.size = int(min(max(target, self.minimum), self.maximum))
+        return self.size
+
+    def _fit_latency(self, rows: int, seconds: float) -> None:
+        decay = 1.0 - SMOOTHING
+        sample = (1.0, rows, seconds, rows * rows, rows * seconds)
+        self._sums = [total * decay + value for total, value in zip(self._sums, sample)]
+        weight, x, y, xx, xy = self._sums
+        variance = xx / weight - (x / weight) ** 2
+        if variance > (0.1 * x / weight) ** 2:
+            slope = max(0.0, (xy / weight - x * y / weight ** 2) / variance)
+            self.seconds_per_row = slope
+            self.overhead_seconds = max(0.0, (y - slope * x) / weight)
+        else:
+            # Bisher nur (fast) gleich große Seiten: Latenz proportional zur Zeilenzahl annehmen
+            self.seconds_per_row = y / x
+            self.overhead_seconds = 0.0
+
+    def timed_out(self) -> bool:
+        """
+        Halbiert die Seitengröße nach einem Timeout; größer wird sie danach nicht mehr.
+
+        Returns:
+            False, wenn die Untergrenze bereits erreicht war (erneuter Versuch sinnlos)
+        """
+        self.timeouts += 1
+        if self.size <= self.minimum:
+            return False
+        self.size = self.maximum = max(self.minimum, self.size // 2)
+        return True
+
+    def describe(self) -> Dict[str, Any]:
+        """Aktueller Stand für Metriken."""
+        return {
+            "page_size": self.size,
+            "bytes_per_row": round(self.bytes_per_row) if self.bytes_per_row is not None else None,
+            "ms_per_row": round(self.seconds_per_row * 1000, 3) if self.seconds_per_row is not None else None,
+            "overhead_ms": round(self.overhead_seconds * 1000, 1) if self.overhead_seconds is not None else None,
+            "pages": self.pages,
+            "timeouts": self.timeouts,
+            "bounds": [self.minimum, self.maximum]
+        }
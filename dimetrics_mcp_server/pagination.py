@@ -0,0 +1,110 @@
+"""
+Keyset-Pagination (Cursor) für die Generics API.
+
+Statt page/page_size (OFFSET) wird nach einem stabilen Schlüssel sortiert
+und die nächste Seite über einen Filter "Schlüssel > letzter Wert"
+geladen. Bei gleichen Werten entscheidet object_id, damit keine Zeile
+doppelt geladen oder übersprungen wird.
+"""
+
+import base64
+import json
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+# Sortierung für Keyset: genau ein Feld, optional absteigend
+_ORDERING = re.compile(r"^-?[A-Za-z_][A-Za-z0-9_]*$")
+
+
+def keyset_ordering(ordering: Optional[str]) -> Tuple[str, bool]:
+    """
+    Sortierfeld und Richtung für Keyset-Pagination.
+
+    Returns:
+        (Feld, absteigend); Standard ist object_id aufsteigend
+
+    Raises:
+        ValueError: bei mehreren Feldern oder ungültigem Feldnamen
+    """
+    ordering = (ordering or "object_id").strip()
+    if not _ORDERING.match(ordering):
+        raise ValueError(
+            f"Keyset-Pagination braucht genau ein Sortierfeld (z.B. 'date_created' oder '-object_id'), nicht '{ordering}'"
+        )
+    return ordering.lstrip("-"), ordering.startswith("-")
+
+
+def keyset_order_param(ordering: Optional[str]) -> str:
+    """ordering-Parameter der API inkl. object_id als Tiebreaker."""
+    field, descending = keyset_ordering(ordering)
+    prefix = "-" if descending else ""
+    if field == "object_id":
+        return f"{prefix}object_id"
+    return f"{prefix}{field},{prefix}object_id"
+
+
+def keyset_filter(
+    directus_filter: Optional[Dict[str, Any]],
+    ordering: Optional[str],
+    last: Optional[List[Any]]
+) -> Optional[Dict[str, Any]]:
+    """
+    Filter für die Seite nach dem Eintrag last = [Wert des Sortierfelds, object_id].
+
+    Die Bedingung lautet feld >= wert UND (feld > wert ODER object_id > id),
+    absteigend entsprechend mit _lte/_lt. Der führende Bereich auf dem
+    Sortierfeld lässt sich über dessen Index auswerten, das ODER allein nicht.
+    """
+    if not last:
+        return directus_filter or None
+    field, descending = keyset_ordering(ordering)
+    op, bound = ("_lt", "_lte") if descending else ("_gt", "_gte")
+    value, object_id = last
+    if field == "object_id":
+        condition: Dict[str, Any] = {"object_id": {op: object_id}}
+    else:
+        condition = {"_and": [
+            {field: {bound: value}},
+            {"_or": [{field: {op: value}}, {"object_id": {op: object_id}}]}
+        ]}
+    if not directus_filter:
+        return condition
+    return {"_and": [directus_filter, condition]}
+
+
+def last_key(entry: Dict[str, Any], ordering: Optional[str]) -> List[Any]:
+    """Schlüssel [Wert des Sortierfelds, object_id] eines Eintrags."""
+    field, _ = keyset_ordering(ordering)
+    value = entry.get(field)
+    if isinstance(value, dict):
+        # Relationen werden nach ihrer object_id sortiert
+        value = value.get("object_id")
+    if value is None:
+        # Leere Werte lassen sich nicht mit _gt/_lt fortsetzen
+        raise ValueError(f"Sortierfeld '{field}' ist bei Eintrag '{entry.get('object_id')}' leer; Keyset-Pagination braucht ein Feld ohne leere Werte")
+    return [value, entry.get("object_id")]
+
+
+def encode_cursor(ordering: Optional[str], last: List[Any]) -> str:
+    """Opaker Cursor für die nächste Seite."""
+    payload = json.dumps([keyset_order_param(ordering), last], separators=(",", ":"), ensure_ascii=False)
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, ordering: Optional[str]) -> List[Any]:
+    """
+    Schlüssel aus einem Cursor.
+
+    Raises:
+        ValueError: wenn der Cursor ungültig ist oder zu einer anderen Sortierung gehört
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        order, last = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, TypeError, UnicodeDecodeError):
+        raise ValueError("Ungültiger Cursor (next_cursor einer vorherigen Antwort übergeben)")
+    if order != keyset_order_param(ordering):
+        raise ValueError(f"Cursor gehört zur Sortierung '{order}', nicht zu '{keyset_order_param(ordering)}'")
+    if not isinstance(last, list) or len(last) != 2:
+        raise ValueError("Ungültiger Cursor (next_cursor einer vorherigen Antwort übergeben)")
+    return last
@@ -0,0 +1,433 @@
+"""
+Bereichs-partitionierte, parallele Scans über die Generics API.
+
+Eine Abfrage wird in disjunkte Teilbereiche zerlegt: Wertebereiche eines
+Zahlen- oder Zeitstempel-Felds oder object_id-Präfixe. Jeder Bereich wird
+für sich per Keyset-Pagination gelesen, die Bereiche laufen parallel.
+Die Grenzen richten sich nach den count-Werten der Bereiche: zu große
+Bereiche werden geteilt, kleine benachbarte zusammengelegt. Decken die
+Bereiche nicht alle Einträge ab (z.B. object_ids, die keine UUIDs in
+Kleinschreibung sind), wird ohne Partitionierung gelesen.
+"""
+
+import asyncio
+import heapq
+import json
+import logging
+import os
+import shutil
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .api_client import DimetricsAPIClient
+from .federation import _aggregate_row, _value
+from .pagination import keyset_ordering, last_key
+
+logger = logging.getLogger(__name__)
+
+# object_ids sind UUIDs: Präfixe aus Hex-Ziffern
+PREFIX_ALPHABET = "0123456789abcdef"
+
+# Runden, in denen zu große Bereiche weiter geteilt werden: Präfixe
+# teilen sich 16-fach, Wertebereiche nur halbieren sich
+MAX_SPLIT_ROUNDS = 3
+MAX_BISECT_ROUNDS = 6
+
+# Ab diesem Vielfachen der Zielgröße wird ein Bereich geteilt
+SPLIT_FACTOR = 1.5
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass
+class Partition:
+    """Teilbereich eines Scans mit seiner Bedingung und der gemeldeten Anzahl."""
+
+    label: str
+    condition: Dict[str, Any]
+    count: int = 0
+    # Wertebereich [low, high) bzw. [low, high] (inclusive) für Zahlen/Zeitstempel
+    low: Any = None
+    high: Any = None
+    inclusive: bool = False
+    prefixes: Tuple[str, ...] = ()
+
+
+def _combine(directus_filter: Optional[Dict[str, Any]], condition: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    if not condition:
+        return directus_filter
+    return {"_and": [directus_filter, condition]} if directus_filter else condition
+
+
+def _parse_bound(value: Any) -> Tuple[str, Any]:
+    """Art und Zahlenwert einer Bereichsgrenze (Aggregate liefern Strings)."""
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return "number", value
+    text = str(value)
+    try:
+        return "number", float(Decimal(text))
+    except (InvalidOperation, ValueError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    except ValueError:
+        raise ValueError(f"Feld mit Wert {value!r} lässt sich nicht in Bereiche teilen (Zahl oder Zeitstempel nötig, sonst object_id)")
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return "timestamp", (parsed - _EPOCH).total_seconds()
+
+
+def _format_bound(kind: str, value: float) -> Any:
+    if kind == "timestamp":
+        return datetime.fromtimestamp(value, tz=timezone.utc).isoformat().replace("+00:00", "Z")
+    return value
+
+
+def _range_partition(field: str, kind: str, low: float, high: float, inclusive: bool, raw: Dict[float, Any]) -> Partition:
+    # Die äußeren Grenzen behalten den Originalwert aus min/max
+    low_value = raw.get(low, _format_bound(kind, low))
+    high_value = raw.get(high, _format_bound(kind, high))
+    condition = {field: {"_gte": low_value, "_lte" if inclusive else "_lt": high_value}}
+    label = f"{field} {low_value} .. {high_value}" + ("]" if inclusive else ")")
+    return Partition(label=label, condition=condition, low=low, high=high, inclusive=inclusive)
+
+
+def _prefix_partition(prefixes: Tuple[str, ...]) -> Partition:
+    if len(prefixes) == 1:
+        condition: Dict[str, Any] = {"object_id": {"_starts_with": prefixes[0]}}
+    else:
+        condition = {"_or": [{"object_id": {"_starts_with": prefix}} for prefix in prefixes]}
+    label = "object_id " + (prefixes[0] if len(prefixes) == 1 else f"{prefixes[0]}..{prefixes[-1]}") + "*"
+    return Partition(label=label, condition=condition, prefixes=prefixes)
+
+
+class PartitionedScan:
+    """
+    Plant und liest einen partitionierten Scan.
+
+    Args:
+        client: API Client
+        resource_name: Name der Resource
+        partition_by: "object_id" (Präfix-Buckets) oder ein Zahlen-/Zeitstempel-Feld
+        partitions: Angestrebte Anzahl Bereiche
+        directus_filter: Zusätzlicher Filter für alle Bereiche
+        concurrency: Parallel laufende Requests
+    """
+
+    def __init__(
+        self,
+        client: DimetricsAPIClient,
+        resource_name: str,
+        partition_by: str = "object_id",
+        partitions: int = 8,
+        directus_filter: Optional[Dict[str, Any]] = None,
+        concurrency: int = 8
+    ):
+        self.client = client
+        self.resource_name = resource_name
+        self.partition_by = partition_by or "object_id"
+        self.partitions = max(1, partitions)
+        self.directus_filter = directus_filter or None
+        self.semaphore = asyncio.Semaphore(max(1, concurrency))
+        self.requests = 0
+
+    async def _list(self, **kwargs: Any) -> Dict[str, Any]:
+        async with self.semaphore:
+            self.requests += 1
+            return await self.client.list_generic_entries(self.resource_name, **kwargs)
+
+    async def _count(self, partitions: List[Partition]) -> None:
+        """Fragt die Anzahl pro Bereich ab (eine Seite mit einem Eintrag)."""
+        async def probe(partition: Partition) -> None:
+            data = await self._list(page_size=1, page=1, directus_filter=_combine(self.directus_filter, partition.condition))
+            partition.count = int(data.get("count") or 0)
+        await asyncio.gather(*(probe(partition) for partition in partitions))
+
+    async def plan(self) -> List[Partition]:
+        """
+        Bereiche mit count, ungefähr gleich groß.
+
+        Ergibt die Summe der Bereiche nicht die Gesamtzahl, liefert plan()
+        einen einzigen Bereich ohne Bedingung (serieller Keyset-Durchlauf),
+        statt Einträge außerhalb der Bereiche zu verlieren.
+        """
+        everything = Partition(label="alle Einträge", condition={})
+        planned, _ = await asyncio.gather(
+            self._plan_prefixes() if self.partition_by == "object_id" else self._plan_ranges(),
+            self._count([everything])
+        )
+        covered = sum(partition.count for partition in planned)
+        if covered != everything.count:
+            logger.warning(
+                f"Partitionierung von '{self.resource_name}' nach {self.partition_by} deckt {covered} von "
+                f"{everything.count} Einträgen ab, lese ohne Partitionierung"
+            )
+            everything.label = f"alle Einträge ({self.partition_by}-Bereiche unvollständig)"
+            return [everything] if everything.count else []
+        return planned
+
+    async def _plan_prefixes(self) -> List[Partition]:
+        buckets = [_prefix_partition((prefix,)) for prefix in PREFIX_ALPHABET]
+        await self._count(buckets)
+        total = sum(bucket.count for bucket in buckets)
+        target = max(1, total / self.partitions)
+        for _ in range(MAX_SPLIT_ROUNDS):
+            large = [bucket for bucket in buckets if bucket.count > target * SPLIT_FACTOR]
+            if not large:
+                break
+            children = {
+                bucket.prefixes[0]: [_prefix_partition((bucket.prefixes[0] + digit,)) for digit in PREFIX_ALPHABET]
+                for bucket in large
+            }
+            await self._count([child for group in children.values() for child in group])
+            buckets = [
+                child for bucket in buckets
+                for child in (children.get(bucket.prefixes[0]) if bucket in large else [bucket])
+            ]
+        # Benachbarte kleine Buckets zusammenlegen, bis die Zielgröße erreicht ist
+        merged: List[Partition] = []
+        group: List[Partition] = []
+        for bucket in buckets:
+            if bucket.count == 0:
+                continue
+            if group and sum(item.count for item in group) + bucket.count > target:
+                merged.append(self._merge_prefixes(group))
+                group = []
+            group.append(bucket)
+        if group:
+            merged.append(self._merge_prefixes(group))
+        return merged
+
+    @staticmethod
+    def _merge_prefixes(group: List[Partition]) -> Partition:
+        partition = _prefix_partition(tuple(prefix for item in group for prefix in item.prefixes))
+        partition.count = sum(item.count for item in group)
+        return partition
+
+    async def _plan_ranges(self) -> List[Partition]:
+        field = self.partition_by
+        data = await self._list(
+            page_size=1, page=1, directus_filter=self.directus_filter, aggregate={"min": field, "max": field}
+        )
+        row = _aggregate_row(data)
+        low_raw, high_raw = _value(row, "min", field), _value(row, "max", field)
+
+        nulls = Partition(label=f"{field} leer", condition={field: {"_null": True}})
+        await self._count([nulls])
+        if low_raw is None or high_raw is None:
+            return [nulls] if nulls.count else []
+
+        kind, low = _parse_bound(low_raw)
+        _, high = _parse_bound(high_raw)
+        # Zeitstempel behalten an den Rändern ihren Originalwert (volle Genauigkeit)
+        raw = {low: low_raw, high: high_raw} if kind == "timestamp" else {}
+        width = (high - low) / self.partitions
+        edges = [low + width * index for index in range(self.partitions)] + [high]
+        ranges = [
+            _range_partition(field, kind, edges[index], edges[index + 1], index == self.partitions - 1, raw)
+            for index in range(self.partitions)
+            if edges[index] < edges[index + 1] or index == self.partitions - 1
+        ]
+        await self._count(ranges)
+        total = sum(item.count for item in ranges)
+        target = max(1, total / self.partitions)
+
+        for _ in range(MAX_BISECT_ROUNDS):
+            large = [item for item in ranges if item.count > target * SPLIT_FACTOR and item.high > item.low]
+            if not large:
+                break
+            halves = {}
+            for item in large:
+                middle = item.low + (item.high - item.low) / 2
+                halves[id(item)] = [
+                    _range_partition(field, kind, item.low, middle, False, raw),
+                    _range_partition(field, kind, middle, item.high, item.inclusive, raw),
+                ]
+            await self._count([half for pair in halves.values() for half in pair])
+            ranges = [half for item in ranges for half in halves.get(id(item), [item])]
+
+        # Benachbarte kleine Bereiche zusammenlegen (Grenzen bleiben lückenlos)
+        merged: List[Partition] = []
+        for item in ranges:
+            previous = merged[-1] if merged else None
+            if previous is not None and previous.count + item.count <= target:
+                combined = _range_partition(field, kind, previous.low, item.high, item.inclusive, raw)
+                combined.count = previous.count + item.count
+                merged[-1] = combined
+            else:
+                merged.append(item)
+        merged = [item for item in merged if item.count]
+        if nulls.count:
+            merged.append(nulls)
+        return merged
+
+    async def _pages(self, partition: Partition, ordering: Optional[str], page_size: int) -> AsyncIterator[List[Dict[str, Any]]]:
+        """Liest einen Bereich Seite für Seite per Keyset-Pagination."""
+        cursor = None
+        directus_filter = _combine(self.directus_filter, partition.condition)
+        while True:
+            async with self.semaphore:
+                self.requests += 1
+                data = await self.client.list_generic_entries_keyset(
+                    self.resource_name, cursor=cursor, page_size=page_size or None, ordering=ordering, directus_filter=directus_filter
+                )
+            yield data.get("results", [])
+            cursor = data["next_cursor"]
+            if not cursor:
+                return
+
+    async def _read(self, partition: Partition, ordering: Optional[str], page_size: int) -> Tuple[List[Dict[str, Any]], int]:
+        """Liest einen Bereich vollständig."""
+        entries: List[Dict[str, Any]] = []
+        pages = 0
+        async for page in self._pages(partition, ordering, page_size):
+            pages += 1
+            entries.extend(page)
+        return entries, pages
+
+    async def _spool(self, partition: Partition, ordering: Optional[str], page_size: int, path: str) -> Tuple[int, int]:
+        """Schreibt einen Bereich Seite für Seite als NDJSON in eine Datei; im Speicher liegt nur die aktuelle Seite."""
+        fetched = 0
+        pages = 0
+        with open(path, "w", encoding="utf-8") as handle:
+            async for page in self._pages(partition, ordering, page_size):
+                pages += 1
+                fetched += len(page)
+                lines = "".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in page)
+                await asyncio.to_thread(handle.write, lines)
+        return fetched, pages
+
+    def _stats(self, partitions: List[Partition], results: List[Tuple[int, int]], planned: int, started: float) -> Dict[str, Any]:
+        return {
+            "partition_by": self.partition_by,
+            "partitions": [
+                {"range": partition.label, "count": partition.count, "fetched": fetched, "pages": pages}
+                for partition, (fetched, pages) in zip(partitions, results)
+            ],
+            "planning_requests": planned,
+            "requests": self.requests,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+
+    async def run(self, ordering: Optional[str] = None, page_size: int = 0) -> Tuple[List[List[Dict[str, Any]]], Dict[str, Any]]:
+        """
+        Plant die Bereiche und liest sie parallel.
+
+        Returns:
+            Einträge pro Bereich und Statistik (Bereiche mit count/fetched/pages, Requests, Dauer)
+        """
+        started = time.perf_counter()
+        keyset_ordering(ordering)
+        partitions = await self.plan()
+        planned = self.requests
+        results = await asyncio.gather(*(self._read(partition, ordering, page_size) for partition in partitions))
+        stats = self._stats(partitions, [(len(entries), pages) for entries, pages in results], planned, started)
+        return [entries for entries, _ in results], stats
+
+    async def export(self, file_path: str, ordering: Optional[str] = None, page_size: int = 0) -> Tuple[int, Dict[str, Any]]:
+        """
+        Plant die Bereiche und schreibt sie parallel als NDJSON nach file_path.
+
+        Jeder Bereich landet beim Lesen seitenweise in einer Teildatei neben
+        file_path; danach werden die Teildateien aneinandergehängt bzw. mit
+        ordering per K-Wege-Merge zusammengeführt. Der Speicherbedarf hängt
+        nur von Seitengröße und Anzahl Bereiche ab, nicht von der Resource.
+
+        Returns:
+            Anzahl geschriebener Einträge und Statistik wie run()
+        """
+        started = time.perf_counter()
+        keyset_ordering(ordering)
+        partitions = await self.plan()
+        planned = self.requests
+        part_paths = [f"{file_path}.part{index}" for index in range(len(partitions))]
+        try:
+            results = await asyncio.gather(*(
+                self._spool(partition, ordering, page_size, path) for partition, path in zip(partitions, part_paths)
+            ))
+            await asyncio.to_thread(_join_parts, part_paths, file_path, ordering)
+        finally:
+            for path in part_paths:
+                if os.path.exists(path):
+                    os.remove(path)
+        return sum(fetched for fetched, _ in results), self._stats(partitions, results, planned, started)
+
+
+def _join_parts(part_paths: List[str], file_path: str, ordering: Optional[str]) -> None:
+    """Vereinigt die NDJSON-Teildateien der Bereiche zeilenweise in file_path."""
+    with open(file_path, "w", encoding="utf-8") as target:
+        if not ordering:
+            for path in part_paths:
+                with open(path, encoding="utf-8") as part:
+                    shutil.copyfileobj(part, target)
+            return
+        _, descending = keyset_ordering(ordering)
+        parts = [open(path, encoding="utf-8") for path in part_paths]
+        try:
+            keyed = [((last_key(json.loads(line), ordering), line) for line in part) for part in parts]
+            for _, line in heapq.merge(*keyed, key=lambda item: item[0], reverse=descending):
+                target.write(line)
+        finally:
+            for part in parts:
+                part.close()
+
+
+def merge_sorted(batches: List[List[Dict[str, Any]]], ordering: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    K-Wege-Merge der pro Bereich sortierten Einträge.
+
+    Jeder Bereich ist nach ordering (plus object_id) sortiert; heapq.merge
+    vereinigt sie, ohne alles neu zu sortieren.
+    """
+    _, descending = keyset_ordering(ordering)
+    return list(heapq.merge(*batches, key=lambda entry: last_key(entry, ordering), reverse=descending))
+
+
+async def partitioned_scan(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    partition_by: str = "object_id",
+    partitions: int = 8,
+    directus_filter: Optional[Dict[str, Any]] = None,
+    ordering: Optional[str] = None,
+    page_size: int = 0,
+    concurrency: int = 8
+) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    """
+    Liest alle (gefilterten) Einträge einer Resource über parallele Teilbereiche.
+
+    Mit ordering werden die Bereiche per K-Wege-Merge zusammengeführt,
+    sonst in der Reihenfolge der Bereiche aneinandergehängt.
+
+    Returns:
+        Einträge und Statistik
+    """
+    scan = PartitionedScan(client, resource_name, partition_by, partitions, directus_filter, concurrency)
+    batches, stats = await scan.run(ordering=ordering, page_size=page_size)
+    if ordering:
+        return merge_sorted(batches, ordering), stats
+    return [entry for batch in batches for entry in batch], stats
+
+
+async def partitioned_export(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    file_path: str,
+    partition_by: str = "object_id",
+    partitions: int = 8,
+    directus_filter: Optional[Dict[str, Any]] = None,
+    ordering: Optional[str] = None,
+    page_size: int = 0,
+    concurrency: int = 8
+) -> Tuple[int, Dict[str, Any]]:
+    """
+    Schreibt alle (gefilterten) Einträge einer Resource über parallele Teilbereiche als NDJSON-Datei.
+
+    Returns:
+        Anzahl exportierter Einträge und Statistik
+    """
+    scan = PartitionedScan(client, resource_name, partition_by, partitions, directus_filter, concurrency)
+    return await scan.export(file_path, ordering=ordering, page_size=page_size)
@@ -0,0 +1,195 @@
+"""
+Spekulatives Vorladen der nächsten Seite beim interaktiven Blättern.
+
+Nach Seite N fragt ein Agent meist Seite N+1 an. Der Prefetcher lädt sie
+im Hintergrund, solange die Antwort auf Seite N unterwegs ist, und hält
+sie kurz pro Session vor. Fragt die Session etwas anderes an, läuft die
+Frist ab oder wird die Resource geschrieben, wird das Vorladen abgebrochen.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Lebensdauer einer vorgeladenen Seite in Sekunden
+PREFETCH_TTL = float(os.getenv("DIMETRICS_PREFETCH_TTL", "30"))
+
+# Maximale Anzahl gleichzeitig vorgehaltener Seiten (über alle Sessions)
+PREFETCH_MAX_PENDING = 256
+
+
+class _Pending:
+    __slots__ = ("position", "resource", "task", "timer", "started", "finished")
+
+    def __init__(self, position: Any, resource: Hashable, task: "asyncio.Task[Any]", timer: asyncio.TimerHandle):
+        self.position = position
+        self.resource = resource
+        self.task = task
+        self.timer = timer
+        self.started = time.perf_counter()
+        self.finished: Optional[float] = None
+        task.add_done_callback(self._done)
+
+    def _done(self, task: "asyncio.Task[Any]") -> None:
+        self.finished = time.perf_counter()
+
+
+def _retrieve(task: "asyncio.Task[Any]") -> None:
+    # Fehler abgebrochener/ungenutzter Vorlade-Tasks nicht als "never retrieved" melden
+    if not task.cancelled():
+        task.exception()
+
+
+class PagePrefetcher:
+    """
+    Pro (Session, Abfrage) höchstens eine vorgeladene Folgeseite.
+
+    Args:
+        ttl: Sekunden, die eine vorgeladene Seite gültig bleibt
+        max_pending: Obergrenze vorgehaltener Seiten; die älteste wird verworfen
+    """
+
+    def __init__(self, ttl: float = PREFETCH_TTL, max_pending: int = PREFETCH_MAX_PENDING):
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._pending: "OrderedDict[Tuple[Hashable, Hashable], _Pending]" = OrderedDict()
+        self.stats: Dict[str, float] = {
+            "requests": 0,
+            "hits": 0,
+            "inflight_hits": 0,
+            "misses": 0,
+            "prefetched": 0,
+            "wasted": 0,
+            "expired": 0,
+            "invalidated": 0,
+            "errors": 0,
+            "saved_seconds": 0.0,
+        }
+
+    async def fetch(
+        self,
+        session: Hashable,
+        stream: Hashable,
+        position: Any,
+        load: Callable[[Any], Awaitable[Any]],
+        next_position: Callable[[Any], Optional[Any]],
+        resource: Hashable = None
+    ) -> Any:
+        """
+        Liefert die Seite position und lädt die folgende im Hintergrund vor.
+
+        Args:
+            session: Schlüssel der Session
+            stream: Schlüssel der Abfrage ohne Seitenangabe (Resource, Filter, Sortierung, ...)
+            position: Seitennummer bzw. Cursor
+            load: Lädt die Seite zu einer Position
+            next_position: Position der Folgeseite aus einer geladenen Seite (None = keine)
+            resource: Gelesene Resource; Schreibzugriffe darauf verwerfen die Folgeseite (siehe invalidate)
+        """
+        key = (session, stream)
+        self.stats["requests"] += 1
+        pending = self._pending.pop(key, None)
+        found = False
+        result = None
+        if pending is not None:
+            pending.timer.cancel()
+            if pending.position == position:
+                inflight = not pending.task.done()
+                # Eingesparte Wartezeit: der bereits erledigte Teil des Requests
+                saved = (pending.finished or time.perf_counter()) - pending.started
+                try:
+                    await asyncio.wait({pending.task})
+                except asyncio.CancelledError:
+                    pending.task.cancel()
+                    raise
+                if pending.task.cancelled() or pending.task.exception() is not None:
+                    self.stats["errors"] += 1
+                    logger.debug(f"Vorgeladene Seite für {stream!r} fehlgeschlagen, lade neu")
+                else:
+                    result = pending.task.result()
+                    found = True
+                if found:
+                    self.stats["inflight_hits" if inflight else "hits"] += 1
+                    self.stats["saved_seconds"] += saved
+            else:
+                pending.task.cancel()
+                self.stats["wasted"] += 1
+
+        if not found:
+            self.stats["misses"] += 1
+            result = await load(position)
+
+        upcoming = next_position(result)
+        if upcoming is not None:
+            self._schedule(key, upcoming, load, resource)
+        return result
+
+    def _schedule(
+        self,
+        key: Tuple[Hashable, Hashable],
+        position: Any,
+        load: Callable[[Any], Awaitable[Any]],
+        resource: Hashable
+    ) -> None:
+        task = asyncio.create_task(load(position))
+        task.add_done_callback(_retrieve)
+        timer = asyncio.get_running_loop().call_later(self.ttl, self._expire, key, task)
+        self._pending[key] = _Pending(position, resource, task, timer)
+        self.stats["prefetched"] += 1
+        while len(self._pending) > self.max_pending:
+            _, oldest = self._pending.popitem(last=False)
+            self._discard(oldest)
+
+    def _expire(self, key: Tuple[Hashable, Hashable], task: "asyncio.Task[Any]") -> None:
+        pending = self._pending.get(key)
+        if pending is not None and pending.task is task:
+            del self._pending[key]
+            self._discard(pending)
+            self.stats["expired"] += 1
+
+    def invalidate(self, resource: Hashable = None) -> int:
+        """
+        Verwirft vorgeladene Seiten einer Resource, z.B. nach einem Schreibzugriff:
+        neue oder gelöschte Einträge verschieben die Folgeseiten.
+
+        Args:
+            resource: Resource wie bei fetch (None = alle)
+
+        Returns:
+            Anzahl verworfener Seiten
+        """
+        keys = [key for key, pending in self._pending.items() if resource is None or pending.resource == resource]
+        for key in keys:
+            self._discard(self._pending.pop(key))
+        self.stats["invalidated"] += len(keys)
+        return len(keys)
+
+    def _discard(self, pending: _Pending) -> None:
+        pending.timer.cancel()
+        pending.task.cancel()
+        self.stats["wasted"] += 1
+
+    def close(self) -> None:
+        """Bricht alle laufenden Vorlade-Tasks ab."""
+        for pending in self._pending.values():
+            pending.timer.cancel()
+            pending.task.cancel()
+        self._pending.clear()
+
+    def describe(self) -> Dict[str, Any]:
+        """Kennzahlen: Trefferquote der Vorhersage und Anteil genutzter Vorlade-Requests."""
+        served = self.stats["hits"] + self.stats["inflight_hits"]
+        settled = served + self.stats["wasted"]
+        return dict(
+            self.stats,
+            saved_seconds=round(self.stats["saved_seconds"], 3),
+            hit_rate=round(served / self.stats["requests"], 3) if self.stats["requests"] else None,
+            precision=round(served / settled, 3) if settled else None,
+            pending=len(self._pending),
+            ttl_seconds=self.ttl
+        )
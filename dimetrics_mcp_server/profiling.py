@@ -0,0 +1,267 @@
+"""
+Spaltenprofile einer Resource in einem Durchlauf.
+
+Statt Attribute abzufragen und Zeilen über mehrere Seiten zu sichten,
+liefert ein Profil pro Spalte Null-Anteil, geschätzte Anzahl
+verschiedener Werte, Minimum/Maximum, ein Histogramm (Zahlen und
+Zeitstempel) und die häufigsten Werte (Dropdown-, Status- und
+Boolean-Felder). Berechnet wird mit den Sketches aus sketches.py beim
+seitenweisen Lesen; das Ergebnis bleibt gültig, bis sich der Wasserstand
+der Resource (Anzahl Einträge, neuester update_timestamp) ändert.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .api_client import DimetricsAPIClient
+from .columnar import _from_micros, _to_bool, _to_micros, _to_number, columnar_schema
+from .mirror import _cell
+from .sketches import THREAD_ROWS, HyperLogLog, SpaceSaving, TDigest
+
+logger = logging.getLogger(__name__)
+
+# HyperLogLog-Präzision pro Spalte (Standardfehler ca. 1.6 %, 4 KB)
+PROFILE_PRECISION = 12
+
+# Zähler für häufigste Werte pro Spalte
+PROFILE_TOP_CAPACITY = 100
+
+NUMERIC_KINDS = ("int64", "float64", "timestamp")
+TOP_VALUE_KINDS = ("dictionary", "bool")
+
+
+class ColumnProfile:
+    """Sketches einer Spalte; welche, hängt vom Spaltentyp ab."""
+
+    __slots__ = ("kind", "values", "invalid", "distinct", "digest", "top", "low", "high")
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self.values = 0
+        self.invalid = 0
+        self.distinct = HyperLogLog(PROFILE_PRECISION)
+        self.digest = TDigest() if kind in NUMERIC_KINDS else None
+        self.top = SpaceSaving(PROFILE_TOP_CAPACITY) if kind in TOP_VALUE_KINDS else None
+        # Minimum/Maximum für Text-Spalten (Zahlen: aus dem Digest)
+        self.low: Optional[str] = None
+        self.high: Optional[str] = None
+
+    def add(self, raw: Any) -> None:
+        value = _cell(raw)
+        if value is None or value == "":
+            return
+        self.values += 1
+        if self.kind == "bool":
+            value = _to_bool(value)
+        self.distinct.add(value)
+        if self.top is not None:
+            self.top.add(value)
+        if self.digest is not None:
+            number = _to_micros(value) if self.kind == "timestamp" else _to_number(value, "float64")
+            if number is None:
+                self.invalid += 1
+            else:
+                self.digest.add(number)
+        elif self.kind not in TOP_VALUE_KINDS:
+            text = str(value)
+            if self.low is None or text < self.low:
+                self.low = text
+            if self.high is None or text > self.high:
+                self.high = text
+
+    def _format(self, value: Optional[float]) -> Any:
+        if value is None:
+            return None
+        if self.kind == "timestamp":
+            # Auf Sekunden, Klassengrenzen und Median sind interpoliert
+            return _from_micros(round(value / 1_000_000) * 1_000_000)
+        if self.kind == "int64":
+            return round(value)
+        return value
+
+    def histogram(self, bins: int) -> Optional[List[Dict[str, Any]]]:
+        """Gleich breite Klassen zwischen Minimum und Maximum, Anzahl aus der Verteilung des Digests."""
+        digest = self.digest
+        if digest is None or not digest.count:
+            return None
+        low, high = digest.min, digest.max
+        if low == high:
+            return [{"from": self._format(low), "to": self._format(high), "count": digest.count}]
+        width = (high - low) / bins
+        edges = [low + index * width for index in range(bins)] + [high]
+        shares = [0.0] + [digest.cdf(edge) for edge in edges[1:-1]] + [1.0]
+        return [
+            {
+                "from": self._format(edges[index]),
+                "to": self._format(edges[index + 1]),
+                "count": round((shares[index + 1] - shares[index]) * digest.count)
+            }
+            for index in range(bins)
+        ]
+
+    def result(self, rows: int, bins: int, top: int) -> Dict[str, Any]:
+        profile: Dict[str, Any] = {
+            "kind": self.kind,
+            "values": self.values,
+            "null_rate": round(1 - self.values / rows, 4) if rows else None,
+            # Die Schätzung kann die Zahl der Werte knapp übersteigen
+            "distinct": min(self.distinct.estimate(), self.values),
+            "distinct_exact": self.distinct.exact
+        }
+        if self.digest is not None:
+            profile.update(
+                min=self._format(self.digest.min),
+                max=self._format(self.digest.max),
+                median=self._format(self.digest.quantile(0.5)),
+                histogram=self.histogram(bins),
+                invalid=self.invalid
+            )
+        elif self.top is None:
+            profile.update(min=self.low, max=self.high)
+        if self.top is not None:
+            profile["top_values"] = [
+                {"value": bool(item["value"]) if self.kind == "bool" else item["value"], "count": item["count"]}
+                for item in self.top.top(top)
+            ]
+        return profile
+
+
+class ResourceProfile:
+    """Profile aller Spalten einer Resource, gespeist Seite für Seite."""
+
+    def __init__(self, schema: Dict[str, str]):
+        self.columns = {name: ColumnProfile(kind) for name, kind in schema.items()}
+        self.rows = 0
+
+    def add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        columns = self.columns
+        for row in rows:
+            self.rows += 1
+            for name, column in columns.items():
+                column.add(row.get(name))
+
+    def result(self, bins: int = 10, top: int = 10) -> Dict[str, Any]:
+        return {name: column.result(self.rows, bins, top) for name, column in self.columns.items()}
+
+
+async def resource_watermark(client: DimetricsAPIClient, resource_name: str) -> Dict[str, Any]:
+    """
+    Wasserstand einer Resource: Anzahl Einträge und neuester update_timestamp.
+
+    Ein Request mit page_size=1; neue und geänderte Einträge verschieben den
+    Zeitstempel, gelöschte die Anzahl. Leere Zeitstempel sind ausgefiltert,
+    weil sie absteigend sortiert je nach Datenbank vorne stehen.
+    """
+    data = await client.list_generic_entries(
+        resource_name,
+        page_size=1,
+        page=1,
+        ordering="-update_timestamp",
+        directus_filter={"update_timestamp": {"_nnull": True}}
+    )
+    results = data.get("results") or []
+    return {
+        "count": data.get("count", 0),
+        "update_timestamp": results[0].get("update_timestamp") if results else None
+    }
+
+
+class ProfileCache:
+    """
+    Zuletzt berechnete Profile pro (Backend, Mandant, Resource) mit ihrem Wasserstand.
+
+    Gleichzeitige Anfragen für dieselbe Resource warten auf denselben Durchlauf.
+    """
+
+    def __init__(self):
+        self._profiles: Dict[Tuple[Hashable, ...], Dict[str, Any]] = {}
+        self._locks: Dict[Tuple[Hashable, ...], asyncio.Lock] = {}
+        self.stats = {"hits": 0, "computed": 0}
+
+    async def profile(
+        self,
+        client: DimetricsAPIClient,
+        key: Tuple[Hashable, ...],
+        resource_name: str,
+        refresh: bool = False,
+        page_size: Optional[int] = None,
+        bins: int = 10,
+        top: int = 10
+    ) -> Dict[str, Any]:
+        """
+        Liefert das Profil aus dem Cache, solange der Wasserstand unverändert ist, sonst neu berechnet.
+
+        Raises:
+            ValueError: bei ungültigen bins/top
+        """
+        if not 1 <= bins <= 100:
+            raise ValueError("bins muss zwischen 1 und 100 liegen")
+        if not 1 <= top <= PROFILE_TOP_CAPACITY:
+            raise ValueError(f"top_values muss zwischen 1 und {PROFILE_TOP_CAPACITY} liegen")
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            watermark = await resource_watermark(client, resource_name)
+            cached = self._profiles.get(key)
+            if (
+                cached is not None
+                and not refresh
+                and cached["watermark"] == watermark
+                and cached["options"] == [bins, top]
+            ):
+                self.stats["hits"] += 1
+                return dict(cached["profile"], cached=True, age_seconds=round(time.time() - cached["computed_at"], 1))
+            profile = await profile_entries(client, resource_name, page_size=page_size, bins=bins, top=top)
+            profile["watermark"] = watermark
+            self._profiles[key] = {
+                "watermark": watermark,
+                "options": [bins, top],
+                "profile": profile,
+                "computed_at": time.time()
+            }
+            self.stats["computed"] += 1
+            return dict(profile, cached=False, age_seconds=0.0)
+
+    def describe(self) -> Dict[str, Any]:
+        return dict(self.stats, profiles=len(self._profiles))
+
+
+async def profile_entries(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    page_size: Optional[int] = None,
+    bins: int = 10,
+    top: int = 10
+) -> Dict[str, Any]:
+    """
+    Berechnet das Profil einer Resource in einem Keyset-Durchlauf.
+
+    Spalten und Typen kommen aus den Attribut-Definitionen (wie beim
+    spaltenorientierten Spiegel); im Speicher liegen nur die aktuelle
+    Seite und die Sketches.
+    """
+    started = time.perf_counter()
+    schema = columnar_schema(await client.get_attribute_schema(resource_name))
+    # object_id ist eindeutig, ein Profil sagt darüber nichts
+    schema.pop("object_id", None)
+    schema.setdefault("date_created", "timestamp")
+    profile = ResourceProfile(schema)
+    pages = 0
+    async for page in client.iter_generic_pages(resource_name, page_size=page_size):
+        pages += 1
+        if len(page) >= THREAD_ROWS:
+            await asyncio.to_thread(profile.add_rows, page)
+        else:
+            profile.add_rows(page)
+    columns = await asyncio.to_thread(profile.result, bins, top)
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Profil für '{resource_name}' berechnet: {profile.rows} Einträge, {len(columns)} Spalten in {duration_ms:.0f} ms")
+    return {
+        "resource_name": resource_name,
+        "rows": profile.rows,
+        "pages": pages,
+        "columns": columns,
+        "profiled_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "duration_ms": duration_ms
+    }
@@ -0,0 +1,424 @@
+"""
+Server-seitig abgelegte Ergebnisse (Result-Handles).
+
+Große Ergebnisse gehen nicht vollständig in die Tool-Antwort: die Zeilen
+werden als JSON-Zeilen abgelegt, die Antwort enthält Zusammenfassung,
+Vorschau und ein Handle. Gelesen wird in Bereichen über read_result_slice
+oder die MCP-Resource dimetrics://results/{handle}, ohne erneute Abfrage
+beim Backend. Im Speicher gilt ein Byte-Budget; darüber hinaus werden die
+am längsten nicht gelesenen Ergebnisse auf die Platte ausgelagert.
+
+Bedienen mehrere Worker-Prozesse die Requests (zustandslose Sessions),
+landet jedes Ergebnis sofort auf der Platte und in einem gemeinsamen
+SQLite-Index, damit jeder Worker jedes Handle lesen kann.
+"""
+
+import json
+import logging
+import os
+import secrets
+import shutil
+import sqlite3
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .json_decoding import loads
+from .serialization import dumps
+
+logger = logging.getLogger(__name__)
+
+# Byte-Budget der Ergebnisse im Speicher
+RESULT_MEMORY_BYTES = int(os.getenv("DIMETRICS_RESULT_MEMORY_BYTES", str(64 * 1024 * 1024)))
+
+# Lebensdauer eines Ergebnisses seit dem letzten Zugriff in Sekunden
+RESULT_TTL = float(os.getenv("DIMETRICS_RESULT_TTL", "3600"))
+
+# Größere Ergebnisse gibt list_generic_entries als Handle statt vollständig zurück
+RESULT_INLINE_BYTES = int(os.getenv("DIMETRICS_RESULT_INLINE_BYTES", str(32 * 1024)))
+
+# Obergrenze für Zeilen eines Ergebnisses, das seitenweise geschrieben wird (all_pages)
+RESULT_MAX_ROWS = int(os.getenv("DIMETRICS_RESULT_MAX_ROWS", "1000000"))
+
+# Zeilen in der Vorschau bzw. maximal pro gelesenem Bereich
+PREVIEW_ROWS = 5
+MAX_SLICE_ROWS = 1000
+
+# Aus so vielen Zeilen werden die Spaltennamen ermittelt
+_COLUMN_SAMPLE = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    handle TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    source TEXT NOT NULL,
+    columns TEXT NOT NULL,
+    path TEXT NOT NULL,
+    offsets BLOB NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+)
+"""
+
+
+def encode_rows(rows: List[Any]) -> List[bytes]:
+    """Zeilen als kompakte JSON-Zeilen (Größe zählt gegen das Budget)."""
+    return [dumps(row).encode("utf-8") for row in rows]
+
+
+class StoredResult:
+    """Abgelegtes Ergebnis: Zeilen im Speicher oder als NDJSON-Datei mit Zeilen-Offsets."""
+
+    __slots__ = ("handle", "owner", "source", "lines", "path", "offsets", "count", "bytes", "columns", "created", "accessed")
+
+    def __init__(self, handle: str, owner: str, source: Dict[str, Any], lines: List[bytes], columns: List[str]):
+        self.handle = handle
+        self.owner = owner
+        self.source = source
+        self.lines: Optional[List[bytes]] = lines
+        self.path: Optional[str] = None
+        self.offsets: Optional[array] = None
+        self.count = len(lines)
+        self.bytes = sum(len(line) for line in lines)
+        self.columns = columns
+        self.created = self.accessed = time.time()
+
+    @classmethod
+    def from_file(
+        cls,
+        handle: str,
+        owner: str,
+        source: Dict[str, Any],
+        path: str,
+        offsets: array,
+        columns: List[str]
+    ) -> "StoredResult":
+        """Ergebnis, dessen Zeilen bereits als NDJSON-Datei vorliegen."""
+        result = cls(handle, owner, source, [], columns)
+        result.lines = None
+        result.path = path
+        result.offsets = offsets
+        result.count = len(offsets) - 1
+        result.bytes = offsets[-1] - result.count
+        return result
+
+    def spill(self, path: str) -> None:
+        """Schreibt die Zeilen in eine Datei und gibt den Speicher frei."""
+        offsets = array("Q", [0])
+        with open(path, "wb") as handle:
+            for line in self.lines:
+                handle.write(line + b"\n")
+                offsets.append(offsets[-1] + len(line) + 1)
+        self.path = path
+        self.offsets = offsets
+        self.lines = None
+
+    def slice(self, start: int, end: int) -> List[bytes]:
+        lines = self.lines  # kann parallel ausgelagert werden
+        if lines is not None:
+            return lines[start:end]
+        if start >= end:
+            return []
+        with open(self.path, "rb") as handle:
+            handle.seek(self.offsets[start])
+            data = handle.read(self.offsets[end] - self.offsets[start])
+        return data.split(b"\n")[:-1]
+
+    def describe(self, ttl: float) -> Dict[str, Any]:
+        return {
+            "handle": self.handle,
+            "uri": f"dimetrics://results/{self.handle}",
+            "count": self.count,
+            "bytes": self.bytes,
+            "columns": self.columns,
+            "storage": "memory" if self.lines is not None else "disk",
+            "source": self.source,
+            "created_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.created)),
+            "expires_in_seconds": round(max(0.0, self.accessed + ttl - time.time()))
+        }
+
+
+class ResultWriter:
+    """
+    Schreibt ein Ergebnis seitenweise direkt in seine Datei (z.B. alle Seiten einer Resource).
+
+    Im Speicher liegen nur die Vorschau und die Zeilen-Offsets; commit()
+    legt das Ergebnis in der Ablage ab, discard() verwirft es.
+    """
+
+    def __init__(self, store: "ResultStore", source: Dict[str, Any], owner: str, max_rows: int):
+        self.store = store
+        self.source = source
+        self.owner = owner
+        self.max_rows = max_rows
+        self.handle = secrets.token_urlsafe(12)
+        os.makedirs(store.directory, exist_ok=True)
+        self.path = os.path.join(store.directory, f"{self.handle}.ndjson")
+        self.offsets = array("Q", [0])
+        self.preview: List[Any] = []
+        self._columns: Dict[str, None] = {}
+        self._file = open(self.path, "wb")
+
+    @property
+    def count(self) -> int:
+        return len(self.offsets) - 1
+
+    def add(self, rows: List[Any]) -> None:
+        """
+        Hängt Zeilen an.
+
+        Raises:
+            ValueError: wenn das Ergebnis mehr als max_rows Zeilen hätte
+        """
+        if self.count + len(rows) > self.max_rows:
+            raise ValueError(
+                f"Ergebnis hat mehr als {self.max_rows} Einträge (DIMETRICS_RESULT_MAX_ROWS); "
+                f"Filter einschränken oder export_resource verwenden"
+            )
+        for row in rows:
+            if len(self.preview) < PREVIEW_ROWS:
+                self.preview.append(row)
+            if self.count < _COLUMN_SAMPLE and isinstance(row, dict):
+                self._columns.update(dict.fromkeys(row))
+            line = dumps(row).encode("utf-8") + b"\n"
+            self._file.write(line)
+            self.offsets.append(self.offsets[-1] + len(line))
+
+    def commit(self) -> StoredResult:
+        self._file.close()
+        result = StoredResult.from_file(self.handle, self.owner, self.source, self.path, self.offsets, list(self._columns))
+        self.store._add(result)
+        return result
+
+    def discard(self) -> None:
+        self._file.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+class ResultStore:
+    """
+    Ablage für Result-Handles.
+
+    Args:
+        directory: Verzeichnis für ausgelagerte Ergebnisse
+        memory_bytes: Byte-Budget im Speicher
+        ttl: Sekunden seit dem letzten Zugriff, bis ein Ergebnis verworfen wird
+        shared: Ablage mehrerer Worker-Prozesse: Ergebnisse werden sofort
+            ausgelagert und im gemeinsamen Index directory/results.sqlite3
+            eingetragen (sonst Unterverzeichnis pro Prozess, nur im Prozess gültig)
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        memory_bytes: int = RESULT_MEMORY_BYTES,
+        ttl: float = RESULT_TTL,
+        shared: bool = False
+    ):
+        self.shared = shared
+        self.directory = directory if shared else os.path.join(directory, str(os.getpid()))
+        self.memory_bytes = 0 if shared else memory_bytes
+        self.ttl = ttl
+        # Reihenfolge = letzter Zugriff (älteste zuerst)
+        self._results: "OrderedDict[str, StoredResult]" = OrderedDict()
+        self._in_memory = 0
+        self._lock = threading.Lock()
+        self._index: Optional[sqlite3.Connection] = None
+        if shared:
+            os.makedirs(directory, exist_ok=True)
+            self._index = sqlite3.connect(
+                os.path.join(directory, "results.sqlite3"), check_same_thread=False, isolation_level=None, timeout=5
+            )
+            self._index.execute("PRAGMA journal_mode=WAL")
+            self._index.execute(_SCHEMA)
+        self.stats = {"stored": 0, "spilled": 0, "expired": 0, "slices": 0}
+
+    def put(
+        self,
+        rows: List[Any],
+        source: Dict[str, Any],
+        owner: str = "",
+        lines: Optional[List[bytes]] = None
+    ) -> StoredResult:
+        """
+        Legt Zeilen ab und vergibt ein Handle.
+
+        Args:
+            rows: Zeilen (z.B. Einträge einer Resource)
+            source: Beschreibung der Abfrage (Resource, Filter, ...), wird mit ausgegeben
+            owner: Mandant; nur er kann das Ergebnis lesen
+            lines: Bereits kodierte Zeilen (siehe encode_rows)
+        """
+        lines = encode_rows(rows) if lines is None else lines
+        columns: Dict[str, None] = {}
+        for row in rows[:_COLUMN_SAMPLE]:
+            if isinstance(row, dict):
+                columns.update(dict.fromkeys(row))
+        result = StoredResult(secrets.token_urlsafe(12), owner, source, lines, list(columns))
+        if self.shared:
+            os.makedirs(self.directory, exist_ok=True)
+            result.spill(os.path.join(self.directory, f"{result.handle}.ndjson"))
+            self.stats["spilled"] += 1
+        self._add(result)
+        return result
+
+    def writer(self, source: Dict[str, Any], owner: str = "", max_rows: Optional[int] = None) -> ResultWriter:
+        """Ergebnis, das seitenweise direkt auf die Platte geschrieben wird (siehe ResultWriter; Standard: RESULT_MAX_ROWS Zeilen)."""
+        return ResultWriter(self, source, owner, max_rows or RESULT_MAX_ROWS)
+
+    def _add(self, result: StoredResult) -> None:
+        with self._lock:
+            self._sweep()
+            self._results[result.handle] = result
+            if result.lines is not None:
+                self._in_memory += result.bytes
+            self.stats["stored"] += 1
+            if self._index is not None:
+                self._index.execute(
+                    "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        result.handle, result.owner, json.dumps(result.source, default=str), json.dumps(result.columns),
+                        result.path, result.offsets.tobytes(), result.created, result.accessed
+                    )
+                )
+            self._spill()
+
+    def _load(self, handle: str) -> Optional[StoredResult]:
+        """Ergebnis eines anderen Worker-Prozesses aus dem gemeinsamen Index."""
+        row = self._index.execute(
+            "SELECT owner, source, columns, path, offsets, created FROM results WHERE handle = ?", (handle,)
+        ).fetchone()
+        if row is None or not os.path.exists(row[3]):
+            return None
+        offsets = array("Q")
+        offsets.frombytes(row[4])
+        result = StoredResult.from_file(handle, row[0], json.loads(row[1]), row[3], offsets, json.loads(row[2]))
+        result.created = row[5]
+        return result
+
+    def get(self, handle: str, owner: str = "") -> StoredResult:
+        """
+        Raises:
+            ValueError: wenn das Handle unbekannt, abgelaufen oder einem anderen Mandanten zugeordnet ist
+        """
+        with self._lock:
+            self._sweep()
+            result = self._results.get(handle)
+            if self._index is not None:
+                # Kann ein anderer Worker abgelegt (oder nach Ablauf gelöscht) haben
+                if result is None:
+                    result = self._load(handle)
+                    if result is not None:
+                        self._results[handle] = result
+                elif not os.path.exists(result.path):
+                    self._results.pop(handle)
+                    result = None
+            if result is None or result.owner != owner:
+                raise ValueError(f"Ergebnis '{handle}' existiert nicht oder ist abgelaufen (Abfrage erneut ausführen)")
+            result.accessed = time.time()
+            self._results.move_to_end(handle)
+            if self._index is not None:
+                self._index.execute("UPDATE results SET accessed = ? WHERE handle = ?", (result.accessed, handle))
+            return result
+
+    def read(
+        self,
+        handle: str,
+        offset: int = 0,
+        limit: int = 100,
+        owner: str = "",
+        fields: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Liest den Bereich [offset, offset + limit) eines Ergebnisses.
+
+        Returns:
+            Zeilen des Bereichs, Gesamtzahl und next_offset (None am Ende)
+
+        Raises:
+            ValueError: bei unbekanntem Handle oder ungültigem Bereich
+        """
+        if offset < 0 or limit <= 0:
+            raise ValueError("offset muss >= 0 und limit > 0 sein")
+        result = self.get(handle, owner)
+        end = min(result.count, offset + min(limit, MAX_SLICE_ROWS))
+        rows = [loads(line) for line in result.slice(offset, end)]
+        if fields:
+            rows = [{name: row.get(name) for name in fields} if isinstance(row, dict) else row for row in rows]
+        self.stats["slices"] += 1
+        return {
+            "handle": handle,
+            "offset": offset,
+            "count": len(rows),
+            "total": result.count,
+            "next_offset": end if end < result.count else None,
+            "rows": rows
+        }
+
+    def _spill(self) -> None:
+        """Lagert die am längsten nicht gelesenen Ergebnisse aus, bis das Budget eingehalten ist."""
+        for result in list(self._results.values()):
+            if self._in_memory <= self.memory_bytes:
+                return
+            if result.lines is None:
+                continue
+            os.makedirs(self.directory, exist_ok=True)
+            result.spill(os.path.join(self.directory, f"{result.handle}.ndjson"))
+            self._in_memory -= result.bytes
+            self.stats["spilled"] += 1
+            logger.info(f"Ergebnis '{result.handle}' ({result.bytes} Bytes) auf die Platte ausgelagert")
+
+    def _sweep(self) -> None:
+        deadline = time.time() - self.ttl
+        if self._index is not None:
+            # Zugriffe anderer Worker zählen mit: maßgeblich ist der Index
+            expired = self._index.execute("SELECT handle, path FROM results WHERE accessed < ?", (deadline,)).fetchall()
+            for handle, path in expired:
+                self._index.execute("DELETE FROM results WHERE handle = ?", (handle,))
+                self._results.pop(handle, None)
+                if os.path.exists(path):
+                    os.remove(path)
+                self.stats["expired"] += 1
+            return
+        for handle, result in list(self._results.items()):
+            if result.accessed >= deadline:
+                break
+            self._remove(handle)
+            self.stats["expired"] += 1
+
+    def _remove(self, handle: str) -> None:
+        result = self._results.pop(handle)
+        if result.lines is not None:
+            self._in_memory -= result.bytes
+        elif result.path and os.path.exists(result.path):
+            os.remove(result.path)
+
+    def describe(self) -> Dict[str, Any]:
+        with self._lock:
+            return dict(
+                self.stats,
+                shared=self.shared,
+                results=len(self._results),
+                memory_bytes=self._in_memory,
+                memory_budget_bytes=self.memory_bytes,
+                disk_bytes=sum(result.bytes for result in self._results.values() if result.lines is None)
+            )
+
+    def close(self) -> None:
+        """
+        Verwirft alle Ergebnisse und löscht die ausgelagerten Dateien.
+
+        Eine gemeinsame Ablage bleibt für die anderen Worker erhalten;
+        abgelaufene Ergebnisse löscht der nächste Zugriff.
+        """
+        with self._lock:
+            self._results.clear()
+            self._in_memory = 0
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+                return
+        shutil.rmtree(self.directory, ignore_errors=True)
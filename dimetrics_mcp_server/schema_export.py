@@ -0,0 +1,242 @@
+"""
+Export von App-Schemas als portables Dokument für den Import in andere Backends.
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Dict, List, Optional
+
+from .api_client import DimetricsAPIClient
+from .app_builder import RELATION_TYPES
+from .schema_sync import SchemaApplier, id_of, list_all_pages, plan_schema_changes
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_FORMAT_VERSION = 1
+
+# Vom Server verwaltete oder backend-spezifische Felder, die nicht exportiert werden
+ATTRIBUTE_DROP_FIELDS = {
+    "object_id",
+    "id",
+    "resource",
+    "ingest_timestamp",
+    "update_timestamp",
+    "date_created",
+    "date_updated",
+    "subscription",
+    "created_by",
+    "updated_by",
+    "user_created",
+    "user_updated",
+}
+PERMISSION_GROUP_DROP_FIELDS = ATTRIBUTE_DROP_FIELDS - {"subscription"}
+
+
+def _create_params(method, *exclude: str) -> List[str]:
+    """Exportierbare Felder = Parameter der create-Methode (ohne Referenzen)."""
+    return [name for name in inspect.signature(method).parameters if name not in exclude]
+
+
+def _strip_prefix(name: str, prefix: str) -> str:
+    if prefix and name.startswith(prefix):
+        return name[len(prefix):]
+    return name
+
+
+def _pick(source: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+    return {field: source[field] for field in fields if source.get(field) is not None}
+
+
+async def export_app_schema(
+    client: DimetricsAPIClient,
+    app: str,
+    include_permission_groups: bool = False,
+    concurrency: int = 4
+) -> Dict[str, Any]:
+    """
+    Exportiert den Schema-Baum einer App (Services, Resources, Attribute).
+
+    Das Ergebnis ist ein Soll-Dokument im Format von plan_schema/apply_schema:
+    IDs werden entfernt, Service- und Resource-Namen ohne App-Präfix
+    gespeichert und linked_resource auf Resource-Namen umgeschrieben. Die
+    ursprünglichen object_ids stehen unter "source" für die ID-Zuordnung.
+
+    Args:
+        client: API Client des Quell-Backends
+        app: object_id oder Name der App
+        include_permission_groups: Permission-Gruppen mit exportieren
+            (subscription-IDs müssen im Ziel-Backend existieren)
+        concurrency: Anzahl paralleler Requests für die Attribute
+
+    Raises:
+        ValueError: wenn die App nicht gefunden wird
+    """
+    fetches = [
+        list_all_pages(client.list_services),
+        list_all_pages(client.list_services_endpoint),
+        list_all_pages(client.list_resources_endpoint),
+    ]
+    if include_permission_groups:
+        fetches.append(list_all_pages(client.list_resource_permission_groups))
+    apps, services, resources, *rest = await asyncio.gather(*fetches)
+    groups = rest[0] if rest else []
+
+    live_app = next((item for item in apps if item.get("object_id") == app), None) \
+        or next((item for item in apps if item.get("name") == app), None)
+    if live_app is None:
+        raise ValueError(f"App '{app}' nicht gefunden")
+
+    prefix = live_app.get("prefix") or ""
+    app_services = [item for item in services if id_of(item.get("app_space")) == live_app["object_id"]]
+    service_ids = {item["object_id"] for item in app_services}
+    app_resources = [item for item in resources if id_of(item.get("service")) in service_ids]
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def fetch_attributes(resource: Dict[str, Any]) -> List[Dict[str, Any]]:
+        async with semaphore:
+            return await client.get_attribute_schema(resource["name"], max_age=0)
+
+    attribute_lists = await asyncio.gather(*(fetch_attributes(resource) for resource in app_resources))
+
+    # linked_resource-UUIDs innerhalb der App werden zu portablen Resource-Namen
+    portable_names = {
+        resource["object_id"]: _strip_prefix(resource["name"], prefix) for resource in app_resources
+    }
+    external_names = {resource.get("object_id"): resource.get("name") for resource in resources}
+
+    service_fields = _create_params(client.create_service_endpoint, "self", "name", "app_space", "category")
+    resource_fields = _create_params(client.create_resource_endpoint, "self", "name", "service", "database_connection")
+    source_ids: Dict[str, str] = {live_app["name"]: live_app["object_id"]}
+    warnings: List[str] = []
+    attribute_count = 0
+
+    exported_services = []
+    for service in app_services:
+        service_name = _strip_prefix(service["name"], prefix)
+        service_path = f"{live_app['name']}/{service_name}"
+        source_ids[service_path] = service["object_id"]
+        exported_resources = []
+
+        for resource, attributes in zip(app_resources, attribute_lists):
+            if id_of(resource.get("service")) != service["object_id"]:
+                continue
+            resource_name = portable_names[resource["object_id"]]
+            source_ids[f"{service_path}/{resource_name}"] = resource["object_id"]
+
+            exported_attributes = []
+            for attribute in attributes:
+                exported = {
+                    field: value for field, value in attribute.items()
+                    if field not in ATTRIBUTE_DROP_FIELDS and value is not None
+                }
+                target = id_of(attribute.get("linked_resource"))
+                if str(attribute.get("type", "")).upper() in RELATION_TYPES and target:
+                    if target in portable_names:
+                        exported["linked_resource"] = portable_names[target]
+                    elif target in external_names:
+                        # Resource außerhalb der App: Zuordnung im Ziel über den Live-Namen
+                        exported["linked_resource"] = external_names[target]
+                        warnings.append(
+                            f"Attribut '{resource_name}.{attribute.get('name')}' verweist auf Resource "
+                            f"'{external_names[target]}' außerhalb der App"
+                        )
+                    else:
+                        exported["linked_resource"] = target
+                exported_attributes.append(exported)
+            attribute_count += len(exported_attributes)
+
+            exported_resource = dict(_pick(resource, resource_fields), name=resource_name, attributes=exported_attributes)
+            if include_permission_groups:
+                exported_resource["permission_groups"] = [
+                    dict(
+                        {field: value for field, value in group.items()
+                         if field not in PERMISSION_GROUP_DROP_FIELDS and value is not None},
+                        subscription=id_of(group.get("subscription"))
+                    )
+                    for group in groups if id_of(group.get("resource")) == resource["object_id"]
+                ]
+            exported_resources.append(exported_resource)
+
+        exported_services.append(dict(_pick(service, service_fields), name=service_name, resources=exported_resources))
+
+    app_document = _pick(live_app, ["name", "description", "prefix"])
+    app_document["services"] = exported_services
+    return {
+        "format_version": SCHEMA_FORMAT_VERSION,
+        "apps": [app_document],
+        "source": {
+            "base_url": client.base_url,
+            "exported_at": time.time(),
+            "ids": source_ids
+        },
+        "stats": {
+            "services": len(exported_services),
+            "resources": len(app_resources),
+            "attributes": attribute_count
+        },
+        "warnings": warnings
+    }
+
+
+async def import_app_schema(
+    client: DimetricsAPIClient,
+    document: Dict[str, Any],
+    app_name: str = "",
+    prefix: Optional[str] = None,
+    concurrency: int = 4
+) -> Dict[str, Any]:
+    """
+    Importiert ein exportiertes Schema in ein Backend.
+
+    Der Import läuft über die Schema-Engine: vorhandene Objekte (gleicher
+    Name) werden abgeglichen, neue mit parallelen Requests und einem
+    create_attributes_bulk pro Resource angelegt. linked_resource-Namen
+    werden im Ziel auf die neuen object_ids aufgelöst.
+
+    Args:
+        client: API Client des Ziel-Backends
+        document: Ergebnis von export_app_schema
+        app_name: Neuer App-Name im Ziel (leer = Name aus dem Export)
+        prefix: App-Präfix im Ziel (None = aus dem Export, "" = generieren)
+        concurrency: Anzahl paralleler Requests
+
+    Returns:
+        Plan, Ausführungsergebnis und Zuordnung Quell-ID -> Ziel-ID
+    """
+    apps = document.get("apps")
+    if not isinstance(apps, list) or len(apps) != 1:
+        raise ValueError("Das Dokument muss genau eine App unter 'apps' enthalten")
+
+    app = dict(apps[0])
+    source_name = app.get("name")
+    if app_name:
+        app["name"] = app_name
+    if prefix is not None:
+        if prefix:
+            app["prefix"] = prefix
+        else:
+            app.pop("prefix", None)
+
+    planner, plan = await plan_schema_changes(client, {"apps": [app]}, concurrency=concurrency)
+    applied = {"results": [], "summary": {"done": 0, "failed": 0, "skipped": 0, "writes": 0}}
+    target_ids = dict(planner.ids)
+    if plan["operations"]:
+        applier = SchemaApplier(client, planner, concurrency=concurrency)
+        applied = await applier.apply(plan)
+        target_ids = applier.ids
+
+    # Quell-IDs über die Pfade (App-Name ggf. umbenannt) den Ziel-IDs zuordnen
+    id_map = {}
+    for path, source_id in document.get("source", {}).get("ids", {}).items():
+        target_path = app["name"] + path[len(source_name):] if path.startswith(source_name) else path
+        if target_path in target_ids:
+            id_map[source_id] = target_ids[target_path]
+
+    return {
+        "plan": plan,
+        "apply": applied,
+        "id_map": id_map
+    }
@@ -0,0 +1,525 @@
+"""
+Deklarativer Abgleich von App-Schemas (Soll-Zustand -> minimale API-Operationen).
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+import httpx
+
+from .api_client import DimetricsAPIClient
+from .app_builder import RELATION_TYPES, attribute_payload, is_uuid
+from .diffing import values_equal
+
+logger = logging.getLogger(__name__)
+
+# Schlüssel für verschachtelte Objekte, die nie als Feld verglichen werden
+CHILD_KEYS = {"services", "resources", "attributes", "permission_groups"}
+
+# Präfix für Verweise auf Objekte, die erst beim Apply angelegt werden
+REF_PREFIX = "$ref:"
+
+
+def id_of(value: Any) -> Any:
+    """Liefert die object_id eines verschachtelten Objekts oder den Wert selbst."""
+    if isinstance(value, dict):
+        return value.get("object_id")
+    return value
+
+
+def _name_matches(live_name: Any, name: str, prefix: str) -> bool:
+    """Services und Resources erhalten vom Server das App-Präfix."""
+    return live_name == name or bool(prefix) and live_name == f"{prefix}{name}"
+
+
+def _fields(desired: Dict[str, Any]) -> Dict[str, Any]:
+    return {key: value for key, value in desired.items() if key not in CHILD_KEYS}
+
+
+def _accepted_params(method: Callable) -> Optional[Set[str]]:
+    """Parameter einer Client-Methode; None wenn sie beliebige **kwargs akzeptiert."""
+    params = inspect.signature(method).parameters
+    if any(param.kind is inspect.Parameter.VAR_KEYWORD for param in params.values()):
+        return None
+    return set(params)
+
+
+def _error_text(e: BaseException) -> str:
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"HTTP {e.response.status_code}: {e.response.text[:500]}"
+    return str(e)
+
+
+async def list_all_pages(fetch: Callable[..., Awaitable[Any]], page_size: int = 200) -> List[Dict[str, Any]]:
+    """Lädt alle Seiten eines List-Endpunkts."""
+    items: List[Dict[str, Any]] = []
+    page = 1
+    while True:
+        data = await fetch(page_size=page_size, page=page)
+        if isinstance(data, list):
+            return items + data
+        results = data.get("results", [])
+        items.extend(results)
+        if not data.get("next") or not results:
+            return items
+        page += 1
+
+
+class SchemaPlanner:
+    """
+    Vergleicht ein Soll-Schema mit dem Live-Zustand und erzeugt einen Plan.
+
+    Soll-Dokument:
+        {"apps": [{"name", "prefix", "description", "services": [
+            {"name", "title", ..., "resources": [
+                {"name", "title", ..., "attributes": [{"name", "type", "label", ...}],
+                 "permission_groups": [{"name", "subscription", "can_create_document", ...}]}]}]}]}
+
+    Objekte werden über ihren Namen innerhalb des Elternobjekts zugeordnet.
+    Es werden nur die im Soll-Dokument angegebenen Felder verglichen, die
+    auch der Live-Zustand liefert; ein unverändertes Schema ergibt einen
+    leeren Plan, auch nach einem vorherigen Apply. Neue Attribute einer
+    Resource werden zu einem create_attributes_bulk zusammengefasst.
+    """
+
+    def __init__(self, client: DimetricsAPIClient, desired: Dict[str, Any], prune: bool = False, concurrency: int = 4):
+        self.client = client
+        self.desired = desired
+        self.prune = prune
+        self.concurrency = max(1, concurrency)
+
+        self.operations: List[Dict[str, Any]] = []
+        self.warnings: List[str] = []
+        # Pfad -> object_id bzw. Resource-Name bestehender Objekte
+        self.ids: Dict[str, str] = {}
+        self.names: Dict[str, str] = {}
+        # Pfad -> ID der Create-Operation für neue Objekte
+        self._creates: Dict[str, int] = {}
+        self.reads = 0
+
+    def _add(self, action: str, kind: str, path: str, depends_on: List[int], **extra: Any) -> Dict[str, Any]:
+        operation = {
+            "id": len(self.operations) + 1,
+            "action": action,
+            "kind": kind,
+            "path": path,
+            "depends_on": sorted(set(depends_on)),
+            **extra
+        }
+        self.operations.append(operation)
+        if action == "create" and kind != "attributes":
+            self._creates[path] = operation["id"]
+        return operation
+
+    def _parent(self, path: str, depends_on: List[int]) -> str:
+        """Verweis auf ein Elternobjekt: object_id wenn vorhanden, sonst $ref."""
+        if path in self.ids:
+            return self.ids[path]
+        depends_on.append(self._creates[path])
+        return f"{REF_PREFIX}{path}"
+
+    def _diff(self, kind: str, path: str, live: Dict[str, Any], desired: Dict[str, Any], update_method: Callable) -> Dict[str, Any]:
+        """
+        Geänderte Felder; nicht per PATCH änderbare Felder werden als Warnung gemeldet.
+
+        Felder, die die API nicht zurückliefert (z.B. typ-spezifische Optionen),
+        lassen sich nicht vergleichen und gelten als unverändert.
+        """
+        accepted = _accepted_params(update_method)
+        changes = {}
+        for field, value in desired.items():
+            if field == "name" or field not in live or values_equal(live[field], value):
+                continue
+            if accepted is not None and field not in accepted:
+                self.warnings.append(f"{kind} '{path}': Feld '{field}' kann nicht aktualisiert werden")
+                continue
+            changes[field] = value
+        return changes
+
+    async def _fetch_tree(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Lädt Apps, Services, Resources und Permission-Gruppen parallel."""
+        client = self.client
+        apps, services, resources, groups = await asyncio.gather(
+            list_all_pages(client.list_services),
+            list_all_pages(client.list_services_endpoint),
+            list_all_pages(client.list_resources_endpoint),
+            list_all_pages(client.list_resource_permission_groups)
+        )
+        self.reads += 4
+        return {"apps": apps, "services": services, "resources": resources, "permission_groups": groups}
+
+    async def _fetch_attributes(self, resource_paths: List[str]) -> Dict[str, List[Dict[str, Any]]]:
+        """Lädt die Attribute der bestehenden Resources parallel (ungecacht)."""
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(path: str) -> Tuple[str, List[Dict[str, Any]]]:
+            async with semaphore:
+                return path, await self.client.get_attribute_schema(self.names[path], max_age=0)
+
+        self.reads += len(resource_paths)
+        return dict(await asyncio.gather(*(fetch(path) for path in resource_paths)))
+
+    def _resolve_linked_resource(self, path: str, target: Any, resource_paths: Dict[str, str], live_resources: List[Dict[str, Any]], depends_on: List[int]) -> Any:
+        """Löst linked_resource (Resource-Name aus dem Dokument, Live-Name oder UUID) auf."""
+        if is_uuid(target):
+            return target
+        if target in resource_paths:
+            return self._parent(resource_paths[target], depends_on)
+        for resource in live_resources:
+            if resource.get("name") == target:
+                return resource.get("object_id")
+        raise ValueError(f"Attribut '{path}': linked_resource '{target}' nicht gefunden")
+
+    async def plan(self) -> Dict[str, Any]:
+        """
+        Erstellt den Plan (nur lesende Requests).
+
+        Returns:
+            Operationen, Stufen (parallel ausführbare Operationen), Warnungen
+
+        Raises:
+            ValueError: bei ungültigem Soll-Dokument
+        """
+        started = time.perf_counter()
+        apps = self.desired.get("apps")
+        if not isinstance(apps, list):
+            raise ValueError("Das Schema braucht eine Liste 'apps'")
+
+        live = await self._fetch_tree()
+        client = self.client
+
+        # Resource-Namen des Dokuments für linked_resource-Verweise
+        resource_paths: Dict[str, str] = {}
+        resources_to_sync: List[Tuple[str, Dict[str, Any], Optional[Dict[str, Any]]]] = []
+
+        for app in apps:
+            if not app.get("name"):
+                raise ValueError("Jede App braucht einen 'name'")
+            app_path = app["name"]
+            live_app = next((item for item in live["apps"] if item.get("name") == app_path), None)
+            if live_app:
+                self.ids[app_path] = live_app["object_id"]
+                prefix = live_app.get("prefix") or app.get("prefix", "")
+                changes = self._diff("App", app_path, live_app, _fields(app), client.update_app_deprecated)
+                if changes:
+                    self._add("update", "app", app_path, [], object_id=live_app["object_id"], data=changes)
+            else:
+                prefix = app.get("prefix", "")
+                self._add("create", "app", app_path, [], data=_fields(app))
+
+            for service in app.get("services", []):
+                if not service.get("name"):
+                    raise ValueError(f"App '{app_path}': jeder Service braucht einen 'name'")
+                service_path = f"{app_path}/{service['name']}"
+                live_service = None
+                if live_app:
+                    live_service = next((
+                        item for item in live["services"]
+                        if id_of(item.get("app_space")) == live_app["object_id"]
+                        and _name_matches(item.get("name"), service["name"], prefix)
+                    ), None)
+                if live_service:
+                    self.ids[service_path] = live_service["object_id"]
+                    changes = self._diff("Service", service_path, live_service, _fields(service), client.update_service_endpoint)
+                    if changes:
+                        self._add("update", "service", service_path, [], object_id=live_service["object_id"], data=changes)
+                else:
+                    depends_on: List[int] = []
+                    data = dict(_fields(service), app_space=self._parent(app_path, depends_on))
+                    self._add("create", "service", service_path, depends_on, data=data)
+
+                for resource in service.get("resources", []):
+                    if not resource.get("name"):
+                        raise ValueError(f"Service '{service_path}': jede Resource braucht einen 'name'")
+                    resource_path = f"{service_path}/{resource['name']}"
+                    if resource["name"] in resource_paths:
+                        raise ValueError(f"Resource-Name '{resource['name']}' ist im Schema mehrfach vergeben")
+                    resource_paths[resource["name"]] = resource_path
+                    live_resource = None
+                    if live_service:
+                        live_resource = next((
+                            item for item in live["resources"]
+                            if id_of(item.get("service")) == live_service["object_id"]
+                            and _name_matches(item.get("name"), resource["name"], prefix)
+                        ), None)
+                    if live_resource:
+                        self.ids[resource_path] = live_resource["object_id"]
+                        self.names[resource_path] = live_resource["name"]
+                        changes = self._diff("Resource", resource_path, live_resource, _fields(resource), client.update_resource_endpoint)
+                        if changes:
+                            self._add("update", "resource", resource_path, [], object_id=live_resource["object_id"], data=changes)
+                    else:
+                        depends_on = []
+                        data = dict(_fields(resource), service=self._parent(service_path, depends_on))
+                        self._add("create", "resource", resource_path, depends_on, data=data)
+                    resources_to_sync.append((resource_path, resource, live_resource))
+
+        live_attributes = await self._fetch_attributes([path for path, _, live_resource in resources_to_sync if live_resource])
+
+        for resource_path, resource, live_resource in resources_to_sync:
+            self._plan_attributes(resource_path, resource, live_attributes.get(resource_path, []), resource_paths, live["resources"])
+            self._plan_permission_groups(resource_path, resource, live_resource, live["permission_groups"])
+
+        return self._result(time.perf_counter() - started)
+
+    def _plan_attributes(self, resource_path: str, resource: Dict[str, Any], live_attributes: List[Dict[str, Any]], resource_paths: Dict[str, str], live_resources: List[Dict[str, Any]]) -> None:
+        live_by_name = {attribute.get("name"): attribute for attribute in live_attributes}
+        new_attributes: List[Dict[str, Any]] = []
+        bulk_depends_on: List[int] = []
+        desired_names = set()
+
+        for attribute in resource.get("attributes", []):
+            if not attribute.get("name") or not attribute.get("type"):
+                raise ValueError(f"Resource '{resource_path}': Attribute brauchen 'name' und 'type'")
+            path = f"{resource_path}.{attribute['name']}"
+            desired_names.add(attribute["name"])
+            payload = attribute_payload(attribute)
+            depends_on: List[int] = []
+            if payload["type"] in RELATION_TYPES and payload.get("linked_resource"):
+                payload["linked_resource"] = self._resolve_linked_resource(
+                    path, payload["linked_resource"], resource_paths, live_resources, depends_on
+                )
+
+            live_attribute = live_by_name.get(attribute["name"])
+            if live_attribute is None:
+                new_attributes.append(payload)
+                bulk_depends_on.extend(depends_on)
+                continue
+
+            if str(live_attribute.get("type", "")).upper() != payload["type"]:
+                self.warnings.append(
+                    f"Attribut '{path}': Typwechsel {live_attribute.get('type')} -> {payload['type']} "
+                    f"wird nicht per Update unterstützt"
+                )
+            # Das Standard-Label wird nur beim Anlegen gesetzt, nicht verglichen
+            compare = {
+                field: value for field, value in payload.items()
+                if field != "type" and (field != "label" or "label" in attribute)
+            }
+            if "linked_resource" in compare and "linked_resource" in live_attribute:
+                live_attribute = dict(live_attribute, linked_resource=id_of(live_attribute["linked_resource"]))
+            changes = self._diff("Attribut", path, live_attribute, compare, self.client.update_attribute)
+            if changes:
+                self._add(
+                    "update", "attribute", path, depends_on,
+                    resource=resource_path, object_id=live_attribute.get("object_id"), data=changes
+                )
+
+        if new_attributes:
+            if resource_path not in self.ids:
+                bulk_depends_on.append(self._creates[resource_path])
+            self._add(
+                "create", "attributes", resource_path, bulk_depends_on,
+                resource=resource_path, data=new_attributes
+            )
+
+        if self.prune and live_attributes:
+            for name, live_attribute in live_by_name.items():
+                if name in desired_names or live_attribute.get("readonly") or live_attribute.get("is_system"):
+                    continue
+                self._add(
+                    "delete", "attribute", f"{resource_path}.{name}", [],
+                    resource=resource_path, object_id=live_attribute.get("object_id")
+                )
+
+    def _plan_permission_groups(self, resource_path: str, resource: Dict[str, Any], live_resource: Optional[Dict[str, Any]], live_groups: List[Dict[str, Any]]) -> None:
+        for group in resource.get("permission_groups", []):
+            if not group.get("name"):
+                raise ValueError(f"Resource '{resource_path}': Permission-Gruppen brauchen einen 'name'")
+            path = f"{resource_path}#{group['name']}"
+            live_group = None
+            if live_resource:
+                live_group = next((
+                    item for item in live_groups
+                    if item.get("name") == group["name"] and id_of(item.get("resource")) == live_resource["object_id"]
+                ), None)
+            if live_group:
+                compare = dict(group)
+                if "subscription" in compare and "subscription" in live_group:
+                    live_group = dict(live_group, subscription=id_of(live_group["subscription"]))
+                changes = self._diff("Permission-Gruppe", path, live_group, compare, self.client.update_resource_permission_group)
+                if changes:
+                    self._add("update", "permission_group", path, [], object_id=live_group["object_id"], data=changes)
+            else:
+                if not group.get("subscription"):
+                    raise ValueError(f"Permission-Gruppe '{path}': 'subscription' ist erforderlich")
+                depends_on: List[int] = []
+                data = dict(group, resource=self._parent(resource_path, depends_on))
+                self._add("create", "permission_group", path, depends_on, data=data)
+
+    def _result(self, elapsed: float) -> Dict[str, Any]:
+        # Stufe = längster Abhängigkeitspfad; Operationen einer Stufe laufen parallel
+        stage_of: Dict[int, int] = {}
+        for operation in self.operations:
+            stage_of[operation["id"]] = max((stage_of[dep] + 1 for dep in operation["depends_on"]), default=0)
+            operation["stage"] = stage_of[operation["id"]]
+        stages: List[List[int]] = []
+        for operation in self.operations:
+            while len(stages) <= operation["stage"]:
+                stages.append([])
+            stages[operation["stage"]].append(operation["id"])
+
+        counts: Dict[str, int] = {"create": 0, "update": 0, "delete": 0}
+        for operation in self.operations:
+            counts[operation["action"]] += 1
+        return {
+            "operations": self.operations,
+            "stages": stages,
+            "summary": {**counts, "writes": len(self.operations), "reads": self.reads},
+            "warnings": self.warnings,
+            "elapsed_seconds": round(elapsed, 3)
+        }
+
+
+class SchemaApplier:
+    """Führt einen Plan stufenweise aus; Operationen einer Stufe laufen parallel."""
+
+    def __init__(self, client: DimetricsAPIClient, planner: SchemaPlanner, concurrency: int = 4):
+        self.client = client
+        self.ids = dict(planner.ids)
+        self.names = dict(planner.names)
+        self.concurrency = max(1, concurrency)
+        self.created_resources: Set[str] = set()
+
+    def _resolve(self, value: Any) -> Any:
+        if isinstance(value, str) and value.startswith(REF_PREFIX):
+            return self.ids[value[len(REF_PREFIX):]]
+        return value
+
+    def _resolve_data(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return {field: self._resolve(value) for field, value in data.items()}
+
+    async def _execute(self, operation: Dict[str, Any]) -> Any:
+        client = self.client
+        kind, action, path = operation["kind"], operation["action"], operation["path"]
+
+        if action == "create" and kind == "attributes":
+            payloads = [self._resolve_data(payload) for payload in operation["data"]]
+            resource_name = self.names[operation["resource"]]
+            if operation["resource"] in self.created_resources:
+                payloads = await self._merge_default_attributes(resource_name, payloads)
+            if not payloads:
+                return []
+            return await client.create_attributes_bulk(resource_name, payloads)
+
+        if action == "delete":
+            return await client.delete_attribute(self.names[operation["resource"]], operation["object_id"])
+
+        data = self._resolve_data(operation["data"])
+        if action == "update":
+            object_id = operation["object_id"]
+            if kind == "app":
+                return await client.update_app_deprecated(object_id, **data)
+            if kind == "service":
+                return await client.update_service_endpoint(object_id, **data)
+            if kind == "resource":
+                return await client.update_resource_endpoint(object_id, **data)
+            if kind == "attribute":
+                return await client.update_attribute(self.names[operation["resource"]], object_id, **data)
+            return await client.update_resource_permission_group(object_id, **data)
+
+        if kind == "app":
+            result = await client.create_app(
+                name=data["name"], description=data.get("description", ""), prefix=data.get("prefix", "")
+            )
+        elif kind == "service":
+            result = await client.create_service_endpoint(**self._known(client.create_service_endpoint, data))
+        elif kind == "resource":
+            result = await client.create_resource_endpoint(**self._known(client.create_resource_endpoint, data))
+        else:
+            known = self._known(client.create_resource_permission_group, data)
+            extra = {field: value for field, value in data.items() if field not in known}
+            result = await client.create_resource_permission_group(**known, extra_fields=extra or None)
+
+        self.ids[path] = result.get("object_id")
+        if kind == "resource":
+            self.names[path] = result.get("name", data["name"])
+            self.created_resources.add(path)
+        return result
+
+    async def _merge_default_attributes(self, resource_name: str, payloads: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Gleicht neue Attribute mit den Standard-Attributen ab, die der Server
+        beim Anlegen einer Resource erzeugt (z.B. name, state).
+
+        Bereits vorhandene Attribute werden per PATCH angepasst statt doppelt
+        angelegt.
+
+        Returns:
+            Die Attribute, die noch per Bulk angelegt werden müssen
+        """
+        existing = {
+            attribute.get("name"): attribute
+            for attribute in await self.client.get_attribute_schema(resource_name, max_age=0)
+        }
+        remaining, updates = [], []
+        for payload in payloads:
+            live = existing.get(payload.get("name"))
+            if live is None:
+                remaining.append(payload)
+                continue
+            changes = {
+                field: value for field, value in payload.items()
+                if field not in ("name", "type") and not (field in live and values_equal(live[field], value))
+            }
+            if changes:
+                updates.append(self.client.update_attribute(resource_name, live.get("object_id"), **changes))
+        await asyncio.gather(*updates)
+        return remaining
+
+    @staticmethod
+    def _known(method: Callable, data: Dict[str, Any]) -> Dict[str, Any]:
+        accepted = _accepted_params(method)
+        return {field: value for field, value in data.items() if accepted is None or field in accepted}
+
+    async def apply(self, plan: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Führt die Operationen des Plans aus.
+
+        Bricht nach der ersten Stufe mit Fehlern ab; bereits ausgeführte
+        Operationen bleiben bestehen (ein erneutes Apply setzt dort fort).
+        """
+        started = time.perf_counter()
+        by_id = {operation["id"]: operation for operation in plan["operations"]}
+        semaphore = asyncio.Semaphore(self.concurrency)
+        results: List[Dict[str, Any]] = []
+        failed = False
+
+        async def run(operation: Dict[str, Any]) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    await self._execute(operation)
+                    return {"id": operation["id"], "status": "done"}
+                except Exception as e:
+                    logger.error(f"Schema-Operation {operation['action']} {operation['kind']} '{operation['path']}' fehlgeschlagen: {e}")
+                    return {"id": operation["id"], "status": "failed", "error": _error_text(e)}
+
+        for stage in plan["stages"]:
+            if failed:
+                results.extend({"id": op_id, "status": "skipped"} for op_id in stage)
+                continue
+            outcomes = await asyncio.gather(*(run(by_id[op_id]) for op_id in stage))
+            results.extend(outcomes)
+            failed = any(outcome["status"] == "failed" for outcome in outcomes)
+
+        for result in results:
+            operation = by_id[result["id"]]
+            result.update(action=operation["action"], kind=operation["kind"], path=operation["path"])
+
+        counts = {"done": 0, "failed": 0, "skipped": 0}
+        for result in results:
+            counts[result["status"]] += 1
+        return {
+            "results": sorted(results, key=lambda item: item["id"]),
+            "summary": {**counts, "writes": counts["done"] + counts["failed"]},
+            "elapsed_seconds": round(time.perf_counter() - started, 3)
+        }
+
+
+async def plan_schema_changes(client: DimetricsAPIClient, desired: Dict[str, Any], prune: bool = False, concurrency: int = 4) -> Tuple[SchemaPlanner, Dict[str, Any]]:
+    """Erstellt Planner und Plan für ein Soll-Schema."""
+    planner = SchemaPlanner(client, desired, prune=prune, concurrency=concurrency)
+    return planner, await planner.plan()
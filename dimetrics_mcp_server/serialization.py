@@ -0,0 +1,58 @@
+"""
+Schnelle Serialisierung der Tool-Ergebnisse (optional, DIMETRICS_FAST_JSON=true).
+"""
+
+import json
+from typing import Any, Dict, Sequence
+
+from mcp.server.fastmcp import FastMCP
+from mcp.types import ContentBlock, TextContent, Tool as MCPTool
+
+from .json_decoding import orjson
+
+
+def dumps(data: Any) -> str:
+    """Kompaktes JSON (orjson, falls installiert); unbekannte Typen als String."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str).decode("utf-8")
+        except TypeError:
+            # z.B. Ganzzahlen > 64 Bit oder Dict-Schlüssel, die keine Strings sind
+            pass
+    return json.dumps(data, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+class FastJSONMCP(FastMCP):
+    """
+    FastMCP mit optionalem schnellen Ausgabepfad für Tool-Ergebnisse.
+
+    Standardmäßig serialisiert FastMCP ein Dict-Ergebnis zweimal: als
+    eingerücktes JSON im Text-Content und - nach Validierung gegen das aus
+    der Annotation abgeleitete Output-Schema - als structuredContent. Mit
+    fast_json=True wird nur noch kompaktes JSON im Text-Content geliefert
+    und die Tools werden ohne Output-Schema gelistet, sodass auch die
+    Validierung entfällt.
+    """
+
+    def __init__(self, name: str, fast_json: bool = False, **settings: Any):
+        super().__init__(name, **settings)
+        self.fast_json = fast_json
+
+    async def list_tools(self) -> list[MCPTool]:
+        tools = await super().list_tools()
+        if not self.fast_json:
+            return tools
+        return [tool.model_copy(update={"outputSchema": None}) for tool in tools]
+
+    async def call_tool(self, name: str, arguments: Dict[str, Any]) -> Sequence[ContentBlock] | Dict[str, Any]:
+        if not self.fast_json:
+            return await super().call_tool(name, arguments)
+
+        result = await self._tool_manager.call_tool(name, arguments, context=self.get_context(), convert_result=False)
+        if not isinstance(result, dict):
+            # Bilder, Content-Blöcke usw. wie gewohnt umwandeln (ohne structuredContent)
+            tool = self._tool_manager.get_tool(name)
+            converted = tool.fn_metadata.convert_result(result)
+            return converted[0] if isinstance(converted, tuple) else converted
+
+        return [TextContent(type="text", text=dumps(result))]
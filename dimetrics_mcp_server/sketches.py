@@ -0,0 +1,457 @@
+"""
+Näherungsweise Aggregate in einem Durchlauf mit festem Speicher.
+
+Die Generics API aggregiert nur sum/count/avg/min/max. Distinct-Zählungen,
+Quantile und häufigste Werte werden hier beim seitenweisen Lesen über
+Sketches berechnet, ohne die Zeilen zu halten:
+
+- HyperLogLog: Anzahl verschiedener Werte (Standardfehler 1.04/sqrt(2^precision))
+- t-digest: Quantile und Median, an den Rändern am genauesten
+- Space-Saving: häufigste Werte mit oberer Fehlerschranke pro Wert
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from .api_client import DimetricsAPIClient
+from .columnar import _to_number
+from .mirror import _cell
+from .partitioning import _EPOCH, _format_bound
+
+logger = logging.getLogger(__name__)
+
+SKETCH_FUNCTIONS = ("count_distinct", "median", "percentiles", "top_k")
+
+# Bis zu so vielen verschiedenen Werten zählt count_distinct exakt
+EXACT_DISTINCT = 1024
+
+# Seiten werden im Thread-Pool eingerechnet, sobald sie so viele Zeilen haben
+THREAD_ROWS = 500
+
+
+def _hash(value: Hashable) -> int:
+    """64-Bit-Hash eines Werts (stabil über Prozesse, anders als hash())."""
+    data = value.encode("utf-8") if isinstance(value, str) else ("\x00" + repr(value)).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "big")
+
+
+class HyperLogLog:
+    """
+    Anzahl verschiedener Werte mit 2^precision Registern (ein Byte pro Register).
+
+    Bis EXACT_DISTINCT verschiedene Werte werden deren Hashes gehalten und
+    exakt gezählt, darüber nur noch die Register.
+    """
+
+    def __init__(self, precision: int = 14):
+        if not 4 <= precision <= 16:
+            raise ValueError("precision muss zwischen 4 und 16 liegen")
+        self.precision = precision
+        self.registers = bytearray(1 << precision)
+        self._exact: Optional[set] = set()
+        self._width = 64 - precision
+        self._mask = (1 << self._width) - 1
+
+    def add(self, value: Hashable) -> None:
+        hashed = _hash(value)
+        if self._exact is not None:
+            self._exact.add(hashed)
+            if len(self._exact) > EXACT_DISTINCT:
+                self._exact = None
+        index = hashed >> self._width
+        rank = self._width - (hashed & self._mask).bit_length() + 1
+        if rank > self.registers[index]:
+            self.registers[index] = rank
+
+    @property
+    def exact(self) -> bool:
+        return self._exact is not None
+
+    @property
+    def relative_error(self) -> float:
+        """Standardfehler der Schätzung (0 solange exakt gezählt wird)."""
+        return 0.0 if self.exact else 1.04 / math.sqrt(len(self.registers))
+
+    def estimate(self) -> int:
+        if self._exact is not None:
+            return len(self._exact)
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / sum(2.0 ** -register for register in self.registers)
+        zeros = self.registers.count(0)
+        if raw <= 2.5 * m and zeros:
+            # Kleine Kardinalitäten: Linear Counting über leere Register
+            return round(m * math.log(m / zeros))
+        return round(raw)
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.registers) + (len(self._exact) * 8 if self._exact is not None else 0)
+
+
+class TDigest:
+    """
+    Quantile über gewichtete Zentroide (merging t-digest, Skalenfunktion k1).
+
+    Neue Werte landen in einem Puffer und werden blockweise eingemischt;
+    die Zahl der Zentroide bleibt in der Größenordnung von compression.
+    """
+
+    def __init__(self, compression: float = 100.0):
+        self.compression = compression
+        self.means: List[float] = []
+        self.weights: List[float] = []
+        self.count = 0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+        self._buffer: List[float] = []
+        self._buffer_size = int(5 * compression)
+
+    def add(self, value: float) -> None:
+        self._buffer.append(value)
+        self.count += 1
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_size:
+            self._compress()
+
+    def _k_inverse(self, k: float) -> float:
+        if k >= self.compression / 4:
+            return 1.0
+        return (math.sin(k * 2 * math.pi / self.compression) + 1) / 2
+
+    def _k(self, q: float) -> float:
+        return self.compression / (2 * math.pi) * math.asin(2 * min(max(q, 0.0), 1.0) - 1)
+
+    def _compress(self) -> None:
+        if not self._buffer:
+            return
+        items = sorted(list(zip(self.means, self.weights)) + [(value, 1.0) for value in self._buffer])
+        self._buffer = []
+        total = float(self.count)
+        means, weights = [], []
+        mean, weight = items[0]
+        done = 0.0
+        limit = self._k_inverse(self._k(0.0) + 1)
+        for item_mean, item_weight in items[1:]:
+            if (done + weight + item_weight) / total <= limit:
+                weight += item_weight
+                mean += (item_mean - mean) * item_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                done += weight
+                limit = self._k_inverse(self._k(done / total) + 1)
+                mean, weight = item_mean, item_weight
+        means.append(mean)
+        weights.append(weight)
+        self.means, self.weights = means, weights
+
+    def _points(self) -> List[Tuple[float, float]]:
+        """Stützstellen (Wert, kumuliertes Gewicht) der stückweise linearen Verteilung."""
+        self._compress()
+        points = [(self.min, 0.0)]
+        done = 0.0
+        for mean, weight in zip(self.means, self.weights):
+            points.append((mean, done + weight / 2))
+            done += weight
+        points.append((self.max, done))
+        return points
+
+    def quantile(self, q: float) -> Optional[float]:
+        if not self.count:
+            return None
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+        target = q * self.count
+        points = self._points()
+        for (left, left_rank), (right, right_rank) in zip(points, points[1:]):
+            if target <= right_rank:
+                if right_rank == left_rank:
+                    return right
+                return left + (right - left) * (target - left_rank) / (right_rank - left_rank)
+        return self.max
+
+    def cdf(self, value: float) -> Optional[float]:
+        """Anteil der Werte <= value."""
+        if not self.count:
+            return None
+        if value < self.min:
+            return 0.0
+        if value >= self.max:
+            return 1.0
+        points = self._points()
+        for (left, left_rank), (right, right_rank) in zip(points, points[1:]):
+            if value < right:
+                if right == left:
+                    return right_rank / self.count
+                return (left_rank + (right_rank - left_rank) * (value - left) / (right - left)) / self.count
+        return 1.0
+
+    @property
+    def memory_bytes(self) -> int:
+        return (2 * len(self.means) + len(self._buffer)) * 8
+
+
+class SpaceSaving:
+    """
+    Häufigste Werte mit höchstens capacity Zählern (Stream-Summary).
+
+    Ist kein Zähler frei, übernimmt ein neuer Wert den kleinsten Zähler;
+    dessen Stand ist die Fehlerschranke des neuen Werts. Jeder Wert mit
+    Häufigkeit über n / capacity ist sicher enthalten.
+    """
+
+    def __init__(self, capacity: int = 100):
+        self.capacity = max(1, capacity)
+        self.counts: Dict[Hashable, int] = {}
+        self.errors: Dict[Hashable, int] = {}
+        # Zählerstand -> Werte mit diesem Stand (dict als geordnete Menge)
+        self._buckets: Dict[int, Dict[Hashable, None]] = {}
+        self._min = 0
+        self.total = 0
+
+    def _move(self, value: Hashable, old: int, new: int) -> None:
+        bucket = self._buckets[old]
+        del bucket[value]
+        if not bucket:
+            del self._buckets[old]
+            if old == self._min:
+                self._min = new
+        self._buckets.setdefault(new, {})[value] = None
+        self.counts[value] = new
+
+    def add(self, value: Hashable) -> None:
+        self.total += 1
+        count = self.counts.get(value)
+        if count is not None:
+            self._move(value, count, count + 1)
+            return
+        if len(self.counts) < self.capacity:
+            self.counts[value] = 1
+            self.errors[value] = 0
+            self._buckets.setdefault(1, {})[value] = None
+            self._min = 1
+            return
+        # Ältesten Wert mit dem kleinsten Zähler ersetzen
+        bucket = self._buckets[self._min]
+        victim = next(iter(bucket))
+        count = self._min
+        del self.counts[victim], self.errors[victim]
+        self.counts[value] = count
+        self.errors[value] = count
+        bucket[value] = bucket.pop(victim)
+        self._move(value, count, count + 1)
+
+    def top(self, k: int) -> List[Dict[str, Any]]:
+        """
+        Die k häufigsten Werte.
+
+        count ist eine obere Schranke, count - error eine untere;
+        guaranteed = der Wert gehört sicher zu den k häufigsten.
+        """
+        ranked = sorted(self.counts.items(), key=lambda item: item[1], reverse=True)
+        threshold = ranked[k][1] if len(ranked) > k else 0
+        return [
+            {
+                "value": value,
+                "count": count,
+                "error": self.errors[value],
+                "guaranteed": count - self.errors[value] >= threshold
+            }
+            for value, count in ranked[:k]
+        ]
+
+    @property
+    def memory_bytes(self) -> int:
+        return len(self.counts) * 64
+
+
+def _measure(value: Any) -> Optional[Tuple[str, float]]:
+    """Art und Zahlenwert für Quantile: Zahl oder ISO-Zeitstempel (Sekunden seit 1970)."""
+    number = _to_number(value, "float64")
+    if number is not None:
+        return "number", number
+    if not isinstance(value, str) or len(value) < 10:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return "timestamp", (parsed - _EPOCH).total_seconds()
+
+
+def normalize_sketch_spec(aggregates: Any) -> List[Tuple[str, str]]:
+    """
+    Prüft die Funktionen einer näherungsweisen Aggregation.
+
+    Args:
+        aggregates: Funktion -> Spalte oder Liste von Spalten, z.B. {"median": "pace", "count_distinct": ["shoe", "route"]}
+
+    Returns:
+        Liste (Funktion, Spalte)
+
+    Raises:
+        ValueError: bei unbekannten Funktionen oder ungültigen Spalten
+    """
+    if not isinstance(aggregates, dict) or not aggregates:
+        raise ValueError("aggregate_json muss ein Objekt {funktion: spalte} sein, z.B. {\"median\": \"pace\"}")
+    measures: List[Tuple[str, str]] = []
+    for function, columns in aggregates.items():
+        if function not in SKETCH_FUNCTIONS:
+            raise ValueError(f"Unbekannte Funktion '{function}' (erlaubt: {', '.join(SKETCH_FUNCTIONS)})")
+        for column in [columns] if isinstance(columns, str) else columns or []:
+            if not isinstance(column, str) or not column:
+                raise ValueError(f"Ungültige Spalte für {function}: {column!r}")
+            measures.append((function, column))
+    return measures
+
+
+class SketchAggregation:
+    """
+    Sketches für eine Menge (Funktion, Spalte), gespeist Seite für Seite.
+
+    Args:
+        measures: Ergebnis von normalize_sketch_spec
+        percentiles: Quantile für "percentiles" (0 < q < 1)
+        top_k: Anzahl häufigster Werte für "top_k"
+        precision: HyperLogLog-Präzision (2^precision Register)
+        compression: t-digest-Kompression (mehr = genauer, mehr Zentroide)
+    """
+
+    def __init__(
+        self,
+        measures: Sequence[Tuple[str, str]],
+        percentiles: Sequence[float] = (0.5, 0.9, 0.99),
+        top_k: int = 10,
+        precision: int = 14,
+        compression: float = 100.0
+    ):
+        if any(not 0 < q < 1 for q in percentiles):
+            raise ValueError("percentiles müssen zwischen 0 und 1 liegen (z.B. 0.5,0.9,0.99)")
+        if top_k < 1:
+            raise ValueError("top_k muss mindestens 1 sein")
+        self.measures = list(measures)
+        self.percentiles = list(percentiles)
+        self.top_k = top_k
+        self.rows = 0
+        self.distinct: Dict[str, HyperLogLog] = {}
+        self.digests: Dict[str, TDigest] = {}
+        self.heavy: Dict[str, SpaceSaving] = {}
+        for function, column in self.measures:
+            if function == "count_distinct":
+                self.distinct.setdefault(column, HyperLogLog(precision))
+            elif function == "top_k":
+                # Mehr Zähler als ausgegeben, damit die Reihenfolge der Top-k stabil ist
+                self.heavy.setdefault(column, SpaceSaving(max(10 * top_k, 100)))
+            else:
+                self.digests.setdefault(column, TDigest(compression))
+        columns = {column for _, column in self.measures}
+        self.values = {column: 0 for column in columns}
+        self.skipped = {column: 0 for column in self.digests}
+        self.kinds: Dict[str, str] = {}
+
+    def add_rows(self, rows: List[Dict[str, Any]]) -> None:
+        for row in rows:
+            self.rows += 1
+            for column in self.values:
+                value = _cell(row.get(column))
+                if value is None or value == "":
+                    continue
+                self.values[column] += 1
+                sketch = self.distinct.get(column)
+                if sketch is not None:
+                    sketch.add(value)
+                summary = self.heavy.get(column)
+                if summary is not None:
+                    summary.add(value)
+                digest = self.digests.get(column)
+                if digest is not None:
+                    measured = _measure(value)
+                    if measured is None or self.kinds.setdefault(column, measured[0]) != measured[0]:
+                        self.skipped[column] += 1
+                    else:
+                        digest.add(measured[1])
+
+    def _format(self, column: str, value: Optional[float]) -> Any:
+        if value is None:
+            return None
+        kind = self.kinds.get(column, "number")
+        # Zeitstempel auf Sekunden, die Interpolation ist ohnehin nicht genauer
+        return _format_bound(kind, round(value) if kind == "timestamp" else value)
+
+    def result(self) -> Dict[str, Any]:
+        """Werte pro "funktion_spalte" wie bei materialisierten Sichten, dazu Genauigkeit pro Spalte."""
+        values: Dict[str, Any] = {}
+        for function, column in self.measures:
+            key = f"{function}_{column}"
+            if function == "count_distinct":
+                values[key] = self.distinct[column].estimate()
+            elif function == "median":
+                values[key] = self._format(column, self.digests[column].quantile(0.5))
+            elif function == "percentiles":
+                digest = self.digests[column]
+                values[key] = {f"p{q * 100:g}": self._format(column, digest.quantile(q)) for q in self.percentiles}
+            else:
+                values[key] = self.heavy[column].top(self.top_k)
+        accuracy: Dict[str, Any] = {}
+        for column, sketch in self.distinct.items():
+            accuracy[f"count_distinct_{column}"] = {"exact": sketch.exact, "relative_error": round(sketch.relative_error, 4)}
+        for column, digest in self.digests.items():
+            accuracy[f"quantiles_{column}"] = {
+                "values": digest.count,
+                "skipped": self.skipped[column],
+                "centroids": len(digest.means),
+                "min": self._format(column, digest.min),
+                "max": self._format(column, digest.max)
+            }
+        for column, summary in self.heavy.items():
+            accuracy[f"top_k_{column}"] = {"capacity": summary.capacity, "max_error": max(summary.errors.values(), default=0)}
+        return {"values": values, "non_null": dict(self.values), "accuracy": accuracy}
+
+    @property
+    def memory_bytes(self) -> int:
+        sketches = [*self.distinct.values(), *self.digests.values(), *self.heavy.values()]
+        return sum(sketch.memory_bytes for sketch in sketches)
+
+
+async def sketch_aggregate(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    aggregation: SketchAggregation,
+    directus_filter: Optional[Dict[str, Any]] = None,
+    search: Optional[str] = None,
+    page_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Liest alle passenden Einträge seitenweise und speist die Sketches.
+
+    Im Speicher liegen nur die aktuelle Seite und die Sketches; größere
+    Seiten werden im Thread-Pool eingerechnet, damit der Event-Loop frei bleibt.
+    """
+    started = time.perf_counter()
+    pages = 0
+    async for page in client.iter_generic_pages(
+        resource_name, directus_filter=directus_filter, page_size=page_size, search=search
+    ):
+        pages += 1
+        if len(page) >= THREAD_ROWS:
+            await asyncio.to_thread(aggregation.add_rows, page)
+        else:
+            aggregation.add_rows(page)
+    result = await asyncio.to_thread(aggregation.result)
+    duration_ms = round((time.perf_counter() - started) * 1000, 1)
+    logger.info(f"Näherungsweise Aggregation über '{resource_name}': {aggregation.rows} Einträge, {pages} Seiten in {duration_ms:.0f} ms")
+    result.update(rows=aggregation.rows, pages=pages, sketch_bytes=aggregation.memory_bytes, duration_ms=duration_ms)
+    return result
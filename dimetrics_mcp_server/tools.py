@@ -427,88 +427,6 @@ def register_tools(server: Server, api_client: DimetricsAPIClient):
                 text=f"Fehler beim Löschen des Datensatzes: {str(e)}"
             )]
     
-    # Utility Tools
-    @server.call_tool()
-    async def create_complete_app(arguments: dict) -> list[types.TextContent]:
-        """
-        Erstellt eine komplette App mit Tabellen und Attributen basierend auf einer Beschreibung.
-        Dies ist ein High-Level Tool für komplexe App-Erstellung.
-        
-        Args:
-            app_name (str): Name der App
-            app_description (str): Beschreibung der App
-            tables (list): Liste von Tabellen-Definitionen mit Attributen
-                Format: [{"name": "table_name", "description": "...", "attributes": [{"name": "attr_name", "type": "attr_type", "required": bool, "options": {}}]}]
-        """
-        try:
-            app_name = arguments.get("app_name")
-            app_description = arguments.get("app_description", "")
-            tables_def = arguments.get("tables", [])
-            
-            if not app_name:
-                return [types.TextContent(
-                    type="text",
-                    text="Fehler: App-Name ist erforderlich."
-                )]
-            
-            # App erstellen
-            app_result = await api_client.create_service(app_name, app_description)
-            app_id = app_result.get("id")
-            
-            if not app_id:
-                return [types.TextContent(
-                    type="text",
-                    text="Fehler: App konnte nicht erstellt werden."
-                )]
-            
-            result_messages = [f"App '{app_name}' erfolgreich erstellt (ID: {app_id})"]
-            
-            # Tabellen und Attribute erstellen
-            for table_def in tables_def:
-                table_name = table_def.get("name")
-                table_desc = table_def.get("description", "")
-                attributes = table_def.get("attributes", [])
-                
-                if not table_name:
-                    continue
-                
-                # Tabelle erstellen
-                table_result = await api_client.create_table(app_id, table_name, table_desc)
-                table_id = table_result.get("id")
-                
-                if table_id:
-                    result_messages.append(f"  Tabelle '{table_name}' erstellt (ID: {table_id})")
-                    
-                    # Attribute erstellen
-                    for attr in attributes:
-                        attr_name = attr.get("name")
-                        attr_type = attr.get("type")
-                        attr_required = attr.get("required", False)
-                        attr_options = attr.get("options", {})
-                        
-                        if attr_name and attr_type:
-                            try:
-                                attr_result = await api_client.create_attribute(
-                                    table_id, attr_name, attr_type, attr_required, attr_options
-                                )
-                                result_messages.append(f"    Attribut '{attr_name}' ({attr_type}) erstellt")
-                            except Exception as e:
-                                result_messages.append(f"    Fehler beim Erstellen von Attribut '{attr_name}': {str(e)}")
-                else:
-                    result_messages.append(f"  Fehler beim Erstellen der Tabelle '{table_name}'")
-            
-            return [types.TextContent(
-                type="text",
-                text="\n".join(result_messages)
-            )]
-            
-        except Exception as e:
-            logger.error(f"Fehler beim Erstellen der kompletten App: {e}")
-            return [types.TextContent(
-                type="text",
-                text=f"Fehler beim Erstellen der kompletten App: {str(e)}"
-            )]
-
     # Resource Permission Group Tools
     @server.call_tool()
     async def list_resource_permission_groups(arguments: dict) -> list[types.TextContent]:
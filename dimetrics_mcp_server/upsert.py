@@ -0,0 +1,250 @@
+"""
+Upsert (create oder update) von Generic Entries anhand von Schlüssel-Attributen.
+"""
+
+import asyncio
+import logging
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+
+import httpx
+
+from .api_client import DimetricsAPIClient
+from .validation import NUMERIC_TYPES
+
+logger = logging.getLogger(__name__)
+
+# Maximale Anzahl Werte pro _in-Filter (begrenzt die URL-Länge)
+DEFAULT_CHUNK_SIZE = 100
+
+
+def _key_part(value: Any, numeric: bool = False) -> Any:
+    """
+    Normalisiert einen Schlüsselwert für den Vergleich mit den Einträgen der API.
+
+    Relationen werden auf ihre object_id reduziert. Werte von Zahlenfeldern
+    werden zu Decimal (5, 5.0 und "5.00" sind derselbe Schlüssel), alle
+    anderen zu str.
+    """
+    if isinstance(value, dict):
+        value = value.get("object_id")
+    if isinstance(value, list):
+        return tuple(_key_part(item, numeric) for item in value)
+    if value is None or value == "":
+        return None
+    if numeric and not isinstance(value, bool):
+        try:
+            number = Decimal(str(value).strip())
+        except InvalidOperation:
+            pass
+        else:
+            if number.is_finite():
+                return number
+    return str(value)
+
+
+def _row_key(row: Dict[str, Any], key_fields: List[str], numeric: FrozenSet[str] = frozenset()) -> Optional[Tuple[Any, ...]]:
+    """Bildet den Schlüssel einer Zeile; None wenn ein Schlüsselfeld fehlt."""
+    key = tuple(_key_part(row.get(field), field in numeric) for field in key_fields)
+    if any(part is None for part in key):
+        return None
+    return key
+
+
+def _filter_value(part: Any) -> Any:
+    """Schlüsselwert als JSON-Wert für den _in-Filter."""
+    if isinstance(part, Decimal):
+        return int(part) if part == part.to_integral_value() else float(part)
+    return part
+
+
+async def _numeric_fields(client: DimetricsAPIClient, resource_name: str, key_fields: List[str]) -> FrozenSet[str]:
+    """Schlüsselfelder, die laut Attribut-Schema Zahlen sind (leer, wenn das Schema fehlt)."""
+    try:
+        attributes = await client.get_attribute_schema(resource_name)
+    except Exception as e:
+        logger.warning(f"Attribut-Schema für '{resource_name}' nicht verfügbar, vergleiche Schlüssel als Text: {e}")
+        return frozenset()
+    return frozenset(
+        attribute.get("name") for attribute in attributes
+        if attribute.get("name") in key_fields and str(attribute.get("type", "")).upper() in NUMERIC_TYPES
+    )
+
+
+def _describe(key: Tuple[Any, ...]) -> List[Any]:
+    """Schlüssel für Fehlermeldungen (ohne Decimal-Darstellung)."""
+    return [_filter_value(part) for part in key]
+
+
+def _http_error(e: Exception) -> str:
+    """Formatiert einen Request-Fehler für das Ergebnis."""
+    if isinstance(e, httpx.HTTPStatusError):
+        return f"HTTP {e.response.status_code}: {e.response.text[:500]}"
+    return str(e)
+
+
+async def resolve_existing_ids(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    key_fields: List[str],
+    keys: List[Tuple[Any, ...]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    concurrency: int = 4,
+    numeric: FrozenSet[str] = frozenset()
+) -> Dict[Tuple[Any, ...], List[Dict[str, Any]]]:
+    """
+    Sucht bestehende Einträge zu den Schlüsseln mit gechunkten _in-Abfragen.
+
+    Bei zusammengesetzten Schlüsseln wird pro Feld ein _in-Filter gesetzt und
+    das exakte Tupel anschließend lokal abgeglichen. Die Schlüssel sind mit
+    _row_key normalisiert (numeric: Zahlen-Schlüsselfelder).
+
+    Returns:
+        Mapping Schlüssel -> Liste der gefundenen Einträge
+    """
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+    found: Dict[Tuple[Any, ...], List[Dict[str, Any]]] = {}
+    wanted = set(keys)
+
+    async def fetch_chunk(chunk: List[Tuple[Any, ...]]) -> None:
+        conditions = []
+        for position, field in enumerate(key_fields):
+            values = sorted({key[position] for key in chunk}, key=str)
+            conditions.append({field: {"_in": [_filter_value(value) for value in values]}})
+        directus_filter = conditions[0] if len(conditions) == 1 else {"_and": conditions}
+
+        async with semaphore:
+            entries = await client.list_all_generic_entries(
+                resource_name=resource_name,
+                directus_filter=directus_filter,
+                page_size=max(len(chunk), 20)
+            )
+
+        for entry in entries:
+            key = _row_key(entry, key_fields, numeric)
+            if key in wanted:
+                found.setdefault(key, []).append(entry)
+
+    chunks = [keys[i:i + chunk_size] for i in range(0, len(keys), chunk_size)]
+    await asyncio.gather(*(fetch_chunk(chunk) for chunk in chunks))
+    return found
+
+
+async def upsert_entries(
+    client: DimetricsAPIClient,
+    resource_name: str,
+    rows: List[Dict[str, Any]],
+    key_fields: List[str],
+    concurrency: int = 8,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    validate: bool = True
+) -> Dict[str, Any]:
+    """
+    Legt Zeilen an oder aktualisiert bestehende Einträge mit gleichem Schlüssel.
+
+    Ablauf pro Batch: (1) bestehende IDs mit gechunkten _in-Abfragen auflösen,
+    (2) Creates und PATCHes parallel mit begrenzter Parallelität senden. PATCHes
+    enthalten nur die Felder, die sich gegenüber dem geladenen Eintrag ändern;
+    unveränderte Zeilen werden ohne Request übersprungen.
+
+    Args:
+        client: API Client
+        resource_name: Name der Resource (Tabellenname)
+        rows: Einzufügende bzw. zu aktualisierende Zeilen
+        key_fields: Schlüssel-Attribute (z.B. unique-Felder)
+        concurrency: Anzahl paralleler Schreib-Requests
+        chunk_size: Anzahl Schlüssel pro _in-Abfrage
+        validate: Zeilen vorab lokal gegen das Attribut-Schema prüfen
+
+    Returns:
+        Zusammenfassung mit Zählern und Ergebnis pro Zeile
+    """
+    validator = None
+    if validate:
+        try:
+            validator = await client.get_entry_validator(resource_name)
+        except Exception as e:
+            logger.warning(f"Attribut-Schema für '{resource_name}' nicht verfügbar, überspringe Validierung: {e}")
+
+    numeric = await _numeric_fields(client, resource_name, key_fields)
+    results: List[Dict[str, Any]] = [{"index": index} for index in range(len(rows))]
+    pending: Dict[Tuple[Any, ...], int] = {}
+
+    for index, row in enumerate(rows):
+        if not isinstance(row, dict):
+            results[index].update(action="failed", error="Zeile muss ein JSON-Objekt sein")
+            continue
+        key = _row_key(row, key_fields, numeric)
+        if key is None:
+            results[index].update(action="failed", error=f"Schlüsselfeld(er) {key_fields} fehlen")
+            continue
+        if key in pending:
+            results[index].update(action="failed", error=f"Schlüssel {_describe(key)} mehrfach im Batch (siehe Zeile {pending[key]})")
+            continue
+        pending[key] = index
+
+    existing = await resolve_existing_ids(
+        client, resource_name, key_fields, list(pending), chunk_size=chunk_size, numeric=numeric
+    )
+
+    semaphore = asyncio.Semaphore(max(1, concurrency))
+
+    async def write(key: Tuple[Any, ...], index: int) -> None:
+        row = rows[index]
+        result = results[index]
+        matches = existing.get(key, [])
+
+        if len(matches) > 1:
+            result.update(
+                action="failed",
+                error=f"Schlüssel {_describe(key)} ist nicht eindeutig ({len(matches)} Einträge)",
+                object_ids=[match.get("object_id") for match in matches]
+            )
+            return
+
+        if matches:
+            entry_id = matches[0].get("object_id")
+            data = {field: value for field, value in row.items() if field not in key_fields}
+            action = "updated"
+        else:
+            entry_id = None
+            data = row
+            action = "created"
+
+        if validator is not None:
+            errors = validator.validate(data, partial=entry_id is not None)
+            if errors:
+                result.update(action="failed", error="Validierung fehlgeschlagen", validation_errors=errors)
+                return
+
+        try:
+            async with semaphore:
+                if entry_id is None:
+                    response = await client.create_generic_entry(resource_name=resource_name, data=data)
+                else:
+                    # Vergleich gegen den bereits geladenen Eintrag: nur Änderungen senden
+                    diff_result = await client.update_generic_entry_if_changed(
+                        resource_name=resource_name, entry_id=entry_id, data=data, current=matches[0]
+                    )
+                    response = diff_result["entry"]
+                    if diff_result["skipped"]:
+                        action = "unchanged"
+                    else:
+                        result["changed_fields"] = diff_result["changed_fields"]
+            result.update(action=action, object_id=response.get("object_id", entry_id))
+        except Exception as e:
+            result.update(action="failed", object_id=entry_id, error=_http_error(e))
+
+    await asyncio.gather(*(write(key, index) for key, index in pending.items()))
+
+    counts = {"created": 0, "updated": 0, "unchanged": 0, "failed": 0}
+    for result in results:
+        counts[result["action"]] += 1
+
+    return {
+        "resource_name": resource_name,
+        "key_fields": key_fields,
+        "total": len(rows),
+        **counts,
+        "results": results
+    }
@@ -0,0 +1,318 @@
+"""
+Validierung von Generic-Entry-Daten gegen die Attribut-Definitionen einer Resource.
+"""
+
+import logging
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Vom System gesetzte Felder, die nie gegen Attribute geprüft werden
+META_FIELDS = {
+    "object_id",
+    "date_created",
+    "date_updated",
+    "ingest_timestamp",
+    "update_timestamp",
+    "subscription",
+}
+
+TEXT_TYPES = {"INPUT_FIELD", "TEXT_FIELD", "RTE"}
+NUMERIC_TYPES = {"NUMERIC_FIELD", "SLIDER_FIELD"}
+BOOLEAN_TYPES = {"BOOLEAN_FIELD"}
+DROPDOWN_TYPES = {"DROPDOWN_FIELD", "STATE_FIELD"}
+MULTI_TYPES = {"DROPDOWN_MULTI_FIELD", "RELATION_FIELD_MULTI", "MEMBER_MULTI", "FILES"}
+STRING_TYPES = {"TIMESTAMP_FIELD", "LINK", "ICON_SELECT"}
+INTEGER_DATATYPES = {"integer", "bigint"}
+
+_TRUE_STRINGS = {"true", "1", "yes", "ja", "y", "x"}
+_FALSE_STRINGS = {"false", "0", "no", "nein", "n"}
+
+
+def _attr_option(attribute: Dict[str, Any], *keys: str) -> Any:
+    """Liest die erste gesetzte Option (API-Schreibweise und snake_case)."""
+    for key in keys:
+        value = attribute.get(key)
+        if value is not None and value != "":
+            return value
+    return None
+
+
+def coerce_row(attributes: List[Dict[str, Any]], row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Wandelt String-Werte (z.B. aus CSV) in die Typen der Attribute um.
+
+    Leere Strings werden entfernt, damit optionale Felder nicht als "" gesendet
+    werden. Nicht konvertierbare Werte bleiben unverändert und werden vom
+    EntryValidator gemeldet.
+
+    Args:
+        attributes: Attribut-Definitionen der Resource
+        row: Rohdaten einer Zeile
+
+    Returns:
+        Zeile mit konvertierten Werten
+    """
+    types_by_name = {attr.get("name"): attr for attr in attributes}
+    coerced: Dict[str, Any] = {}
+
+    for key, value in row.items():
+        if key is None:
+            continue
+        if not isinstance(value, str):
+            coerced[key] = value
+            continue
+
+        value = value.strip()
+        if value == "":
+            continue
+
+        attribute = types_by_name.get(key)
+        attr_type = attribute.get("type") if attribute else None
+
+        if attr_type in NUMERIC_TYPES:
+            try:
+                if attribute.get("numeric_datatype", "integer") in INTEGER_DATATYPES:
+                    coerced[key] = int(value)
+                else:
+                    coerced[key] = float(value)
+            except ValueError:
+                try:
+                    coerced[key] = float(value.replace(",", "."))
+                except ValueError:
+                    coerced[key] = value
+        elif attr_type in BOOLEAN_TYPES:
+            lowered = value.lower()
+            if lowered in _TRUE_STRINGS:
+                coerced[key] = True
+            elif lowered in _FALSE_STRINGS:
+                coerced[key] = False
+            else:
+                coerced[key] = value
+        else:
+            coerced[key] = value
+
+    return coerced
+
+
+# Ein Check liefert None (gültig) oder (Fehlercode, Meldung)
+FieldCheck = Callable[[Any], Optional[Tuple[str, str]]]
+
+
+def _dropdown_values(attribute: Dict[str, Any]) -> Optional[set]:
+    """Liest die erlaubten Dropdown-Werte aus den Attribut-Optionen."""
+    options = _attr_option(
+        attribute, "dropdown_options_string", "dropdown_options_number", "dropdown_options", "options"
+    )
+    if not isinstance(options, list) or not options:
+        return None
+    values = set()
+    for option in options:
+        if isinstance(option, dict):
+            values.add(option.get("value"))
+        else:
+            values.add(option)
+    return values
+
+
+def _is_allowed(value: Any, allowed: set) -> bool:
+    """Prüft einen Wert gegen die erlaubten Optionen (unhashbare Werte sind nie erlaubt)."""
+    try:
+        return value in allowed
+    except TypeError:
+        return False
+
+
+def _compile_checks(attribute: Dict[str, Any]) -> List[FieldCheck]:
+    """Übersetzt eine Attribut-Definition in eine Liste von Check-Funktionen."""
+    attr_type = attribute.get("type")
+    checks: List[FieldCheck] = []
+
+    if attr_type in TEXT_TYPES or attr_type in STRING_TYPES:
+        def check_str(value):
+            if not isinstance(value, str):
+                return "type", f"Text erwartet, {type(value).__name__} erhalten"
+            return None
+        checks.append(check_str)
+
+        max_length = _attr_option(attribute, "maxLength", "max_length")
+        if max_length:
+            max_length = int(max_length)
+
+            def check_max_length(value):
+                if len(value) > max_length:
+                    return "max_length", f"Länge {len(value)} überschreitet maxLength {max_length}"
+                return None
+            checks.append(check_max_length)
+
+        min_length = _attr_option(attribute, "minLength", "min_length")
+        if min_length:
+            min_length = int(min_length)
+
+            def check_min_length(value):
+                if len(value) < min_length:
+                    return "min_length", f"Länge {len(value)} unterschreitet minLength {min_length}"
+                return None
+            checks.append(check_min_length)
+
+    elif attr_type in NUMERIC_TYPES:
+        integer_only = attribute.get("numeric_datatype", "integer") in INTEGER_DATATYPES
+
+        def check_number(value):
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                return "type", f"Zahl erwartet, {type(value).__name__} erhalten"
+            if integer_only and isinstance(value, float) and not value.is_integer():
+                return "type", f"Ganzzahl erwartet, {value} erhalten"
+            return None
+        checks.append(check_number)
+
+        min_numeric = _attr_option(attribute, "minNumeric", "min_numeric")
+        if min_numeric is not None:
+            min_numeric = float(min_numeric)
+
+            def check_min(value):
+                if value < min_numeric:
+                    return "min_numeric", f"Wert {value} unterschreitet minNumeric {min_numeric:g}"
+                return None
+            checks.append(check_min)
+
+        max_numeric = _attr_option(attribute, "maxNumeric", "max_numeric")
+        if max_numeric is not None:
+            max_numeric = float(max_numeric)
+
+            def check_max(value):
+                if value > max_numeric:
+                    return "max_numeric", f"Wert {value} überschreitet maxNumeric {max_numeric:g}"
+                return None
+            checks.append(check_max)
+
+    elif attr_type in BOOLEAN_TYPES:
+        def check_bool(value):
+            if not isinstance(value, bool):
+                return "type", f"Boolean erwartet, {type(value).__name__} erhalten"
+            return None
+        checks.append(check_bool)
+
+    elif attr_type in DROPDOWN_TYPES:
+        allowed = _dropdown_values(attribute)
+        if allowed:
+            def check_option(value):
+                if not _is_allowed(value, allowed):
+                    return "choice", f"Wert {value!r} nicht erlaubt (erlaubt: {sorted(map(str, allowed))})"
+                return None
+            checks.append(check_option)
+
+    elif attr_type in MULTI_TYPES:
+        def check_list(value):
+            if not isinstance(value, list):
+                return "type", f"Liste erwartet, {type(value).__name__} erhalten"
+            return None
+        checks.append(check_list)
+
+        allowed = _dropdown_values(attribute) if attr_type == "DROPDOWN_MULTI_FIELD" else None
+        if allowed:
+            def check_options(value):
+                invalid = [item for item in value if not _is_allowed(item, allowed)]
+                if invalid:
+                    return "choice", f"Werte {invalid!r} nicht erlaubt (erlaubt: {sorted(map(str, allowed))})"
+                return None
+            checks.append(check_options)
+
+    return checks
+
+
+class EntryValidator:
+    """
+    Aus den Attribut-Definitionen einer Resource kompilierter Validator.
+
+    Die Attribute werden einmalig in Check-Funktionen pro Feld übersetzt;
+    validate() läuft danach nur noch über die übergebenen Felder und die
+    Pflichtfelder.
+    """
+
+    __slots__ = ("resource_name", "attributes", "unique_fields", "_checks", "_required")
+
+    def __init__(self, attributes: List[Dict[str, Any]], resource_name: str = ""):
+        self.resource_name = resource_name
+        self.attributes = attributes
+        self._checks: Dict[str, Tuple[FieldCheck, ...]] = {}
+        required: List[str] = []
+        unique: List[str] = []
+
+        for attribute in attributes:
+            name = attribute.get("name")
+            if not name or name in META_FIELDS:
+                continue
+            self._checks[name] = tuple(_compile_checks(attribute))
+            if (
+                attribute.get("required")
+                and not attribute.get("readonly")
+                and not attribute.get("is_auto_increment")
+            ):
+                required.append(name)
+            if attribute.get("unique"):
+                unique.append(name)
+
+        self._required = tuple(required)
+        self.unique_fields = tuple(unique)
+
+    def validate(self, data: Dict[str, Any], partial: bool = False) -> List[Dict[str, Any]]:
+        """
+        Prüft Entry-Daten.
+
+        Geprüft werden Typ, required, maxLength/minLength,
+        minNumeric/maxNumeric und Dropdown-Optionen.
+
+        Args:
+            data: Zu prüfende Entry-Daten
+            partial: True für PATCH-Daten (required wird nicht geprüft)
+
+        Returns:
+            Liste der Fehler als {"field", "code", "message"} (leer wenn gültig)
+        """
+        errors: List[Dict[str, Any]] = []
+        checks_by_field = self._checks
+
+        if not partial:
+            for name in self._required:
+                value = data.get(name)
+                if value is None or value == "":
+                    errors.append({"field": name, "code": "required", "message": f"{name}: Pflichtfeld fehlt"})
+
+        for name, value in data.items():
+            if value is None:
+                continue
+            checks = checks_by_field.get(name)
+            if not checks:
+                continue
+            for check in checks:
+                failure = check(value)
+                if failure is not None:
+                    code, message = failure
+                    errors.append({"field": name, "code": code, "message": f"{name}: {message}", "value": value})
+                    break
+
+        return errors
+
+    def unknown_fields(self, data: Dict[str, Any]) -> List[str]:
+        """Liefert Felder, die keinem Attribut der Resource entsprechen."""
+        if not self._checks:
+            return []
+        return [name for name in data if name not in self._checks and name not in META_FIELDS]
+
+
+def validate_entry(
+    attributes: List[Dict[str, Any]],
+    data: Dict[str, Any],
+    partial: bool = False
+) -> List[str]:
+    """
+    Prüft Entry-Daten gegen die Attribut-Definitionen einer Resource.
+
+    Kurzform für einmalige Prüfungen; für wiederholte Prüfungen
+    DimetricsAPIClient.get_entry_validator() verwenden.
+
+    Returns:
+        Liste der Fehlermeldungen (leer wenn gültig)
+    """
+    return [error["message"] for error in EntryValidator(attributes).validate(data, partial=partial)]
@@ -0,0 +1,485 @@
+"""
+Materialisierte Aggregat-Sichten über Resources, inkrementell über update_timestamp gepflegt.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from .api_client import DimetricsAPIClient
+from .columnar import _to_number
+from .mirror import _cell, fetch_entries
+
+logger = logging.getLogger(__name__)
+
+AGGREGATE_FUNCTIONS = ("count", "sum", "avg", "min", "max")
+FILTER_OPERATORS = ("_eq", "_neq", "_gt", "_gte", "_lt", "_lte", "_in", "_nin", "_null", "_nnull")
+# Zeitliche Gruppierung: "spalte:week" usw.
+BUCKETS = ("day", "week", "month", "year")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS views (
+    name TEXT PRIMARY KEY,
+    resource TEXT NOT NULL,
+    spec TEXT NOT NULL,
+    watermark TEXT,
+    row_count INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    refreshed_at REAL,
+    last_refresh TEXT
+);
+CREATE TABLE IF NOT EXISTS view_rows (
+    view TEXT NOT NULL,
+    object_id TEXT NOT NULL,
+    group_key TEXT NOT NULL,
+    vals TEXT NOT NULL,
+    PRIMARY KEY (view, object_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS view_rows_group ON view_rows (view, group_key);
+CREATE TABLE IF NOT EXISTS view_groups (
+    view TEXT NOT NULL,
+    group_key TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (view, group_key)
+) WITHOUT ROWID;
+"""
+
+_NAME = re.compile(r"^[A-Za-z][A-Za-z0-9_-]{0,63}$")
+
+
+def normalize_spec(
+    resource_name: str,
+    aggregates: Any,
+    group_by: Sequence[str] = (),
+    where: Optional[Any] = None
+) -> Dict[str, Any]:
+    """
+    Prüft und normalisiert die Definition einer Sicht.
+
+    Args:
+        aggregates: Funktion -> Spalte oder Liste von Spalten, z.B. {"sum": ["distance_km", "duration_min"], "count": "object_id"}
+        group_by: Spalten, optional mit Zeit-Bucket, z.B. ["date:week", "training_type"]
+        where: Bedingungen pro Spalte (UND), Operatoren wie bei scan_columnar_mirror
+
+    Raises:
+        ValueError: bei unbekannten Funktionen, Operatoren oder Buckets
+    """
+    if not isinstance(aggregates, dict) or not aggregates:
+        raise ValueError("aggregate_json muss ein Objekt {funktion: spalte} sein, z.B. {\"sum\": \"distance_km\"}")
+    measures: List[Tuple[str, str]] = []
+    for function, columns in aggregates.items():
+        if function not in AGGREGATE_FUNCTIONS:
+            raise ValueError(f"Unbekannte Aggregation '{function}' (erlaubt: {', '.join(AGGREGATE_FUNCTIONS)})")
+        for column in [columns] if isinstance(columns, str) else columns or []:
+            if not isinstance(column, str) or not column:
+                raise ValueError(f"Ungültige Spalte für {function}: {column!r}")
+            measures.append((function, column))
+    groups = []
+    for item in group_by:
+        column, _, bucket = item.partition(":")
+        if bucket and bucket not in BUCKETS:
+            raise ValueError(f"Unbekannter Zeit-Bucket '{bucket}' (erlaubt: {', '.join(BUCKETS)})")
+        groups.append([column, bucket or None])
+    where = where or {}
+    if not isinstance(where, dict) or not all(isinstance(value, dict) for value in where.values()):
+        raise ValueError("directus_filter_json muss ein Objekt {spalte: {operator: wert}} sein")
+    for conditions in where.values():
+        for op, argument in conditions.items():
+            if op not in FILTER_OPERATORS:
+                raise ValueError(f"Nicht unterstützter Operator '{op}' (erlaubt: {', '.join(FILTER_OPERATORS)})")
+            if op in ("_in", "_nin") and not isinstance(argument, list):
+                raise ValueError(f"{op} erwartet eine Liste")
+    return {"resource": resource_name, "aggregates": measures, "group_by": groups, "where": where}
+
+
+def _bucket(value: Any, unit: str) -> Optional[str]:
+    """Beginn des Zeit-Buckets eines ISO-Zeitstempels (UTC), z.B. Montag der Woche."""
+    if not isinstance(value, str) or not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc)
+    day = parsed.date()
+    if unit == "week":
+        day -= timedelta(days=day.weekday())
+    elif unit == "month":
+        return day.strftime("%Y-%m")
+    elif unit == "year":
+        return day.strftime("%Y")
+    return day.isoformat()
+
+
+def _stamp_order(stamp: str) -> str:
+    # ISO-Zeitstempel mit "Z" und "+00:00" vergleichbar machen
+    try:
+        return datetime.fromisoformat(stamp.replace("Z", "+00:00")).astimezone(timezone.utc).isoformat()
+    except ValueError:
+        return stamp
+
+
+def _order(value: Any) -> Tuple[int, Any]:
+    # Zahlen vor Text (wie SQLite), damit gemischte Spalten vergleichbar bleiben
+    return (0, value) if isinstance(value, (int, float)) else (1, str(value))
+
+
+def _matches(entry: Dict[str, Any], where: Dict[str, Dict[str, Any]]) -> bool:
+    """Wertet die Bedingungen einer Sicht lokal für einen Eintrag aus."""
+    for column, conditions in where.items():
+        value = _cell(entry.get(column))
+        for op, argument in conditions.items():
+            if op in ("_null", "_nnull"):
+                if (value is None) != (bool(argument) == (op == "_null")):
+                    return False
+                continue
+            if value is None:
+                return False
+            if op in ("_in", "_nin"):
+                hit = any(_order(value) == _order(_comparable(value, item)) for item in argument)
+                if hit != (op == "_in"):
+                    return False
+                continue
+            left, right = _order(value), _order(_comparable(value, argument))
+            if left[0] != right[0]:
+                return False
+            if not {
+                "_eq": left == right, "_neq": left != right, "_gt": left > right,
+                "_gte": left >= right, "_lt": left < right, "_lte": left <= right,
+            }[op]:
+                return False
+    return True
+
+
+def _comparable(value: Any, argument: Any) -> Any:
+    """Vergleichswert im Typ des Feldes (Zahlen als Zahl, sonst Text)."""
+    if isinstance(value, (int, float)):
+        number = _to_number(argument, "float64")
+        return argument if number is None else number
+    return argument if isinstance(argument, str) else _cell(argument)
+
+
+class MaterializedViews:
+    """
+    SQLite-Datei mit den Sichten eines Backends.
+
+    Pro Sicht wird der Beitrag jedes passenden Eintrags (Gruppe und Werte)
+    gespeichert und pro Gruppe ein Zustand [count, sum, min, max] je
+    Spalte. refresh() lädt nur Einträge mit update_timestamp ab dem
+    Wasserstand, zieht deren alten Beitrag ab und addiert den neuen;
+    Lesen liest nur die Gruppen. Gelöschte Einträge erfasst erst ein
+    vollständiger Refresh (full=True).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        self._write_lock = threading.Lock()
+        self._refresh_locks: Dict[str, asyncio.Lock] = {}
+
+    def _read(self, sql: str, params: Sequence[Any] = ()) -> List[tuple]:
+        """Liest über eine eigene Verbindung (sieht nur abgeschlossene Refreshs)."""
+        conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        try:
+            return conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+    def _view(self, name: str) -> Dict[str, Any]:
+        rows = self._read(
+            "SELECT name, resource, spec, watermark, row_count, created_at, refreshed_at, last_refresh FROM views WHERE name = ?",
+            (name,)
+        )
+        row = rows[0] if rows else None
+        if row is None:
+            raise ValueError(f"Materialisierte Sicht '{name}' existiert nicht (siehe list_materialized_views)")
+        return {
+            "name": row[0], "resource": row[1], "spec": json.loads(row[2]), "watermark": row[3],
+            "rows": row[4], "created_at": row[5], "refreshed_at": row[6],
+            "last_refresh": json.loads(row[7]) if row[7] else None
+        }
+
+    def define(self, name: str, spec: Dict[str, Any]) -> None:
+        """Legt eine Sicht an oder ersetzt ihre Definition (Inhalt wird verworfen)."""
+        if not _NAME.match(name):
+            raise ValueError("Name der Sicht: Buchstabe, dann Buchstaben, Ziffern, _ oder - (max. 64 Zeichen)")
+        with self._write_lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._clear(name)
+                conn.execute(
+                    "INSERT OR REPLACE INTO views (name, resource, spec, created_at) VALUES (?, ?, ?, ?)",
+                    (name, spec["resource"], json.dumps(spec), time.time())
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def drop(self, name: str) -> bool:
+        with self._write_lock:
+            conn = self._conn
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._clear(name)
+                deleted = conn.execute("DELETE FROM views WHERE name = ?", (name,)).rowcount
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return bool(deleted)
+
+    def _clear(self, name: str) -> None:
+        self._conn.execute("DELETE FROM view_rows WHERE view = ?", (name,))
+        self._conn.execute("DELETE FROM view_groups WHERE view = ?", (name,))
+
+    def names(self) -> List[str]:
+        return [row[0] for row in self._read("SELECT name FROM views ORDER BY name")]
+
+    def describe(self, name: str) -> Dict[str, Any]:
+        """Definition, Wasserstand und Alter einer Sicht."""
+        view = self._view(name)
+        spec = view["spec"]
+        groups = self._read("SELECT COUNT(*) FROM view_groups WHERE view = ?", (name,))[0][0]
+        return {
+            "name": name,
+            "resource": view["resource"],
+            "aggregate": [f"{function}({column})" for function, column in spec["aggregates"]],
+            "group_by": [f"{column}:{bucket}" if bucket else column for column, bucket in spec["group_by"]],
+            "filter": spec["where"],
+            "rows": view["rows"],
+            "groups": groups,
+            "watermark": view["watermark"],
+            "refreshed_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(view["refreshed_at"])) if view["refreshed_at"] else None,
+            "age_seconds": round(time.time() - view["refreshed_at"], 1) if view["refreshed_at"] else None,
+            "last_refresh": view["last_refresh"]
+        }
+
+    def age(self, name: str) -> Optional[float]:
+        """Sekunden seit dem letzten Refresh (None = noch nie aufgebaut)."""
+        refreshed_at = self._view(name)["refreshed_at"]
+        return time.time() - refreshed_at if refreshed_at else None
+
+    def read(self, name: str) -> Dict[str, Any]:
+        """Gruppen mit Aggregaten (liest nur die gespeicherten Gruppen)."""
+        view = self._view(name)
+        spec = view["spec"]
+        keys = [column if not bucket else f"{column}_{bucket}" for column, bucket in spec["group_by"]]
+        groups = []
+        for group_key, state in self._read(
+            "SELECT group_key, state FROM view_groups WHERE view = ? ORDER BY group_key", (name,)
+        ):
+            state = json.loads(state)
+            row = dict(zip(keys, json.loads(group_key)))
+            for function, column in spec["aggregates"]:
+                count, total, low, high = state["columns"].get(column, [0, 0, None, None])
+                if function == "count":
+                    value = count
+                elif function in ("sum", "avg"):
+                    value = (total if function == "sum" else total / count) if count else None
+                    if isinstance(value, float):
+                        # Abziehen und Addieren über viele Refreshs: Rundungsrauschen abschneiden
+                        value = round(value, 9)
+                else:
+                    value = low if function == "min" else high
+                row[f"{function}_{column}"] = value
+            groups.append(row)
+        return {"groups": groups, "watermark": view["watermark"], "rows": view["rows"]}
+
+    async def refresh(
+        self,
+        client: DimetricsAPIClient,
+        name: str,
+        full: bool = False,
+        page_size: int = 0,
+        concurrency: int = 4
+    ) -> Dict[str, Any]:
+        """
+        Bringt eine Sicht auf den aktuellen Stand.
+
+        Ohne Wasserstand oder mit full=True wird neu aufgebaut, sonst
+        werden nur Einträge mit update_timestamp >= Wasserstand angewendet
+        (>=, damit Änderungen in derselben Zeitstempel-Einheit nicht fehlen;
+        erneutes Anwenden desselben Eintrags ändert nichts).
+        """
+        lock = self._refresh_locks.setdefault(name, asyncio.Lock())
+        async with lock:
+            started = time.perf_counter()
+            view = self._view(name)
+            watermark = view["watermark"]
+            rebuild = full or not watermark
+            directus_filter = None if rebuild else {"update_timestamp": {"_gte": watermark}}
+            batches, pages = await fetch_entries(
+                client, view["resource"], page_size=page_size, concurrency=concurrency, directus_filter=directus_filter
+            )
+            entries = [entry for batch in batches for entry in batch]
+            stamps = [entry["update_timestamp"] for entry in entries if entry.get("update_timestamp")]
+            new_watermark = max([watermark] * bool(watermark) + stamps, key=_stamp_order) if stamps else watermark
+            result = await asyncio.to_thread(self._apply, name, view["spec"], entries, new_watermark, rebuild)
+            result.update(
+                mode="full" if rebuild else "incremental",
+                fetched=len(entries),
+                pages=pages,
+                watermark=new_watermark,
+                duration_ms=round((time.perf_counter() - started) * 1000, 1)
+            )
+            await asyncio.to_thread(self._record, name, result)
+        logger.info(
+            f"Sicht '{name}' aktualisiert ({result['mode']}): {result['fetched']} Einträge geladen, "
+            f"{result['changed']} geändert in {result['duration_ms']:.0f} ms"
+        )
+        return result
+
+    def _record(self, name: str, result: Dict[str, Any]) -> None:
+        with self._write_lock:
+            self._conn.execute("UPDATE views SET last_refresh = ? WHERE name = ?", (json.dumps(result), name))
+
+    def _contribution(self, spec: Dict[str, Any], entry: Dict[str, Any]) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Gruppe und Werte eines Eintrags (None = fällt nicht in die Sicht)."""
+        if not _matches(entry, spec["where"]):
+            return None
+        key = []
+        for column, bucket in spec["group_by"]:
+            value = entry.get(column)
+            key.append(_bucket(value, bucket) if bucket else _cell(value))
+        numeric = {column for function, column in spec["aggregates"] if function in ("sum", "avg")}
+        values = {}
+        for _, column in spec["aggregates"]:
+            raw = entry.get(column)
+            values[column] = _to_number(raw, "float64") if column in numeric else _cell(raw)
+            if column in numeric and isinstance(raw, int) and not isinstance(raw, bool):
+                values[column] = raw
+        return json.dumps(key, ensure_ascii=False), values
+
+    def _apply(
+        self,
+        name: str,
+        spec: Dict[str, Any],
+        entries: List[Dict[str, Any]],
+        watermark: Optional[str],
+        rebuild: bool
+    ) -> Dict[str, Any]:
+        conn = self._conn
+        with self._write_lock:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                if rebuild:
+                    self._clear(name)
+                row_count = conn.execute("SELECT row_count FROM views WHERE name = ?", (name,)).fetchone()[0]
+                ids = list(dict.fromkeys(entry.get("object_id") for entry in entries if entry.get("object_id")))
+                previous: Dict[str, Optional[Tuple[str, Dict[str, Any]]]] = {}
+                for start in range(0, len(ids), 500):
+                    chunk = ids[start:start + 500]
+                    for object_id, group_key, vals in conn.execute(
+                        f"SELECT object_id, group_key, vals FROM view_rows WHERE view = ? AND object_id IN ({', '.join('?' * len(chunk))})",
+                        (name, *chunk)
+                    ):
+                        previous[object_id] = (group_key, json.loads(vals))
+
+                current = {
+                    entry["object_id"]: self._contribution(spec, entry)
+                    for entry in entries if entry.get("object_id")
+                }
+                changed = {object_id: new for object_id, new in current.items() if previous.get(object_id) != new}
+                affected = {old[0] for object_id in changed if (old := previous.get(object_id))}
+                affected |= {new[0] for new in changed.values() if new}
+                states: Dict[str, Dict[str, Any]] = {}
+                for group_key in affected:
+                    row = conn.execute(
+                        "SELECT state FROM view_groups WHERE view = ? AND group_key = ?", (name, group_key)
+                    ).fetchone()
+                    states[group_key] = json.loads(row[0]) if row else {"rows": 0, "columns": {}}
+
+                # (Gruppe, Spalte), deren min/max ein abgezogener Wert war
+                dirty = set()
+                added = removed = 0
+                for object_id, new in changed.items():
+                    old = previous.get(object_id)
+                    if old:
+                        removed += 1
+                        state = states[old[0]]
+                        state["rows"] -= 1
+                        for column, value in old[1].items():
+                            if value is None:
+                                continue
+                            entry = state["columns"][column]
+                            entry[0] -= 1
+                            if isinstance(value, (int, float)):
+                                entry[1] -= value
+                            if value == entry[2] or value == entry[3]:
+                                dirty.add((old[0], column))
+                        conn.execute("DELETE FROM view_rows WHERE view = ? AND object_id = ?", (name, object_id))
+                    if new:
+                        added += 1
+                        state = states[new[0]]
+                        state["rows"] += 1
+                        for column, value in new[1].items():
+                            entry = state["columns"].setdefault(column, [0, 0, None, None])
+                            if value is None:
+                                continue
+                            entry[0] += 1
+                            if isinstance(value, (int, float)):
+                                entry[1] += value
+                            if entry[2] is None or _order(value) < _order(entry[2]):
+                                entry[2] = value
+                            if entry[3] is None or _order(value) > _order(entry[3]):
+                                entry[3] = value
+                        conn.execute(
+                            "INSERT INTO view_rows (view, object_id, group_key, vals) VALUES (?, ?, ?, ?)",
+                            (name, object_id, new[0], json.dumps(new[1], ensure_ascii=False))
+                        )
+
+                for group_key, column in dirty:
+                    if states[group_key]["rows"] <= 0:
+                        continue
+                    path = "$." + json.dumps(column)
+                    low, high = conn.execute(
+                        "SELECT MIN(json_extract(vals, ?)), MAX(json_extract(vals, ?)) FROM view_rows WHERE view = ? AND group_key = ?",
+                        (path, path, name, group_key)
+                    ).fetchone()
+                    states[group_key]["columns"][column][2:] = [low, high]
+
+                for group_key, state in states.items():
+                    if state["rows"] <= 0:
+                        conn.execute("DELETE FROM view_groups WHERE view = ? AND group_key = ?", (name, group_key))
+                    else:
+                        conn.execute(
+                            "INSERT OR REPLACE INTO view_groups (view, group_key, state) VALUES (?, ?, ?)",
+                            (name, group_key, json.dumps(state, ensure_ascii=False))
+                        )
+                conn.execute(
+                    "UPDATE views SET watermark = ?, row_count = ?, refreshed_at = ? WHERE name = ?",
+                    (watermark, (0 if rebuild else row_count) + added - removed, time.time(), name)
+                )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        return {"changed": len(changed), "added": added, "removed": removed, "groups_touched": len(states)}
+
+    async def pending_changes(self, client: DimetricsAPIClient, name: str) -> Optional[int]:
+        """Anzahl Einträge, die seit dem Wasserstand geändert wurden (None = noch nie aufgebaut)."""
+        view = self._view(name)
+        if not view["watermark"]:
+            return None
+        data = await client.list_generic_entries(
+            view["resource"], page_size=1, page=1, directus_filter={"update_timestamp": {"_gt": view["watermark"]}}
+        )
+        return data.get("count", 0)
+
+    def close(self) -> None:
+        self._conn.close()
@@ -0,0 +1,87 @@
+"""
+Tests für den App-Aufbau: parallele Resources, Relationen und Rollback.
+"""
+
+import asyncio
+
+import pytest
+
+from dimetrics_mcp_server.app_builder import AppBuildError, AppBuilder
+
+TABLES = [
+    {"name": "runs", "attributes": [
+        {"name": "distance_km", "type": "numeric_field"},
+        {"name": "shoe", "type": "RELATION_FIELD", "linked_resource": "shoes"},
+    ]},
+    {"name": "shoes", "attributes": [{"name": "model", "type": "TEXT_FIELD"}]},
+    {"name": "races", "attributes": [{"name": "run", "type": "RELATION_FIELD", "linked_resource": "runs"}]},
+]
+
+
+class FakeClient:
+    """Zeichnet die Aufrufe auf; fail nennt eine Resource, deren Anlegen scheitert."""
+
+    def __init__(self, fail=None):
+        self.fail = fail
+        self.calls = []
+
+    async def create_app(self, name, description, prefix):
+        self.calls.append(("create_app", name))
+        return {"object_id": "app-1", "name": name, "prefix": prefix or "abc"}
+
+    async def create_service_endpoint(self, name, app_space, description):
+        self.calls.append(("create_service", name))
+        return {"object_id": "service-1", "name": name}
+
+    async def create_resource_endpoint(self, name, service, title, title_plural, description):
+        await asyncio.sleep(0.01 if name == "shoes" else 0)
+        self.calls.append(("create_resource", name))
+        if name == self.fail:
+            raise RuntimeError(f"{name} abgelehnt")
+        return {"object_id": f"res-{name}", "name": f"abc_{name}"}
+
+    async def create_attributes_bulk(self, resource_name, attributes):
+        self.calls.append(("create_attributes", resource_name, [item.get("linked_resource") for item in attributes]))
+        return [dict(item, object_id=f"attr-{item['name']}") for item in attributes]
+
+    async def delete_resource_endpoint(self, resource_id):
+        self.calls.append(("delete_resource", resource_id))
+
+    async def delete_service_endpoint(self, service_id):
+        self.calls.append(("delete_service", service_id))
+
+    async def delete_service(self, app_id):
+        self.calls.append(("delete_app", app_id))
+
+
+def test_relations_are_created_after_their_targets():
+    client = FakeClient()
+    result = asyncio.run(AppBuilder(client, "Lauftagebuch", TABLES).run())
+    assert not result["rolled_back"]
+    assert [item["attributes_created"] for item in result["resources"]] == [2, 1, 1]
+    assert ("create_attributes", "abc_runs", ["res-shoes"]) in client.calls
+    assert client.calls.index(("create_resource", "shoes")) < client.calls.index(("create_attributes", "abc_runs", ["res-shoes"]))
+    assert result["dependencies"] == {"runs": ["shoes"], "shoes": [], "races": ["runs"]}
+
+
+def test_failure_mid_build_rolls_back_in_reverse_order():
+    client = FakeClient(fail="shoes")
+    with pytest.raises(AppBuildError, match="shoes") as error:
+        asyncio.run(AppBuilder(client, "Lauftagebuch", TABLES).run())
+
+    result = error.value.result
+    assert result["rolled_back"] and result["rollback_errors"] == []
+    deletions = [call for call in client.calls if call[0].startswith("delete")]
+    # Erst alle erstellten Resources, dann Service, dann App
+    assert sorted(deletions[:-2]) == [("delete_resource", "res-races"), ("delete_resource", "res-runs")]
+    assert deletions[-2:] == [("delete_service", "service-1"), ("delete_app", "app-1")]
+    # Relationen auf die fehlgeschlagene Resource wurden nicht mehr angelegt
+    assert not any(call[0] == "create_attributes" and "res-shoes" in call[2] for call in client.calls)
+
+
+def test_invalid_spec_creates_nothing():
+    client = FakeClient()
+    tables = [{"name": "runs", "attributes": [{"name": "shoe", "type": "RELATION_FIELD", "linked_resource": "shoes"}]}]
+    with pytest.raises(ValueError, match="unbekannte Tabelle 'shoes'"):
+        asyncio.run(AppBuilder(client, "Lauftagebuch", tables).run())
+    assert client.calls == []
@@ -0,0 +1,37 @@
+"""
+Tests für die Client-Registry: gemeinsame Ressourcen pro Backend.
+"""
+
+import asyncio
+
+from dimetrics_mcp_server.backends import BackendConfig, ClientRegistry
+
+
+def _registry(rate_limit: float) -> ClientRegistry:
+    config = BackendConfig(name="prod", api_url="https://example.invalid/api", api_key="backend", rate_limit=rate_limit)
+    return ClientRegistry({"prod": config})
+
+
+def test_tenant_clients_share_rate_limit_of_backend():
+    async def scenario():
+        registry = _registry(rate_limit=5)
+        default = registry.get("prod")
+        tenant_a = registry.get("prod", token="tenantA")
+        tenant_b = registry.get("prod", token="tenantB")
+        limiters = {id(client.rate_limiter) for client in (default, tenant_a, tenant_b)}
+        await registry.close()
+        return limiters, tenant_a.rate_limiter.rate
+
+    limiters, rate = asyncio.run(scenario())
+    assert len(limiters) == 1
+    assert rate == 5
+
+
+def test_backend_without_rate_limit_has_no_limiter():
+    async def scenario():
+        registry = _registry(rate_limit=0)
+        clients = [registry.get("prod"), registry.get("prod", token="tenantA")]
+        await registry.close()
+        return clients
+
+    assert all(client.rate_limiter is None for client in asyncio.run(scenario()))
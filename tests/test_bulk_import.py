@@ -0,0 +1,73 @@
+"""
+Tests für den Streaming-Import: Abschluss bei max_rows, unique-Prüfung beim Resume.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from dimetrics_mcp_server.bulk_import import ResourceImporter
+from dimetrics_mcp_server.validation import EntryValidator
+
+
+class RecordingClient:
+    """Client-Attrappe: Resource ohne Attribut-Regeln, merkt sich erstellte Einträge."""
+
+    def __init__(self):
+        self.created = []
+
+    async def get_entry_validator(self, resource_name: str) -> EntryValidator:
+        return EntryValidator([], resource_name)
+
+    async def create_generic_entry(self, resource_name: str, data):
+        self.created.append(data)
+        return data
+
+
+def _import(path, max_rows: int, client=None):
+    client = client or RecordingClient()
+    importer = ResourceImporter(client, "runs", str(path), max_rows=max_rows, concurrency=2)
+    return asyncio.run(importer.run()), client
+
+
+@pytest.fixture
+def rows_file(tmp_path):
+    path = tmp_path / "runs.ndjson"
+    path.write_text("".join(json.dumps({"distance_km": index}) + "\n" for index in range(5)), encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("max_rows, completed", [(0, True), (3, False), (5, True), (10, True)])
+def test_completed_only_when_file_is_exhausted(rows_file, max_rows, completed):
+    summary, _ = _import(rows_file, max_rows)
+    assert summary["completed"] is completed
+    assert summary["processed"] == min(max_rows or 5, 5)
+
+
+def test_resume_after_max_rows_imports_the_rest(rows_file):
+    first, client = _import(rows_file, 3)
+    second, client = _import(rows_file, 0, client)
+    assert (first["completed"], second["completed"]) == (False, True)
+    assert second["skipped_resumed"] == 3
+    assert [row["distance_km"] for row in client.created] == [0, 1, 2, 3, 4]
+
+
+class UniqueClient(RecordingClient):
+    """Resource mit unique-Attribut "code"."""
+
+    async def get_entry_validator(self, resource_name: str) -> EntryValidator:
+        return EntryValidator([{"name": "code", "type": "TEXT_FIELD", "unique": True}], resource_name)
+
+
+def test_duplicates_of_the_imported_prefix_are_rejected_after_resume(tmp_path):
+    path = tmp_path / "codes.ndjson"
+    codes = ["a", "b", "a", "c", "b", "d"]
+    path.write_text("".join(json.dumps({"code": code}) + "\n" for code in codes), encoding="utf-8")
+
+    first, client = _import(path, 3, UniqueClient())
+    second, client = _import(path, 0, client)
+    assert (first["rejected"], second["rejected"]) == (1, 1)
+    assert [row["code"] for row in client.created] == ["a", "b", "c", "d"]
+    rejected = [json.loads(line) for line in open(f"{path}.rejected.ndjson", encoding="utf-8")]
+    assert [(item["row"], item["errors"][0]["code"]) for item in rejected] == [(3, "unique"), (5, "unique")]
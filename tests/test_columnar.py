@@ -0,0 +1,86 @@
+"""
+Tests für den Spalten-Spiegel: Segmente, Ersetzen von Versionen und Verdichtung.
+"""
+
+import os
+
+import pytest
+
+from dimetrics_mcp_server.columnar import ColumnarTable
+
+SCHEMA = {"object_id": "string", "distance_km": "float64", "shoe": "dictionary", "done": "bool", "update_timestamp": "timestamp"}
+
+
+def entries(start, count, distance=1.0, shoe="A"):
+    return [
+        {"object_id": f"run-{index:04d}", "distance_km": distance + index, "shoe": shoe, "done": index % 2 == 0,
+         "update_timestamp": f"2025-01-01T00:00:{index % 60:02d}Z"}
+        for index in range(start, start + count)
+    ]
+
+
+@pytest.fixture
+def table(tmp_path):
+    table = ColumnarTable(str(tmp_path / "runs"))
+    table.write("runs", SCHEMA, entries(0, 10), "2025-01-01T00:00:09Z")
+    table.write("runs", SCHEMA, entries(10, 10), None)
+    # Ersetzt run-0000..0004 aus dem ersten Segment
+    table.write("runs", SCHEMA, entries(0, 5, distance=100.0, shoe="B"), None)
+    yield table
+    table.close()
+
+
+def segment_dirs(table):
+    return sorted(name for name in os.listdir(table.path) if name.startswith("seg-"))
+
+
+def test_newer_segments_replace_older_versions(table):
+    assert table.rows == 20
+    assert table.describe()["stored_rows"] == 25
+    rows = table.read(["object_id", "distance_km", "shoe"], where={"shoe": {"_eq": "B"}}, limit=100)
+    assert sorted(row["object_id"] for row in rows) == [f"run-{index:04d}" for index in range(5)]
+    result = table.aggregate({"count": "object_id", "sum": "distance_km"}, group_by="shoe")
+    groups = {group["shoe"]: group for group in result["groups"]}
+    assert groups["A"]["count_object_id"] == 15
+    assert groups["B"]["sum_distance_km"] == sum(100.0 + index for index in range(5))
+
+
+def test_compaction_keeps_current_rows(table):
+    before = table.aggregate({"count": "object_id", "sum": "distance_km", "max": "update_timestamp"}, group_by="done")
+    assert table.compact()["compacted"]
+    assert table.describe()["segments"] == 1
+    assert table.aggregate({"count": "object_id", "sum": "distance_km", "max": "update_timestamp"}, group_by="done") == before
+    assert len(segment_dirs(table)) == 1
+    assert table.compact() == {"segments": 1, "compacted": False}
+
+
+def test_scan_keeps_its_segments_across_compaction(table):
+    scan = table.scan(["object_id", "distance_km"])
+    rows, _, mask = next(scan)
+    assert (rows, mask.count(1)) == (10, 5)
+    table.compact()
+    # Ersetzte Segmente bleiben, solange der Scan läuft
+    assert len(segment_dirs(table)) == 4
+    rest = [(rows, values["distance_km"][0], mask.count(1)) for rows, values, mask in scan]
+    assert rest == [(10, 11.0, 10), (5, 100.0, 5)]
+    assert len(segment_dirs(table)) == 1
+    assert table.rows == 20
+
+
+def test_closed_scan_releases_retired_segments(table):
+    scan = table.scan(["object_id"])
+    next(scan)
+    table.write("runs", SCHEMA, entries(0, 3), None, replace=True)
+    assert len(segment_dirs(table)) == 4
+    scan.close()
+    assert len(segment_dirs(table)) == 1
+    assert table.rows == 3
+
+
+def test_unknown_columns_and_operators_are_rejected(table):
+    with pytest.raises(ValueError, match="Unbekannte Spalten"):
+        table.read(["pace"])
+    with pytest.raises(ValueError, match="Operator"):
+        table.read(["object_id"], where={"distance_km": {"_like": 1}})
+    with pytest.raises(ValueError, match="sum"):
+        table.aggregate({"sum": "shoe"})
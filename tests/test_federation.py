@@ -0,0 +1,39 @@
+"""
+Tests für die Sortierung vereinigter Zeilen mehrerer Backends.
+"""
+
+from dimetrics_mcp_server.federation import _sort_rows
+
+
+def _ids(rows):
+    return [row["object_id"] for row in rows]
+
+
+def test_sort_by_relation_uses_object_id():
+    rows = [
+        {"object_id": "a", "shoe": {"object_id": "s2", "name": "Trail"}},
+        {"object_id": "b", "shoe": None},
+        {"object_id": "c", "shoe": {"object_id": "s1", "name": "Road"}},
+    ]
+    assert _ids(_sort_rows(rows, "shoe")) == ["c", "a", "b"]
+    assert _ids(_sort_rows(rows, "-shoe")) == ["b", "a", "c"]
+
+
+def test_sort_mixed_types_numbers_before_text_and_empty_last():
+    rows = [
+        {"object_id": "a", "value": "zehn"},
+        {"object_id": "b", "value": 10},
+        {"object_id": "c", "value": None},
+        {"object_id": "d", "value": 2.5},
+        {"object_id": "e", "value": ["x", "y"]},
+    ]
+    assert _ids(_sort_rows(rows, "value")) == ["d", "b", "e", "a", "c"]
+
+
+def test_sort_multiple_fields_with_directions():
+    rows = [
+        {"object_id": "a", "team": "blau", "pace": 5.1},
+        {"object_id": "b", "team": "rot", "pace": 4.2},
+        {"object_id": "c", "team": "blau", "pace": 6.0},
+    ]
+    assert _ids(_sort_rows(rows, "team,-pace")) == ["c", "a", "b"]
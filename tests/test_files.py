@@ -0,0 +1,59 @@
+"""
+Tests für Import-/Exportpfade innerhalb von DIMETRICS_FILE_DIR.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from dimetrics_mcp_server import __main__ as server
+
+
+@pytest.fixture
+def file_dir(tmp_path, monkeypatch):
+    directory = tmp_path / "files"
+    directory.mkdir()
+    monkeypatch.setenv("DIMETRICS_FILE_DIR", str(directory))
+    return directory
+
+
+def test_relative_path_resolves_inside_file_dir(file_dir):
+    path = server._file_path("exports/runs.ndjson", create_dirs=True)
+    assert path == os.path.join(os.path.realpath(file_dir), "exports", "runs.ndjson")
+    assert os.path.isdir(os.path.dirname(path))
+
+
+@pytest.mark.parametrize("file_path", ["../runs.ndjson", "/etc/passwd", "exports/../../runs.ndjson", "", "."])
+def test_paths_outside_file_dir_are_rejected(file_dir, file_path):
+    with pytest.raises(ValueError, match="DIMETRICS_FILE_DIR"):
+        server._file_path(file_path)
+
+
+def test_symlink_out_of_file_dir_is_rejected(file_dir, tmp_path):
+    (file_dir / "escape").symlink_to(tmp_path)
+    with pytest.raises(ValueError):
+        server._file_path("escape/runs.ndjson")
+
+
+def test_export_outside_file_dir_fails_without_writing(file_dir, tmp_path):
+    result = asyncio.run(server.export_resource("runs", str(tmp_path / "runs.ndjson")))
+    assert result["success"] is False
+    assert not (tmp_path / "runs.ndjson").exists()
+
+
+def test_tenant_gets_own_subdirectory(file_dir, monkeypatch):
+    monkeypatch.setattr(server, "_session_tenant", lambda: "0123abcd")
+    assert server._file_path("runs.ndjson") == os.path.join(os.path.realpath(file_dir), "0123abcd", "runs.ndjson")
+    with pytest.raises(ValueError):
+        server._file_path("../other/runs.ndjson")
+
+
+def test_import_outside_file_dir_is_rejected(file_dir, tmp_path):
+    source = tmp_path / "runs.ndjson"
+    source.write_text('{"distance_km": 1}\n', encoding="utf-8")
+    result = asyncio.run(server.import_resource("runs", str(source)))
+    assert result["success"] is False
+    assert "DIMETRICS_FILE_DIR" in result["error"]
+    # Keine Seitendateien neben der fremden Datei
+    assert sorted(os.listdir(tmp_path)) == ["files", "runs.ndjson"]
@@ -0,0 +1,201 @@
+"""
+Tests für den Job-Manager: Zugangsdaten und Sichtbarkeit pro Mandant.
+"""
+
+import asyncio
+import contextvars
+import os
+from types import SimpleNamespace
+
+from mcp.server.lowlevel.server import request_ctx
+
+from dimetrics_mcp_server import __main__ as server
+from dimetrics_mcp_server import http_server, jobs
+from dimetrics_mcp_server.jobs import CANCELLED, FINAL_STATES, JobManager
+
+
+async def _whoami() -> dict:
+    return {"success": True, "token": server.get_session_token()}
+
+
+def _as_tenant(token, function, *args, **kwargs):
+    """Führt function im Kontext eines Requests mit dem Token des Mandanten aus."""
+    def call():
+        headers = {"x-dimetrics-token": token} if token else {}
+        request_ctx.set(SimpleNamespace(request=SimpleNamespace(headers=headers)))
+        return function(*args, **kwargs)
+    return contextvars.copy_context().run(call)
+
+
+def _tenant(token):
+    return _as_tenant(token, server._session_tenant)
+
+
+async def _wait(manager: JobManager, job_id: str, timeout: float = 5.0) -> dict:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while True:
+        job = manager.store.get(job_id)
+        if job["status"] in FINAL_STATES:
+            return job
+        assert asyncio.get_running_loop().time() < deadline, f"Job {job_id} hängt im Status {job['status']}"
+        await asyncio.sleep(0.01)
+
+
+def test_job_runs_with_credentials_of_submitter(tmp_path):
+    async def scenario():
+        manager = JobManager(str(tmp_path / "jobs.sqlite3"))
+        manager.register("whoami", _whoami)
+        # Der erste Job startet die Worker: sein Kontext darf nicht an spätere Jobs vererbt werden
+        first = _as_tenant("tenantA", manager.submit, "whoami", {}, tenant=_tenant("tenantA"))
+        second = _as_tenant("tenantB", manager.submit, "whoami", {}, tenant=_tenant("tenantB"))
+        local = _as_tenant(None, manager.submit, "whoami", {})
+        results = [await _wait(manager, job_id) for job_id in (first, second, local)]
+        await manager.shutdown()
+        return [server.json.loads(job["result"])["token"] for job in results]
+
+    assert asyncio.run(scenario()) == ["tenantA", "tenantB", None]
+
+
+def test_jobs_are_only_visible_to_their_tenant(tmp_path):
+    async def scenario():
+        manager = JobManager(str(tmp_path / "jobs.sqlite3"))
+        manager.register("whoami", _whoami)
+        tenant_a, tenant_b = _tenant("tenantA"), _tenant("tenantB")
+        job_id = _as_tenant("tenantA", manager.submit, "whoami", {}, tenant=tenant_a)
+        await _wait(manager, job_id)
+
+        assert manager.get(job_id, tenant=tenant_b) is None
+        assert manager.get(job_id) is None
+        assert manager.list(tenant=tenant_b) == []
+        assert manager.cancel(job_id, tenant=tenant_b) is None
+        assert manager.get(job_id, tenant=tenant_a)["status"] == "succeeded"
+        assert [job["job_id"] for job in manager.list(tenant=tenant_a)] == [job_id]
+        await manager.shutdown()
+
+    asyncio.run(scenario())
+
+
+def test_tenant_jobs_are_interrupted_after_restart(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "jobs.sqlite3")
+        before = JobManager(path)
+        before.register("whoami", _whoami)
+        # Eingereiht, aber nie gestartet (Prozess endet vor dem Worker)
+        before.store.insert("tenantjob", "whoami", {}, tenant=_tenant("tenantA"))
+        before.store.insert("localjob", "whoami", {})
+
+        after = JobManager(path)
+        after.register("whoami", _whoami)
+        # Erster Zugriff startet die Worker und übernimmt offene Jobs
+        after.list()
+        local = await _wait(after, "localjob")
+        tenant_job = after.store.get("tenantjob")
+        await after.shutdown()
+        return tenant_job, local
+
+    tenant_job, local = asyncio.run(scenario())
+    assert tenant_job["status"] == "interrupted"
+    assert local["status"] == "succeeded"
+    assert server.json.loads(local["result"])["token"] is None
+
+
+async def _block(event_name: str) -> dict:
+    await _events[event_name].wait()
+    return {"success": True}
+
+
+_events: dict = {}
+
+
+def _owned_by_other_process(manager: JobManager, *job_ids: str) -> None:
+    """Ordnet Jobs einem anderen, laufenden Worker-Prozess zu (hier: dem Elternprozess)."""
+    for job_id in job_ids:
+        manager.store.update(job_id, owner=os.getppid())
+
+
+def test_cancel_from_other_worker_stops_running_job(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "CANCEL_POLL_SECONDS", 0.01)
+
+    async def scenario():
+        path = str(tmp_path / "jobs.sqlite3")
+        _events["forever"] = asyncio.Event()
+        owner, other = JobManager(path), JobManager(path)
+        for manager in (owner, other):
+            manager.register("block", _block)
+        job_id = owner.submit("block", {"event_name": "forever"})
+        while owner.store.get(job_id)["status"] != "running":
+            await asyncio.sleep(0.01)
+
+        # Der Job läuft nicht im Prozess des abbrechenden Workers
+        _owned_by_other_process(owner, job_id)
+        assert other.cancel(job_id) == CANCELLED
+        job = await _wait(owner, job_id)
+        running = dict(owner._running)
+        await owner.shutdown()
+        await other.shutdown()
+        return job, running
+
+    job, running = asyncio.run(scenario())
+    assert job["status"] == CANCELLED
+    assert running == {}
+
+
+def test_finishing_job_does_not_overwrite_cancelled(tmp_path):
+    async def scenario():
+        manager = JobManager(str(tmp_path / "jobs.sqlite3"))
+        _events["release"] = asyncio.Event()
+        manager.register("block", _block)
+        job_id = manager.submit("block", {"event_name": "release"})
+        while manager.store.get(job_id)["status"] != "running":
+            await asyncio.sleep(0.01)
+        # Abbruch durch einen anderen Worker, während der Handler gerade fertig wird
+        manager.store.update(job_id, status=CANCELLED, finished_at=0.0)
+        _events["release"].set()
+        while job_id in manager._running:
+            await asyncio.sleep(0.01)
+        job = manager.store.get(job_id)
+        await manager.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job["status"] == CANCELLED
+    assert job["result"] is None
+
+
+def test_cancelled_queued_job_is_not_started(tmp_path):
+    async def scenario():
+        path = str(tmp_path / "jobs.sqlite3")
+        manager = JobManager(path, workers=1)
+        _events["gate"] = asyncio.Event()
+        manager.register("block", _block)
+        first = manager.submit("block", {"event_name": "gate"})
+        second = manager.submit("block", {"event_name": "gate"})
+        # Ein anderer Worker bricht den wartenden Job ab
+        _owned_by_other_process(manager, first, second)
+        assert JobManager(path).cancel(second) == CANCELLED
+        _events["gate"].set()
+        await _wait(manager, first)
+        await asyncio.sleep(0.05)
+        job = manager.store.get(second)
+        await manager.shutdown()
+        return job
+
+    job = asyncio.run(scenario())
+    assert job["status"] == CANCELLED
+    assert job["started_at"] is None
+
+
+def test_server_start_resumes_queued_jobs(tmp_path, monkeypatch):
+    async def scenario():
+        path = str(tmp_path / "jobs.sqlite3")
+        JobManager(path).store.insert("waiting", "whoami", {})
+        manager = JobManager(path)
+        manager.register("whoami", _whoami)
+        monkeypatch.setattr(server, "job_manager", manager)
+        # Ohne Aufruf eines Job-Tools: die Lifespan des HTTP-Servers startet die Worker
+        app = http_server.create_app()
+        async with app.router.lifespan_context(app):
+            job = await _wait(manager, "waiting")
+        return job
+
+    assert asyncio.run(scenario())["status"] == "succeeded"
@@ -0,0 +1,67 @@
+"""
+Tests für den SQLite-Spiegel: nur lesendes SQL und atomares Ersetzen der Tabellen.
+"""
+
+import asyncio
+
+import pytest
+
+from dimetrics_mcp_server.mirror import ResourceMirror
+
+COLUMNS = [("object_id", "TEXT"), ("distance_km", "REAL"), ("shoe", "TEXT")]
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = ResourceMirror(str(tmp_path / "mirror.sqlite3"))
+    mirror._replace_table("runs", "runs", COLUMNS, [(f"e{index}", index / 2, "A" if index % 3 else "B") for index in range(30)], 1.0)
+    yield mirror
+    mirror.close()
+
+
+def query(mirror, sql, **kwargs):
+    return asyncio.run(mirror.query(sql, **kwargs))
+
+
+def test_select_and_with_are_allowed(mirror):
+    result = query(mirror, "WITH long AS (SELECT * FROM runs WHERE distance_km >= ?) SELECT shoe, COUNT(*) AS n FROM long GROUP BY shoe ORDER BY shoe", params=(10,))
+    assert result["rows"] == [{"shoe": "A", "n": 7}, {"shoe": "B", "n": 3}]
+    assert query(mirror, "SELECT object_id FROM runs", max_rows=5)["truncated"]
+    assert query(mirror, "SELECT value FROM json_each('[1, 2]')")["row_count"] == 2
+
+
+@pytest.mark.parametrize("sql", [
+    "ATTACH DATABASE ':memory:' AS other",
+    "PRAGMA journal_mode=DELETE",
+    "CREATE TEMP TABLE copy AS SELECT * FROM runs",
+    "DELETE FROM runs",
+    "SELECT load_extension('mod_spatialite')",
+    "SELECT 1; DELETE FROM runs",
+])
+def test_statements_other_than_reads_are_rejected(mirror, sql):
+    with pytest.raises(ValueError, match="SQL-Fehler"):
+        query(mirror, sql)
+    assert query(mirror, "SELECT COUNT(*) AS n FROM runs")["rows"] == [{"n": 30}]
+
+
+def test_long_running_query_is_interrupted(mirror):
+    sql = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT COUNT(*) FROM n"
+    with pytest.raises(ValueError, match="Zeitüberschreitung"):
+        query(mirror, sql, timeout=0.05)
+
+
+def test_failed_replace_keeps_previous_table(mirror):
+    with pytest.raises(Exception):
+        mirror._replace_table("runs", "runs", COLUMNS, [("x1", 1.0, "A"), ("x2", 2.0)], 1.0)
+    assert query(mirror, "SELECT COUNT(*) AS n FROM runs")["rows"] == [{"n": 30}]
+    tables = query(mirror, "SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name")["rows"]
+    assert [row["name"] for row in tables] == ["_mirror_tables", "runs"]
+    assert [(table["table"], table["rows"]) for table in mirror.tables()] == [("runs", 30)]
+
+
+def test_replace_swaps_table_and_metadata(mirror):
+    mirror._replace_table("runs", "runs", COLUMNS[:2], [("e1", 1.0), ("e1", 2.0), ("e2", 3.0)], 2.0)
+    assert query(mirror, "SELECT * FROM runs ORDER BY object_id")["rows"] == [
+        {"object_id": "e1", "distance_km": 2.0}, {"object_id": "e2", "distance_km": 3.0}
+    ]
+    assert mirror.tables()[0]["columns"] == {"object_id": "TEXT", "distance_km": "REAL"}
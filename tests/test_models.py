@@ -0,0 +1,32 @@
+"""
+Tests für die Projektionen der Strukturobjekte.
+"""
+
+from dimetrics_mcp_server.models import APP, ATTRIBUTE, RESOURCE, SERVICE
+
+
+def test_missing_fields_get_defaults_and_own_containers():
+    first, second = SERVICE.project({"name": "runs"}), SERVICE.project({})
+    assert first["name"] == "runs"
+    assert (first["description"], first["nested_resources"], first["subscription"]) == ("", [], {})
+    first["nested_resources"].append("x")
+    first["subscription"]["plan"] = "pro"
+    assert (second["nested_resources"], second["subscription"]) == ([], {})
+    assert SERVICE.project({})["subscription"] == {}
+
+
+def test_present_values_are_kept_even_if_empty():
+    app = APP.project({"object_id": "a1", "description": None, "subscription": None, "extra": 1})
+    assert app["description"] is None and app["subscription"] is None
+    assert "extra" not in app
+    assert list(app) == list(APP.names)
+
+
+def test_page_accepts_list_and_results_and_projects_summary_fields():
+    payload = [{"name": "distance", "type": "NUMERIC_FIELD", "ingest_timestamp": "2025-01-01"}]
+    assert ATTRIBUTE.page(payload, summary=True) == ATTRIBUTE.page({"results": payload}, summary=True)
+    summary = ATTRIBUTE.page(payload, summary=True)[0]
+    assert list(summary) == list(ATTRIBUTE.summary)
+    assert (summary["show_in_table"], summary["form_layout_col"], summary["resource"]) == (True, "12", {})
+    assert ATTRIBUTE.page(None) == [] and RESOURCE.page({"results": None}) == []
+    assert "table_column_width" in RESOURCE.page({"results": [{}]})[0]
@@ -0,0 +1,89 @@
+"""
+Tests für die adaptive Seitengröße und lückenlose Seiten beim parallelen Laden.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from dimetrics_mcp_server.api_client import DimetricsAPIClient
+from dimetrics_mcp_server.mirror import fetch_entries
+from dimetrics_mcp_server.page_sizing import GROWTH, PageSizer
+from keyset_benchmark import StandIn
+
+ROWS = 1500
+
+
+def test_growth_is_limited_per_page():
+    sizer = PageSizer(initial=100, maximum=5000, target_bytes=10**9, target_seconds=100)
+    assert sizer.observe(rows=100, response_bytes=10_000, seconds=0.01, requested=100, more=True) == 100 * GROWTH
+    assert sizer.observe(rows=200, response_bytes=20_000, seconds=0.02, requested=200, more=True) == 200 * GROWTH
+
+
+def test_wide_rows_shrink_to_target_bytes_at_once():
+    sizer = PageSizer(initial=1000, target_bytes=100_000, target_seconds=100)
+    # 1 KB pro Zeile: 100 Zeilen erfüllen das Ziel
+    assert sizer.observe(rows=1000, response_bytes=1_000_000, seconds=0.1, requested=1000, more=True) == 100
+
+
+def test_latency_target_uses_fixed_and_per_row_share():
+    sizer = PageSizer(initial=100, maximum=100_000, target_bytes=10**9, target_seconds=1.0)
+    # 0.2 s fest + 1 ms pro Zeile
+    for rows in (100, 200, 400, 800):
+        sizer.observe(rows=rows, response_bytes=rows * 10, seconds=0.2 + rows * 0.001, requested=rows, more=True)
+    assert sizer.overhead_seconds == pytest.approx(0.2, abs=0.01)
+    assert sizer.seconds_per_row == pytest.approx(0.001, rel=0.05)
+    assert sizer.size == pytest.approx(800, rel=0.05)
+
+
+def test_api_cap_lowers_maximum():
+    sizer = PageSizer(initial=500)
+    sizer.observe(rows=100, response_bytes=1000, seconds=0.01, requested=500, more=True)
+    assert sizer.maximum == 100
+    assert sizer.size <= 100
+
+
+def test_timeout_halves_until_minimum():
+    sizer = PageSizer(initial=80, minimum=20)
+    assert sizer.timed_out() and sizer.size == 40
+    assert sizer.timed_out() and sizer.size == 20
+    assert sizer.timed_out() is False
+    assert sizer.maximum == 20
+
+
+class CappedStandIn(StandIn):
+    """Attrappe, die page_size wie manche APIs auf eine Obergrenze begrenzt."""
+
+    def __init__(self, rows: int, cap: int):
+        super().__init__(rows)
+        self.cap = cap
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        size = int(request.url.params.get("page_size", 20))
+        if size > self.cap:
+            request = httpx.Request(request.method, request.url.copy_set_param("page_size", str(self.cap)))
+        return super().handler(request)
+
+
+@pytest.mark.parametrize("stand_in, page_size", [
+    (StandIn(ROWS), 37),
+    (StandIn(ROWS), 0),
+    (CappedStandIn(ROWS, cap=64), 0),
+    (CappedStandIn(ROWS, cap=64), 500),
+])
+def test_parallel_pages_cover_every_entry_once(stand_in, page_size):
+    async def scenario():
+        client = DimetricsAPIClient("http://test/api", api_key="test", transport=httpx.MockTransport(stand_in.handler))
+        if not page_size:
+            # Gemessene Seitengröße größer als die erste Seite: übrige Seiten in einem Vielfachen
+            client.page_sizer("runs").size = 100
+        batches, pages = await fetch_entries(client, "runs", page_size=page_size, concurrency=4)
+        await client.close()
+        return batches, pages
+
+    batches, pages = asyncio.run(scenario())
+    ids = [entry["object_id"] for batch in batches for entry in batch]
+    assert sorted(ids) == [row[0] for row in stand_in.db.execute("SELECT object_id FROM runs ORDER BY object_id")]
+    assert len(ids) == len(set(ids)) == ROWS
+    assert pages == len(batches)
@@ -0,0 +1,80 @@
+"""
+Tests für Keyset-Pagination: Cursor, Filter und vollständige Durchläufe.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from dimetrics_mcp_server.api_client import DimetricsAPIClient
+from dimetrics_mcp_server.pagination import decode_cursor, encode_cursor, keyset_filter, keyset_ordering, last_key
+from keyset_benchmark import StandIn
+
+ROWS = 400
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    return StandIn(ROWS)
+
+
+def test_cursor_round_trip():
+    last = ["2025-01-01T00:00:00Z", "0f3a-äöü"]
+    assert decode_cursor(encode_cursor("-date_created", last), "-date_created") == last
+
+
+def test_cursor_of_other_ordering_is_rejected():
+    cursor = encode_cursor("date_created", [1, "a"])
+    with pytest.raises(ValueError, match="Sortierung"):
+        decode_cursor(cursor, "-date_created")
+    with pytest.raises(ValueError, match="Ungültiger Cursor"):
+        decode_cursor("kein-cursor", "date_created")
+
+
+@pytest.mark.parametrize("ordering", ["date_created,object_id", "-", "name desc"])
+def test_keyset_needs_exactly_one_field(ordering):
+    with pytest.raises(ValueError):
+        keyset_ordering(ordering)
+
+
+def test_keyset_filter_keeps_caller_filter_and_breaks_ties_on_object_id():
+    condition = keyset_filter({"state": {"_eq": "ok"}}, "-distance_km", [5.0, "abc"])
+    assert condition == {"_and": [
+        {"state": {"_eq": "ok"}},
+        {"_and": [
+            {"distance_km": {"_lte": 5.0}},
+            {"_or": [{"distance_km": {"_lt": 5.0}}, {"object_id": {"_lt": "abc"}}]}
+        ]}
+    ]}
+    assert keyset_filter(None, None, ["abc", "abc"]) == {"object_id": {"_gt": "abc"}}
+    assert keyset_filter(None, "distance_km", None) is None
+
+
+def test_last_key_uses_object_id_of_relations_and_rejects_empty_values():
+    assert last_key({"object_id": "e1", "shoe": {"object_id": "s1"}}, "shoe") == ["s1", "e1"]
+    with pytest.raises(ValueError, match="leer"):
+        last_key({"object_id": "e1", "shoe": None}, "shoe")
+
+
+@pytest.mark.parametrize("ordering", ["object_id", "distance_km", "-distance_km", "-date_created"])
+def test_walk_returns_every_entry_once_in_order(stand_in, ordering):
+    # distance_km hat nur 42 verschiedene Werte: Seitengrenzen fallen mitten in gleiche Werte
+    async def walk():
+        client = DimetricsAPIClient("http://test/api", api_key="test", transport=httpx.MockTransport(stand_in.handler))
+        ids, cursor, pages = [], None, 0
+        while True:
+            data = await client.list_generic_entries_keyset("runs", cursor=cursor, page_size=7, ordering=ordering)
+            pages += 1
+            ids += [entry["object_id"] for entry in data["results"]]
+            cursor = data["next_cursor"]
+            if not cursor:
+                await client.close()
+                return ids, pages
+
+    ids, pages = asyncio.run(walk())
+    field, descending = keyset_ordering(ordering)
+    direction = "DESC" if descending else "ASC"
+    order = f"{field} {direction}, object_id {direction}" if field != "object_id" else f"object_id {direction}"
+    assert ids == [row[0] for row in stand_in.db.execute(f"SELECT object_id FROM runs ORDER BY {order}")]
+    assert pages == -(-ROWS // 7)
@@ -0,0 +1,87 @@
+"""
+Tests für partitionierte Scans und Exporte gegen eine Attrappe der Generics API.
+"""
+
+import asyncio
+import json
+import os
+
+import httpx
+import pytest
+
+from dimetrics_mcp_server.api_client import DimetricsAPIClient
+from dimetrics_mcp_server.partitioning import partitioned_export, partitioned_scan
+from partition_benchmark import PartitionStandIn
+
+ROWS = 1500
+
+
+@pytest.fixture(scope="module")
+def stand_in():
+    return PartitionStandIn(ROWS, latency_ms=0)
+
+
+def _client(stand_in) -> DimetricsAPIClient:
+    return DimetricsAPIClient("http://test/api", api_key="test", transport=httpx.MockTransport(stand_in.delayed))
+
+
+def _all_ids(stand_in, order: str = "object_id"):
+    return [row[0] for row in stand_in.db.execute(f"SELECT object_id FROM runs ORDER BY {order}")]
+
+
+@pytest.mark.parametrize("partition_by", ["object_id", "distance_km", "date_created"])
+def test_partitions_cover_every_entry_once(stand_in, partition_by):
+    async def scenario():
+        client = _client(stand_in)
+        entries, stats = await partitioned_scan(client, "runs", partition_by=partition_by, partitions=6, page_size=100)
+        await client.close()
+        return entries, stats
+
+    entries, stats = asyncio.run(scenario())
+    ids = [entry["object_id"] for entry in entries]
+    assert len(ids) == ROWS
+    assert sorted(ids) == _all_ids(stand_in)
+    assert sum(partition["fetched"] for partition in stats["partitions"]) == ROWS
+    assert all(partition["fetched"] == partition["count"] for partition in stats["partitions"])
+
+
+@pytest.mark.parametrize("ordering", ["", "date_created", "-date_created"])
+def test_export_streams_partitions_into_file(stand_in, tmp_path, ordering):
+    target = str(tmp_path / "runs.ndjson")
+
+    async def scenario():
+        client = _client(stand_in)
+        result = await partitioned_export(client, "runs", target, partitions=5, ordering=ordering or None, page_size=64)
+        await client.close()
+        return result
+
+    entries, stats = asyncio.run(scenario())
+    with open(target, encoding="utf-8") as handle:
+        ids = [json.loads(line)["object_id"] for line in handle]
+    assert entries == len(ids) == ROWS
+    if ordering:
+        direction = "DESC" if ordering.startswith("-") else "ASC"
+        assert ids == _all_ids(stand_in, f"date_created {direction}, object_id {direction}")
+    else:
+        assert sorted(ids) == _all_ids(stand_in)
+    # Teildateien der Bereiche sind aufgeräumt
+    assert os.listdir(tmp_path) == ["runs.ndjson"]
+    assert len(stats["partitions"]) > 1
+
+
+def test_ids_outside_hex_prefixes_fall_back_to_unpartitioned_read():
+    stand_in = PartitionStandIn(300, latency_ms=0)
+    stand_in.db.executemany(
+        "INSERT INTO runs VALUES (?, ?, ?)",
+        [("ABCDEF-import-1", "2025-02-01T00:00:00Z", 3.0), ("legacy-42", "2025-02-02T00:00:00Z", 4.0)]
+    )
+
+    async def scenario():
+        client = _client(stand_in)
+        entries, stats = await partitioned_scan(client, "runs", partition_by="object_id", partitions=4, page_size=50)
+        await client.close()
+        return entries, stats
+
+    entries, stats = asyncio.run(scenario())
+    assert sorted(entry["object_id"] for entry in entries) == _all_ids(stand_in)
+    assert [partition["range"] for partition in stats["partitions"]] == ["alle Einträge (object_id-Bereiche unvollständig)"]
@@ -0,0 +1,173 @@
+"""
+Tests für das Vorladen von Folgeseiten: Treffer, Verwerfen und nur mit einem Worker.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from dimetrics_mcp_server import __main__ as server
+from dimetrics_mcp_server.api_client import DimetricsAPIClient
+from dimetrics_mcp_server.backends import BackendConfig, ClientRegistry
+from dimetrics_mcp_server.prefetch import PagePrefetcher
+
+
+@pytest.fixture
+def prefetch_enabled(monkeypatch):
+    monkeypatch.setenv("DIMETRICS_PREFETCH", "true")
+    monkeypatch.setattr(server, "page_prefetcher", None)
+    monkeypatch.setattr(server.mcp.settings, "stateless_http", False)
+
+
+def test_prefetcher_active_with_single_worker(prefetch_enabled, monkeypatch):
+    monkeypatch.setenv("MCP_WORKERS", "1")
+    assert server.get_page_prefetcher() is not None
+    server.page_prefetcher.close()
+
+
+@pytest.mark.parametrize("workers, stateless", [("4", False), ("1", True)])
+def test_prefetcher_disabled_with_multiple_workers(prefetch_enabled, monkeypatch, workers, stateless):
+    monkeypatch.setenv("MCP_WORKERS", workers)
+    monkeypatch.setattr(server.mcp.settings, "stateless_http", stateless)
+    assert server.get_page_prefetcher() is None
+
+
+class Pages:
+    """Seiten 1..last; jede Seite wartet auf ihr Event, falls eines gesetzt ist."""
+
+    def __init__(self, last=5):
+        self.last = last
+        self.loaded = []
+        self.gates = {}
+        self.failing = set()
+
+    async def load(self, page):
+        self.loaded.append(page)
+        if page in self.gates:
+            await self.gates[page].wait()
+        if page in self.failing:
+            raise RuntimeError(f"Seite {page} fehlgeschlagen")
+        return {"page": page, "version": self.loaded.count(page)}
+
+    def next_position(self, data):
+        return data["page"] + 1 if data["page"] < self.last else None
+
+
+def fetch(prefetcher, pages, page, resource=("prod", "runs")):
+    return prefetcher.fetch("session", "runs?ordering=-date", page, pages.load, pages.next_position, resource=resource)
+
+
+def test_prefetched_page_is_served_without_second_request():
+    async def scenario():
+        prefetcher, pages = PagePrefetcher(), Pages()
+        await fetch(prefetcher, pages, 1)
+        await asyncio.sleep(0)
+        second = await fetch(prefetcher, pages, 2)
+        prefetcher.close()
+        return second, pages.loaded, prefetcher.describe()
+
+    second, loaded, stats = asyncio.run(scenario())
+    assert second == {"page": 2, "version": 1}
+    assert loaded == [1, 2]
+    assert (stats["hits"], stats["misses"], stats["prefetched"]) == (1, 1, 2)
+
+
+def test_request_waits_for_prefetch_in_flight():
+    async def scenario():
+        prefetcher, pages = PagePrefetcher(), Pages()
+        pages.gates[2] = asyncio.Event()
+        await fetch(prefetcher, pages, 1)
+        waiting = asyncio.create_task(fetch(prefetcher, pages, 2))
+        await asyncio.sleep(0.01)
+        pages.gates[2].set()
+        second = await waiting
+        prefetcher.close()
+        return second, pages.loaded, prefetcher.describe()
+
+    second, loaded, stats = asyncio.run(scenario())
+    assert second["page"] == 2
+    assert loaded.count(2) == 1
+    assert (stats["inflight_hits"], stats["hits"]) == (1, 0)
+
+
+def test_other_position_cancels_prefetch_and_counts_as_wasted():
+    async def scenario():
+        prefetcher, pages = PagePrefetcher(), Pages()
+        pages.gates[2] = asyncio.Event()
+        await fetch(prefetcher, pages, 1)
+        await asyncio.sleep(0)
+        pending = next(iter(prefetcher._pending.values())).task
+        fourth = await fetch(prefetcher, pages, 4)
+        await asyncio.sleep(0)
+        prefetcher.close()
+        return fourth, pending.cancelled(), prefetcher.describe()
+
+    fourth, cancelled, stats = asyncio.run(scenario())
+    assert fourth["page"] == 4
+    assert cancelled
+    assert (stats["wasted"], stats["misses"], stats["precision"]) == (1, 2, 0.0)
+
+
+def test_expired_prefetch_is_discarded():
+    async def scenario():
+        prefetcher, pages = PagePrefetcher(ttl=0.01), Pages()
+        await fetch(prefetcher, pages, 1)
+        await asyncio.sleep(0.05)
+        stats = prefetcher.describe()
+        second = await fetch(prefetcher, pages, 2)
+        prefetcher.close()
+        return stats, second, prefetcher.describe()
+
+    expired, second, stats = asyncio.run(scenario())
+    assert (expired["expired"], expired["pending"]) == (1, 0)
+    assert second == {"page": 2, "version": 2}
+    assert (stats["hits"], stats["misses"]) == (0, 2)
+
+
+def test_failed_prefetch_falls_back_to_loading():
+    async def scenario():
+        prefetcher, pages = PagePrefetcher(), Pages()
+        pages.failing.add(2)
+        await fetch(prefetcher, pages, 1)
+        await asyncio.sleep(0)
+        pages.failing.clear()
+        second = await fetch(prefetcher, pages, 2)
+        prefetcher.close()
+        return second, prefetcher.describe()
+
+    second, stats = asyncio.run(scenario())
+    assert second == {"page": 2, "version": 2}
+    assert (stats["errors"], stats["misses"], stats["hits"]) == (1, 2, 0)
+
+
+def test_entry_write_drops_prefetched_page_of_resource(monkeypatch):
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(204)
+
+    async def scenario():
+        client = DimetricsAPIClient("http://bench/api", api_key="bench", name="prod", transport=httpx.MockTransport(handler))
+        registry = ClientRegistry({"prod": BackendConfig(name="prod", api_url="http://bench/api", api_key="bench")})
+        registry.register_client("prod", client)
+        monkeypatch.setattr(server, "client_registry", registry)
+        monkeypatch.setattr(server, "page_prefetcher", None)
+        prefetcher = server.get_page_prefetcher()
+        pages, other = Pages(), Pages()
+        await fetch(prefetcher, pages, 1)
+        await prefetcher.fetch("session", "shoes", 1, other.load, other.next_position, resource=("prod", "shoes"))
+        await asyncio.sleep(0)
+        await client.delete_generic_entry("runs", "run-1")
+        second = await fetch(prefetcher, pages, 2)
+        shoes = await prefetcher.fetch("session", "shoes", 2, other.load, other.next_position, resource=("prod", "shoes"))
+        prefetcher.close()
+        await registry.close()
+        return second, shoes, prefetcher.describe()
+
+    monkeypatch.setenv("DIMETRICS_PREFETCH", "true")
+    monkeypatch.setenv("MCP_WORKERS", "1")
+    monkeypatch.setattr(server.mcp.settings, "stateless_http", False)
+    second, shoes, stats = asyncio.run(scenario())
+    # Seite 2 von runs neu geladen, die vorgeladene Seite von shoes bleibt gültig
+    assert second == {"page": 2, "version": 2}
+    assert shoes == {"page": 2, "version": 1}
+    assert stats["invalidated"] == 1
@@ -0,0 +1,90 @@
+"""
+Tests für Spaltenprofile: Werte gegen die Tabelle und Cache nach Wasserstand.
+"""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+
+from dimetrics_mcp_server.api_client import DimetricsAPIClient
+from dimetrics_mcp_server.profiling import ColumnProfile, ProfileCache, profile_entries
+from keyset_benchmark import StandIn
+
+ROWS = 900
+ATTRIBUTES = [{"name": "distance_km", "type": "NUMERIC_FIELD", "numeric_datatype": "float"}]
+
+
+def client_for(stand_in: StandIn) -> DimetricsAPIClient:
+    """Stand-in mit Attribut-Definitionen und Wasserstand (Anzahl Einträge)."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "/attributes/" in request.url.path:
+            body = ATTRIBUTES
+        elif request.url.params.get("ordering") == "-update_timestamp":
+            count = stand_in.db.execute("SELECT COUNT(*) FROM runs").fetchone()[0]
+            body = {"count": count, "next": None, "previous": None, "results": [{"update_timestamp": "2025-02-01T00:00:00Z"}]}
+        else:
+            return stand_in.handler(request)
+        return httpx.Response(200, content=json.dumps(body).encode(), headers={"content-type": "application/json"})
+
+    return DimetricsAPIClient("http://bench/api", api_key="bench", transport=httpx.MockTransport(handler))
+
+
+def test_profile_matches_table():
+    stand_in = StandIn(ROWS)
+
+    async def scenario():
+        client = client_for(stand_in)
+        try:
+            return await profile_entries(client, "runs", page_size=200, bins=4)
+        finally:
+            await client.close()
+
+    profile = asyncio.run(scenario())
+    assert (profile["rows"], profile["pages"]) == (ROWS, 5)
+    assert "object_id" not in profile["columns"]
+    distance = profile["columns"]["distance_km"]
+    assert distance["kind"] == "float64"
+    assert (distance["min"], distance["max"]) == (0.0, 20.5)
+    assert distance["distinct"] == 42 and distance["distinct_exact"]
+    assert distance["null_rate"] == 0
+    assert sum(bucket["count"] for bucket in distance["histogram"]) == ROWS
+    created = profile["columns"]["date_created"]
+    assert created["min"] == "2025-01-01T00:00:00Z"
+    assert profile["columns"]["update_timestamp"]["null_rate"] == 1
+
+
+def test_cache_recomputes_only_when_watermark_moves():
+    stand_in = StandIn(ROWS)
+
+    async def scenario():
+        client = client_for(stand_in)
+        cache = ProfileCache()
+        try:
+            first = await cache.profile(client, ("local", "", "runs"), "runs", page_size=300)
+            second = await cache.profile(client, ("local", "", "runs"), "runs", page_size=300)
+            stand_in.insert_front(3)
+            third = await cache.profile(client, ("local", "", "runs"), "runs", page_size=300)
+            with pytest.raises(ValueError, match="bins"):
+                await cache.profile(client, ("local", "", "runs"), "runs", bins=0)
+            return first, second, third, cache.describe()
+        finally:
+            await client.close()
+
+    first, second, third, stats = asyncio.run(scenario())
+    assert (first["cached"], second["cached"], third["cached"]) == (False, True, False)
+    assert second["columns"] == first["columns"]
+    assert third["rows"] == ROWS + 3
+    assert stats == {"hits": 1, "computed": 2, "profiles": 1}
+
+
+def test_top_values_and_empty_cells():
+    column = ColumnProfile("dictionary")
+    for value in ["easy"] * 5 + ["tempo"] * 3 + ["long", None, ""]:
+        column.add(value)
+    result = column.result(rows=11, bins=10, top=2)
+    assert result["values"] == 9
+    assert result["null_rate"] == round(2 / 11, 4)
+    assert result["top_values"] == [{"value": "easy", "count": 5}, {"value": "tempo", "count": 3}]
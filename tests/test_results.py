@@ -0,0 +1,121 @@
+"""
+Tests für Result-Handles: Auslagern, seitenweises Schreiben und gemeinsame Ablage mehrerer Worker.
+"""
+
+import asyncio
+import os
+import time
+
+import httpx
+import pytest
+
+from dimetrics_mcp_server import __main__ as server
+from dimetrics_mcp_server.api_client import DimetricsAPIClient
+from dimetrics_mcp_server.backends import BackendConfig, ClientRegistry
+from dimetrics_mcp_server.results import ResultStore
+from keyset_benchmark import StandIn
+
+ROWS = [{"object_id": f"{index:04d}", "distance_km": index / 2} for index in range(250)]
+
+
+def test_spilled_result_reads_like_memory(tmp_path):
+    store = ResultStore(str(tmp_path), memory_bytes=500)
+    first = store.put(ROWS, {"resource_name": "runs"})
+    second = store.put(ROWS[:3], {"resource_name": "runs"})
+    assert store.describe()["spilled"] >= 1
+    assert first.lines is None
+    data = store.read(first.handle, offset=240, limit=50)
+    assert data["rows"] == ROWS[240:]
+    assert data["next_offset"] is None
+    assert store.read(second.handle, fields=["object_id"])["rows"] == [{"object_id": row["object_id"]} for row in ROWS[:3]]
+    store.close()
+
+
+def test_writer_streams_pages_to_disk(tmp_path):
+    store = ResultStore(str(tmp_path))
+    writer = store.writer({"resource_name": "runs"}, owner="tenant")
+    for start in range(0, len(ROWS), 100):
+        writer.add(ROWS[start:start + 100])
+    stored = writer.commit()
+    assert (stored.count, stored.lines, stored.columns) == (len(ROWS), None, ["object_id", "distance_km"])
+    assert writer.preview == ROWS[:5]
+    assert store.read(stored.handle, offset=100, limit=3, owner="tenant")["rows"] == ROWS[100:103]
+    with pytest.raises(ValueError):
+        store.read(stored.handle, owner="")
+    store.close()
+
+
+def test_writer_stops_at_row_cap(tmp_path):
+    store = ResultStore(str(tmp_path))
+    writer = store.writer({"resource_name": "runs"}, max_rows=150)
+    writer.add(ROWS[:100])
+    with pytest.raises(ValueError, match="DIMETRICS_RESULT_MAX_ROWS"):
+        writer.add(ROWS[100:200])
+    writer.discard()
+    assert os.listdir(store.directory) == []
+    store.close()
+
+
+def test_shared_store_serves_handles_of_other_workers(tmp_path):
+    # Zwei Worker-Prozesse mit derselben Ablage
+    worker_a = ResultStore(str(tmp_path), shared=True)
+    worker_b = ResultStore(str(tmp_path), shared=True)
+    stored = worker_a.put(ROWS, {"resource_name": "runs"}, owner="tenant")
+    assert stored.lines is None
+    streamed = worker_a.writer({"resource_name": "runs"}, owner="tenant")
+    streamed.add(ROWS[:10])
+    streamed = streamed.commit()
+
+    assert worker_b.read(stored.handle, offset=200, limit=10, owner="tenant")["rows"] == ROWS[200:210]
+    assert worker_b.read(streamed.handle, owner="tenant")["total"] == 10
+    assert worker_b.get(stored.handle, owner="tenant").source == {"resource_name": "runs"}
+    with pytest.raises(ValueError):
+        worker_b.read(stored.handle, owner="other")
+
+    # Herunterfahren eines Workers lässt die Ergebnisse für die anderen stehen
+    worker_a.close()
+    assert worker_b.read(stored.handle, owner="tenant")["total"] == len(ROWS)
+    worker_b.close()
+
+
+def test_shared_store_expires_across_workers(tmp_path):
+    worker_a = ResultStore(str(tmp_path), shared=True, ttl=0.2)
+    worker_b = ResultStore(str(tmp_path), shared=True, ttl=0.2)
+    stored = worker_a.put(ROWS, {"resource_name": "runs"})
+    worker_b.read(stored.handle)
+    time.sleep(0.3)
+    with pytest.raises(ValueError):
+        worker_b.read(stored.handle)
+    # Der Worker, der abgelegt hat, sieht das Handle ebenfalls nicht mehr
+    with pytest.raises(ValueError):
+        worker_a.read(stored.handle)
+    assert not os.path.exists(stored.path)
+    worker_a.close()
+    worker_b.close()
+
+
+def test_all_pages_is_streamed_into_handle(tmp_path, monkeypatch):
+    stand_in = StandIn(700)
+    registry = ClientRegistry({"test": BackendConfig(name="test", api_url="http://test/api")})
+    registry.register_client("test", DimetricsAPIClient("http://test/api", api_key="test", transport=httpx.MockTransport(stand_in.handler)))
+    monkeypatch.setattr(server, "client_registry", registry)
+    monkeypatch.setattr(server, "result_store", ResultStore(str(tmp_path)))
+
+    async def scenario(max_rows):
+        monkeypatch.setattr("dimetrics_mcp_server.results.RESULT_MAX_ROWS", max_rows)
+        return await server.list_generic_entries("runs", all_pages=True, ordering="date_created")
+
+    result = asyncio.run(scenario(1000))
+    assert result["success"] is True
+    handle = result["data"]["result"]["handle"]
+    assert result["data"]["count"] == 700
+    assert result["data"]["result"]["storage"] == "disk"
+    rows = server.result_store.read(handle, offset=0, limit=1000)["rows"]
+    assert [row["date_created"] for row in rows] == sorted(row["date_created"] for row in rows)
+
+    capped = asyncio.run(scenario(500))
+    assert capped["success"] is False
+    assert "DIMETRICS_RESULT_MAX_ROWS" in capped["error"]
+    assert len(os.listdir(server.result_store.directory)) == 1
+    asyncio.run(registry.close())
+    server.result_store.close()
@@ -0,0 +1,129 @@
+"""
+Tests für den Schema-Abgleich: Plan, Apply und Idempotenz.
+"""
+
+import asyncio
+import copy
+import itertools
+
+from dimetrics_mcp_server.schema_sync import SchemaApplier, plan_schema_changes
+
+# Felder, die die Attribut-API zurückliefert (typ-spezifische Optionen fehlen)
+LIVE_ATTRIBUTE_FIELDS = ("object_id", "name", "type", "label", "required", "linked_resource")
+
+SCHEMA = {"apps": [{"name": "Lauftagebuch", "prefix": "lt_", "description": "Läufe", "services": [{
+    "name": "training", "title": "Training", "resources": [
+        {"name": "shoes", "title": "Schuhe", "attributes": [{"name": "model", "type": "TEXT_FIELD", "required": True}]},
+        {"name": "runs", "title": "Läufe", "attributes": [
+            {"name": "distance_km", "type": "NUMERIC_FIELD", "label": "Distanz", "options": {"numeric_datatype": "float"}},
+            {"name": "shoe", "type": "RELATION_FIELD", "linked_resource": "shoes", "form_layout_col": "6"},
+        ]},
+    ]
+}]}]}
+
+
+def page(items):
+    async def fetch(page_size, page):
+        return {"results": [dict(item) for item in items], "next": None}
+    return fetch
+
+
+class FakeBackend:
+    """Strukturobjekte im Speicher; Resources erhalten das App-Präfix wie beim Server."""
+
+    def __init__(self):
+        self.ids = (f"00000000-0000-0000-0000-{index:012d}" for index in itertools.count(1))
+        self.apps, self.services, self.resources, self.groups = [], [], [], []
+        self.attributes = {}
+        self.writes = []
+        self.list_services = page(self.apps)
+        self.list_services_endpoint = page(self.services)
+        self.list_resources_endpoint = page(self.resources)
+        self.list_resource_permission_groups = page(self.groups)
+
+    async def get_attribute_schema(self, resource_name, max_age=300.0):
+        return [{field: item[field] for field in LIVE_ATTRIBUTE_FIELDS if field in item} for item in self.attributes[resource_name]]
+
+    async def create_app(self, name, description="", prefix=""):
+        self.writes.append(("create", "app", name))
+        app = {"object_id": next(self.ids), "name": name, "prefix": prefix, "description": description}
+        self.apps.append(app)
+        return app
+
+    async def create_service_endpoint(self, **data):
+        self.writes.append(("create", "service", data["name"]))
+        service = dict(data, object_id=next(self.ids))
+        self.services.append(service)
+        return service
+
+    async def create_resource_endpoint(self, **data):
+        self.writes.append(("create", "resource", data["name"]))
+        prefix = next(app["prefix"] for app in self.apps for service in self.services
+                      if service["object_id"] == data["service"] and service["app_space"] == app["object_id"])
+        resource = dict(data, name=prefix + data["name"], object_id=next(self.ids))
+        self.resources.append(resource)
+        self.attributes[resource["name"]] = []
+        return resource
+
+    async def create_attributes_bulk(self, resource_name, attributes):
+        self.writes.append(("create", "attributes", resource_name))
+        created = [dict(item, object_id=next(self.ids)) for item in attributes]
+        self.attributes[resource_name].extend(created)
+        return created
+
+    async def update_attribute(self, resource_name, attribute_id, **data):
+        self.writes.append(("update", "attribute", resource_name))
+        attribute = next(item for item in self.attributes[resource_name] if item["object_id"] == attribute_id)
+        attribute.update(data)
+        return attribute
+
+    async def _update(self, kind, items, object_id, data):
+        self.writes.append(("update", kind, object_id))
+        item = next(item for item in items if item["object_id"] == object_id)
+        item.update(data)
+        return item
+
+    async def update_app_deprecated(self, app_id, name=None, description=None, prefix=None):
+        return await self._update("app", self.apps, app_id, {"description": description})
+
+    async def update_service_endpoint(self, service_id, **data):
+        return await self._update("service", self.services, service_id, data)
+
+    async def update_resource_endpoint(self, resource_id, **data):
+        return await self._update("resource", self.resources, resource_id, data)
+
+
+def sync(backend, schema):
+    async def scenario():
+        planner, plan = await plan_schema_changes(backend, schema)
+        applied = await SchemaApplier(backend, planner).apply(plan)
+        return plan, applied
+
+    return asyncio.run(scenario())
+
+
+def test_second_sync_of_unchanged_schema_plans_nothing():
+    backend = FakeBackend()
+    plan, applied = sync(backend, SCHEMA)
+    assert plan["summary"]["create"] == 6
+    assert applied["summary"]["failed"] == 0
+    shoes = backend.resources[0]["object_id"]
+    assert [item["linked_resource"] for item in backend.attributes["lt_runs"] if item["name"] == "shoe"] == [shoes]
+
+    backend.writes.clear()
+    plan, applied = sync(backend, SCHEMA)
+    assert plan["operations"] == [] and plan["warnings"] == []
+    assert backend.writes == []
+
+
+def test_changed_fields_are_updated_once():
+    backend = FakeBackend()
+    sync(backend, SCHEMA)
+    changed = copy.deepcopy(SCHEMA)
+    changed["apps"][0]["description"] = "Alle Läufe"
+    changed["apps"][0]["services"][0]["resources"][1]["attributes"][0]["label"] = "Strecke"
+    plan, _ = sync(backend, changed)
+    assert sorted((operation["action"], operation["kind"]) for operation in plan["operations"]) == [
+        ("update", "app"), ("update", "attribute")
+    ]
+    assert sync(backend, changed)[0]["operations"] == []
@@ -0,0 +1,83 @@
+"""
+Tests für die Genauigkeit der Sketches gegen exakt berechnete Werte.
+"""
+
+import collections
+import random
+
+import pytest
+
+from dimetrics_mcp_server.sketches import EXACT_DISTINCT, HyperLogLog, SketchAggregation, SpaceSaving, TDigest
+
+
+def test_hyperloglog_counts_exactly_up_to_threshold():
+    sketch = HyperLogLog(12)
+    for index in range(EXACT_DISTINCT):
+        sketch.add(f"route-{index}")
+        sketch.add(f"route-{index}")
+    assert sketch.exact
+    assert sketch.estimate() == EXACT_DISTINCT
+    assert sketch.relative_error == 0.0
+
+
+@pytest.mark.parametrize("distinct", [5_000, 60_000])
+def test_hyperloglog_estimate_within_three_standard_errors(distinct):
+    sketch = HyperLogLog(12)
+    for index in range(distinct):
+        sketch.add(index)
+    assert not sketch.exact
+    assert abs(sketch.estimate() - distinct) / distinct < 3 * sketch.relative_error
+
+
+def test_tdigest_quantiles_close_to_exact():
+    rng = random.Random(7)
+    values = [rng.gauss(5.5, 0.8) for _ in range(50_000)]
+    digest = TDigest()
+    for value in values:
+        digest.add(value)
+    values.sort()
+    for q in (0.01, 0.5, 0.9, 0.99):
+        exact = values[int(q * len(values))]
+        # Fehler in Rängen: an den Rändern genauer als in der Mitte
+        assert abs(digest.cdf(digest.quantile(q)) - q) < 0.01
+        assert digest.quantile(q) == pytest.approx(exact, rel=0.01)
+    assert (digest.min, digest.max) == (values[0], values[-1])
+    assert len(digest.means) < 1000
+
+
+def test_space_saving_keeps_heavy_hitters_with_bounds():
+    rng = random.Random(11)
+    stream = [f"shoe-{int(rng.paretovariate(1.1))}" for _ in range(30_000)]
+    exact = collections.Counter(stream)
+    summary = SpaceSaving(100)
+    for value in stream:
+        summary.add(value)
+    top = summary.top(5)
+    assert [item["value"] for item in top] == [value for value, _ in exact.most_common(5)]
+    for item in top:
+        assert item["count"] - item["error"] <= exact[item["value"]] <= item["count"]
+        assert item["guaranteed"]
+
+
+def test_aggregation_over_pages_matches_exact_values():
+    rng = random.Random(5)
+    rows = [
+        {"object_id": f"{index:06d}", "pace": round(rng.uniform(3.5, 7.5), 2), "shoe": rng.choice("ABCD"),
+         "date": f"2025-03-{1 + index % 28:02d}T06:00:00Z", "route": None if index % 10 == 0 else f"r{index % 300}"}
+        for index in range(6000)
+    ]
+    aggregation = SketchAggregation(
+        [("count_distinct", "route"), ("median", "pace"), ("median", "date"), ("top_k", "shoe")], top_k=2
+    )
+    for start in range(0, len(rows), 500):
+        aggregation.add_rows(rows[start:start + 500])
+    result = aggregation.result()
+    values = result["values"]
+    assert values["count_distinct_route"] == len({row["route"] for row in rows if row["route"]})
+    assert result["non_null"]["route"] == 5400
+    paces = sorted(row["pace"] for row in rows)
+    assert values["median_pace"] == pytest.approx(paces[len(paces) // 2], abs=0.05)
+    assert values["median_date"].startswith("2025-03-1")
+    exact_top = [value for value, _ in collections.Counter(row["shoe"] for row in rows).most_common(2)]
+    assert [item["value"] for item in values["top_k_shoe"]] == exact_top
+    assert result["accuracy"]["top_k_shoe"]["max_error"] == 0
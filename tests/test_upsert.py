@@ -0,0 +1,84 @@
+"""
+Tests für Upserts: Schlüsselabgleich mit den Einträgen der API.
+"""
+
+import asyncio
+import json
+
+import httpx
+
+from dimetrics_mcp_server.api_client import DimetricsAPIClient
+from dimetrics_mcp_server.upsert import _row_key, upsert_entries
+
+ATTRIBUTES = [
+    {"name": "start_number", "type": "NUMERIC_FIELD"},
+    {"name": "code", "type": "TEXT_FIELD"},
+    {"name": "time", "type": "TEXT_FIELD"},
+]
+
+
+class FakeGenerics:
+    """Generics-Endpunkt mit Einträgen im Speicher; Zahlen kommen wie bei der API als "5.00" zurück."""
+
+    def __init__(self, entries):
+        self.entries = {entry["object_id"]: entry for entry in entries}
+        self.filters = []
+        self.created = []
+        self.patched = []
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.rstrip("/").split("/")
+        if "attributes" in path:
+            return httpx.Response(200, json=ATTRIBUTES)
+        if request.method == "GET":
+            self.filters.append(json.loads(request.url.params["filter"]))
+            results = sorted(self.entries.values(), key=lambda entry: entry["object_id"])
+            return httpx.Response(200, json={"count": len(results), "next": None, "previous": None, "results": results})
+        if request.method == "POST":
+            entry = dict(json.loads(request.content), object_id=f"new-{len(self.created)}")
+            self.created.append(entry)
+            return httpx.Response(201, json=entry)
+        entry = self.entries[path[-1]]
+        entry.update(json.loads(request.content))
+        self.patched.append(path[-1])
+        return httpx.Response(200, json=entry)
+
+
+def run(fake, rows, key_fields):
+    async def scenario():
+        client = DimetricsAPIClient("http://test/api", api_key="test", transport=httpx.MockTransport(fake.handler))
+        try:
+            return await upsert_entries(client, "runs", rows, key_fields, validate=False)
+        finally:
+            await client.close()
+
+    return asyncio.run(scenario())
+
+
+def test_numeric_key_matches_decimal_string_of_api():
+    fake = FakeGenerics([{"object_id": "e1", "start_number": "5.00", "code": "A", "time": "0:40"}])
+    summary = run(fake, [{"start_number": 5, "time": "0:39"}, {"start_number": "6", "time": "0:45"}], ["start_number"])
+    assert (summary["updated"], summary["created"], summary["failed"]) == (1, 1, 0)
+    assert fake.patched == ["e1"] and fake.entries["e1"]["time"] == "0:39"
+    assert fake.filters[0] == {"start_number": {"_in": [5, 6]}}
+
+
+def test_text_keys_compare_as_text_and_unchanged_rows_are_skipped():
+    fake = FakeGenerics([{"object_id": "e1", "start_number": "1.00", "code": "007", "time": "0:40"}])
+    summary = run(fake, [{"code": "007", "time": "0:40"}, {"code": 7, "time": "0:41"}], ["code"])
+    assert (summary["unchanged"], summary["created"]) == (1, 1)
+    assert fake.patched == []
+
+
+def test_duplicate_keys_in_batch_are_rejected_after_normalization():
+    fake = FakeGenerics([])
+    summary = run(fake, [{"start_number": 5}, {"start_number": "5.0"}, {"time": "0:40"}], ["start_number"])
+    assert [result["action"] for result in summary["results"]] == ["created", "failed", "failed"]
+    assert "mehrfach" in summary["results"][1]["error"]
+    assert "fehlen" in summary["results"][2]["error"]
+
+
+def test_relation_keys_use_object_id():
+    assert _row_key({"shoe": {"object_id": "s1"}, "n": 3}, ["shoe", "n"], frozenset({"n"})) == _row_key(
+        {"shoe": "s1", "n": "3.00"}, ["shoe", "n"], frozenset({"n"})
+    )
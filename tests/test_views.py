@@ -0,0 +1,97 @@
+"""
+Tests für materialisierte Sichten: Abziehen und Anwenden geänderter Einträge.
+"""
+
+import random
+
+import pytest
+
+from dimetrics_mcp_server.views import MaterializedViews, normalize_spec
+
+SPEC = normalize_spec(
+    "runs",
+    {"count": "object_id", "sum": "distance_km", "avg": "distance_km", "min": "pace", "max": "pace"},
+    group_by=["team"],
+    where={"state": {"_eq": "ok"}}
+)
+
+
+@pytest.fixture
+def views(tmp_path):
+    views = MaterializedViews(str(tmp_path / "views.sqlite3"))
+    views.define("by_team", SPEC)
+    yield views
+    views.close()
+
+
+def _expected(entries):
+    """Gruppen wie read(), direkt aus allen aktuellen Einträgen berechnet."""
+    groups = {}
+    for entry in entries.values():
+        if entry["state"] != "ok":
+            continue
+        groups.setdefault(entry["team"], []).append(entry)
+    result = []
+    for team in sorted(groups):
+        rows = groups[team]
+        total = sum(row["distance_km"] for row in rows)
+        result.append({
+            "team": team,
+            "count_object_id": len(rows),
+            "sum_distance_km": round(total, 9),
+            "avg_distance_km": round(total / len(rows), 9),
+            "min_pace": min(row["pace"] for row in rows),
+            "max_pace": max(row["pace"] for row in rows),
+        })
+    return result
+
+
+def _apply(views, entries, rebuild=False):
+    return views._apply("by_team", SPEC, entries, "2025-01-01T00:00:00Z", rebuild)
+
+
+def test_changed_entries_are_retracted_and_reapplied(views):
+    entries = {
+        f"e{index}": {"object_id": f"e{index}", "team": f"t{index % 3}", "state": "ok", "distance_km": index * 1.5, "pace": 4.0 + index / 10}
+        for index in range(12)
+    }
+    _apply(views, list(entries.values()), rebuild=True)
+    assert views.read("by_team")["groups"] == _expected(entries)
+
+    changes = [
+        dict(entries["e0"], team="t1"),               # Gruppe wechselt
+        dict(entries["e3"], pace=9.9),                # neues Maximum
+        dict(entries["e1"], pace=5.5),                # bisheriges Minimum von t1 fällt weg
+        dict(entries["e2"], state="archived"),        # fällt aus dem Filter
+        {"object_id": "e99", "team": "t3", "state": "ok", "distance_km": 2.0, "pace": 5.0},
+    ]
+    for change in changes:
+        entries[change["object_id"]] = change
+    result = _apply(views, changes)
+    assert result["changed"] == 5
+    assert views.read("by_team")["groups"] == _expected(entries)
+    assert views.read("by_team")["rows"] == sum(entry["state"] == "ok" for entry in entries.values())
+
+    # Derselbe Stand erneut angewendet (Wasserstand mit >=) ändert nichts
+    assert _apply(views, changes)["changed"] == 0
+    assert views.read("by_team")["groups"] == _expected(entries)
+
+
+def test_random_updates_match_full_recomputation(views):
+    rng = random.Random(3)
+    entries = {}
+    for round_number in range(20):
+        batch = []
+        for _ in range(15):
+            object_id = f"e{rng.randrange(40)}"
+            entry = {
+                "object_id": object_id,
+                "team": rng.choice(["rot", "blau", "gelb"]),
+                "state": rng.choice(["ok", "ok", "ok", "draft"]),
+                "distance_km": rng.randrange(1, 400) / 4,
+                "pace": rng.randrange(30, 80) / 10,
+            }
+            entries[object_id] = entry
+            batch.append(entry)
+        _apply(views, batch, rebuild=round_number == 0)
+        assert views.read("by_team")["groups"] == _expected(entries)